@@ -0,0 +1,29 @@
+"""Query parameter helpers shared by the analytics routes."""
+from __future__ import annotations
+
+import re
+from datetime import UTC, datetime
+
+from fastapi import HTTPException
+
+_DURATION_RE = re.compile(r"^\s*(\d+)\s*([hd])\s*$", re.IGNORECASE)
+
+
+def invalid_parameter(message: str) -> HTTPException:
+    return HTTPException(
+        status_code=400,
+        detail={"status": "error", "code": "parameterInvalid", "message": message},
+    )
+
+
+def iso(dt: datetime) -> str:
+    return dt.astimezone(UTC).isoformat().replace("+00:00", "Z")
+
+
+def parse_hours(value: str, name: str) -> int:
+    """Parse durations like "12h" or "7d" into whole hours."""
+    match = _DURATION_RE.match(value)
+    if not match or int(match.group(1)) <= 0:
+        raise invalid_parameter(f"{name} must look like '12h' or '7d'")
+    amount, unit = int(match.group(1)), match.group(2).lower()
+    return amount * 24 if unit == "d" else amount
@@ -0,0 +1,185 @@
+"""
+API routes for the entity co-occurrence graph.
+"""
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import numpy as np
+from fastapi import APIRouter, HTTPException, Query
+
+from app.api.params import invalid_parameter, iso, parse_hours
+from app.core.config import settings
+from app.services.analytics.seasonal import bucket_hour, parse_bucket, shift_bucket
+from app.services.analytics.timelines import kinematics, series_matrix
+from app.services.entity_graph import EntityGraph, articles_connecting, load_entity_graph
+from app.services.rollups import entity_series_for_buckets
+
+
+router = APIRouter()
+
+RELATED_SORTS = ("count", "association")
+TIMELINE_SORTS = ("mentions", "velocity", "acceleration")
+
+
+async def _graph_for_window(window: str) -> tuple[EntityGraph, dict]:
+    window_hours = parse_hours(window, "window")
+    if window_hours > settings.rollup_retention_days * 24:
+        raise invalid_parameter(f"window exceeds rollup retention ({settings.rollup_retention_days}d)")
+    now = datetime.now(tz=UTC)
+    end = shift_bucket(bucket_hour(now), 1)
+    start = shift_bucket(end, -window_hours)
+    graph = await load_entity_graph(settings.sqlite_path, start_bucket=start, end_bucket=end)
+    return graph, {"windowHours": window_hours, "fetchedAt": iso(now)}
+
+
+def _find(graph: EntityGraph, name: str, label: str | None) -> int:
+    i = graph.find(name, label)
+    if i is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"status": "error", "code": "entityNotFound", "message": f"No mentions of '{name}' in window"},
+        )
+    return i
+
+
+@router.get("/entities/related")
+async def get_related_entities(
+    name: str, label: str | None = None, window: str = "24h", limit: int = 20, sort: str = "count"
+):
+    """
+    Entities most often mentioned in the same articles as ``name``.
+
+    ``sort=count`` ranks by shared articles, ``sort=association`` by
+    count / sqrt(mentions_a * mentions_b) so ubiquitous entities rank lower.
+    """
+    if sort not in RELATED_SORTS:
+        raise invalid_parameter(f"sort must be one of {RELATED_SORTS}")
+    graph, meta = await _graph_for_window(window)
+    i = _find(graph, name, label)
+    return {"meta": meta, "entity": graph.node(i), "related": graph.related(i, limit=limit, sort=sort)}
+
+
+@router.get("/entities/neighbourhood")
+async def get_entity_neighbourhood(
+    name: str, label: str | None = None, window: str = "24h", limit: int = 8, depth: int = 1
+):
+    """
+    Ego network around an entity: its top neighbours (expanded ``depth`` hops,
+    at most 2) and every co-occurrence edge among them, ready for a graph view.
+    """
+    if not 1 <= depth <= 2:
+        raise invalid_parameter("depth must be 1 or 2")
+    graph, meta = await _graph_for_window(window)
+    i = _find(graph, name, label)
+    return {"meta": meta, **graph.neighbourhood(i, limit=limit, depth=depth)}
+
+
+@router.get("/entities/connecting")
+async def get_connecting_articles(
+    a: str,
+    b: str,
+    label_a: str | None = None,
+    label_b: str | None = None,
+    limit: int = 20,
+):
+    """
+    Stored articles that mention both entities (newest first).
+
+    Only articles inside ``retention_hours`` are stored, so older connections
+    are visible as counts in /entities/related but not as articles here.
+    """
+    graph, meta = await _graph_for_window(f"{settings.retention_hours}h")
+    first, second = graph.nodes[_find(graph, a, label_a)], graph.nodes[_find(graph, b, label_b)]
+    articles = await articles_connecting(settings.sqlite_path, first, second, limit=limit)
+    return {
+        "meta": meta,
+        "entities": [
+            {"label": first[0], "name": first[1]},
+            {"label": second[0], "name": second[1]},
+        ],
+        "articles": [
+            {
+                "title": row["title"],
+                "url": row["url"],
+                "source": row["source_name"],
+                "published_at": row["published_at"],
+            }
+            for row in articles
+        ],
+    }
+
+
+def _parse_entity(value: str) -> tuple[str | None, str]:
+    """"ORG:NASA" -> ("ORG", "NASA"); "NASA" -> (None, "NASA")."""
+    label, sep, name = value.partition(":")
+    if sep and label.isupper() and name:
+        return label, name
+    return None, value
+
+
+@router.get("/entities/timeline")
+async def get_entity_timeline(
+    entity: list[str] = Query(default=[]),
+    window: str = "48h",
+    smoothing: int = 3,
+    limit: int = 10,
+    sort: str = "mentions",
+):
+    """
+    Hourly mention series with velocity and acceleration per entity.
+
+    Pass ``entity`` several times (optionally ``LABEL:name``) to compare
+    entities in one call; without it the ``limit`` most mentioned entities of
+    the window are returned. Everything comes from the hourly entity rollups:
+    one (entities x hours) matrix, smoothed with a ``smoothing``-hour moving
+    average; velocity/acceleration are its first/second differences at the
+    latest closed hour, in mentions per hour.
+    """
+    if sort not in TIMELINE_SORTS:
+        raise invalid_parameter(f"sort must be one of {TIMELINE_SORTS}")
+    if smoothing < 1:
+        raise invalid_parameter("smoothing must be at least 1")
+    window_hours = parse_hours(window, "window")
+    if window_hours > settings.rollup_retention_days * 24:
+        raise invalid_parameter(f"window exceeds rollup retention ({settings.rollup_retention_days}d)")
+
+    now = datetime.now(tz=UTC)
+    end = shift_bucket(bucket_hour(now), 1)
+    start = shift_bucket(end, -window_hours)
+    buckets = [shift_bucket(start, h) for h in range(window_hours)]
+
+    keys, rows = await entity_series_for_buckets(
+        settings.sqlite_path,
+        start_bucket=start,
+        end_bucket=end,
+        entities=[_parse_entity(e) for e in entity] or None,
+        top=limit,
+    )
+    series = series_matrix(rows, keys, buckets)
+    # The last bucket is the current, partial hour
+    motion = kinematics(series, smoothing_hours=smoothing, partial_last=True)
+    totals = series.sum(axis=1)
+
+    rank_by = {"mentions": totals, "velocity": motion.velocity, "acceleration": motion.acceleration}[sort]
+    order = np.argsort(-rank_by, kind="stable")
+    return {
+        "meta": {
+            "windowHours": window_hours,
+            "smoothingHours": smoothing,
+            "buckets": [iso(parse_bucket(b)) for b in buckets],
+            "fetchedAt": iso(now),
+        },
+        "entities": [
+            {
+                "label": keys[i][0],
+                "name": keys[i][1],
+                "mentions": int(totals[i]),
+                "series": series[i].astype(int).tolist(),
+                "smoothed": np.round(motion.smoothed[i], 3).tolist(),
+                "velocity": round(float(motion.velocity[i]), 3),
+                "acceleration": round(float(motion.acceleration[i]), 3),
+            }
+            for i in order
+        ],
+    }
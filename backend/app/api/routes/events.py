@@ -0,0 +1,112 @@
+"""
+API routes for pushing server events (new articles, breaking stories, clusters).
+"""
+from __future__ import annotations
+
+import asyncio
+
+from fastapi import APIRouter, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from app.services.broadcast import get_broadcast_hub
+
+
+router = APIRouter()
+
+# Comment frame sent when idle so proxies keep the connection open
+KEEPALIVE_SECONDS = 15.0
+
+
+def _parse_types(types: str | None) -> set[str] | None:
+    if not types:
+        return None
+    return {t.strip() for t in types.split(",") if t.strip()}
+
+
+@router.get("/events")
+async def stream_events(request: Request, types: str | None = None):
+    """
+    Server-Sent Events stream of server-side updates.
+
+    The latest event of each type is replayed on connect, so clients can
+    render immediately and never need to poll.
+
+    Args:
+        types: Comma-separated event types to receive (default: all).
+               Known types: articles, breaking, clusters, topics
+
+    Returns:
+        text/event-stream response
+    """
+    hub = get_broadcast_hub()
+    sub = hub.subscribe(_parse_types(types))
+
+    async def event_stream():
+        try:
+            yield "retry: 5000\n\n"
+            while sub.active:
+                event = await sub.get(timeout=KEEPALIVE_SECONDS)
+                if await request.is_disconnected():
+                    break
+                if event is not None:
+                    yield event.to_sse()
+                elif sub.dropped:
+                    # Tell the client it fell behind; EventSource will reconnect
+                    yield "event: dropped\ndata: {}\n\n"
+                else:
+                    yield ": keepalive\n\n"
+        finally:
+            hub.unsubscribe(sub)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def websocket_events(websocket: WebSocket, types: str | None = None):
+    """
+    WebSocket variant of /events; each event is sent as a JSON message.
+
+    Incoming messages are read (and ignored) alongside sending, so a client
+    that goes away is unsubscribed at once instead of at the next send.
+    """
+    await websocket.accept()
+    hub = get_broadcast_hub()
+    sub = hub.subscribe(_parse_types(types))
+
+    async def send_events() -> None:
+        while sub.active:
+            event = await sub.get(timeout=KEEPALIVE_SECONDS)
+            if event is not None:
+                await websocket.send_json(event.to_dict())
+            elif not sub.dropped:
+                await websocket.send_json({"type": "keepalive"})
+        if sub.dropped:
+            await websocket.close(code=1013, reason="Subscriber fell behind")
+
+    async def wait_disconnect() -> None:
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    tasks = {asyncio.create_task(send_events()), asyncio.create_task(wait_disconnect())}
+    try:
+        _, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception) and not isinstance(result, WebSocketDisconnect):
+                raise result
+    finally:
+        for task in tasks:
+            task.cancel()
+        hub.unsubscribe(sub)
+
+
+@router.get("/events/stats")
+async def event_stats():
+    """Broadcast hub statistics (subscribers, published events, dropped clients)."""
+    return get_broadcast_hub().stats()
@@ -4,14 +4,17 @@ API routes for entity extraction and article clustering.
 from __future__ import annotations
 
 from datetime import datetime, timedelta
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 
-from app.services.db import get_all_articles, get_recent_articles
-from app.services.entity_extractor import get_entity_extractor
+from app.services.annotations import top_entities
+from app.services.db import get_all_articles, get_articles_by_urls, get_recent_articles
 from app.services.article_clusterer import get_article_clusterer
 from app.services.topic_modeler import get_topic_modeler
-from app.services.breaking_news_detector import get_breaking_news_detector
+from app.services.breaking_news_detector import BREAKING_THRESHOLD
 from app.core.config import settings
+from app.services.gemini_client import get_gemini_client
+from app.services.presummarizer import cached_summaries
+from app.services.summary_cache import get_summary_cache
 
 
 router = APIRouter()
@@ -27,25 +30,11 @@ async def get_trending_entities():
     Get trending named entities from recent articles.
 
     Returns trending people, organizations, locations, events, and products
-    extracted from articles in the database.
+    extracted from articles in the database (aggregated from the per-article
+    annotations, no NLP at request time).
     """
-    # Get recent articles from database
-    articles = await get_all_articles(settings.sqlite_path)
-
-    if not articles:
-        return {
-            "PERSON": [],
-            "ORG": [],
-            "GPE": [],
-            "EVENT": [],
-            "PRODUCT": []
-        }
-
-    # Extract entities
-    extractor = get_entity_extractor()
-    entities = extractor.extract_from_articles(articles)
-
-    return entities
+    # Entities were extracted once per article at ingest
+    return await top_entities(settings.sqlite_path, limit=20)
 
 
 @router.get("/related/{article_index}")
@@ -245,6 +234,13 @@ async def get_article_clusters():
                 clusters_map[cid] = []
             clusters_map[cid].append(article)
     
+    # Summaries precomputed after the ML cycle (newest summarized member per cluster)
+    summaries = await cached_summaries(
+        get_summary_cache(),
+        get_gemini_client().model,
+        [a for a in articles if clusters_dict.get(a['url'], {}).get('cluster_id', -1) >= 0],
+    )
+
     # Format response (exclude noise cluster -1)
     formatted_clusters = []
     for cluster_id, cluster_articles in clusters_map.items():
@@ -254,6 +250,7 @@ async def get_article_clusters():
         formatted_clusters.append({
             "cluster_id": cluster_id,
             "article_count": len(cluster_articles),
+            "summary": next((summaries[a['url']] for a in cluster_articles if a['url'] in summaries), None),
             "articles": [
                 {
                     "title": art.get("title"),
@@ -301,51 +298,82 @@ async def get_discovered_topics(lookback_hours: int = 24, min_articles: int = 3)
 
 
 @router.get("/breaking")
-async def get_breaking_news(threshold: int = 60):
+async def get_breaking_news(threshold: float = BREAKING_THRESHOLD, limit: int = 5):
     """
-    Get breaking news detected by analyzing article velocity and novelty.
+    Get the top breaking stories detected by analyzing article velocity and novelty.
     
-    Breaking news detection is pre-computed during the 30-minute polling cycle.
+    Breaking news detection is pre-computed per story (article cluster) during
+    the 30-minute polling cycle.
 
-    Uses multiple signals:
-    - Volume spike: Sudden increase in article count
-    - Novel entities: New people/orgs/locations appearing
-    - Rapid clustering: Many similar articles published quickly
+    Uses multiple signals per story:
+    - Volume spike: Sudden increase in the story's article count
+    - Novel entities: New people/orgs/locations appearing in the story
+    - Rapid clustering: How tightly the story's articles agree
 
     Args:
-        threshold: Minimum score to consider breaking news (0-100, default 60)
+        threshold: Minimum score to consider breaking news (0-100, default BREAKING_THRESHOLD)
+        limit: Maximum number of stories to return (default 5)
 
     Returns:
-        Breaking news score, signals, and detection status
+        Ranked breaking stories with their member URLs, plus the top score
     """
-    from app.services.ml_cache import get_breaking_news
+    from app.services.ml_cache import get_breaking_news, get_breaking_stories
     
-    # Get cached breaking news result
+    # Get cached detection results
     cached_result = await get_breaking_news(settings.sqlite_path)
+    stories = await get_breaking_stories(settings.sqlite_path, limit=limit, min_score=threshold)
+    if stories:
+        urls = sorted({story['url'] for story in stories})
+        articles = await get_articles_by_urls(settings.sqlite_path, urls)
+        summaries = await cached_summaries(get_summary_cache(), get_gemini_client().model, articles)
+        for story in stories:
+            story['summary'] = summaries.get(story['url'])
     
     if cached_result:
-        # Apply threshold filter
-        if cached_result["score"] >= threshold:
-            return {
-                "is_breaking": True,
-                "score": cached_result["score"],
-                "signals": cached_result["signals"],
-                "detected_at": cached_result["detected_at"]
-            }
+        response = {
+            "is_breaking": bool(stories),
+            "score": cached_result["score"],
+            "signals": cached_result["signals"],
+            "breaking": stories,
+        }
+        if stories:
+            response["detected_at"] = cached_result["detected_at"]
         else:
-            return {
-                "is_breaking": False,
-                "score": cached_result["score"],
-                "signals": cached_result["signals"],
-                "message": f"Score {cached_result['score']:.1f} below threshold {threshold}"
-            }
+            response["message"] = f"No story scored above threshold {threshold} (top score {cached_result['score']:.1f})"
+        return response
     
     # Fallback: No cached data yet
     return {
         "is_breaking": False,
         "score": 0,
         "signals": {},
+        "breaking": [],
         "message": "Breaking news detection is being computed. Check back in a few minutes."
     }
 
 
+@router.get("/spikes")
+async def get_volume_spikes(scope: str = "source", limit: int = 20):
+    """
+    Get volume spikes for every feed or source against its seasonal baseline.
+
+    Expected volume comes from an hour-of-week EWMA over hourly rollups, so the
+    morning publishing ramp is not mistaken for a spike.
+
+    Args:
+        scope: "feed", "source" or "keyword" (default "source")
+        limit: Maximum number of keys to return (default 20)
+
+    Returns:
+        Observed vs expected counts with z-scores, most anomalous first
+    """
+    from app.services.rollups import BASELINE_SCOPES, score_volume_spikes
+    
+    if scope not in BASELINE_SCOPES:
+        raise HTTPException(
+            status_code=400,
+            detail={"status": "error", "code": "parameterInvalid", "message": f"scope must be one of {', '.join(BASELINE_SCOPES)}"}
+        )
+    
+    spikes = await score_volume_spikes(settings.sqlite_path, scope, limit=limit)
+    return {"scope": scope, "spikes": spikes}
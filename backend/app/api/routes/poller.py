@@ -0,0 +1,20 @@
+"""
+API routes for the headline poller's adaptive schedule.
+"""
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, Request
+
+from app.core.config import settings
+
+
+router = APIRouter()
+
+
+@router.get("/poller/status")
+async def poller_status(request: Request):
+    """Current poll interval per feed (and why), next poll times and daily budget consumption."""
+    poller = getattr(request.app.state, "poller", None)
+    if poller is None:
+        raise HTTPException(status_code=503, detail="Poller not running")
+    return {"adaptive": settings.poll_adaptive, **poller.scheduler.status()}
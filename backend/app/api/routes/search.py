@@ -1,59 +1,46 @@
 from __future__ import annotations
 
-from pathlib import Path
-
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 
 from app.core.errors import UpstreamAPIError
-from app.services.newsapi_client import NewsAPIClient
-from app.services.sentiment import SentimentModel
+from app.services.search_cache import get_search_cache, search_key
+from app.services.sentiment import get_sentiment_model, sentiment_text
 
 
 router = APIRouter()
 
-# Load sentiment model once at module level
-_sentiment_model = SentimentModel(
-    model_path=str(Path(__file__).parent.parent.parent.parent / "models" / "sentiment.pkl"),
-    vectorizer_path=str(Path(__file__).parent.parent.parent.parent / "models" / "vectorizer.pkl"),
-)
-try:
-    _sentiment_model.load()
-except Exception as e:
-    print(f"Warning: Could not load sentiment model: {e}")
-    _sentiment_model = None
-
 
 @router.get("/search")
-async def search(q: str, page: int | None = None, pageSize: int | None = None, language: str | None = None):
-    client = NewsAPIClient()
+async def search(
+    request: Request, q: str, page: int | None = None, pageSize: int | None = None, language: str | None = None
+):
+    client = request.app.state.newsapi
     try:
-        resp = await client.everything(q=q, page=page, page_size=pageSize, language=language)
-        
-        # Enrich articles with sentiment analysis
-        enriched_articles = []
-        for article in resp.articles:
-            article_dict = article.model_dump()
-            
-            # Add sentiment if model is available and article has content
-            if _sentiment_model and article.title:
-                try:
-                    text_to_analyze = article.title
-                    if article.description:
-                        text_to_analyze = f"{article.title}. {article.description}"
-                    
-                    sentiment = _sentiment_model.predict(text_to_analyze)
-                    article_dict["sentiment"] = {
-                        "label": sentiment.label,
-                        "score": sentiment.score
-                    }
-                except Exception as e:
-                    # Don't fail the whole request if sentiment fails
-                    article_dict["sentiment"] = {"label": "unknown", "score": None}
-            else:
-                article_dict["sentiment"] = {"label": "unknown", "score": None}
-            
-            enriched_articles.append(article_dict)
-        
+        # Repeat queries (every keystroke in the search box) are served from the page cache
+        resp, cache_source = await get_search_cache().get_or_fetch(
+            search_key(q, page, pageSize, language),
+            lambda: client.everything(q=q, page=page, page_size=pageSize, language=language),
+        )
+
+        # Enrich the whole page with one batched sentiment pass
+        enriched_articles = [article.model_dump() for article in resp.articles]
+        for article_dict in enriched_articles:
+            article_dict["sentiment"] = {"label": "unknown", "score": None}
+
+        sentiment_meta = None
+        model = get_sentiment_model()
+        if model is not None:
+            texts = [sentiment_text(a.title, a.description) for a in resp.articles]
+            scored = [i for i, text in enumerate(texts) if text]
+            try:
+                batch = model.predict_many([texts[i] for i in scored])
+                for i, result in zip(scored, batch.results):
+                    enriched_articles[i]["sentiment"] = {"label": result.label, "score": result.score}
+                sentiment_meta = batch.to_meta()
+            except Exception:
+                # Don't fail the whole request if sentiment fails
+                pass
+
         return {
             "meta": {
                 "q": q,
@@ -61,10 +48,10 @@ async def search(q: str, page: int | None = None, pageSize: int | None = None, l
                 "pageSize": pageSize,
                 "language": language,
                 "totalResults": resp.totalResults,
+                "sentiment": sentiment_meta,
+                "cache": cache_source,
             },
             "articles": enriched_articles,
         }
     except UpstreamAPIError as e:
         raise HTTPException(status_code=e.status_code, detail=e.to_dict())
-    finally:
-        await client.close()
@@ -0,0 +1,110 @@
+"""
+API routes for stored article sentiment (scored at ingest, never at request time).
+"""
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import numpy as np
+from fastapi import APIRouter, Query
+
+from app.api.params import invalid_parameter, iso, parse_hours
+from app.core.config import settings
+from app.services.analytics.seasonal import bucket_hour, parse_bucket, shift_bucket
+from app.services.rollups import sentiment_series_for_buckets
+from app.services.sentiment_store import sentiment_by_cluster
+
+
+router = APIRouter()
+
+SENTIMENT_SCOPES = ("all", "source", "topic")
+
+
+@router.get("/sentiment/timeline")
+async def get_sentiment_timeline(
+    scope: str = "all",
+    key: list[str] = Query(default=[]),
+    window: str = "24h",
+    limit: int = 10,
+):
+    """
+    Hourly sentiment of all stored articles, or per source / per topic.
+
+    Each series has the article count, mean polarity (P(positive) - P(negative),
+    null for empty hours) and label counts per hour. Pass ``key`` (repeatable)
+    to pick sources/topics, otherwise the ``limit`` busiest are returned.
+    """
+    if scope not in SENTIMENT_SCOPES:
+        raise invalid_parameter(f"scope must be one of {SENTIMENT_SCOPES}")
+    window_hours = parse_hours(window, "window")
+    if window_hours > settings.rollup_retention_days * 24:
+        raise invalid_parameter(f"window exceeds rollup retention ({settings.rollup_retention_days}d)")
+
+    now = datetime.now(tz=UTC)
+    end = shift_bucket(bucket_hour(now), 1)
+    start = shift_bucket(end, -window_hours)
+    buckets = [shift_bucket(start, h) for h in range(window_hours)]
+    bucket_index = {b: i for i, b in enumerate(buckets)}
+
+    keys, rows = await sentiment_series_for_buckets(
+        settings.sqlite_path,
+        scope,
+        start_bucket=start,
+        end_bucket=end,
+        keys=(key or None) if scope != "all" else ["all"],
+        top=limit,
+    )
+    key_index = {k: i for i, k in enumerate(keys)}
+
+    # (keys, hours, [n, polarity_sum, positive, negative, neutral])
+    data = np.zeros((len(keys), len(buckets), 5))
+    for k, bucket, *values in rows:
+        data[key_index[k], bucket_index[bucket]] = values
+    n = data[:, :, 0]
+    mean = np.divide(data[:, :, 1], n, out=np.full(n.shape, np.nan), where=n > 0)
+    overall = np.divide(data[:, :, 1].sum(axis=1), n.sum(axis=1), out=np.zeros(len(keys)), where=n.sum(axis=1) > 0)
+
+    return {
+        "meta": {
+            "scope": scope,
+            "windowHours": window_hours,
+            "buckets": [iso(parse_bucket(b)) for b in buckets],
+            "fetchedAt": iso(now),
+        },
+        "series": [
+            {
+                "key": k,
+                "articles": int(n[i].sum()),
+                "meanPolarity": round(float(overall[i]), 4),
+                "counts": n[i].astype(int).tolist(),
+                "polarity": [None if np.isnan(v) else round(float(v), 4) for v in mean[i]],
+                "positive": data[i, :, 2].astype(int).tolist(),
+                "negative": data[i, :, 3].astype(int).tolist(),
+                "neutral": data[i, :, 4].astype(int).tolist(),
+            }
+            for k, i in key_index.items()
+        ],
+    }
+
+
+@router.get("/sentiment/clusters")
+async def get_sentiment_by_cluster(limit: int = 20, min_size: int = 2):
+    """Sentiment of the current story clusters, largest first."""
+    clusters = await sentiment_by_cluster(settings.sqlite_path, limit=limit, min_size=min_size)
+    return {
+        "clusters": [
+            {
+                "cluster_id": c["cluster_id"],
+                "size": c["size"],
+                "scored": c["scored"],
+                "meanPolarity": None if c["mean_polarity"] is None else round(c["mean_polarity"], 4),
+                "positive": c["positive"] or 0,
+                "negative": c["negative"] or 0,
+                "neutral": c["neutral"] or 0,
+                "title": c["title"],
+                "url": c["url"],
+                "latest": c["latest"],
+            }
+            for c in clusters
+        ]
+    }
@@ -1,14 +1,27 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import time
+from contextlib import aclosing
+
+import httpx
 from pydantic import BaseModel
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 
+from app.api.params import invalid_parameter
+from app.core.config import settings
 from app.core.errors import UpstreamAPIError
-from app.services.gemini_client import GeminiClient
+from app.services.extractive_summarizer import summarize_extractive
+from app.services.gemini_client import get_gemini_client
+from app.services.summary_cache import get_summary_cache, summary_key
 
 
 router = APIRouter()
 
+SUMMARY_MODES = ("fast", "llm", "auto")
+
 
 class SummarizeRequest(BaseModel):
     title: str | None = None
@@ -16,16 +29,154 @@ class SummarizeRequest(BaseModel):
     content: str | None = None
 
 
-@router.post("/summarize")
-async def summarize(req: SummarizeRequest):
+def _require_fields(req: SummarizeRequest) -> None:
     if not (req.title or req.description or req.content):
         raise HTTPException(status_code=400, detail={"status": "error", "code": "parametersMissing", "message": "Provide at least one of title/description/content"})
 
-    client = GeminiClient()
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _unavailable(e: httpx.HTTPError) -> UpstreamAPIError:
+    """Gemini could not be reached (timeout, connection error, ...)."""
+    return UpstreamAPIError(502, "upstreamUnavailable", f"Gemini unavailable: {type(e).__name__}")
+
+
+@router.post("/summarize")
+async def summarize(req: SummarizeRequest, mode: str = "llm"):
+    """
+    Summarize an article.
+
+    Args:
+        mode: "llm" (Gemini, cached), "fast" (local extractive summary, no
+              network) or "auto" (Gemini within summary_llm_budget_seconds,
+              otherwise the extractive summary; the Gemini call keeps running
+              in the background and fills the cache for the next request)
+
+    Gemini errors are returned as-is in "llm" mode (502 "upstreamUnavailable"
+    on timeouts and connection errors); "auto" falls back with the code.
+
+    Returns:
+        {"summary", "source": "cache"|"coalesced"|"upstream"|"extractive", ...}
+    """
+    _require_fields(req)
+    if mode not in SUMMARY_MODES:
+        raise invalid_parameter(f"mode must be one of {', '.join(SUMMARY_MODES)}")
+
+    if mode == "fast":
+        return {"summary": _extractive(req), "source": "extractive"}
+
+    client = get_gemini_client()
+    key = summary_key(client.model, req.title, req.description, req.content)
+    llm = get_summary_cache().get_or_compute(
+        key,
+        client.model,
+        lambda: client.summarize(title=req.title, description=req.description, content=req.content),
+    )
+    if mode == "llm":
+        try:
+            summary, source = await llm
+        except UpstreamAPIError as e:
+            raise HTTPException(status_code=e.status_code, detail=e.to_dict())
+        except httpx.HTTPError as e:
+            raise HTTPException(status_code=502, detail=_unavailable(e).to_dict())
+        return {"summary": summary, "source": source}
+
+    # auto: the upstream task is shielded inside get_or_compute, so the timeout only stops waiting
     try:
-        summary = await client.summarize(title=req.title, description=req.description, content=req.content)
-        return {"summary": summary}
+        summary, source = await asyncio.wait_for(llm, timeout=settings.summary_llm_budget_seconds)
+        return {"summary": summary, "source": source}
+    except TimeoutError:
+        fallback = "llmTimeout"
     except UpstreamAPIError as e:
-        raise HTTPException(status_code=e.status_code, detail=e.to_dict())
-    finally:
-        await client.close()
+        fallback = e.code or f"upstream{e.status_code}"
+    except httpx.HTTPError:
+        fallback = "upstreamUnavailable"
+    return {"summary": _extractive(req), "source": "extractive", "fallback": fallback}
+
+
+def _extractive(req: SummarizeRequest) -> str:
+    return summarize_extractive(
+        title=req.title,
+        description=req.description,
+        content=req.content,
+        max_sentences=settings.summary_extractive_sentences,
+    )
+
+
+@router.post("/summarize/stream")
+async def summarize_stream(req: SummarizeRequest, request: Request):
+    """
+    Server-Sent Events variant of /summarize that relays the summary as it is generated.
+
+    Events:
+        chunk: {"text": ...} - the next piece of the summary
+        done:  {"source": "cache"|"coalesced"|"upstream", "ttftMs", "totalMs"}
+        error: the upstream error (status/code/message; "upstreamUnavailable"
+               when Gemini could not be reached)
+
+    A cached summary is sent as a single chunk. Concurrent requests share one
+    upstream stream: a late joiner first gets the chunks sent so far. Once
+    every browser listening has disconnected, the upstream request is closed
+    and nothing is cached; a completed stream is stored in the summary cache.
+    """
+    _require_fields(req)
+    client = get_gemini_client()
+    cache = get_summary_cache()
+    key = summary_key(client.model, req.title, req.description, req.content)
+
+    async def event_stream():
+        start = time.perf_counter()
+
+        def elapsed_ms() -> float:
+            return round((time.perf_counter() - start) * 1000, 1)
+
+        try:
+            # A non-streaming call for the same summary is already running
+            inflight = None if cache.streaming(key) else cache.inflight(key)
+            if inflight is not None:
+                cache.coalesced += 1
+                summary, source = await asyncio.shield(inflight), "coalesced"
+            else:
+                summary, source = await cache.lookup(key), "cache"
+            if summary is not None:
+                yield _sse("chunk", {"text": summary})
+                yield _sse("done", {"source": source, "ttftMs": elapsed_ms(), "totalMs": elapsed_ms()})
+                return
+        except UpstreamAPIError as e:
+            yield _sse("error", e.to_dict())
+            return
+        except httpx.HTTPError as e:
+            yield _sse("error", _unavailable(e).to_dict())
+            return
+
+        chunks, source = cache.relay(
+            key,
+            client.model,
+            lambda: client.summarize_stream(title=req.title, description=req.description, content=req.content),
+        )
+        ttft_ms = None
+        try:
+            # aclosing: leaving early stops listening now, which closes the upstream
+            # stream if this was its last client
+            async with aclosing(chunks):
+                async for text in chunks:
+                    if ttft_ms is None:
+                        ttft_ms = elapsed_ms()
+                    yield _sse("chunk", {"text": text})
+                    if await request.is_disconnected():
+                        return
+        except UpstreamAPIError as e:
+            yield _sse("error", e.to_dict())
+            return
+        except httpx.HTTPError as e:
+            yield _sse("error", _unavailable(e).to_dict())
+            return
+        yield _sse("done", {"source": source, "ttftMs": ttft_ms, "totalMs": elapsed_ms()})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,65 +1,115 @@
 from __future__ import annotations
 
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, datetime
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter
 
+from app.api.params import invalid_parameter, iso, parse_hours
 from app.core.config import settings
-from app.services.analytics.keywords import count_keywords
-from app.services.analytics.trends import rank_trends
-from app.services.db import fetch_articles_between_published
+from app.services.analytics.seasonal import bucket_hour, parse_bucket, shift_bucket
+from app.services.analytics.sketches import error_bounds
+from app.services.analytics.trends import TREND_MODES, rank_trends, rank_trends_scored
+from app.services.rollups import keyword_counts_for_buckets, keyword_sketch_for_buckets
 
 
 router = APIRouter()
 
-
-def _iso(dt: datetime) -> str:
-    return dt.astimezone(UTC).isoformat().replace("+00:00", "Z")
+PRECISIONS = ("auto", "exact", "approx")
 
 
 @router.get("/trends")
-async def get_trends(limit: int = 50):
+async def get_trends(
+    limit: int = 50,
+    window: str = "24h",
+    split: str = "12h",
+    mode: str = "growth",
+    min_support: int = 2,
+    precision: str = "auto",
+):
     """Compute trends from stored headlines.
 
     v1 locks: country=us, language=en polling only; keywords/phrases are trend units.
-    """
 
-    now = datetime.now(tz=UTC)
-    start_24h = now - timedelta(hours=24)
-    split_12h = now - timedelta(hours=12)
-
-    # Use published_at for windowing
-    previous_rows = await fetch_articles_between_published(
-        settings.sqlite_path,
-        start_iso=_iso(start_24h),
-        end_iso=_iso(split_12h),
-    )
-    current_rows = await fetch_articles_between_published(
-        settings.sqlite_path,
-        start_iso=_iso(split_12h),
-        end_iso=_iso(now),
-    )
+    The current window is the last ``split`` and the previous window is the rest of
+    ``window`` (e.g. window=12h, split=6h compares 6h vs 6h; window=14d, split=7d
+    compares 7d vs 7d). Both are answered by summing hourly keyword rollups, so the
+    cost depends on buckets and distinct terms, not on the number of articles.
 
-    # Keyword extraction uses title as primary; fallback to description.
-    # (Summaries are separate; no scraping.)
-    from app.main import nlp  # avoid circular init ordering issues
+    ``mode=growth`` keeps the locked group-A/group-B ranking. ``mode=log_ratio``
+    and ``mode=zscore`` score the whole vocabulary in one vectorized pass and
+    drop terms with fewer than ``min_support`` current mentions.
 
-    prev_texts = [r["title"] for r in previous_rows if r.get("title")]
-    cur_texts = [r["title"] for r in current_rows if r.get("title")]
+    ``precision=exact`` sums exact rollups (limited to ``rollup_retention_days``);
+    ``precision=approx`` merges per-hour Count-Min/Space-Saving sketches in fixed
+    memory (up to ``sketch_retention_days``) and reports error bounds. ``auto``
+    goes approximate only when the window is longer than the exact rollups.
+    """
 
-    prev_counts = count_keywords(nlp, prev_texts).counts
-    cur_counts = count_keywords(nlp, cur_texts).counts
+    window_hours = parse_hours(window, "window")
+    split_hours = parse_hours(split, "split")
+    if mode not in TREND_MODES:
+        raise invalid_parameter(f"mode must be one of {TREND_MODES}")
+    if split_hours >= window_hours:
+        raise invalid_parameter("split must be shorter than window")
+    if precision not in PRECISIONS:
+        raise invalid_parameter(f"precision must be one of {PRECISIONS}")
+    exact_limit = settings.rollup_retention_days * 24
+    if precision == "auto":
+        precision = "exact" if window_hours <= exact_limit else "approx"
+    limit_hours, limit_days = (
+        (exact_limit, settings.rollup_retention_days)
+        if precision == "exact"
+        else (settings.sketch_retention_days * 24, settings.sketch_retention_days)
+    )
+    if window_hours > limit_hours:
+        raise invalid_parameter(f"window exceeds {precision} retention ({limit_days}d)")
 
-    ranked = rank_trends(current=dict(cur_counts), previous=dict(prev_counts), limit=limit)
+    now = datetime.now(tz=UTC)
+    # Hour buckets; the current (partial) hour belongs to the current window
+    end = shift_bucket(bucket_hour(now), 1)
+    split_at = shift_bucket(end, -split_hours)
+    start = shift_bucket(end, -window_hours)
+
+    error = None
+    totals = None
+    if precision == "exact":
+        prev_counts = await keyword_counts_for_buckets(settings.sqlite_path, start_bucket=start, end_bucket=split_at)
+        cur_counts = await keyword_counts_for_buckets(settings.sqlite_path, start_bucket=split_at, end_bucket=end)
+    else:
+        dims = {"width": settings.sketch_width, "depth": settings.sketch_depth, "capacity": settings.sketch_topk}
+        prev_sketch = await keyword_sketch_for_buckets(
+            settings.sqlite_path, start_bucket=start, end_bucket=split_at, **dims
+        )
+        cur_sketch = await keyword_sketch_for_buckets(settings.sqlite_path, start_bucket=split_at, end_bucket=end, **dims)
+        # Only current heavy hitters can trend; previous counts are point estimates
+        candidates = cur_sketch.candidates()
+        cur_counts = cur_sketch.estimate_many(candidates)
+        prev_counts = {t: n for t, n in prev_sketch.estimate_many(candidates).items() if n}
+        totals = (cur_sketch.total, prev_sketch.total)
+        error = {"current": error_bounds(cur_sketch).to_dict(), "previous": error_bounds(prev_sketch).to_dict()}
+
+    if mode == "growth":
+        ranked = rank_trends(current=dict(cur_counts), previous=dict(prev_counts), limit=limit)
+    else:
+        ranked = rank_trends_scored(
+            current=cur_counts, previous=prev_counts, method=mode, limit=limit, min_support=min_support, totals=totals
+        )
 
     return {
         "meta": {
             "country": settings.poll_country,
             "language": settings.poll_language,
-            "windowHours": 24,
-            "splitHours": 12,
+            "windowHours": window_hours,
+            "splitHours": split_hours,
+            "mode": mode,
+            "precision": precision,
+            "errorBounds": error,
+            "windowStart": iso(parse_bucket(start)),
+            "splitAt": iso(parse_bucket(split_at)),
+            "windowEnd": iso(parse_bucket(end)),
             "retentionHours": settings.retention_hours,
-            "fetchedAt": _iso(now),
+            "rollupRetentionDays": settings.rollup_retention_days,
+            "fetchedAt": iso(now),
         },
         "trending": [
             {
@@ -68,6 +118,7 @@ async def get_trends(limit: int = 50):
                 "previousCount": t.previous_count,
                 "growth": t.growth,
                 "isNew": t.previous_count == 0,
+                "score": None if t.score is None else round(t.score, 4),
             }
             for t in ranked
         ],
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -18,9 +19,35 @@ class Settings(BaseSettings):
     # Polling / trends
     poll_country: str = "us"
     poll_language: str = "en"
-    poll_interval_minutes: int = 30
+    poll_interval_minutes: int = 30  # initial interval (the fixed one when poll_adaptive is off)
+    # Adaptive polling: interval follows the share of new URLs and the breaking score, within a daily budget
+    poll_adaptive: bool = True
+    poll_min_interval_minutes: float = 5.0
+    poll_max_interval_minutes: float = 90.0
+    poll_target_new_fraction: float = 0.2
+    poll_daily_budget: int = 100  # NewsAPI requests per UTC day for polling, shared by all feeds
+    poll_jitter: float = 0.1  # +/- fraction applied to every interval
     retention_hours: int = 48
 
+    # Seasonal volume baseline (hour-of-week EWMA over hourly rollups)
+    baseline_alpha: float = 0.2
+    baseline_settle_hours: int = 1
+    baseline_keyword_terms: int = 200  # most frequent keywords (trailing week) with their own baseline
+    rollup_retention_days: int = 14
+
+    # Keyword sketches (Count-Min + Space-Saving per hour) for long /trends windows
+    sketch_width: int = 2048
+    sketch_depth: int = 4
+    sketch_topk: int = 256
+    sketch_retention_days: int = 90
+
+    # spaCy batching (nlp.pipe)
+    nlp_batch_size: int = 256
+    nlp_n_process: int = 1
+
+    # Headline keyword engine: "spacy" (noun chunks) or "rules" (regex chunker, no parser)
+    keyword_engine: Literal["spacy", "rules"] = "spacy"
+
     # Storage
     sqlite_path: str = "news.db"
 
@@ -28,6 +55,43 @@ class Settings(BaseSettings):
     newsapi_base_url: str = "https://newsapi.org/v2"
     gemini_model: str = "gemini-2.5-flash"  # Latest stable model (verified working)
     gemini_timeout_seconds: float = 20.0
+    gemini_base_url: str = "https://generativelanguage.googleapis.com/v1"
+
+    # Response decoding: "pydantic" (one pass from bytes) or "orjson" (needs the optional orjson package)
+    json_decoder: str = "pydantic"
+    # Stream-decode /everything pages with at least this many articles (0 = off: the one-pass parse
+    # is cheaper at NewsAPI's 100-article page cap; streaming only bounds buffering)
+    newsapi_stream_min_page_size: int = 0
+
+    # Shared upstream clients: pool size and AIMD concurrency limits per API
+    upstream_max_connections: int = 20
+    newsapi_concurrency: int = 4
+    newsapi_concurrency_max: int = 16
+    newsapi_latency_target_ms: float = 3000.0
+    newsapi_hedge: bool = False  # a hedge is a second request against the NewsAPI quota
+    gemini_concurrency: int = 4
+    gemini_concurrency_max: int = 16
+    gemini_latency_target_ms: float = 15000.0
+
+    # Summary cache (SQLite, TTL + LRU)
+    summary_cache_ttl_hours: float = 72.0
+    summary_cache_max_entries: int = 5000
+
+    # /search page cache (in-process LRU, stale-while-revalidate; optionally mirrored to SQLite)
+    search_cache_ttl_seconds: float = 120.0
+    search_cache_stale_seconds: float = 600.0
+    search_cache_max_entries: int = 500
+    search_cache_sqlite: bool = False
+
+    # /summarize?mode=auto serves the extractive summary when the LLM misses this budget
+    summary_llm_budget_seconds: float = 3.0
+    summary_extractive_sentences: int = 3
+
+    # Background summaries of top breaking stories / clusters after each ML cycle
+    presummarize_breaking: int = 5
+    presummarize_clusters: int = 10
+    presummarize_concurrency: int = 3
+    presummarize_token_budget: int = 0  # estimated tokens per cycle (e.g. 20000); 0 disables
 
 
 settings = Settings()  # singleton
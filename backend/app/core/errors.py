@@ -3,7 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+# Not frozen: raising through a context manager sets __traceback__ on the instance
+@dataclass
 class UpstreamAPIError(Exception):
     status_code: int
     code: str | None
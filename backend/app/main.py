@@ -1,27 +1,45 @@
 from __future__ import annotations
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.routes.entities import router as entities_router
+from app.api.routes.events import router as events_router
+from app.api.routes.ml import router as ml_router
+from app.api.routes.poller import router as poller_router
 from app.api.routes.search import router as search_router
+from app.api.routes.sentiment import router as sentiment_router
 from app.api.routes.summarize import router as summarize_router
 from app.api.routes.trends import router as trends_router
 from app.core.config import settings
-from app.services.analytics.keywords import load_spacy_model
+from app.services.gemini_client import get_gemini_client
+from app.services.newsapi_client import NewsAPIClient
+from app.services.nlp_registry import get_nlp_registry
 from app.services.poller import HeadlinePoller
-
-nlp = load_spacy_model()
+from app.services.search_cache import get_search_cache
+from app.services.sentiment import get_sentiment_model
+from app.services.summary_cache import get_summary_cache
+from app.services.upstream import close_upstreams, upstream_stats
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Load spaCy in the background; the API serves while the model warms up
+    app.state.nlp_warmup = asyncio.create_task(get_nlp_registry().warmup(), name="nlp_warmup")
+    # App-scoped upstream clients over shared connection pools
+    app.state.newsapi = NewsAPIClient()
+    app.state.gemini = get_gemini_client()
     poller = HeadlinePoller(sqlite_path=settings.sqlite_path)
     await poller.start()
     app.state.poller = poller
     yield
     await poller.stop()
+    app.state.nlp_warmup.cancel()
+    await asyncio.gather(app.state.nlp_warmup, return_exceptions=True)
+    await close_upstreams()
 
 
 app = FastAPI(title="NewsPulse API", version="0.1.0", lifespan=lifespan)
@@ -37,8 +55,21 @@ app.add_middleware(
 app.include_router(trends_router)
 app.include_router(search_router)
 app.include_router(summarize_router)
+app.include_router(ml_router)
+app.include_router(events_router)
+app.include_router(entities_router)
+app.include_router(sentiment_router)
+app.include_router(poller_router)
 
 
 @app.get("/health")
 async def health():
-    return {"status": "ok"}
+    sentiment = get_sentiment_model()
+    return {
+        "status": "ok",
+        "nlp": get_nlp_registry().stats(),
+        "sentiment": sentiment.stats() if sentiment is not None else None,
+        "summaries": get_summary_cache().stats(),
+        "search": get_search_cache().stats(),
+        "upstreams": upstream_stats(),
+    }
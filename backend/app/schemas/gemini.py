@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from pydantic import BaseModel, Field
+
+
+class GeminiPart(BaseModel):
+    text: str | None = None
+
+
+class GeminiContent(BaseModel):
+    parts: list[GeminiPart] = Field(default_factory=list)
+
+
+class GeminiCandidate(BaseModel):
+    content: GeminiContent | None = None
+    finishReason: str | None = None
+
+
+class GeminiUsage(BaseModel):
+    totalTokenCount: int = 0
+
+
+class GeminiResponse(BaseModel):
+    """generateContent response, and each streamGenerateContent chunk (fields we read only)."""
+
+    candidates: list[GeminiCandidate] = Field(default_factory=list)
+    usageMetadata: GeminiUsage | None = None
+
+    def texts(self) -> list[str]:
+        if not self.candidates or self.candidates[0].content is None:
+            return []
+        return [part.text for part in self.candidates[0].content.parts if part.text]
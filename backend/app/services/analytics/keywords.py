@@ -1,9 +1,20 @@
 from __future__ import annotations
 
 from collections import Counter
+from collections.abc import Iterable
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-import spacy
+from app.services.analytics.rule_keywords import extract_keywords_rules_many
+from app.services.nlp_registry import get_nlp_registry
+
+if TYPE_CHECKING:
+    import spacy
+
+    from app.services.nlp_registry import PipelineView
+
+# "spacy": lemmatized noun chunks; "rules": regex chunker (no tagger/parser)
+KEYWORD_ENGINES = ("spacy", "rules")
 
 
 @dataclass(frozen=True)
@@ -11,13 +22,12 @@ class KeywordCounts:
     counts: Counter[str]
 
 
-def load_spacy_model() -> "spacy.language.Language":
-    # Requires user to install: python -m spacy download en_core_web_sm
-    return spacy.load("en_core_web_sm", disable=["ner", "textcat"])
+def load_spacy_model() -> "PipelineView":
+    """The keyword view of the process-wide pipeline (NER disabled)."""
+    return get_nlp_registry().view("keywords")
 
 
-def extract_keywords(nlp: "spacy.language.Language", text: str) -> list[str]:
-    doc = nlp(text)
+def _keywords_from_doc(doc: "spacy.tokens.Doc") -> list[str]:
     keywords: list[str] = []
 
     for chunk in doc.noun_chunks:
@@ -41,9 +51,39 @@ def extract_keywords(nlp: "spacy.language.Language", text: str) -> list[str]:
     return keywords
 
 
-def count_keywords(nlp: "spacy.language.Language", texts: list[str]) -> KeywordCounts:
+def extract_keywords(nlp: "PipelineView", text: str) -> list[str]:
+    return _keywords_from_doc(nlp(text))
+
+
+def extract_keywords_many(
+    nlp: "PipelineView | None",
+    texts: Iterable[str],
+    *,
+    batch_size: int = 256,
+    n_process: int = 1,
+    engine: str = "spacy",
+) -> list[list[str]]:
+    """Extract keywords for many texts in one batched nlp.pipe pass (order preserved).
+
+    ``engine="rules"`` uses the regex chunker instead and ignores ``nlp``.
+    """
+    if engine == "rules":
+        return extract_keywords_rules_many(texts)
+    if engine != "spacy":
+        raise ValueError(f"Unknown keyword engine: {engine}")
+    docs = nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+    return [_keywords_from_doc(doc) for doc in docs]
+
+
+def count_keywords(
+    nlp: "PipelineView | None",
+    texts: list[str],
+    *,
+    batch_size: int = 256,
+    n_process: int = 1,
+    engine: str = "spacy",
+) -> KeywordCounts:
     counter: Counter[str] = Counter()
-    for text in texts:
-        for kw in extract_keywords(nlp, text):
-            counter[kw] += 1
+    for keywords in extract_keywords_many(nlp, texts, batch_size=batch_size, n_process=n_process, engine=engine):
+        counter.update(keywords)
     return KeywordCounts(counter)
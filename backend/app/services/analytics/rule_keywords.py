@@ -0,0 +1,159 @@
+"""
+Rule-based keyword extraction for headlines (no spaCy).
+
+A RAKE-style chunker: one compiled regex splits a headline into words and
+punctuation, candidate phrases are the runs of words between punctuation,
+stopwords and common headline verbs/adverbs, and each word is normalized by
+a small lemmatizer table. Output format matches the spaCy noun-chunk
+extractor (lowercased lemma phrases), at a fraction of the cost.
+"""
+from __future__ import annotations
+
+import re
+from collections import Counter
+from collections.abc import Iterable
+
+# Close to spaCy's English stopwords, minus words that matter in headlines
+STOPWORDS = frozenset(
+    """
+    a about above across after afterwards again against all almost alone along already also although always am
+    among amongst an and another any anyhow anyone anything anyway anywhere are around as at be became because
+    become becomes becoming been before beforehand behind being below beside besides between beyond both but by
+    can cannot could did do does doing done down due during each either else elsewhere enough even ever every
+    everyone everything everywhere except few for former formerly from further had has have having he hence her
+    here hereafter hereby herein hers herself him himself his how however i if in indeed into is it its itself
+    just last latter least less made make many may me meanwhile might mine more moreover most mostly much must my
+    myself namely neither never nevertheless next no nobody none noone nor not nothing now nowhere of off often on
+    once one only onto or other others otherwise our ours ourselves out over own per perhaps please put quite
+    rather re really regarding same say says see seem seemed seeming seems serious several she should show side
+    since so some somehow someone something sometime sometimes somewhere still such than that the their them
+    themselves then thence there thereafter thereby therefore therein thereupon these they this those though
+    through throughout thru thus to together too toward towards under until up upon us used using various very via
+    was we well were what whatever when whence whenever where whereafter whereas whereby wherein whereupon
+    wherever whether which while whither who whoever whole whom whose why will with within without would yet you
+    your yours yourself yourselves vs get gets got amid despite ahead inside outside near like
+    """.split()
+)
+
+# Verbs that join subject and object in headlines; they end a noun phrase.
+# Words mostly used as nouns in headlines (deal, report, vote, test, ...) are left out.
+_VERB_BASES = """
+    accuse add admit agree aim allow announce approve arrest ask ban beat blame block boost break bring call
+    cancel charge cheer claim clash close confirm consider criticize cut debate decide defend delay deny describe
+    die drop ease end enter expand expect face fail fall file flee force give grow halt help hike hint hit hold hurt
+    join jump kill know launch lead leave lift lose lower meet miss move open pass pay plan plunge pledge praise
+    prepare promise propose push quit raise reach reject remain reveal rise run rush say seek seize sell send set
+    shoot sign slam slip slow soar spark split spur stand start stay stop strike struggle suggest suspend take
+    tell threaten tout treat trigger try turn unveil urge vow want warn weigh win withdraw worry
+""".split()
+
+_IRREGULAR_VERBS = """
+    said told took gave won lost led left met ran set shot sent sold held hit fell rose broke brought fought
+    sought seized struck stood began begun found made became came went gone saw seen knew known thought
+    is are was were be been being has have had do does did
+""".split()
+
+
+def _inflections(base: str) -> set[str]:
+    stem = base[:-1] if base.endswith("e") else base
+    forms = {base, base + "s", stem + "ed", stem + "ing"}
+    if base.endswith(("s", "sh", "ch", "x", "z")):
+        forms.add(base + "es")
+    if base.endswith("y") and base[-2:-1] not in "aeiou":
+        forms |= {base[:-1] + "ies", base[:-1] + "ied"}
+    if base.endswith("e"):
+        forms.add(base + "d")
+    return forms
+
+
+HEADLINE_VERBS = frozenset(
+    {form for base in _VERB_BASES for form in _inflections(base)} | set(_IRREGULAR_VERBS)
+)
+
+# Nouns that look like -ly adverbs
+_LY_NOUNS = frozenset("italy family july ally rally supply assembly reply anomaly monopoly fly belly bully".split())
+
+# Irregular plural -> singular (regular plurals are handled by suffix rules)
+LEMMA_TABLE = {
+    "men": "man", "women": "woman", "children": "child", "feet": "foot", "teeth": "tooth", "mice": "mouse",
+    "geese": "goose", "lives": "life", "wives": "wife", "knives": "knife", "leaves": "leaf", "halves": "half",
+    "wolves": "wolf", "thieves": "thief", "crises": "crisis", "analyses": "analysis", "theses": "thesis",
+    "criteria": "criterion", "phenomena": "phenomenon", "data": "data", "media": "medium", "series": "series",
+    "species": "species", "news": "news", "people": "people",
+}
+
+_NO_STRIP_SUFFIXES = ("ss", "us", "is", "ics", "ous", "'s")
+
+# Words (with inner apostrophes, dots, hyphens or ampersands) or runs of punctuation
+_TOKEN_RE = re.compile(r"(?P<word>[A-Za-z0-9]+(?:['’.\-&][A-Za-z0-9]+)*)|(?P<brk>[^\sA-Za-z0-9]+)")
+_NUMBER_RE = re.compile(r"^[\d.,]+(?:s|st|nd|rd|th|k|m|bn)?$", re.IGNORECASE)
+_POSSESSIVE_RE = re.compile(r"['’]s$", re.IGNORECASE)
+
+MAX_PHRASE_WORDS = 4
+
+
+def lemmatize(word: str) -> str:
+    """Singularize a lowercased noun with a lookup table and suffix rules."""
+    if word in LEMMA_TABLE:
+        return LEMMA_TABLE[word]
+    if len(word) <= 3 or not word.endswith("s") or word.endswith(_NO_STRIP_SUFFIXES):
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith(("sses", "xes", "ches", "shes", "zes")):
+        return word[:-2]
+    return word[:-1]
+
+
+def _is_breaker(lower: str) -> bool:
+    if lower in STOPWORDS or lower in HEADLINE_VERBS:
+        return True
+    return lower.endswith("ly") and len(lower) > 4 and lower not in _LY_NOUNS
+
+
+def extract_keywords_rules(text: str) -> list[str]:
+    """Keyword phrases of one headline (same format as the spaCy extractor)."""
+    words = [m.group("word") for m in _TOKEN_RE.finditer(text) if m.group("word")]
+    # In Title Case headlines capitalization says nothing about proper nouns
+    title_case = bool(words) and sum(w[0].isupper() for w in words) / len(words) > 0.6
+
+    keywords: list[str] = []
+    run: list[str] = []
+
+    def flush() -> None:
+        for i in range(0, len(run), MAX_PHRASE_WORDS):
+            phrase = " ".join(run[i : i + MAX_PHRASE_WORDS])
+            if len(phrase) >= 3:
+                keywords.append(phrase)
+        run.clear()
+
+    for position, match in enumerate(_TOKEN_RE.finditer(text)):
+        word = match.group("word")
+        if word is None:
+            flush()
+            continue
+        word = _POSSESSIVE_RE.sub("", word)
+        lower = word.lower()
+        if _NUMBER_RE.match(lower):
+            continue
+        if _is_breaker(lower):
+            flush()
+            continue
+        # A capital only marks a proper noun mid-sentence in sentence-case headlines
+        proper = word[0].isupper() and not title_case and position > 0
+        acronym = word.isupper() and len(word) > 1
+        run.append(lower if proper or acronym else lemmatize(lower))
+    flush()
+
+    return keywords
+
+
+def extract_keywords_rules_many(texts: Iterable[str]) -> list[list[str]]:
+    return [extract_keywords_rules(text) for text in texts]
+
+
+def count_keywords_rules(texts: Iterable[str]) -> Counter[str]:
+    counter: Counter[str] = Counter()
+    for text in texts:
+        counter.update(extract_keywords_rules(text))
+    return counter
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+
+HOURS_PER_WEEK = 168
+BUCKET_FORMAT = "%Y-%m-%dT%H"
+
+
+def bucket_hour(dt: datetime) -> str:
+    """Hour bucket key ("YYYY-MM-DDTHH", UTC) for a timestamp."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    return dt.astimezone(UTC).strftime(BUCKET_FORMAT)
+
+
+def parse_bucket(bucket: str) -> datetime:
+    return datetime.strptime(bucket, BUCKET_FORMAT).replace(tzinfo=UTC)
+
+
+def shift_bucket(bucket: str, hours: int) -> str:
+    return bucket_hour(parse_bucket(bucket) + timedelta(hours=hours))
+
+
+def hour_of_week(dt: datetime) -> int:
+    """Monday 00:00 UTC = 0 ... Sunday 23:00 UTC = 167."""
+    dt = dt.astimezone(UTC) if dt.tzinfo else dt
+    return dt.weekday() * 24 + dt.hour
+
+
+def ewma_update(
+    mean: np.ndarray,
+    var: np.ndarray,
+    n: np.ndarray,
+    observed: np.ndarray,
+    alpha: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Fold one observation per key into an EWMA mean/variance.
+
+    All arrays are aligned per key. The first observation of a slot seeds the
+    mean with the count and the variance with the Poisson variance (= count).
+    """
+    observed = observed.astype(np.float64)
+    first = n == 0
+    delta = observed - mean
+    new_mean = np.where(first, observed, mean + alpha * delta)
+    new_var = np.where(first, observed, (1 - alpha) * (var + alpha * delta**2))
+    return new_mean, new_var, n + 1
+
+
+@dataclass(frozen=True)
+class SpikeScores:
+    expected: np.ndarray
+    z: np.ndarray
+    score: np.ndarray  # 0-100
+
+
+def spike_scores(
+    observed: np.ndarray,
+    expected_mean: np.ndarray,
+    expected_var: np.ndarray,
+    *,
+    min_var: float = 1.0,
+) -> SpikeScores:
+    """Z-score of observed counts against the seasonal expectation.
+
+    The variance is floored at the Poisson variance (= mean) so sparse keys
+    with a lucky near-zero EWMA variance do not explode. Score maps z linearly
+    onto 0-100 (z = 2 -> 50, z >= 4 -> 100).
+    """
+    observed = observed.astype(np.float64)
+    std = np.sqrt(np.maximum(np.maximum(expected_var, expected_mean), min_var))
+    z = (observed - expected_mean) / std
+    return SpikeScores(
+        expected=expected_mean,
+        z=z,
+        score=np.clip(z * 25, 0, 100),
+    )
@@ -0,0 +1,208 @@
+"""
+Fixed-memory keyword sketches for long-horizon trends.
+
+Each hour bucket is summarized by a Count-Min Sketch (approximate count of
+any term) plus a Space-Saving summary (the bucket's heavy hitters). Both are
+mergeable, so a window of any length is answered by merging per-bucket
+sketches in constant memory, and both serialize to plain bytes/JSON for SQLite.
+
+Error bounds (N = total count summarized):
+  Count-Min:    estimate - true <= (e / width) * N with probability 1 - e^-depth
+  Space-Saving: estimate - true <= error stored for the term (<= N / capacity)
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+import zlib
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+def _hash_pairs(terms: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Two stable 32-bit hashes per term (Python's hash() is salted per process)."""
+    digests = np.frombuffer(
+        b"".join(hashlib.blake2b(t.encode(), digest_size=8).digest() for t in terms),
+        dtype="<u4",
+    ).reshape(-1, 2)
+    # Odd second hash so double hashing visits distinct columns
+    return digests[:, 0].astype(np.uint64), digests[:, 1].astype(np.uint64) | np.uint64(1)
+
+
+class CountMinSketch:
+    """Count-Min Sketch with double hashing; supports signed (turnstile) updates."""
+
+    def __init__(self, width: int = 2048, depth: int = 4, table: np.ndarray | None = None, total: int = 0):
+        self.width = width
+        self.depth = depth
+        self.table = table if table is not None else np.zeros((depth, width), dtype=np.int64)
+        self.total = total
+
+    def _columns(self, terms: list[str]) -> np.ndarray:
+        """Column index per (row, term), shape (depth, len(terms))."""
+        a, b = _hash_pairs(terms)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        return ((a[None, :] + rows * b[None, :]) % np.uint64(self.width)).astype(np.intp)
+
+    def add_many(self, counts: Mapping[str, int]) -> None:
+        if not counts:
+            return
+        terms = list(counts)
+        values = np.fromiter(counts.values(), dtype=np.int64, count=len(terms))
+        cols = self._columns(terms)
+        for row in range(self.depth):
+            np.add.at(self.table[row], cols[row], values)
+        self.total += int(values.sum())
+
+    def estimate_many(self, terms: list[str]) -> np.ndarray:
+        if not terms:
+            return np.zeros(0, dtype=np.int64)
+        cols = self._columns(terms)
+        estimates = self.table[np.arange(self.depth)[:, None], cols].min(axis=0)
+        return np.maximum(estimates, 0)
+
+    def estimate(self, term: str) -> int:
+        return int(self.estimate_many([term])[0])
+
+    def merge(self, other: CountMinSketch) -> None:
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("Count-Min sketches must share width and depth to merge")
+        self.table += other.table
+        self.total += other.total
+
+    @property
+    def epsilon(self) -> float:
+        return math.e / self.width
+
+    @property
+    def delta(self) -> float:
+        return math.exp(-self.depth)
+
+    def max_overcount(self) -> float:
+        """Overcount bound that holds for any single estimate with probability 1 - delta."""
+        return self.epsilon * self.total
+
+    def to_bytes(self) -> bytes:
+        # Hourly counts are small; int32 + zlib keeps mostly-empty tables tiny
+        return zlib.compress(self.table.astype(np.int32).tobytes())
+
+    @classmethod
+    def from_bytes(cls, data: bytes, *, width: int, depth: int, total: int) -> CountMinSketch:
+        table = np.frombuffer(zlib.decompress(data), dtype=np.int32).astype(np.int64).reshape(depth, width)
+        return cls(width, depth, table=table, total=total)
+
+
+@dataclass
+class SpaceSaving:
+    """Space-Saving heavy hitters: at most ``capacity`` terms with count and overcount error."""
+
+    capacity: int = 256
+    counters: dict[str, list[int]] = field(default_factory=dict)  # term -> [count, error]
+
+    def _min_count(self) -> int:
+        if len(self.counters) < self.capacity:
+            return 0
+        return min(c for c, _ in self.counters.values())
+
+    def add_many(self, counts: Mapping[str, int]) -> None:
+        """Offer weighted items; heavy ones first so evictions hit the tail."""
+        for term, n in sorted(counts.items(), key=lambda kv: kv[1], reverse=True):
+            if n <= 0:
+                continue
+            if term in self.counters:
+                self.counters[term][0] += n
+            elif len(self.counters) < self.capacity:
+                self.counters[term] = [n, 0]
+            else:
+                victim = min(self.counters, key=lambda t: self.counters[t][0])
+                floor = self.counters.pop(victim)[0]
+                self.counters[term] = [floor + n, floor]
+
+    def merge(self, other: SpaceSaving) -> None:
+        """Mergeable-summaries rule: terms missing from a full summary get its minimum as count and error."""
+        mine, theirs = self._min_count(), other._min_count()
+        merged: dict[str, list[int]] = {}
+        for term in self.counters.keys() | other.counters.keys():
+            c1, e1 = self.counters.get(term, (mine, mine))
+            c2, e2 = other.counters.get(term, (theirs, theirs))
+            merged[term] = [c1 + c2, e1 + e2]
+        top = sorted(merged.items(), key=lambda kv: (kv[1][0], kv[0]), reverse=True)[: self.capacity]
+        self.counters = dict(top)
+
+    def top(self, k: int | None = None) -> list[tuple[str, int, int]]:
+        """(term, count, error) with the highest counts first."""
+        ranked = sorted(self.counters.items(), key=lambda kv: (-kv[1][0], kv[0]))
+        return [(t, c, e) for t, (c, e) in ranked[:k]]
+
+    def max_error(self) -> int:
+        return max((e for _, e in self.counters.values()), default=0)
+
+    def to_rows(self) -> list[list]:
+        return [[t, c, e] for t, c, e in self.top()]
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[list], *, capacity: int) -> SpaceSaving:
+        return cls(capacity, {t: [c, e] for t, c, e in rows})
+
+
+@dataclass
+class KeywordSketch:
+    """Count-Min + Space-Saving pair summarizing the keyword counts of one or more hour buckets."""
+
+    cms: CountMinSketch
+    heavy: SpaceSaving
+
+    @classmethod
+    def empty(cls, *, width: int = 2048, depth: int = 4, capacity: int = 256) -> KeywordSketch:
+        return cls(CountMinSketch(width, depth), SpaceSaving(capacity))
+
+    def add_many(self, counts: Mapping[str, int]) -> None:
+        self.cms.add_many(counts)
+        self.heavy.add_many(counts)
+
+    def merge(self, other: KeywordSketch) -> None:
+        self.cms.merge(other.cms)
+        self.heavy.merge(other.heavy)
+
+    @property
+    def total(self) -> int:
+        return self.cms.total
+
+    def candidates(self, k: int | None = None) -> list[str]:
+        return [t for t, _, _ in self.heavy.top(k)]
+
+    def estimate_many(self, terms: list[str]) -> dict[str, int]:
+        """Count estimates; the tighter of the two upper bounds when a term is tracked by both."""
+        estimates = self.cms.estimate_many(terms)
+        result = {}
+        for term, est in zip(terms, estimates):
+            tracked = self.heavy.counters.get(term)
+            result[term] = int(min(est, tracked[0]) if tracked else est)
+        return result
+
+
+@dataclass(frozen=True)
+class SketchErrorBounds:
+    epsilon: float
+    delta: float
+    max_overcount: float
+    heavy_hitter_max_error: int
+
+    def to_dict(self) -> dict:
+        return {
+            "epsilon": round(self.epsilon, 6),
+            "delta": round(self.delta, 6),
+            "maxOvercount": round(self.max_overcount, 2),
+            "heavyHitterMaxError": self.heavy_hitter_max_error,
+        }
+
+
+def error_bounds(sketch: KeywordSketch) -> SketchErrorBounds:
+    return SketchErrorBounds(
+        epsilon=sketch.cms.epsilon,
+        delta=sketch.cms.delta,
+        max_overcount=sketch.cms.max_overcount(),
+        heavy_hitter_max_error=sketch.heavy.max_error(),
+    )
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Kinematics:
+    smoothed: np.ndarray  # (keys, hours) trailing moving average
+    velocity: np.ndarray  # (keys,) latest change of the smoothed rate, mentions/hour per hour
+    acceleration: np.ndarray  # (keys,) latest change of velocity
+
+
+def series_matrix(
+    rows: list[tuple[str, str, str, int]],
+    keys: list[tuple[str, str]],
+    buckets: list[str],
+) -> np.ndarray:
+    """Dense (keys, hours) count matrix from sparse (label, term, bucket, count) rows."""
+    key_index = {k: i for i, k in enumerate(keys)}
+    bucket_index = {b: i for i, b in enumerate(buckets)}
+    hits = [(key_index[(l, t)], bucket_index[b], n) for l, t, b, n in rows if (l, t) in key_index and b in bucket_index]
+    matrix = np.zeros((len(keys), len(buckets)))
+    if hits:
+        ki, bi, n = (np.array(col) for col in zip(*hits))
+        np.add.at(matrix, (ki, bi), n)
+    return matrix
+
+
+def kinematics(series: np.ndarray, *, smoothing_hours: int = 3, partial_last: bool = False) -> Kinematics:
+    """
+    Velocity and acceleration of every row of a (keys, hours) series at once.
+
+    Counts are smoothed with a trailing moving average (cumulative-sum trick),
+    velocity is its first difference and acceleration the second, read at the
+    last hour. With ``partial_last`` the last column is the still-open hour:
+    it is smoothed but velocity/acceleration are read at the last closed hour,
+    so an hour in progress does not look like a slowdown. Short series yield zeros.
+    """
+    keys, hours = series.shape
+    w = max(1, min(smoothing_hours, hours))
+    csum = np.cumsum(np.pad(series, ((0, 0), (1, 0))), axis=1)
+    lagged = np.concatenate([np.zeros((keys, w)), csum[:, : hours + 1 - w]], axis=1)[:, 1:]
+    # Early hours average over what exists so far
+    smoothed = (csum[:, 1:] - lagged) / np.minimum(np.arange(1, hours + 1), w)
+
+    closed = hours - 1 if partial_last else hours
+    velocity_series = np.diff(smoothed[:, :closed], axis=1)
+    acceleration_series = np.diff(velocity_series, axis=1)
+    velocity = velocity_series[:, -1] if closed > 1 else np.zeros(keys)
+    acceleration = acceleration_series[:, -1] if closed > 2 else np.zeros(keys)
+    return Kinematics(smoothed, velocity, acceleration)
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import dataclass
 
+import numpy as np
+
+# "growth" is the locked group-A/group-B ranking; the others are statistical scores
+TREND_MODES = ("growth", "log_ratio", "zscore")
+
 
 @dataclass(frozen=True)
 class TrendItem:
@@ -9,6 +15,7 @@ class TrendItem:
     current_count: int
     previous_count: int
     growth: float | None  # None => new/emerging (previous_count == 0)
+    score: float | None = None  # statistical modes only
 
 
 def compute_growth(current_count: int, previous_count: int) -> float | None:
@@ -46,3 +53,100 @@ def rank_trends(
 
     ranked = group_a + group_b
     return ranked[:limit]
+
+
+def align_counts(
+    current: Mapping[str, int], previous: Mapping[str, int]
+) -> tuple[list[str], np.ndarray, np.ndarray]:
+    """Align two term->count maps into one vocabulary and two count vectors."""
+    terms = list(current)
+    terms.extend(t for t in previous if t not in current)
+    cur = np.fromiter((current.get(t, 0) for t in terms), dtype=np.float64, count=len(terms))
+    prev = np.fromiter((previous.get(t, 0) for t in terms), dtype=np.float64, count=len(terms))
+    return terms, cur, prev
+
+
+def score_trends(
+    current: np.ndarray,
+    previous: np.ndarray,
+    *,
+    method: str = "log_ratio",
+    alpha: float = 1.0,
+    min_support: int = 2,
+    totals: tuple[float, float] | None = None,
+) -> np.ndarray:
+    """
+    Score every term of an aligned vocabulary in one vectorized pass.
+
+    log_ratio: additive-smoothed log ratio of the term's share in each window,
+               so one-off terms cannot outrank well-supported risers.
+    zscore:    binomial z-score of the current count given the term's total
+               count and the current window's share of all mentions.
+
+    Terms with fewer than ``min_support`` current mentions get -inf.
+    ``totals`` overrides the window totals when the vectors only hold a
+    candidate subset of the vocabulary (e.g. sketch heavy hitters).
+    """
+    n_cur, n_prev = totals if totals is not None else (current.sum(), previous.sum())
+
+    if method == "log_ratio":
+        vocab = len(current)
+        scores = np.log((current + alpha) / (n_cur + alpha * vocab)) - np.log(
+            (previous + alpha) / (n_prev + alpha * vocab)
+        )
+    elif method == "zscore":
+        total = current + previous
+        share = n_cur / (n_cur + n_prev) if n_cur + n_prev else 0.0
+        std = np.sqrt(total * share * (1 - share))
+        scores = np.divide(
+            current - total * share,
+            std,
+            out=np.full(len(current), -np.inf),
+            where=std > 0,
+        )
+    else:
+        raise ValueError(f"Unknown trend scoring method: {method}")
+
+    return np.where(current >= min_support, scores, -np.inf)
+
+
+def top_k(scores: np.ndarray, k: int, tiebreak: np.ndarray | None = None) -> np.ndarray:
+    """
+    Indices of the k highest finite scores, best first.
+
+    argpartition selects the k winners in O(n); only those k are sorted.
+    Ties on score are broken by ``tiebreak`` (e.g. current count), higher first.
+    """
+    finite = np.flatnonzero(np.isfinite(scores))
+    if k <= 0 or finite.size == 0:
+        return np.array([], dtype=np.int64)
+    if finite.size > k:
+        finite = finite[np.argpartition(-scores[finite], k - 1)[:k]]
+    # lexsort uses the last key as primary
+    keys = (-scores[finite],) if tiebreak is None else (-tiebreak[finite], -scores[finite])
+    return finite[np.lexsort(keys)]
+
+
+def rank_trends_scored(
+    *,
+    current: Mapping[str, int],
+    previous: Mapping[str, int],
+    method: str = "log_ratio",
+    limit: int = 50,
+    min_support: int = 2,
+    alpha: float = 1.0,
+    totals: tuple[float, float] | None = None,
+) -> list[TrendItem]:
+    """Statistical alternative to rank_trends for large vocabularies."""
+    terms, cur, prev = align_counts(current, previous)
+    scores = score_trends(cur, prev, method=method, alpha=alpha, min_support=min_support, totals=totals)
+    return [
+        TrendItem(
+            keyword=terms[i],
+            current_count=int(cur[i]),
+            previous_count=int(prev[i]),
+            growth=compute_growth(int(cur[i]), int(prev[i])),
+            score=float(scores[i]),
+        )
+        for i in top_k(scores, limit, tiebreak=cur)
+    ]
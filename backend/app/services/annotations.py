@@ -0,0 +1,387 @@
+"""
+Article Annotations - NLP results computed once per article at ingest.
+
+Keyword phrases (spaCy noun chunks of the title) and typed entities (NER over
+title + description) are stored in normalized tables keyed by article ID.
+An article is re-annotated only when its title/description change, so
+/trends and /entities become pure SQL aggregations with no NLP at request time.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from collections import Counter
+from collections.abc import Iterable
+from itertools import combinations
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+import aiosqlite
+
+from app.services.analytics.keywords import extract_keywords_many
+from app.services.analytics.seasonal import bucket_hour
+from app.services.entity_extractor import ENTITY_TYPES
+from app.services.rollups import apply_term_deltas
+
+if TYPE_CHECKING:
+    from app.services.entity_extractor import EntityExtractor
+    from app.services.nlp_registry import PipelineView
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS article_annotations (
+  article_id INTEGER PRIMARY KEY,
+  text_hash TEXT NOT NULL,
+  bucket_hour TEXT,  -- hour bucket the annotations were rolled up into
+  annotated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS article_keywords (
+  article_id INTEGER NOT NULL,
+  phrase TEXT NOT NULL,
+  count INTEGER NOT NULL,
+  PRIMARY KEY (article_id, phrase)
+);
+
+CREATE INDEX IF NOT EXISTS idx_article_keywords_phrase ON article_keywords(phrase);
+
+CREATE TABLE IF NOT EXISTS article_entities (
+  article_id INTEGER NOT NULL,
+  label TEXT NOT NULL,
+  text TEXT NOT NULL,
+  count INTEGER NOT NULL,
+  PRIMARY KEY (article_id, label, text)
+);
+
+CREATE INDEX IF NOT EXISTS idx_article_entities_entity ON article_entities(label, text);
+"""
+
+
+async def init_annotation_tables(sqlite_path: str) -> None:
+    async with aiosqlite.connect(sqlite_path) as db:
+        await db.executescript(SCHEMA)
+        cur = await db.execute("PRAGMA table_info(article_annotations)")
+        if "bucket_hour" not in {row[1] for row in await cur.fetchall()}:
+            await db.execute("ALTER TABLE article_annotations ADD COLUMN bucket_hour TEXT")
+        await db.commit()
+
+
+def _text_hash(
+    title: str | None,
+    description: str | None,
+    published_at: str | None,
+    keyword_engine: str = "spacy",
+    model: str | None = None,
+) -> str:
+    # published_at decides the rollup bucket; the keyword engine and the spaCy
+    # model are part of the identity, so switching either re-annotates everything
+    parts = (title or "", description or "", published_at or "", keyword_engine, model or "")
+    return hashlib.sha1("\n".join(parts).encode()).hexdigest()
+
+
+def _bucket_of(published_at: str | None) -> str | None:
+    try:
+        return bucket_hour(datetime.fromisoformat(published_at))
+    except (TypeError, ValueError):
+        return None
+
+
+# Pairs grow quadratically; entity-dense articles only pair their first N entities
+MAX_PAIR_ENTITIES = 15
+
+
+def entity_pairs(entities: Iterable[tuple[str, str]]) -> list[tuple[str, str, str, str]]:
+    """Distinct co-occurring entity pairs of one article as (label_a, term_a, label_b, term_b), a < b."""
+    distinct = sorted(dict.fromkeys(entities))[:MAX_PAIR_ENTITIES]
+    return [(*a, *b) for a, b in combinations(distinct, 2)]
+
+
+def _entity_text(article: dict) -> str:
+    return " ".join(p for p in (article.get("title"), article.get("description")) if p)
+
+
+async def find_pending_articles(
+    sqlite_path: str, *, keyword_engine: str = "spacy", model: str | None = None
+) -> list[dict]:
+    """Articles never annotated by this engine/model, or whose title/description/published_at changed since."""
+    async with aiosqlite.connect(sqlite_path) as db:
+        db.row_factory = aiosqlite.Row
+        cur = await db.execute(
+            """
+            SELECT a.id, a.title, a.description, a.published_at, n.text_hash
+            FROM articles a
+            LEFT JOIN article_annotations n ON n.article_id = a.id
+            """
+        )
+        rows = await cur.fetchall()
+
+    pending = []
+    for row in rows:
+        text_hash = _text_hash(row["title"], row["description"], row["published_at"], keyword_engine, model)
+        if row["text_hash"] != text_hash:
+            pending.append({**dict(row), "text_hash": text_hash})
+    return pending
+
+
+async def annotate_pending(
+    sqlite_path: str,
+    *,
+    nlp: "PipelineView | None",
+    extractor: "EntityExtractor",
+    batch_size: int = 256,
+    n_process: int = 1,
+    keyword_engine: str = "spacy",
+) -> list[dict]:
+    """
+    Annotate every new or changed article and persist keywords and entities.
+
+    The keyword/entity hourly rollups are updated in the same transaction:
+    the article's previous contribution is subtracted and the new one added.
+
+    Args:
+        sqlite_path: Path to SQLite database
+        nlp: Keyword view of the shared pipeline (unused by the "rules" engine)
+        extractor: Entity extractor used for NER
+        batch_size: Number of texts per spaCy batch
+        n_process: Number of spaCy worker processes
+        keyword_engine: "spacy" (noun chunks) or "rules" (regex chunker)
+
+    Returns:
+        The annotated articles (id, title, description, published_at)
+    """
+    pending = await find_pending_articles(sqlite_path, keyword_engine=keyword_engine, model=extractor.model_id)
+    if not pending:
+        return []
+
+    def run_nlp() -> tuple[list[list[str]], list[dict[str, list[str]]]]:
+        keywords = extract_keywords_many(
+            nlp,
+            [a["title"] or "" for a in pending],
+            batch_size=batch_size,
+            n_process=n_process,
+            engine=keyword_engine,
+        )
+        entities = extractor.extract_entities_many(
+            [_entity_text(a) for a in pending], batch_size=batch_size, n_process=n_process
+        )
+        return keywords, entities
+
+    # spaCy is CPU-bound; keep the event loop serving requests meanwhile
+    keywords, entities = await asyncio.to_thread(run_nlp)
+
+    ids = [a["id"] for a in pending]
+    now = datetime.now(tz=UTC).isoformat()
+    keyword_deltas: Counter[tuple[str, str]] = Counter()
+    entity_deltas: Counter[tuple[str, str, str]] = Counter()
+    pair_deltas: Counter[tuple[str, str, str, str, str]] = Counter()
+    async with aiosqlite.connect(sqlite_path) as db:
+        for i in range(0, len(ids), 500):
+            chunk = ids[i : i + 500]
+            placeholders = ",".join("?" * len(chunk))
+
+            # Subtract what these articles previously contributed to the rollups
+            cur = await db.execute(
+                f"""
+                SELECT n.bucket_hour, k.phrase, k.count FROM article_keywords k
+                JOIN article_annotations n ON n.article_id = k.article_id
+                WHERE k.article_id IN ({placeholders}) AND n.bucket_hour IS NOT NULL
+                """,
+                chunk,
+            )
+            for bucket, phrase, n in await cur.fetchall():
+                keyword_deltas[(bucket, phrase)] -= n
+            cur = await db.execute(
+                f"""
+                SELECT e.article_id, n.bucket_hour, e.label, e.text, e.count FROM article_entities e
+                JOIN article_annotations n ON n.article_id = e.article_id
+                WHERE e.article_id IN ({placeholders}) AND n.bucket_hour IS NOT NULL
+                """,
+                chunk,
+            )
+            previous: dict[int, tuple[str, list[tuple[str, str]]]] = {}
+            for article_id, bucket, label, text, n in await cur.fetchall():
+                entity_deltas[(bucket, label, text)] -= n
+                previous.setdefault(article_id, (bucket, []))[1].append((label, text))
+            for bucket, found in previous.values():
+                for pair in entity_pairs(found):
+                    pair_deltas[(bucket, *pair)] -= 1
+
+            await db.execute(f"DELETE FROM article_keywords WHERE article_id IN ({placeholders})", chunk)
+            await db.execute(f"DELETE FROM article_entities WHERE article_id IN ({placeholders})", chunk)
+
+        for article, phrases, found in zip(pending, keywords, entities):
+            article["bucket_hour"] = bucket = _bucket_of(article["published_at"])
+            if bucket is None:
+                continue
+            for phrase in phrases:
+                keyword_deltas[(bucket, phrase)] += 1
+            for label, texts in found.items():
+                for text in texts:
+                    entity_deltas[(bucket, label, text)] += 1
+            for pair in entity_pairs((label, text) for label, texts in found.items() for text in texts):
+                pair_deltas[(bucket, *pair)] += 1
+
+        await db.executemany(
+            "INSERT INTO article_keywords(article_id, phrase, count) VALUES(?, ?, ?)",
+            [
+                (article["id"], phrase, n)
+                for article, phrases in zip(pending, keywords)
+                for phrase, n in Counter(phrases).items()
+            ],
+        )
+        await db.executemany(
+            "INSERT INTO article_entities(article_id, label, text, count) VALUES(?, ?, ?, ?)",
+            [
+                (article["id"], label, text, n)
+                for article, found in zip(pending, entities)
+                for label, texts in found.items()
+                for text, n in Counter(texts).items()
+            ],
+        )
+        await db.executemany(
+            """
+            INSERT OR REPLACE INTO article_annotations(article_id, text_hash, bucket_hour, annotated_at)
+            VALUES(?, ?, ?, ?)
+            """,
+            [(article["id"], article["text_hash"], article["bucket_hour"], now) for article in pending],
+        )
+        await apply_term_deltas(db, keywords=keyword_deltas, entities=entity_deltas, pairs=pair_deltas)
+        await db.commit()
+
+    return pending
+
+
+async def rollup_unbucketed_annotations(sqlite_path: str) -> int:
+    """Add annotations stored before rollups existed to the hourly rollups (one-time)."""
+    async with aiosqlite.connect(sqlite_path) as db:
+        cur = await db.execute(
+            """
+            SELECT n.article_id, a.published_at FROM article_annotations n
+            JOIN articles a ON a.id = n.article_id
+            WHERE n.bucket_hour IS NULL
+            """
+        )
+        buckets = {article_id: _bucket_of(published_at) for article_id, published_at in await cur.fetchall()}
+        buckets = {article_id: b for article_id, b in buckets.items() if b is not None}
+        if not buckets:
+            return 0
+
+        keyword_deltas: Counter[tuple[str, str]] = Counter()
+        entity_deltas: Counter[tuple[str, str, str]] = Counter()
+        cur = await db.execute(
+            "SELECT k.article_id, k.phrase, k.count FROM article_keywords k "
+            "JOIN article_annotations n ON n.article_id = k.article_id WHERE n.bucket_hour IS NULL"
+        )
+        for article_id, phrase, n in await cur.fetchall():
+            if article_id in buckets:
+                keyword_deltas[(buckets[article_id], phrase)] += n
+        cur = await db.execute(
+            "SELECT e.article_id, e.label, e.text, e.count FROM article_entities e "
+            "JOIN article_annotations n ON n.article_id = e.article_id WHERE n.bucket_hour IS NULL"
+        )
+        found: dict[int, list[tuple[str, str]]] = {}
+        for article_id, label, text, n in await cur.fetchall():
+            if article_id in buckets:
+                entity_deltas[(buckets[article_id], label, text)] += n
+                found.setdefault(article_id, []).append((label, text))
+        pair_deltas: Counter[tuple[str, str, str, str, str]] = Counter()
+        for article_id, entities in found.items():
+            for pair in entity_pairs(entities):
+                pair_deltas[(buckets[article_id], *pair)] += 1
+
+        await apply_term_deltas(db, keywords=keyword_deltas, entities=entity_deltas, pairs=pair_deltas)
+        await db.executemany(
+            "UPDATE article_annotations SET bucket_hour = ? WHERE article_id = ?",
+            [(b, article_id) for article_id, b in buckets.items()],
+        )
+        await db.commit()
+        return len(buckets)
+
+
+async def backfill_entity_pairs(sqlite_path: str) -> int:
+    """Build the entity co-occurrence rollup from stored annotations if it was never built (one-time)."""
+    async with aiosqlite.connect(sqlite_path) as db:
+        cur = await db.execute("SELECT 1 FROM entity_pair_hourly LIMIT 1")
+        if await cur.fetchone() is not None:
+            return 0
+        cur = await db.execute(
+            """
+            SELECT e.article_id, n.bucket_hour, e.label, e.text FROM article_entities e
+            JOIN article_annotations n ON n.article_id = e.article_id
+            WHERE n.bucket_hour IS NOT NULL
+            """
+        )
+        found: dict[int, tuple[str, list[tuple[str, str]]]] = {}
+        for article_id, bucket, label, text in await cur.fetchall():
+            found.setdefault(article_id, (bucket, []))[1].append((label, text))
+
+        pair_deltas: Counter[tuple[str, str, str, str, str]] = Counter()
+        for bucket, entities in found.values():
+            for pair in entity_pairs(entities):
+                pair_deltas[(bucket, *pair)] += 1
+        await apply_term_deltas(db, keywords=Counter(), entities=Counter(), pairs=pair_deltas)
+        await db.commit()
+        return sum(pair_deltas.values())
+
+
+async def delete_orphan_annotations(sqlite_path: str) -> None:
+    """Remove annotations of articles that no longer exist (e.g. after retention cleanup)."""
+    async with aiosqlite.connect(sqlite_path) as db:
+        for table in ("article_annotations", "article_keywords", "article_entities"):
+            await db.execute(f"DELETE FROM {table} WHERE article_id NOT IN (SELECT id FROM articles)")
+        await db.commit()
+
+
+async def keyword_counts_between(sqlite_path: str, *, start_iso: str, end_iso: str) -> Counter[str]:
+    """Keyword phrase counts over articles published in [start_iso, end_iso)."""
+    async with aiosqlite.connect(sqlite_path) as db:
+        cur = await db.execute(
+            """
+            SELECT k.phrase, SUM(k.count)
+            FROM article_keywords k
+            JOIN articles a ON a.id = k.article_id
+            WHERE a.published_at >= ? AND a.published_at < ?
+            GROUP BY k.phrase
+            """,
+            (start_iso, end_iso),
+        )
+        return Counter(dict(await cur.fetchall()))
+
+
+async def top_entities(sqlite_path: str, *, limit: int = 20) -> dict[str, list[tuple[str, int]]]:
+    """Most mentioned entities per type across all stored articles."""
+    async with aiosqlite.connect(sqlite_path) as db:
+        cur = await db.execute(
+            """
+            SELECT label, text, mentions FROM (
+              SELECT label, text, SUM(count) AS mentions,
+                     ROW_NUMBER() OVER (PARTITION BY label ORDER BY SUM(count) DESC, text) AS rn
+              FROM article_entities
+              GROUP BY label, text
+            )
+            WHERE rn <= ?
+            ORDER BY label, mentions DESC, text
+            """,
+            (limit,),
+        )
+        rows = await cur.fetchall()
+
+    result: dict[str, list[tuple[str, int]]] = {label: [] for label in ENTITY_TYPES}
+    for label, text, mentions in rows:
+        result.setdefault(label, []).append((text, mentions))
+    return result
+
+
+async def get_article_entities(sqlite_path: str, article_ids: list[int]) -> dict[int, dict[str, list[str]]]:
+    """Stored entities per article ID ({type: [names]})."""
+    result: dict[int, dict[str, list[str]]] = {}
+    async with aiosqlite.connect(sqlite_path) as db:
+        for i in range(0, len(article_ids), 500):
+            chunk = article_ids[i : i + 500]
+            cur = await db.execute(
+                f"SELECT article_id, label, text FROM article_entities WHERE article_id IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            for article_id, label, text in await cur.fetchall():
+                result.setdefault(article_id, {}).setdefault(label, []).append(text)
+    return result
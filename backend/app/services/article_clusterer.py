@@ -50,6 +50,27 @@ class ArticleClusterer:
 
         return self.model.encode(texts, show_progress_bar=False)
 
+    def cluster_embeddings(
+        self, embeddings: np.ndarray, eps: float = 0.3, min_samples: int = 2
+    ) -> np.ndarray:
+        """
+        Cluster pre-computed embeddings using DBSCAN.
+
+        Args:
+            embeddings: Numpy array of embeddings (n_texts, embedding_dim)
+            eps: Maximum distance between two samples for clustering (lower = tighter clusters)
+            min_samples: Minimum number of articles to form a cluster
+
+        Returns:
+            Cluster label per row (-1 means noise)
+        """
+        if embeddings.size == 0:
+            return np.array([], dtype=int)
+
+        # DBSCAN works well for varying cluster sizes
+        clustering = DBSCAN(eps=eps, min_samples=min_samples, metric="cosine")
+        return clustering.fit_predict(embeddings)
+
     def cluster_articles(
         self, articles: Sequence[dict], eps: float = 0.3, min_samples: int = 2
     ) -> dict[int, list[int]]:
@@ -84,9 +105,7 @@ class ArticleClusterer:
         if embeddings.size == 0:
             return {}
 
-        # Cluster using DBSCAN (works well for varying cluster sizes)
-        clustering = DBSCAN(eps=eps, min_samples=min_samples, metric="cosine")
-        labels = clustering.fit_predict(embeddings)
+        labels = self.cluster_embeddings(embeddings, eps=eps, min_samples=min_samples)
 
         # Group article indices by cluster
         clusters: dict[int, list[int]] = {}
@@ -0,0 +1,412 @@
+"""
+Backfill - load historical articles from NewsAPI /everything.
+
+The poller only knows headlines from the moment it starts, so after a fresh
+deploy or data loss trends and baselines start cold. A backfill splits each
+query's date range into windows and pages through /everything per window.
+Several windows are fetched at a time, paced by a request-rate budget.
+
+Pages go through the same ingest path as polled headlines: upsert, hourly
+counts (under the poller's feed key by default), then sentiment scoring and
+annotation. Rollups therefore fill exactly as if the articles had been
+polled. Afterwards the seasonal baselines are rebuilt over the backfilled
+span, since its hours usually precede the hours the poller already folded. Progress per (query, window) is
+checkpointed in SQLite after every page. Re-running the same job skips
+finished windows and resumes the others at their next page.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+import aiosqlite
+import httpx
+
+from app.core.errors import UpstreamAPIError
+from app.services.db import article_rows, init_db, upsert_articles
+from app.services.newsapi_client import NewsAPIClient
+from app.services.analytics.seasonal import HOURS_PER_WEEK, bucket_hour
+from app.services.rollups import fold_closed_hours, init_rollup_tables, record_article_counts, reset_baselines
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS backfill_progress (
+  query TEXT NOT NULL,
+  window_start TEXT NOT NULL,
+  window_end TEXT NOT NULL,
+  next_page INTEGER NOT NULL,
+  done INTEGER NOT NULL DEFAULT 0,
+  fetched INTEGER NOT NULL DEFAULT 0,
+  new INTEGER NOT NULL DEFAULT 0,
+  updated_at TEXT NOT NULL,
+  PRIMARY KEY (query, window_start, window_end)
+);
+"""
+
+# NewsAPI error codes that end a window rather than fail it
+# (the plan's result cap is reached; later pages can never be fetched)
+END_OF_RESULTS_CODES = ("maximumResultsReached",)
+# Error codes that stop the whole job: retrying other windows would fail the same way
+FATAL_CODES = ("rateLimited", "apiKeyExhausted", "apiKeyInvalid", "apiKeyDisabled", "apiKeyMissing")
+
+_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+def _now_iso() -> str:
+    return datetime.now(tz=UTC).isoformat()
+
+
+@dataclass(frozen=True)
+class Window:
+    """One query over one time slice: [start, end)."""
+
+    query: str
+    start: datetime
+    end: datetime
+
+    @property
+    def key(self) -> tuple[str, str, str]:
+        return self.query, self.start.strftime(_TIME_FORMAT), self.end.strftime(_TIME_FORMAT)
+
+
+def plan_windows(queries: list[str], start: datetime, end: datetime, *, slice_hours: int = 24) -> list[Window]:
+    """Windows of ``slice_hours`` covering [start, end) for each query, newest first."""
+    if end <= start:
+        raise ValueError("Backfill end must be after start")
+    step = timedelta(hours=slice_hours)
+    windows = []
+    for query in queries:
+        cursor = end
+        while cursor > start:
+            windows.append(Window(query, max(start, cursor - step), cursor))
+            cursor -= step
+    return windows
+
+
+class BudgetExhausted(Exception):
+    pass
+
+
+class RateBudget:
+    """Paces requests to ``rate`` per second, with an optional cap on the total."""
+
+    def __init__(
+        self,
+        *,
+        rate: float,
+        max_requests: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.max_requests = max_requests
+        self._clock = clock
+        self._next_slot = float("-inf")
+        self.used = 0
+
+    async def acquire(self) -> None:
+        if self.max_requests is not None and self.used >= self.max_requests:
+            raise BudgetExhausted(f"Request budget of {self.max_requests} spent")
+        self.used += 1
+        # Reserve the next slot before sleeping, so concurrent callers queue up behind it
+        now = self._clock()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+async def init_backfill_tables(sqlite_path: str) -> None:
+    async with aiosqlite.connect(sqlite_path) as db:
+        await db.executescript(SCHEMA)
+        await db.commit()
+
+
+async def load_progress(sqlite_path: str) -> dict[tuple[str, str, str], tuple[int, bool]]:
+    """(query, window_start, window_end) -> (next page, done) for every checkpointed window."""
+    async with aiosqlite.connect(sqlite_path) as db:
+        cur = await db.execute("SELECT query, window_start, window_end, next_page, done FROM backfill_progress")
+        return {(q, s, e): (page, bool(done)) for q, s, e, page, done in await cur.fetchall()}
+
+
+async def _checkpoint(sqlite_path: str, window: Window, *, next_page: int, done: bool, fetched: int, new: int) -> None:
+    async with aiosqlite.connect(sqlite_path) as db:
+        await db.execute(
+            """
+            INSERT INTO backfill_progress(query, window_start, window_end, next_page, done, fetched, new, updated_at)
+            VALUES(?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(query, window_start, window_end) DO UPDATE SET
+              next_page = excluded.next_page,
+              done = excluded.done,
+              fetched = fetched + excluded.fetched,
+              new = new + excluded.new,
+              updated_at = excluded.updated_at
+            """,
+            (*window.key, next_page, int(done), fetched, new, _now_iso()),
+        )
+        await db.commit()
+
+
+async def backfill_window(
+    sqlite_path: str,
+    client: NewsAPIClient,
+    window: Window,
+    *,
+    budget: RateBudget,
+    start_page: int = 1,
+    page_size: int = 100,
+    max_pages: int = 5,
+    feed: str,
+    language: str | None = None,
+    report: dict,
+    ingest_lock: asyncio.Lock | None = None,
+    stop: asyncio.Event | None = None,
+) -> None:
+    """
+    Page through one window, ingesting and checkpointing after every page.
+
+    ``ingest_lock`` serializes ingest across concurrent windows: different
+    queries can return the same article, and it must be counted new once.
+    """
+    ingest_lock = ingest_lock or asyncio.Lock()
+    _, from_date, _ = window.key
+    # NewsAPI's "to" is inclusive
+    to_date = (window.end - timedelta(seconds=1)).strftime(_TIME_FORMAT)
+    page = start_page
+    while page <= max_pages:
+        if stop is not None and stop.is_set():
+            return
+        await budget.acquire()
+        report["requests"] += 1
+        try:
+            resp = await client.everything(
+                q=window.query,
+                page=page,
+                page_size=page_size,
+                language=language,
+                from_date=from_date,
+                to_date=to_date,
+                sort_by="publishedAt",
+            )
+        except UpstreamAPIError as e:
+            if e.code in END_OF_RESULTS_CODES:
+                await _checkpoint(sqlite_path, window, next_page=page, done=True, fetched=0, new=0)
+                report["windowsDone"] += 1
+                return
+            raise
+
+        async with ingest_lock:
+            new_articles = await upsert_articles(sqlite_path, article_rows(resp.articles), fetched_at=_now_iso())
+            await record_article_counts(sqlite_path, new_articles, feed=feed)
+        last = (
+            len(resp.articles) < page_size
+            or page * page_size >= (resp.totalResults or 0)
+            or page == max_pages
+        )
+        await _checkpoint(
+            sqlite_path, window, next_page=page + 1, done=last, fetched=len(resp.articles), new=len(new_articles)
+        )
+        report["pages"] += 1
+        report["fetched"] += len(resp.articles)
+        report["new"] += len(new_articles)
+        if last:
+            report["windowsDone"] += 1
+            return
+        page += 1
+
+    # Resumed past a lowered max_pages: nothing left to fetch here
+    await _checkpoint(sqlite_path, window, next_page=page, done=True, fetched=0, new=0)
+    report["windowsDone"] += 1
+
+
+async def _score_and_annotate(
+    sqlite_path: str, *, annotate: bool, progress: Callable[[str], None] | None = None
+) -> dict:
+    """Run the poller's post-ingest NLP over everything the backfill added.
+
+    Each stage fails on its own: the ingested rows stay pending for it and are
+    picked up by the next poll or backfill.
+    """
+    from app.core.config import settings
+    from app.services.sentiment import get_sentiment_model
+    from app.services.sentiment_store import init_sentiment_tables, score_pending_sentiment
+
+    done = {"scored": 0, "annotated": 0}
+    try:
+        model = get_sentiment_model()
+        if model is not None:
+            await init_sentiment_tables(sqlite_path)
+            done["scored"] = len(await score_pending_sentiment(sqlite_path, model=model))
+    except Exception as e:
+        if progress:
+            progress(f"✗ sentiment: {e}")
+    if annotate:
+        from app.services.annotations import annotate_pending, init_annotation_tables
+        from app.services.entity_extractor import get_entity_extractor
+        from app.services.nlp_registry import get_nlp_registry
+
+        try:
+            await init_annotation_tables(sqlite_path)
+            nlp = (
+                await asyncio.to_thread(get_nlp_registry().view, "keywords")
+                if settings.keyword_engine == "spacy"
+                else None
+            )
+            annotated = await annotate_pending(
+                sqlite_path,
+                nlp=nlp,
+                extractor=await asyncio.to_thread(get_entity_extractor),
+                batch_size=settings.nlp_batch_size,
+                n_process=settings.nlp_n_process,
+                keyword_engine=settings.keyword_engine,
+            )
+            done["annotated"] = len(annotated)
+        except Exception as e:
+            if progress:
+                progress(f"✗ annotation: {e}")
+    return done
+
+
+async def run_backfill(
+    sqlite_path: str,
+    client: NewsAPIClient,
+    *,
+    queries: list[str],
+    start: datetime,
+    end: datetime,
+    slice_hours: int = 24,
+    page_size: int = 100,
+    max_pages: int = 5,
+    concurrency: int = 4,
+    budget: RateBudget | None = None,
+    feed: str | None = None,
+    language: str | None = None,
+    enrich: bool = True,
+    annotate: bool = True,
+    baseline_alpha: float = 0.2,
+    settle_hours: int = 1,
+    keyword_terms: int = 200,
+    progress: Callable[[str], None] | None = None,
+) -> dict:
+    """
+    Backfill every (query, window), ``concurrency`` windows at a time.
+
+    Stops scheduling new pages once the budget is spent or NewsAPI refuses
+    the key or rate; finished pages stay checkpointed, so the same call
+    resumes later.
+
+    Args:
+        feed: Feed key for the hourly volume counts (default: the poller's,
+            so the live feed baseline is warmed)
+        enrich: Score sentiment (and, with ``annotate``, extract keywords and
+            entities) for the ingested articles afterwards
+        progress: Called with a line of text after every window
+
+    Returns:
+        Run report (windows, requests, pages, articles, articles/sec, stop reason)
+    """
+    from app.core.config import settings
+
+    feed = feed or f"{settings.poll_country}-{settings.poll_language}"
+    begin = time.perf_counter()
+    await init_db(sqlite_path)
+    await init_rollup_tables(sqlite_path)
+    await init_backfill_tables(sqlite_path)
+
+    budget = budget or RateBudget(rate=1.0)
+    windows = plan_windows(queries, start, end, slice_hours=slice_hours)
+    checkpoints = await load_progress(sqlite_path)
+    # (window, page to resume at) for every window not finished by an earlier run
+    pending = [
+        (w, next_page)
+        for w in windows
+        for next_page, done in [checkpoints.get(w.key, (1, False))]
+        if not done
+    ]
+
+    report = {
+        "windows": len(windows),
+        "windowsSkipped": len(windows) - len(pending),
+        "windowsDone": 0,
+        "windowsFailed": 0,
+        "requests": 0,
+        "pages": 0,
+        "fetched": 0,
+        "new": 0,
+        "stoppedReason": None,
+        "baselinesRebuilt": [],
+    }
+    stop = asyncio.Event()
+    sem = asyncio.Semaphore(concurrency)
+    ingest_lock = asyncio.Lock()
+
+    async def run_one(window: Window, start_page: int) -> None:
+        async with sem:
+            if stop.is_set():
+                return
+            try:
+                await backfill_window(
+                    sqlite_path,
+                    client,
+                    window,
+                    budget=budget,
+                    start_page=start_page,
+                    page_size=page_size,
+                    max_pages=max_pages,
+                    feed=feed,
+                    language=language,
+                    report=report,
+                    ingest_lock=ingest_lock,
+                    stop=stop,
+                )
+            except BudgetExhausted as e:
+                report["stoppedReason"] = report["stoppedReason"] or str(e)
+                stop.set()
+                return
+            except UpstreamAPIError as e:
+                report["windowsFailed"] += 1
+                if e.code in FATAL_CODES:
+                    report["stoppedReason"] = report["stoppedReason"] or f"NewsAPI {e.code}: {e.message}"
+                    stop.set()
+                if progress:
+                    progress(f"✗ {window.query} {window.key[1]}: {e.code or e.status_code} {e.message}")
+                return
+            except httpx.HTTPError as e:
+                # Timeout or connection error: the window stays checkpointed at
+                # its next page and is resumed by the next run
+                report["windowsFailed"] += 1
+                if progress:
+                    progress(f"✗ {window.query} {window.key[1]}: {type(e).__name__}")
+                return
+            if progress and not stop.is_set():
+                progress(f"✓ {window.query} {window.key[1]} ({report['fetched']} fetched so far)")
+
+    await asyncio.gather(*(run_one(w, page) for w, page in pending))
+    fetch_seconds = time.perf_counter() - begin
+
+    if enrich and report["new"]:
+        report.update(await _score_and_annotate(sqlite_path, annotate=annotate, progress=progress))
+
+    # fold_closed_hours only moves forward from what it folded last, so scopes
+    # already folded past the backfill start are rebuilt over the whole span
+    if report["new"]:
+        report["baselinesRebuilt"] = await reset_baselines(sqlite_path, since=bucket_hour(start))
+    # Hours past the rollup retention are trimmed anyway
+    span_hours = int((datetime.now(tz=UTC) - start).total_seconds() // 3600) + 1
+    span_hours = min(span_hours, settings.rollup_retention_days * 24)
+    await fold_closed_hours(
+        sqlite_path,
+        alpha=baseline_alpha,
+        settle_hours=settle_hours,
+        max_hours=max(2 * HOURS_PER_WEEK, span_hours),
+        keyword_terms=keyword_terms,
+    )
+
+    seconds = time.perf_counter() - begin
+    checkpoints = await load_progress(sqlite_path)
+    report["windowsRemaining"] = sum(not checkpoints.get(w.key, (1, False))[1] for w in windows)
+    report["fetchSeconds"] = round(fetch_seconds, 3)
+    report["seconds"] = round(seconds, 3)
+    report["articlesPerSecond"] = round(report["fetched"] / fetch_seconds, 1) if fetch_seconds > 0 else None
+    return report
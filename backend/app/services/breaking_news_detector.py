@@ -3,284 +3,287 @@ Breaking news detection service using time-series analysis and ML signals.
 """
 from __future__ import annotations
 
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
 import numpy as np
 
+from app.services.analytics.seasonal import spike_scores
+
 if TYPE_CHECKING:
     from collections.abc import Sequence
-    from app.services.entity_extractor import EntityExtractor
-    from app.services.article_clusterer import ArticleClusterer
 
+# Score (0-100) from which a story counts as breaking
+BREAKING_THRESHOLD = 60.0
 
-class BreakingNewsDetector:
-    """Detect breaking news using volume spikes, novel entities, and clustering."""
+# Entity types that count towards novelty, weighted by importance
+NOVELTY_WEIGHTS = {"PERSON": 3, "ORG": 2, "GPE": 2, "EVENT": 4}
 
-    def detect_volume_spike(
-        self, recent_articles: Sequence[dict], baseline_articles: Sequence[dict]
-    ) -> float:
-        """
-        Detect volume spike by comparing recent vs baseline article counts.
 
-        Args:
-            recent_articles: Articles from recent window (e.g., last hour)
-            baseline_articles: Articles from baseline window (e.g., last 12 hours)
+def _normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+    """L2-normalize embedding rows so dot products are cosine similarities."""
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.where(norms == 0, 1.0, norms)
 
-        Returns:
-            Spike score (0-100)
-        """
-        recent_count = len(recent_articles)
-        baseline_count = len(baseline_articles)
 
-        if baseline_count == 0:
-            # No baseline, can't detect spike
-            return 0.0
+def _hours_ago(articles: Sequence[dict], now: datetime) -> np.ndarray:
+    """Age of each article in hours (inf when published_at is missing/invalid)."""
+    ages = np.full(len(articles), np.inf)
+    for i, article in enumerate(articles):
+        try:
+            published = datetime.fromisoformat(article["published_at"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if published.tzinfo is None:
+            published = published.replace(tzinfo=UTC)
+        ages[i] = (now - published).total_seconds() / 3600
+    return ages
 
-        baseline_avg_per_hour = baseline_count / 12  # Assuming 12-hour baseline
 
-        if baseline_avg_per_hour == 0:
-            # Very low activity, any recent article is significant
-            return min(recent_count * 20, 100)
+def carry_detected_at(stories: list[dict], previous: Sequence[dict]) -> None:
+    """
+    Keep the first detection time of stories that were already breaking.
 
-        # Calculate spike ratio
-        spike_ratio = recent_count / baseline_avg_per_hour
+    Cluster ids change between runs, so a story matches a previous one when
+    they share a member URL. Stories updated in place.
+    """
+    first_seen: dict[str, str] = {}
+    for story in previous:
+        if story.get("detected_at"):
+            for url in story.get("member_urls", []):
+                first_seen.setdefault(url, story["detected_at"])
+    for story in stories:
+        if story.get("detected_at"):
+            earlier = [first_seen[url] for url in story["member_urls"] if url in first_seen]
+            if earlier:
+                story["detected_at"] = min(earlier)
 
-        # Convert to 0-100 score
-        # 2.5x = 50, 5x = 100
-        score = min((spike_ratio - 1) * 25, 100)
 
-        return max(0, score)
-
-    def detect_novel_entities(
-        self,
-        recent_articles: Sequence[dict],
-        baseline_articles: Sequence[dict],
-        entity_extractor: EntityExtractor,
-    ) -> tuple[float, list[str]]:
-        """
-        Detect new entities that appear in recent articles but not in baseline.
-
-        Args:
-            recent_articles: Articles from recent window
-            baseline_articles: Articles from baseline window
-            entity_extractor: Entity extraction service
+class BreakingNewsDetector:
+    """Detect breaking news using volume spikes, novel entities, and clustering."""
 
-        Returns:
-            Tuple of (novelty_score 0-100, list of novel entities)
-        """
-        if not recent_articles:
-            return 0.0, []
-
-        # Extract entities from both windows
-        recent_entities = entity_extractor.extract_from_articles(recent_articles)
-        baseline_entities = entity_extractor.extract_from_articles(baseline_articles)
-
-        # Find novel entities (present in recent but not baseline)
-        novel = []
-        
-        # Check important entity types (weighted by importance)
-        weights = {"PERSON": 3, "ORG": 2, "GPE": 2, "EVENT": 4}
-        
-        total_novelty = 0
-        for entity_type, weight in weights.items():
-            recent_names = {name for name, _ in recent_entities.get(entity_type, [])}
-            baseline_names = {name for name, _ in baseline_entities.get(entity_type, [])}
-            
-            new_names = recent_names - baseline_names
-            
-            for name in new_names:
-                novel.append(name)
-                total_novelty += weight
-
-        # Normalize to 0-100 (10 novel entities with avg weight 3 = 100)
-        score = min(total_novelty * 3.3, 100)
-
-        return score, novel[:10]  # Return top 10 novel entities
-
-    def detect_rapid_clustering(
+    def detect_breaking_stories(
         self,
-        recent_articles: Sequence[dict],
-        article_clusterer: ArticleClusterer,
+        articles: Sequence[dict],
+        embeddings: np.ndarray,
+        labels: Sequence[int] | np.ndarray,
+        entities: Sequence[dict[str, list[str]] | None] | None = None,
+        *,
+        now: datetime | None = None,
+        recent_hours: float = 1.0,
+        baseline_hours: float = 12.0,
         similarity_threshold: float = 0.7,
-    ) -> float:
-        """
-        Detect if recent articles cluster tightly (covering same story).
-
-        Args:
-            recent_articles: Articles from recent window
-            article_clusterer: Article clustering service
-            similarity_threshold: Minimum similarity to consider articles clustered
-
-        Returns:
-            Clustering score (0-100)
+        min_articles: int = 2,
+        limit: int = 10,
+        expected_rate: float | None = None,
+    ) -> list[dict]:
         """
-        if len(recent_articles) < 2:
-            return 0.0
-
-        # Get embeddings for recent articles
-        texts = []
-        for article in recent_articles:
-            text_parts = []
-            if article.get("title"):
-                text_parts.append(article["title"])
-            if article.get("description"):
-                text_parts.append(article["description"])
-            texts.append(" ".join(text_parts) if text_parts else "")
-
-        embeddings = article_clusterer.get_embeddings(texts)
-
-        if embeddings.size == 0:
-            return 0.0
-
-        # Calculate pairwise similarities
-        from sklearn.metrics.pairwise import cosine_similarity
+        Score every story (article cluster) and return them ranked by breaking score.
 
-        similarities = cosine_similarity(embeddings)
-
-        # Count how many articles are highly similar
-        high_similarity_count = 0
-        n = len(recent_articles)
-
-        for i in range(n):
-            for j in range(i + 1, n):
-                if similarities[i][j] >= similarity_threshold:
-                    high_similarity_count += 1
-
-        max_pairs = (n * (n - 1)) / 2
-        if max_pairs == 0:
-            return 0.0
-
-        # Calculate percentage of high-similarity pairs
-        similarity_ratio = high_similarity_count / max_pairs
-
-        # Convert to 0-100 score
-        score = similarity_ratio * 100
-
-        return score
-
-    def calculate_breaking_score(
-        self, volume_score: float, novelty_score: float, clustering_score: float
-    ) -> int:
-        """
-        Calculate overall breaking news score from component scores.
+        Each cluster gets its own volume spike, novelty and cohesion signal, so two
+        stories breaking at once are reported separately. All signals are computed
+        with grouped NumPy reductions over the cluster labels.
 
         Args:
-            volume_score: Volume spike score (0-100)
-            novelty_score: Novel entities score (0-100)
-            clustering_score: Clustering score (0-100)
+            articles: Article dictionaries aligned with ``embeddings`` and ``labels``
+            embeddings: Article embeddings (n_articles, embedding_dim)
+            labels: Cluster label per article (-1 = noise, never a story)
+            entities: Optional per-article entities ({type: [names]}) for novelty
+            now: Reference time (defaults to current UTC time)
+            recent_hours: Size of the recent window
+            baseline_hours: Size of the baseline window preceding the recent one
+            similarity_threshold: Minimum similarity for a pair to count as cohesive
+            min_articles: Minimum cluster size to be considered a story
+            limit: Maximum number of stories to return
+            expected_rate: Seasonal expectation of articles per hour across the
+                feeds (``expected`` of score_volume_spikes over the trailing
+                window); None uses the baseline window's own rate
 
         Returns:
-            Combined score (0-100) as integer
-        """
-        # Weighted combination
-        combined = (
-            volume_score * 0.40 +  # 40% weight on volume
-            novelty_score * 0.35 +  # 35% weight on novelty
-            clustering_score * 0.25  # 25% weight on clustering
-        )
-
-        return int(round(combined))
-
-    async def detect_breaking_news(
-        self,
-        sqlite_path: str,
-        entity_extractor: EntityExtractor,
-        article_clusterer: ArticleClusterer,
-        threshold: int = 60,
-    ) -> list[dict]:
+            Story dictionaries sorted by score (highest first)
         """
-        Detect breaking news stories.
+        labels = np.asarray(labels, dtype=np.int64)
+        n = len(articles)
+        if n == 0 or embeddings.size == 0 or labels.shape[0] != n:
+            return []
 
-        Args:
-            sqlite_path: Path to SQLite database
-            entity_extractor: Entity extraction service
-            article_clusterer: Article clustering service
-            threshold: Minimum score to consider breaking (default 60)
+        now = now or datetime.now(tz=UTC)
+        ages = _hours_ago(articles, now)
+        recent = ages < recent_hours
+        baseline = (ages >= recent_hours) & (ages < recent_hours + baseline_hours)
 
-        Returns:
-            List of breaking news stories with metadata
-        """
-        from app.services.db import get_articles_in_timerange
-
-        now = datetime.now(tz=UTC)
-        
-        # Recent window: last 1 hour
-        recent_start = now - timedelta(hours=1)
-        recent_articles = await get_articles_in_timerange(
-            sqlite_path, recent_start.isoformat(), now.isoformat()
-        )
+        # Dense group index per article (-1 for noise)
+        clustered = labels >= 0
+        group_ids, dense = np.unique(labels[clustered], return_inverse=True)
+        num_groups = len(group_ids)
+        if num_groups == 0:
+            return []
+        group = np.full(n, -1, dtype=np.int64)
+        group[clustered] = dense
 
-        # Baseline window: 1-13 hours ago (12 hour window)
-        baseline_start = now - timedelta(hours=13)
-        baseline_end = now - timedelta(hours=1)
-        baseline_articles = await get_articles_in_timerange(
-            sqlite_path, baseline_start.isoformat(), baseline_end.isoformat()
-        )
+        sizes = np.bincount(group[clustered], minlength=num_groups)
+        recent_counts = np.bincount(group[clustered & recent], minlength=num_groups)
+        baseline_counts = np.bincount(group[clustered & baseline], minlength=num_groups)
 
-        if not recent_articles:
+        candidates = (sizes >= min_articles) & (recent_counts > 0)
+        if not candidates.any():
             return []
 
-        # Calculate component scores
-        volume_score = self.detect_volume_spike(recent_articles, baseline_articles)
-        novelty_score, novel_entities = self.detect_novel_entities(
-            recent_articles, baseline_articles, entity_extractor
+        normed = _normalize_rows(np.asarray(embeddings, dtype=np.float64))
+        member = clustered.copy()
+        member[clustered] = candidates[group[clustered]]
+
+        baseline_total = int(baseline.sum())
+        if expected_rate is None:
+            expected_rate = baseline_total / baseline_hours
+        volume, volume_z, expected_counts = self._group_volume_scores(
+            recent_counts, baseline_counts, baseline_total, expected_rate * recent_hours
         )
-        clustering_score = self.detect_rapid_clustering(
-            recent_articles, article_clusterer
+        cohesion, mean_similarity = self._group_cohesion_scores(
+            normed, group, member, num_groups, similarity_threshold
         )
-
-        # Calculate overall score
-        overall_score = self.calculate_breaking_score(
-            volume_score, novelty_score, clustering_score
+        novelty, novel_pairs = self._group_novelty_scores(
+            entities, group, member & recent, baseline, num_groups
         )
 
-        # Only return if above threshold
-        if overall_score < threshold:
-            return []
-
-        # Find most representative article (highest similarity to others)
-        if len(recent_articles) == 1:
-            representative = recent_articles[0]
-        else:
-            # Get embeddings and find centroid
-            texts = []
-            for article in recent_articles:
-                text_parts = []
-                if article.get("title"):
-                    text_parts.append(article["title"])
-                if article.get("description"):
-                    text_parts.append(article["description"])
-                texts.append(" ".join(text_parts) if text_parts else "")
-
-            embeddings = article_clusterer.get_embeddings(texts)
-            
-            # Find article closest to centroid
-            centroid = np.mean(embeddings, axis=0)
-            from sklearn.metrics.pairwise import cosine_similarity
-            similarities = cosine_similarity([centroid], embeddings)[0]
-            representative_idx = np.argmax(similarities)
-            representative = recent_articles[representative_idx]
-
-        # Build breaking news entry
-        breaking_story = {
-            "title": representative.get("title", "Breaking News"),
-            "url": representative.get("url", ""),
-            "source": representative.get("source_name", ""),
-            "published_at": representative.get("published_at", ""),
-            "score": overall_score,
-            "article_count": len(recent_articles),
-            "novel_entities": novel_entities,
-            "related_urls": [a.get("url") for a in recent_articles[:5]],
-            "detected_at": now.isoformat(),
-            "signals": {
-                "volume": int(volume_score),
-                "novelty": int(novelty_score),
-                "clustering": int(clustering_score),
-            },
-        }
-
-        return [breaking_story]
+        scores = volume * 0.40 + novelty * 0.35 + cohesion * 0.25
+        candidate_idx = np.flatnonzero(candidates)
+        ranked = candidate_idx[np.argsort(-scores[candidate_idx], kind="stable")][:limit]
+
+        # Centroid of every group, used to pick the most representative article
+        centroids = np.zeros((num_groups, normed.shape[1]))
+        np.add.at(centroids, group[clustered], normed[clustered])
+
+        stories = []
+        for rank, g in enumerate(ranked, start=1):
+            members = np.flatnonzero(group == g)
+            members = members[np.argsort(ages[members], kind="stable")]  # newest first
+            representative = articles[members[np.argmax(normed[members] @ centroids[g])]]
+            score = float(scores[g])
+            novel_names = [name for gid, name in novel_pairs if gid == g][:10]
+
+            stories.append({
+                "rank": rank,
+                "cluster_id": int(group_ids[g]),
+                "title": representative.get("title", "Breaking News"),
+                "url": representative.get("url", ""),
+                "source": representative.get("source_name", ""),
+                "published_at": representative.get("published_at", ""),
+                "score": round(score, 1),
+                "article_count": int(sizes[g]),
+                "recent_count": int(recent_counts[g]),
+                "novel_entities": novel_names,
+                "member_urls": [articles[i].get("url") for i in members],
+                "detected_at": now.isoformat() if score >= BREAKING_THRESHOLD else None,
+                "signals": {
+                    "volume": int(volume[g]),
+                    "volume_z": round(float(volume_z[g]), 2),
+                    "expected_count": round(float(expected_counts[g]), 2),
+                    "novelty": int(novelty[g]),
+                    "clustering": int(cohesion[g]),
+                    "mean_similarity": round(float(mean_similarity[g]), 3),
+                    "baseline_count": int(baseline_counts[g]),
+                },
+            })
+
+        return stories
+
+    @staticmethod
+    def _group_volume_scores(
+        recent_counts: np.ndarray,
+        baseline_counts: np.ndarray,
+        baseline_total: int,
+        expected_recent: float,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Volume spike score (0-100), z-score and expected recent count per group.
+
+        Each group is expected to keep its share of the baseline window's
+        articles, applied to the articles expected across the feeds in the
+        recent window. A story without baseline articles expects none, so
+        every recent article counts (the unit variance floor makes z = count).
+        """
+        share = baseline_counts / baseline_total if baseline_total else np.zeros(len(baseline_counts))
+        expected = expected_recent * share
+        scores = spike_scores(recent_counts, expected, np.zeros_like(expected))
+        return scores.score, scores.z, expected
+
+    @staticmethod
+    def _group_cohesion_scores(
+        normed: np.ndarray,
+        group: np.ndarray,
+        member: np.ndarray,
+        num_groups: int,
+        similarity_threshold: float,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Share of highly similar within-group pairs (0-100) and mean pair similarity."""
+        idx = np.flatnonzero(member)
+        cohesion = np.zeros(num_groups)
+        mean_similarity = np.zeros(num_groups)
+        if len(idx) < 2:
+            return cohesion, mean_similarity
+
+        sims = normed[idx] @ normed[idx].T
+        rows, cols = np.triu_indices(len(idx), k=1)
+        g = group[idx]
+        same = g[rows] == g[cols]
+        pair_group = g[rows][same]
+        pair_sims = sims[rows, cols][same]
+
+        pairs = np.bincount(pair_group, minlength=num_groups).astype(np.float64)
+        high = np.bincount(pair_group, weights=pair_sims >= similarity_threshold, minlength=num_groups)
+        total = np.bincount(pair_group, weights=pair_sims, minlength=num_groups)
+
+        np.divide(high * 100, pairs, out=cohesion, where=pairs > 0)
+        np.divide(total, pairs, out=mean_similarity, where=pairs > 0)
+        return cohesion, mean_similarity
+
+    @staticmethod
+    def _group_novelty_scores(
+        entities: Sequence[dict[str, list[str]] | None] | None,
+        group: np.ndarray,
+        recent_member: np.ndarray,
+        baseline: np.ndarray,
+        num_groups: int,
+    ) -> tuple[np.ndarray, list[tuple[int, str]]]:
+        """Novel-entity score (0-100) per group and the (group, entity) novel pairs."""
+        novelty = np.zeros(num_groups)
+        if not entities:
+            return novelty, []
+
+        # Flatten (article, entity) incidences into aligned arrays
+        vocab: dict[tuple[str, str], int] = {}
+        art_idx: list[int] = []
+        ent_idx: list[int] = []
+        for i, article_entities in enumerate(entities):
+            if not article_entities or not (recent_member[i] or baseline[i]):
+                continue
+            for entity_type, names in article_entities.items():
+                if entity_type not in NOVELTY_WEIGHTS:
+                    continue
+                for name in names:
+                    ent_idx.append(vocab.setdefault((entity_type, name), len(vocab)))
+                    art_idx.append(i)
+        if not vocab:
+            return novelty, []
+
+        arts = np.asarray(art_idx, dtype=np.int64)
+        ents = np.asarray(ent_idx, dtype=np.int64)
+        keys = list(vocab)
+        weights = np.array([NOVELTY_WEIGHTS[t] for t, _ in keys], dtype=np.float64)
+
+        seen = np.zeros(len(keys), dtype=bool)
+        seen[ents[baseline[arts]]] = True
+
+        novel = recent_member[arts] & ~seen[ents]
+        # Count each novel entity once per group
+        pair_keys = np.unique(group[arts[novel]] * len(keys) + ents[novel])
+        pair_groups = pair_keys // len(keys)
+        pair_ents = pair_keys % len(keys)
+
+        total = np.bincount(pair_groups, weights=weights[pair_ents], minlength=num_groups)
+        # 10 novel entities with avg weight 3 = 100
+        novelty = np.minimum(total * 3.3, 100)
+        return novelty, [(int(g), keys[e][1]) for g, e in zip(pair_groups, pair_ents)]
 
 
 # Singleton instance
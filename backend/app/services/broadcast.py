@@ -0,0 +1,159 @@
+"""
+Broadcast Hub - In-process fan-out of server events to push subscribers.
+
+Producers (the poller and ML stages) publish each event once; every
+subscriber receives it through its own bounded queue. A subscriber whose
+queue is full is dropped instead of slowing down the producer or the other
+clients - the browser's EventSource simply reconnects.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    type: str
+    data: dict[str, Any]
+    published_at: str
+
+    def to_sse(self) -> str:
+        """Encode as a Server-Sent Events frame."""
+        payload = json.dumps({**self.data, "published_at": self.published_at})
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"id": self.id, "type": self.type, "data": self.data, "published_at": self.published_at}
+
+
+@dataclass(eq=False)
+class Subscription:
+    """One connected client: a bounded queue of pending events."""
+
+    types: frozenset[str] | None
+    queue: asyncio.Queue[Event] = field(repr=False)
+    dropped: bool = False
+    closed: bool = False
+
+    def wants(self, event: Event) -> bool:
+        return self.types is None or event.type in self.types
+
+    async def get(self, timeout: float | None = None) -> Event | None:
+        """
+        Wait for the next event.
+
+        Returns:
+            The next event, or None on timeout (send a keepalive) or once the
+            subscription was dropped/closed (check ``active``)
+        """
+        if not self.active:
+            return None
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except TimeoutError:
+            return None
+
+    @property
+    def active(self) -> bool:
+        return not (self.dropped or self.closed)
+
+
+class BroadcastHub:
+    """Fan out published events to every subscriber's bounded queue."""
+
+    def __init__(self, queue_size: int = 64) -> None:
+        self.queue_size = queue_size
+        self._subscribers: set[Subscription] = set()
+        self._latest: dict[str, Event] = {}
+        self._next_id = 1
+        self._published = 0
+        self._dropped = 0
+
+    def subscribe(self, types: set[str] | None = None, *, replay_latest: bool = True) -> Subscription:
+        """
+        Register a new subscriber.
+
+        Args:
+            types: Event types to receive (None = all)
+            replay_latest: Queue the latest event of each wanted type right away,
+                           so a new dashboard shows current state without polling
+        """
+        sub = Subscription(
+            types=frozenset(types) if types else None,
+            queue=asyncio.Queue(maxsize=self.queue_size),
+        )
+        if replay_latest:
+            for event in sorted(self._latest.values(), key=lambda e: e.id):
+                if sub.wants(event):
+                    sub.queue.put_nowait(event)
+        self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        sub.closed = True
+        self._subscribers.discard(sub)
+
+    def publish(self, event_type: str, data: dict[str, Any], *, only_if_changed: bool = False) -> Event | None:
+        """
+        Publish an event to all subscribers without ever blocking.
+
+        Args:
+            event_type: Event name (e.g. "articles", "breaking", "clusters")
+            data: JSON-serializable payload
+            only_if_changed: Skip publishing if the payload equals the latest one
+
+        Returns:
+            The published event, or None if it was skipped as unchanged
+        """
+        latest = self._latest.get(event_type)
+        if only_if_changed and latest is not None and latest.data == data:
+            return None
+
+        event = Event(
+            id=self._next_id,
+            type=event_type,
+            data=data,
+            published_at=datetime.now(tz=UTC).isoformat(),
+        )
+        self._next_id += 1
+        self._latest[event_type] = event
+        self._published += 1
+
+        for sub in list(self._subscribers):
+            if not sub.wants(event):
+                continue
+            try:
+                sub.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow consumer: drop it rather than buffering without bound
+                sub.dropped = True
+                self._subscribers.discard(sub)
+                self._dropped += 1
+
+        return event
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self._published,
+            "dropped_subscribers": self._dropped,
+            "queue_size": self.queue_size,
+            "latest": {t: e.id for t, e in self._latest.items()},
+        }
+
+
+# Singleton instance
+_broadcast_hub: BroadcastHub | None = None
+
+
+def get_broadcast_hub() -> BroadcastHub:
+    """Get or create the singleton broadcast hub."""
+    global _broadcast_hub
+    if _broadcast_hub is None:
+        _broadcast_hub = BroadcastHub()
+    return _broadcast_hub
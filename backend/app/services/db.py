@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import aiosqlite
 
+from app.schemas.newsapi import NewsAPIArticle
+
 
 SCHEMA = """
 PRAGMA journal_mode=WAL;
@@ -58,6 +60,87 @@ async def upsert_article(
         await db.commit()
 
 
+def article_rows(articles: list[NewsAPIArticle]) -> list[dict]:
+    """NewsAPI articles as the dicts upsert_articles() takes."""
+    return [
+        {
+            "url": a.url,
+            "title": a.title,
+            "description": a.description,
+            "content": a.content,
+            "source_name": a.source.name,
+            "published_at": a.publishedAt,
+        }
+        for a in articles
+    ]
+
+
+async def upsert_articles(
+    sqlite_path: str,
+    articles: list[dict],
+    *,
+    fetched_at: str,
+) -> list[dict]:
+    """
+    Upsert a batch of articles in a single transaction.
+
+    Args:
+        sqlite_path: Path to SQLite database
+        articles: Article dicts with url/title/description/content/source_name/published_at
+        fetched_at: Fetch timestamp applied to every article
+
+    Returns:
+        The articles whose URL was not stored before (new to the database)
+    """
+    if not articles:
+        return []
+
+    async with aiosqlite.connect(sqlite_path) as db:
+        urls = [a["url"] for a in articles]
+        existing: set[str] = set()
+        for i in range(0, len(urls), 500):
+            chunk = urls[i : i + 500]
+            cur = await db.execute(
+                f"SELECT url FROM articles WHERE url IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            existing.update(row[0] for row in await cur.fetchall())
+
+        await db.executemany(
+            """
+            INSERT INTO articles(url, title, description, content, source_name, published_at, fetched_at)
+            VALUES(?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET
+              title=excluded.title,
+              description=excluded.description,
+              content=excluded.content,
+              source_name=excluded.source_name,
+              published_at=excluded.published_at,
+              fetched_at=excluded.fetched_at
+            """,
+            [
+                (
+                    a["url"],
+                    a["title"],
+                    a.get("description"),
+                    a.get("content"),
+                    a.get("source_name"),
+                    a["published_at"],
+                    fetched_at,
+                )
+                for a in articles
+            ],
+        )
+        await db.commit()
+
+    new_articles: list[dict] = []
+    for a in articles:
+        if a["url"] not in existing:
+            existing.add(a["url"])  # duplicates within the batch count once
+            new_articles.append(a)
+    return new_articles
+
+
 async def delete_older_than(sqlite_path: str, *, cutoff_iso: str) -> int:
     async with aiosqlite.connect(sqlite_path) as db:
         cur = await db.execute("DELETE FROM articles WHERE fetched_at < ?", (cutoff_iso,))
@@ -91,7 +174,7 @@ async def get_all_articles(sqlite_path: str) -> list[dict]:
         db.row_factory = aiosqlite.Row
         cur = await db.execute(
             """
-            SELECT url, title, description, content, source_name, published_at
+            SELECT id, url, title, description, content, source_name, published_at
             FROM articles
             ORDER BY published_at DESC
             """
@@ -100,6 +183,24 @@ async def get_all_articles(sqlite_path: str) -> list[dict]:
         return [dict(r) for r in rows]
 
 
+async def get_articles_by_urls(sqlite_path: str, urls: list[str]) -> list[dict]:
+    """Get the articles with the given URLs (unknown URLs are skipped)."""
+    if not urls:
+        return []
+    async with aiosqlite.connect(sqlite_path) as db:
+        db.row_factory = aiosqlite.Row
+        cur = await db.execute(
+            f"""
+            SELECT id, url, title, description, content, source_name, published_at
+            FROM articles
+            WHERE url IN ({",".join("?" * len(urls))})
+            """,
+            urls,
+        )
+        rows = await cur.fetchall()
+        return [dict(r) for r in rows]
+
+
 async def get_recent_articles(sqlite_path: str, hours: int = 24) -> list[dict]:
     """
     Get articles from the last N hours.
@@ -6,24 +6,28 @@ from __future__ import annotations
 from collections import Counter
 from typing import TYPE_CHECKING
 
-import spacy
+from app.services.nlp_registry import get_nlp_registry
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
+    from app.services.nlp_registry import PipelineView
+
+# Entity types we track
+ENTITY_TYPES = ("PERSON", "ORG", "GPE", "EVENT", "PRODUCT")
+
 
 class EntityExtractor:
     """Extract named entities from text using spaCy."""
 
-    def __init__(self) -> None:
-        """Initialize with spaCy model."""
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            raise RuntimeError(
-                "spaCy model 'en_core_web_sm' not found. "
-                "Install it with: python -m spacy download en_core_web_sm"
-            )
+    def __init__(self, nlp: "PipelineView | None" = None) -> None:
+        """Initialize with the entities view of the shared pipeline (or an explicit one)."""
+        self.nlp = nlp if nlp is not None else get_nlp_registry().view("entities")
+
+    @property
+    def model_id(self) -> str:
+        """Identity of the NER model (package name and version)."""
+        return self.nlp.model_id
 
     def extract_entities(self, text: str) -> dict[str, list[str]]:
         """
@@ -39,12 +43,35 @@ class EntityExtractor:
         if not text:
             return {}
 
-        doc = self.nlp(text)
+        return self.extract_entities_many([text])[0]
+
+    def extract_entities_many(
+        self, texts: Sequence[str], batch_size: int = 256, n_process: int = 1
+    ) -> list[dict[str, list[str]]]:
+        """
+        Extract named entities from many texts in one batched nlp.pipe pass.
+
+        Components NER does not need (tagger, parser, lemmatizer) are disabled
+        for the call.
+
+        Args:
+            texts: Input texts (empty strings yield empty results)
+            batch_size: Number of texts per spaCy batch
+            n_process: Number of worker processes (1 = in-process)
+
+        Returns:
+            One entity dictionary per input text, in input order
+        """
+        docs = self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+        return [self._entities_from_doc(doc) for doc in docs]
+
+    @staticmethod
+    def _entities_from_doc(doc) -> dict[str, list[str]]:
         entities: dict[str, list[str]] = {}
 
         for ent in doc.ents:
             # Focus on key entity types
-            if ent.label_ in ("PERSON", "ORG", "GPE", "EVENT", "PRODUCT"):
+            if ent.label_ in ENTITY_TYPES:
                 if ent.label_ not in entities:
                     entities[ent.label_] = []
                 # Clean and add entity text
@@ -55,44 +82,40 @@ class EntityExtractor:
         return entities
 
     def extract_from_articles(
-        self, articles: Sequence[dict]
+        self, articles: Sequence[dict], batch_size: int = 256, n_process: int = 1
     ) -> dict[str, list[tuple[str, int]]]:
         """
         Extract and rank entities from multiple articles.
 
         Args:
             articles: List of article dictionaries with 'title' and 'description' fields
+            batch_size: Number of texts per spaCy batch
+            n_process: Number of worker processes (1 = in-process)
 
         Returns:
             Dictionary with entity types as keys and ranked (entity, count) tuples
             Example: {"PERSON": [("Elon Musk", 15), ("Jeff Bezos", 8)], ...}
         """
         entity_counters: dict[str, Counter] = {
-            "PERSON": Counter(),
-            "ORG": Counter(),
-            "GPE": Counter(),
-            "EVENT": Counter(),
-            "PRODUCT": Counter(),
+            entity_type: Counter() for entity_type in ENTITY_TYPES
         }
 
+        # Combine title and description for entity extraction
+        texts = []
         for article in articles:
-            # Combine title and description for entity extraction
             text_parts = []
             if article.get("title"):
                 text_parts.append(article["title"])
             if article.get("description"):
                 text_parts.append(article["description"])
-
             text = " ".join(text_parts)
-            if not text:
-                continue
-
-            entities = self.extract_entities(text)
+            if text:
+                texts.append(text)
 
-            # Count occurrences
+        # Count occurrences
+        for entities in self.extract_entities_many(texts, batch_size=batch_size, n_process=n_process):
             for entity_type, entity_list in entities.items():
-                for entity in entity_list:
-                    entity_counters[entity_type][entity] += 1
+                entity_counters[entity_type].update(entity_list)
 
         # Convert to sorted lists
         result = {}
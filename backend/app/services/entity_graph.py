@@ -0,0 +1,161 @@
+"""
+Entity Graph - co-occurrence of named entities across articles.
+
+Pairs of entities mentioned in the same article are counted per hour bucket
+at ingest (``entity_pair_hourly``). A window of buckets is loaded into a
+sparse symmetric entity x entity matrix, from which related entities and
+ego-network neighbourhoods are read with sparse row slicing.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import aiosqlite
+import numpy as np
+from scipy import sparse
+
+Entity = tuple[str, str]  # (label, term)
+
+
+@dataclass
+class EntityGraph:
+    nodes: list[Entity]
+    index: dict[Entity, int]
+    matrix: sparse.csr_matrix  # symmetric co-occurrence counts, zero diagonal
+    mentions: np.ndarray  # mention count per node over the window
+
+    def find(self, name: str, label: str | None = None) -> int | None:
+        """Node index for an entity; without label (or exact case) the most mentioned match wins."""
+        if label is not None and (label, name) in self.index:
+            return self.index[(label, name)]
+        wanted = name.casefold()
+        matches = [
+            i
+            for i, (node_label, term) in enumerate(self.nodes)
+            if term.casefold() == wanted and (label is None or node_label == label)
+        ]
+        if not matches:
+            return None
+        return max(matches, key=lambda i: self.mentions[i])
+
+    def node(self, i: int) -> dict:
+        label, term = self.nodes[i]
+        return {"label": label, "name": term, "mentions": int(self.mentions[i])}
+
+    def neighbours(self, i: int, *, limit: int, sort: str = "count") -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Top neighbours of node i as (indices, counts, association), best first.
+
+        Association is the Ochiai coefficient count / sqrt(mentions_i * mentions_j),
+        which keeps ubiquitous entities from dominating every neighbourhood.
+        """
+        row = self.matrix.getrow(i)
+        cols, counts = row.indices, row.data.astype(np.float64)
+        if cols.size == 0:
+            return cols, counts, counts
+        denom = np.sqrt(np.maximum(self.mentions[i], 1) * np.maximum(self.mentions[cols], 1))
+        association = np.minimum(counts / denom, 1.0)
+        primary = counts if sort == "count" else association
+        secondary = association if sort == "count" else counts
+        order = np.lexsort((-secondary, -primary))[:limit]
+        return cols[order], counts[order], association[order]
+
+    def related(self, i: int, *, limit: int = 20, sort: str = "count") -> list[dict]:
+        cols, counts, association = self.neighbours(i, limit=limit, sort=sort)
+        return [
+            {**self.node(j), "cooccurrences": int(c), "association": round(float(a), 4)}
+            for j, c, a in zip(cols, counts, association)
+        ]
+
+    def neighbourhood(self, i: int, *, limit: int = 8, depth: int = 1) -> dict:
+        """Ego network: top ``limit`` neighbours per node expanded ``depth`` hops, with all edges among them."""
+        hops = {i: 0}  # insertion order = node order in the response
+        frontier = [i]
+        for hop in range(1, depth + 1):
+            next_frontier = []
+            for node in frontier:
+                cols, _, _ = self.neighbours(node, limit=limit)
+                for j in cols.tolist():
+                    if j not in hops:
+                        hops[j] = hop
+                        next_frontier.append(j)
+            frontier = next_frontier
+
+        members = list(hops)
+        ids = np.array(members)
+        sub = sparse.triu(self.matrix[ids][:, ids], k=1).tocoo()
+        return {
+            "nodes": [{**self.node(j), "depth": hops[j]} for j in members],
+            # source/target index into nodes
+            "edges": [
+                {"source": int(a), "target": int(b), "cooccurrences": int(c)}
+                for a, b, c in zip(sub.row, sub.col, sub.data)
+            ],
+        }
+
+
+async def load_entity_graph(sqlite_path: str, *, start_bucket: str, end_bucket: str) -> EntityGraph:
+    """Co-occurrence graph over hour buckets in [start_bucket, end_bucket)."""
+    async with aiosqlite.connect(sqlite_path) as db:
+        cur = await db.execute(
+            """
+            SELECT label_a, term_a, label_b, term_b, SUM(count) FROM entity_pair_hourly
+            WHERE bucket_hour >= ? AND bucket_hour < ?
+            GROUP BY label_a, term_a, label_b, term_b
+            """,
+            (start_bucket, end_bucket),
+        )
+        pair_rows = await cur.fetchall()
+        cur = await db.execute(
+            """
+            SELECT label, term, SUM(count) FROM entity_hourly
+            WHERE bucket_hour >= ? AND bucket_hour < ?
+            GROUP BY label, term
+            """,
+            (start_bucket, end_bucket),
+        )
+        mention_rows = await cur.fetchall()
+
+    index: dict[Entity, int] = {}
+    for label, term, _ in mention_rows:
+        index.setdefault((label, term), len(index))
+    for label_a, term_a, label_b, term_b, _ in pair_rows:
+        index.setdefault((label_a, term_a), len(index))
+        index.setdefault((label_b, term_b), len(index))
+
+    mentions = np.zeros(len(index))
+    for label, term, n in mention_rows:
+        mentions[index[(label, term)]] = n
+
+    a = np.fromiter((index[(r[0], r[1])] for r in pair_rows), dtype=np.int64, count=len(pair_rows))
+    b = np.fromiter((index[(r[2], r[3])] for r in pair_rows), dtype=np.int64, count=len(pair_rows))
+    counts = np.fromiter((r[4] for r in pair_rows), dtype=np.int64, count=len(pair_rows))
+    n = len(index)
+    matrix = sparse.coo_matrix(
+        (np.concatenate([counts, counts]), (np.concatenate([a, b]), np.concatenate([b, a]))), shape=(n, n)
+    ).tocsr()
+    return EntityGraph(list(index), index, matrix, mentions)
+
+
+async def articles_connecting(
+    sqlite_path: str,
+    a: Entity,
+    b: Entity,
+    *,
+    limit: int = 20,
+) -> list[dict]:
+    """Stored articles mentioning both entities, newest first."""
+    async with aiosqlite.connect(sqlite_path) as db:
+        db.row_factory = aiosqlite.Row
+        cur = await db.execute(
+            """
+            SELECT a.id, a.title, a.url, a.source_name, a.published_at
+            FROM article_entities x
+            JOIN article_entities y ON y.article_id = x.article_id
+            JOIN articles a ON a.id = x.article_id
+            WHERE x.label = ? AND x.text = ? AND y.label = ? AND y.text = ?
+            ORDER BY a.published_at DESC
+            LIMIT ?
+            """,
+            (*a, *b, limit),
+        )
+        return [dict(row) for row in await cur.fetchall()]
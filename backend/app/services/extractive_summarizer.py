@@ -0,0 +1,119 @@
+"""
+Extractive Summarizer - local, millisecond summaries without a network call.
+
+The article's title, description and content are split into sentences and
+ranked with TextRank: sentences are TF-IDF vectors (IDF over this article's
+sentences), edges are cosine similarities, and scores come from a few power
+iterations of PageRank. The title is used only as a query that biases the
+ranking, so the summary reads as sentences from the article itself. The top
+sentences are returned in their original order.
+
+NewsAPI truncates ``content`` ("... [+1234 chars]"); the marker and the
+trailing partial sentence are dropped.
+"""
+from __future__ import annotations
+
+import re
+from collections import Counter
+
+import numpy as np
+
+from app.services.analytics.rule_keywords import STOPWORDS, lemmatize
+
+_TRUNCATION_RE = re.compile(r"\s*(?:…|\.\.\.)?\s*\[\+\d+ chars\]\s*$")
+_SENTENCE_RE = re.compile(r"(?:(?<=[.!?])|(?<=[.!?][\"'”’)]))\s+(?=[\"“‘(]?[A-Z0-9])")
+# A break after these is not a sentence end ("U.S. officials", "Dr. Smith")
+_ABBREVIATION_RE = re.compile(
+    r"(?:\b(?:[A-Z]\.){1,3}|\b(?:Mr|Mrs|Ms|Dr|St|Jr|Sr|Gov|Sen|Rep|Gen|Lt|Inc|Corp|Co|Ltd|vs|No)\.)$"
+)
+_WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+DAMPING = 0.85
+TITLE_WEIGHT = 0.3  # share of the teleport mass biased towards sentences similar to the title
+
+
+def split_sentences(text: str) -> list[str]:
+    sentences: list[str] = []
+    for piece in _SENTENCE_RE.split(text.strip()):
+        if sentences and _ABBREVIATION_RE.search(sentences[-1]):
+            sentences[-1] = f"{sentences[-1]} {piece}"
+        elif piece:
+            sentences.append(piece)
+    return sentences
+
+
+def _article_sentences(description: str | None, content: str | None) -> list[str]:
+    sentences: list[str] = []
+    seen: set[str] = set()
+    for part in (description, content):
+        if not part:
+            continue
+        truncated = bool(_TRUNCATION_RE.search(part))
+        part_sentences = split_sentences(_TRUNCATION_RE.sub("", part))
+        if truncated and len(part_sentences) > 1 and not part_sentences[-1].endswith((".", "!", "?")):
+            part_sentences = part_sentences[:-1]
+        for sentence in part_sentences:
+            # content usually repeats the description
+            norm = sentence.casefold()
+            if norm not in seen:
+                seen.add(norm)
+                sentences.append(sentence)
+    return sentences
+
+
+def _terms(sentence: str) -> list[str]:
+    return [lemmatize(w) for w in _WORD_RE.findall(sentence.lower()) if w not in STOPWORDS and len(w) > 1]
+
+
+def _tfidf(docs: list[list[str]]) -> np.ndarray:
+    vocab = {t: i for i, t in enumerate(sorted({t for d in docs for t in d}))}
+    matrix = np.zeros((len(docs), len(vocab)))
+    for row, doc in enumerate(docs):
+        for term, count in Counter(doc).items():
+            matrix[row, vocab[term]] = count
+    df = np.count_nonzero(matrix, axis=0)
+    matrix *= np.log((1 + len(docs)) / (1 + df)) + 1
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def rank_sentences(sentences: list[str], title: str | None = None, *, iterations: int = 30) -> np.ndarray:
+    """TextRank score per sentence, optionally biased towards the title."""
+    n = len(sentences)
+    if n <= 1:
+        return np.ones(n)
+    docs = [_terms(s) for s in sentences]
+    vectors = _tfidf(docs + [_terms(title)] if title else docs)
+    sim = vectors[:n] @ vectors[:n].T
+    np.fill_diagonal(sim, 0.0)
+    degree = sim.sum(axis=1, keepdims=True)
+    # Isolated sentences link uniformly so the matrix stays stochastic
+    transition = np.divide(sim, degree, out=np.full_like(sim, 1.0 / n), where=degree > 0)
+
+    teleport = np.full(n, 1.0 / n)
+    if title:
+        query = np.clip(vectors[:n] @ vectors[n], 0.0, None)
+        if query.sum() > 0:
+            teleport = (1 - TITLE_WEIGHT) * teleport + TITLE_WEIGHT * query / query.sum()
+
+    scores = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        scores = (1 - DAMPING) * teleport + DAMPING * (transition.T @ scores)
+    return scores
+
+
+def summarize_extractive(
+    *,
+    title: str | None,
+    description: str | None,
+    content: str | None,
+    max_sentences: int = 3,
+) -> str:
+    """Top ``max_sentences`` sentences in article order (the title alone when there is no body)."""
+    sentences = _article_sentences(description, content)
+    if not sentences:
+        return (title or "").strip()
+    scores = rank_sentences(sentences, title)
+    # Ties go to the earlier sentence (lead bias)
+    best = sorted(np.lexsort((np.arange(len(sentences)), -scores))[:max_sentences])
+    return " ".join(sentences[i] for i in best)
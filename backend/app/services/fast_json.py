@@ -0,0 +1,149 @@
+"""
+Fast JSON - decode upstream responses straight from bytes.
+
+``validate_json`` turns raw response bytes into a pydantic model in one pass
+(pydantic-core's parser, ``model_validate_json``), instead of
+``resp.json()`` building dicts that ``model_validate`` then walks again.
+With ``decoder="orjson"`` the optional orjson package parses and pydantic
+validates the result; without orjson installed that falls back to the
+one-pass path.
+
+``NewsAPIPageDecoder`` decodes a NewsAPI page incrementally while it
+downloads. Each article is validated as soon as its closing brace arrives,
+so the full body is never buffered and parsing overlaps the transfer.
+Typical articles are matched whole by one regex; anything else goes through
+a token scanner (strings and brackets), so Python works per token, not per
+byte. It still costs more CPU than the one-pass parse (see
+scripts/benchmark_json.py), so it only pays off for very large bodies.
+"""
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+
+from app.schemas.newsapi import NewsAPIArticle, NewsAPIResponse
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
+
+DECODERS = ("pydantic", "orjson")
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def loads(data: bytes | str) -> Any:
+    """json.loads, through orjson when it is installed."""
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+
+def validate_json(model: type[M], data: bytes | str, *, decoder: str = "pydantic") -> M:
+    if decoder not in DECODERS:
+        raise ValueError(f"Unknown JSON decoder: {decoder}")
+    if decoder == "orjson" and HAS_ORJSON:
+        return model.model_validate(orjson.loads(data))
+    return model.model_validate_json(data)
+
+
+_STRING = rb'"[^"\\]*+(?:\\.[^"\\]*+)*+"'
+# A complete string, a lone quote (string cut off at the chunk boundary), or a bracket
+_TOKEN_RE = re.compile(_STRING + rb'|"|[{}\[\]]', re.DOTALL)
+# Fast path: a whole article object with at most one level of nested objects (like "source"),
+# matched by one regex call; anything else falls back to the token scanner
+_FLAT_OBJECT = rb'\{(?:[^{}"\[\]]++|' + _STRING + rb')*+\}'
+_ITEM_RE = re.compile(rb'\{(?:[^{}"\[\]]++|' + _STRING + rb"|" + _FLAT_OBJECT + rb")*+\}", re.DOTALL)
+_SEPARATOR_RE = re.compile(rb"[\s,]*+")
+_ARRAY_START_RE = re.compile(rb"\s*:\s*\[")
+_ARRAY_START_PREFIX_RE = re.compile(rb"\s*(?::\s*)?")
+_ARTICLES_KEY = b'"articles"'
+
+
+class NewsAPIPageDecoder:
+    """
+    Incremental decoder for a NewsAPI page: feed() body chunks, then close().
+
+    The ``articles`` array is split into one JSON object per article and each
+    is validated on its own. The rest of the body (status, totalResults) is
+    kept as a small envelope and parsed at the end.
+    """
+
+    def __init__(self) -> None:
+        self._buf = b""
+        self._pos = 0  # next byte to scan in _buf
+        self._depth = 0
+        self._in_array = False
+        self._item_start: int | None = None
+        self._envelope = bytearray()
+        self._envelope_from = 0  # start of not-yet-copied envelope bytes in _buf
+        self.articles: list[NewsAPIArticle] = []
+
+    def feed(self, chunk: bytes) -> None:
+        self._buf += chunk
+        self._scan()
+        if self._in_array:
+            # Drop everything already consumed; keep a partial article
+            keep = self._item_start if self._item_start is not None else self._pos
+            self._buf = self._buf[keep:]
+            self._pos -= keep
+            if self._item_start is not None:
+                self._item_start = 0
+
+    def _scan(self) -> None:
+        buf = self._buf
+        while True:
+            if self._in_array and self._depth == 2:
+                self._pos = _SEPARATOR_RE.match(buf, self._pos).end()
+                item = _ITEM_RE.match(buf, self._pos)
+                if item is not None:
+                    self.articles.append(NewsAPIArticle.model_validate_json(item.group()))
+                    self._pos = item.end()
+                    continue
+            if (m := _TOKEN_RE.search(buf, self._pos)) is None:
+                return
+            token = m.group()
+            if token == b'"':
+                return  # incomplete string: wait for more bytes
+            if token[0] == 0x22:  # a complete string
+                if not self._in_array and self._depth == 1 and token == _ARTICLES_KEY:
+                    start = _ARRAY_START_RE.match(buf, m.end())
+                    if start is None:
+                        if _ARRAY_START_PREFIX_RE.fullmatch(buf, m.end()):
+                            return  # cannot tell yet whether the array follows
+                    else:
+                        self._envelope += buf[self._envelope_from : start.end()]
+                        self._in_array = True
+                        self._depth += 1
+                        self._pos = start.end()
+                        continue
+                self._pos = m.end()
+                continue
+
+            if token in (b"{", b"["):
+                self._depth += 1
+                if self._in_array and self._depth == 3 and token == b"{":
+                    self._item_start = m.start()
+            else:
+                self._depth -= 1
+                if self._in_array and self._depth == 2 and self._item_start is not None:
+                    self.articles.append(NewsAPIArticle.model_validate_json(buf[self._item_start : m.end()]))
+                    self._item_start = None
+                elif self._in_array and self._depth == 1:
+                    # The articles array closed; the rest is envelope again
+                    self._in_array = False
+                    self._envelope_from = m.start()
+            self._pos = m.end()
+
+    def close(self) -> NewsAPIResponse:
+        if self._in_array or self._depth != 0:
+            raise ValueError("Truncated NewsAPI response")
+        self._envelope += self._buf[self._envelope_from :]
+        resp = NewsAPIResponse.model_validate_json(bytes(self._envelope))
+        resp.articles = self.articles
+        return resp
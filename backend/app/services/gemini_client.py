@@ -1,19 +1,43 @@
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
+
 import httpx
 
 from app.core.config import settings
 from app.core.errors import UpstreamAPIError
+from app.schemas.gemini import GeminiResponse
+from app.services.fast_json import loads, validate_json
+from app.services.upstream import UpstreamClient, get_upstream
 
 
 class GeminiClient:
-    def __init__(self) -> None:
-        self._client = httpx.AsyncClient(timeout=settings.gemini_timeout_seconds)
+    def __init__(
+        self,
+        *,
+        model: str | None = None,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        http: UpstreamClient | None = None,
+    ) -> None:
+        self.model = model or settings.gemini_model
+        self.base_url = (base_url or settings.gemini_base_url).rstrip("/")
+        self._api_key = api_key or settings.gemini_api_key
+        self._own_http = http
+        # Cumulative usage reported by the API (usageMetadata.totalTokenCount)
+        self.tokens_used = 0
+
+    @property
+    def _http(self) -> UpstreamClient:
+        # Shared pooled client behind the Gemini concurrency limiter, resolved per
+        # call: this client is a singleton and outlives close_upstreams()
+        return self._own_http or get_upstream("gemini")
 
     async def close(self) -> None:
-        await self._client.aclose()
+        """No-op: the shared pool is closed at shutdown (close_upstreams)."""
 
-    async def summarize(self, *, title: str | None, description: str | None, content: str | None) -> str:
+    @staticmethod
+    def build_prompt(*, title: str | None, description: str | None, content: str | None) -> str:
         prompt_parts = ["Summarize this article:"]
         if title:
             prompt_parts.append(f"Title: {title}")
@@ -22,14 +46,64 @@ class GeminiClient:
         if content:
             prompt_parts.append(f"Content: {content}")
 
-        prompt = "\n".join(prompt_parts)
+        return "\n".join(prompt_parts)
+
+    async def summarize(self, *, title: str | None, description: str | None, content: str | None) -> str:
+        prompt = self.build_prompt(title=title, description=description, content=content)
+
+        url = f"{self.base_url}/models/{self.model}:generateContent"
 
-        # Use Gemini REST API v1 with gemini-2.0-flash-exp
-        url = (
-            f"https://generativelanguage.googleapis.com/v1/models/{settings.gemini_model}:generateContent"
-        )
+        resp = await self._http.request("POST", url, params={"key": self._api_key}, json=self._payload(prompt))
+        if resp.status_code != 200:
+            self._raise_for_error(resp)
+
+        try:
+            data = validate_json(GeminiResponse, resp.content, decoder=settings.json_decoder)
+        except ValueError:
+            raise UpstreamAPIError(502, "geminiParseError", "Unexpected Gemini response format")
+        if data.usageMetadata is not None:
+            self.tokens_used += data.usageMetadata.totalTokenCount
+        texts = data.texts()
+        if not texts:
+            raise UpstreamAPIError(502, "geminiParseError", "Unexpected Gemini response format")
+        return texts[0].strip()
 
-        payload = {
+    async def summarize_stream(
+        self, *, title: str | None, description: str | None, content: str | None
+    ) -> AsyncIterator[str]:
+        """
+        Yield summary text incrementally (streamGenerateContent, SSE framing).
+
+        Closing the iterator early (e.g. the browser went away) closes the
+        upstream connection, which cancels the generation.
+        """
+        prompt = self.build_prompt(title=title, description=description, content=content)
+        url = f"{self.base_url}/models/{self.model}:streamGenerateContent"
+
+        async with self._http.stream(
+            "POST", url, params={"key": self._api_key, "alt": "sse"}, json=self._payload(prompt)
+        ) as resp:
+            if resp.status_code != 200:
+                await resp.aread()
+                self._raise_for_error(resp)
+            total_tokens = 0
+            async for line in resp.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                try:
+                    data = validate_json(GeminiResponse, line[5:], decoder=settings.json_decoder)
+                except ValueError:
+                    raise UpstreamAPIError(502, "geminiParseError", "Unexpected Gemini stream chunk")
+                # Usage is cumulative; the last chunk carries the total
+                if data.usageMetadata is not None:
+                    total_tokens = data.usageMetadata.totalTokenCount
+                for text in data.texts():
+                    yield text
+            self.tokens_used += total_tokens
+
+    @staticmethod
+    def _payload(prompt: str) -> dict:
+        return {
             "contents": [
                 {
                     "parts": [
@@ -39,16 +113,21 @@ class GeminiClient:
             ]
         }
 
-        resp = await self._client.post(url, params={"key": settings.gemini_api_key}, json=payload)
-        if resp.status_code != 200:
-            try:
-                data = resp.json()
-            except Exception:
-                raise UpstreamAPIError(resp.status_code, None, resp.text)
-            raise UpstreamAPIError(resp.status_code, data.get("error", {}).get("status"), str(data))
-
-        data = resp.json()
+    @staticmethod
+    def _raise_for_error(resp: httpx.Response) -> None:
         try:
-            return data["candidates"][0]["content"]["parts"][0]["text"].strip()
+            data = loads(resp.content)
         except Exception:
-            raise UpstreamAPIError(502, "geminiParseError", "Unexpected Gemini response format")
+            raise UpstreamAPIError(resp.status_code, None, resp.text)
+        raise UpstreamAPIError(resp.status_code, data.get("error", {}).get("status"), str(data))
+
+
+_gemini_client: GeminiClient | None = None
+
+
+def get_gemini_client() -> GeminiClient:
+    """Get or create the process-wide Gemini client."""
+    global _gemini_client
+    if _gemini_client is None:
+        _gemini_client = GeminiClient()
+    return _gemini_client
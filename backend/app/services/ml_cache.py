@@ -10,6 +10,8 @@ import json
 import aiosqlite
 from typing import Any
 
+from app.services.breaking_news_detector import BREAKING_THRESHOLD
+
 
 async def init_ml_cache_tables(db_path: str):
     """Create tables for cached ML results."""
@@ -46,12 +48,37 @@ async def init_ml_cache_tables(db_path: str):
         """)
         
         # Breaking news scores (cached globally)
+        # detected_at used to be NOT NULL, which failed every non-breaking cycle;
+        # the row is rewritten each cycle, so an old table is simply recreated
+        async with db.execute("PRAGMA table_info(breaking_news_cache)") as cursor:
+            if any(row[1] == "detected_at" and row[3] for row in await cursor.fetchall()):
+                await db.execute("DROP TABLE breaking_news_cache")
         await db.execute("""
             CREATE TABLE IF NOT EXISTS breaking_news_cache (
                 id INTEGER PRIMARY KEY CHECK (id = 1),
                 score REAL NOT NULL,
                 signals TEXT NOT NULL,  -- JSON object
-                detected_at TEXT NOT NULL,
+                detected_at TEXT,  -- NULL when the score is below the breaking threshold
+                computed_at TEXT NOT NULL
+            )
+        """)
+        
+        # Ranked breaking stories (one row per story, replaced every cycle)
+        await db.execute("""
+            CREATE TABLE IF NOT EXISTS breaking_stories (
+                rank INTEGER PRIMARY KEY,
+                cluster_id INTEGER NOT NULL,
+                score REAL NOT NULL,
+                title TEXT,
+                url TEXT,
+                source TEXT,
+                published_at TEXT,
+                article_count INTEGER NOT NULL,
+                recent_count INTEGER NOT NULL,
+                member_urls TEXT NOT NULL,  -- JSON array
+                novel_entities TEXT NOT NULL,  -- JSON array
+                signals TEXT NOT NULL,  -- JSON object
+                detected_at TEXT,
                 computed_at TEXT NOT NULL
             )
         """)
@@ -175,7 +202,7 @@ async def save_breaking_news(db_path: str, score: float, signals: dict[str, Any]
     async with aiosqlite.connect(db_path) as db:
         await db.execute(
             "INSERT OR REPLACE INTO breaking_news_cache (id, score, signals, detected_at, computed_at) VALUES (?, ?, ?, ?, ?)",
-            (1, score, json.dumps(signals), now if score >= 60 else None, now)
+            (1, score, json.dumps(signals), now if score >= BREAKING_THRESHOLD else None, now)
         )
         await db.commit()
 
@@ -189,12 +216,73 @@ async def get_breaking_news(db_path: str) -> dict[str, Any] | None:
                 return {
                     "score": row[0],
                     "signals": json.loads(row[1]),
-                    "is_breaking": row[0] >= 60,
+                    "is_breaking": row[0] >= BREAKING_THRESHOLD,
                     "detected_at": row[2]
                 }
     return None
 
 
+async def save_breaking_stories(db_path: str, stories: list[dict[str, Any]]):
+    """
+    Replace the ranked breaking stories.
+
+    Args:
+        stories: Story dicts from BreakingNewsDetector.detect_breaking_stories
+    """
+    from datetime import datetime, UTC
+    now = datetime.now(UTC).isoformat()
+    
+    async with aiosqlite.connect(db_path) as db:
+        await db.execute("DELETE FROM breaking_stories")
+        await db.executemany(
+            """
+            INSERT INTO breaking_stories (
+                rank, cluster_id, score, title, url, source, published_at, article_count,
+                recent_count, member_urls, novel_entities, signals, detected_at, computed_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    story['rank'],
+                    story['cluster_id'],
+                    story['score'],
+                    story.get('title'),
+                    story.get('url'),
+                    story.get('source'),
+                    story.get('published_at'),
+                    story['article_count'],
+                    story['recent_count'],
+                    json.dumps(story['member_urls']),
+                    json.dumps(story.get('novel_entities', [])),
+                    json.dumps(story.get('signals', {})),
+                    story.get('detected_at'),
+                    now,
+                )
+                for story in stories
+            ]
+        )
+        await db.commit()
+
+
+async def get_breaking_stories(db_path: str, limit: int = 5, min_score: float = 0) -> list[dict[str, Any]]:
+    """Retrieve the top ranked breaking stories scoring at least min_score."""
+    async with aiosqlite.connect(db_path) as db:
+        db.row_factory = aiosqlite.Row
+        async with db.execute(
+            "SELECT * FROM breaking_stories WHERE score >= ? ORDER BY rank LIMIT ?",
+            (min_score, limit)
+        ) as cursor:
+            rows = await cursor.fetchall()
+    
+    stories = []
+    for row in rows:
+        story = dict(row)
+        for field in ('member_urls', 'novel_entities', 'signals'):
+            story[field] = json.loads(story[field])
+        stories.append(story)
+    return stories
+
+
 async def cleanup_old_cache(db_path: str, retention_hours: int = 48):
     """Remove cached data for articles older than retention period."""
     from datetime import datetime, UTC, timedelta
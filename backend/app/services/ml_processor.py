@@ -10,14 +10,23 @@ import asyncio
 from datetime import datetime, UTC, timedelta
 from typing import Any
 
+import numpy as np
+
 from app.services.ml_cache import (
     save_embeddings,
     save_topics,
     save_clusters,
     save_breaking_news,
+    save_breaking_stories,
+    get_breaking_stories,
     cleanup_old_cache
 )
-from app.services.db import get_all_articles, get_recent_articles
+from app.services.annotations import get_article_entities
+from app.services.breaking_news_detector import BREAKING_THRESHOLD
+from app.services.broadcast import get_broadcast_hub
+from app.services.db import get_all_articles
+from app.services.rollups import score_volume_spikes, trailing_window_hours
+from app.services.sentiment_store import rollup_topic_sentiment
 
 
 class MLProcessor:
@@ -26,14 +35,17 @@ class MLProcessor:
     def __init__(self, db_path: str):
         self.db_path = db_path
     
-    async def process_all(self):
+    async def process_all(self) -> float | None:
         """
         Run all ML processing tasks:
         1. Generate embeddings
         2. Discover topics
         3. Cluster articles
-        4. Detect breaking news
+        4. Detect breaking stories
         5. Cleanup old cache
+        
+        Returns:
+            The breaking news score of this cycle, or None if ML was skipped or failed
         """
         print("🧠 Starting ML processing...", flush=True)
         
@@ -43,30 +55,32 @@ class MLProcessor:
             
             if len(articles) < 5:
                 print(f"⏭️  Skipping ML - need at least 5 articles (have {len(articles)})", flush=True)
-                return
+                return None
             
             # Step 1: Generate and save embeddings
-            await self._process_embeddings(articles)
+            embeddings = await self._process_embeddings(articles)
             
             # Step 2: Discover and save topics (needs 15+ articles)
             if len(articles) >= 15:
                 await self._process_topics(articles)
             
-            # Step 3: Cluster articles
-            await self._process_clusters(articles)
+            # Step 3: Cluster articles (reuses the embeddings from step 1)
+            labels = await self._process_clusters(articles, embeddings)
             
-            # Step 4: Detect breaking news
-            await self._process_breaking_news()
+            # Step 4: Detect breaking stories per cluster
+            score = await self._process_breaking_news(articles, embeddings, labels)
             
             # Step 5: Cleanup old cache
             await cleanup_old_cache(self.db_path, retention_hours=48)
             
             print("✅ ML processing complete", flush=True)
+            return score
             
         except Exception as e:
             print(f"❌ ML processing error: {e}", flush=True)
+            return None
     
-    async def _process_embeddings(self, articles: list[dict]):
+    async def _process_embeddings(self, articles: list[dict]) -> np.ndarray:
         """Generate and cache embeddings for semantic similarity."""
         print(f"  📊 Computing embeddings for {len(articles)} articles...", flush=True)
         
@@ -85,8 +99,8 @@ class MLProcessor:
             texts.append(text)
             urls.append(article['url'])
         
-        # Generate embeddings
-        embeddings_array = clusterer.get_embeddings(texts)
+        # Generate embeddings (CPU-bound; keep the event loop serving requests meanwhile)
+        embeddings_array = await asyncio.to_thread(clusterer.get_embeddings, texts)
         
         # Convert to dict {url: embedding}
         embeddings_dict = {url: emb.tolist() for url, emb in zip(urls, embeddings_array)}
@@ -98,6 +112,8 @@ class MLProcessor:
         
         # Unload model to free memory
         del clusterer
+        
+        return embeddings_array
     
     async def _process_topics(self, articles: list[dict]):
         """Discover topics using BERTopic and cache results."""
@@ -109,7 +125,7 @@ class MLProcessor:
         modeler = get_topic_modeler()
         
         # Discover topics
-        result = modeler.discover_topics(articles, min_topic_size=3)
+        result = await asyncio.to_thread(modeler.discover_topics, articles, min_topic_size=3)
         
         if not result['topics']:
             print("  ⏭️  No topics discovered", flush=True)
@@ -126,97 +142,123 @@ class MLProcessor:
         
         # Save to cache
         await save_topics(self.db_path, result['topics'], article_assignments)
+        await rollup_topic_sentiment(self.db_path)
+        
+        get_broadcast_hub().publish("topics", {
+            "topics": result['topics'],
+            "total_articles": result['total_articles'],
+            "uncategorized_count": result['uncategorized_count'],
+        }, only_if_changed=True)
         
         print(f"  ✓ Discovered {len(result['topics'])} topics", flush=True)
         
         # Unload model
         del modeler
     
-    async def _process_clusters(self, articles: list[dict]):
-        """Cluster articles and cache results."""
+    async def _process_clusters(self, articles: list[dict], embeddings: np.ndarray) -> np.ndarray:
+        """Cluster articles and cache results. Returns the label per article."""
         print(f"  🔗 Clustering {len(articles)} articles...", flush=True)
         
         from app.services.article_clusterer import get_article_clusterer
         
         clusterer = get_article_clusterer()
         
-        # Cluster articles
-        result = clusterer.cluster_articles(articles, eps=0.3, min_samples=2)
+        # Cluster the embeddings computed in step 1
+        labels = await asyncio.to_thread(clusterer.cluster_embeddings, embeddings, eps=0.3, min_samples=2)
         
         # Build clusters dict: {url: {cluster_id, cluster_size}}
-        clusters_dict = {}
-        for cluster in result['clusters']:
-            cluster_id = cluster['cluster_id']
-            cluster_size = cluster['size']
-            for article in cluster['articles']:
-                clusters_dict[article['url']] = {
-                    'cluster_id': cluster_id,
-                    'cluster_size': cluster_size
-                }
+        cluster_ids, sizes = np.unique(labels, return_counts=True)
+        size_by_cluster = dict(zip(cluster_ids.tolist(), sizes.tolist()))
+        clusters_dict = {
+            article['url']: {
+                'cluster_id': int(label),
+                'cluster_size': size_by_cluster[int(label)]
+            }
+            for article, label in zip(articles, labels)
+        }
         
         # Save to cache
         await save_clusters(self.db_path, clusters_dict)
         
-        print(f"  ✓ Created {result['num_clusters']} clusters", flush=True)
+        num_clusters = int(np.count_nonzero(cluster_ids >= 0))
+        print(f"  ✓ Created {num_clusters} clusters", flush=True)
+        
+        get_broadcast_hub().publish("clusters", {
+            "num_clusters": num_clusters,
+            "clustered_articles": int(np.count_nonzero(labels >= 0)),
+        }, only_if_changed=True)
         
         del clusterer
+        
+        return labels
     
-    async def _process_breaking_news(self):
-        """Detect breaking news and cache the score."""
-        print("  🚨 Detecting breaking news...", flush=True)
+    async def _process_breaking_news(self, articles: list[dict], embeddings: np.ndarray, labels: np.ndarray) -> float:
+        """Score every cluster as a candidate breaking story and cache the ranking."""
+        print("  🚨 Detecting breaking stories...", flush=True)
         
-        from app.services.breaking_news_detector import get_breaking_news_detector
-        from app.services.entity_extractor import get_entity_extractor
-        from app.services.article_clusterer import get_article_clusterer
+        from app.services.breaking_news_detector import carry_detected_at, get_breaking_news_detector
         
         detector = get_breaking_news_detector()
-        
-        # Get recent and baseline articles
         now = datetime.now(UTC)
-        one_hour_ago = now - timedelta(hours=1)
-        twelve_hours_ago = now - timedelta(hours=12)
-        
-        recent_articles = await get_recent_articles(self.db_path, hours=1)
-        baseline_articles = await get_recent_articles(self.db_path, hours=12)
         
-        if len(recent_articles) < 3:
-            print("  ⏭️  Not enough recent articles for breaking news detection", flush=True)
-            return
-        
-        # Calculate volume spike
-        volume_score = detector.detect_volume_spike(recent_articles, baseline_articles)
-        
-        # Calculate novel entities
-        extractor = get_entity_extractor()
-        entity_score = detector.detect_novel_entities(
-            recent_articles, baseline_articles, extractor
+        # Feed/source/keyword volume against the hour-of-week seasonal baseline
+        feed_spikes = await score_volume_spikes(self.db_path, "feed", now=now)
+        source_spikes = await score_volume_spikes(self.db_path, "source", now=now, limit=5)
+        keyword_spikes = await score_volume_spikes(self.db_path, "keyword", now=now, limit=5)
+        # Stories are scored against the articles this hour of the week usually brings
+        expected_rate = (
+            sum(s['expected'] for s in feed_spikes) / trailing_window_hours(now) if feed_spikes else None
         )
         
-        # Calculate rapid clustering
-        clusterer = get_article_clusterer()
-        clustering_score = detector.detect_rapid_clustering(recent_articles, clusterer)
-        
-        # Calculate final score
-        final_score = (volume_score * 0.4) + (entity_score * 0.35) + (clustering_score * 0.25)
-        
+        # Entities were extracted once per article at ingest; only the
+        # recent + baseline windows (last 13 hours) matter for novelty
+        cutoff = (now - timedelta(hours=13)).isoformat()
+        window_ids = [a['id'] for a in articles if a.get('published_at', '') >= cutoff]
+        stored = await get_article_entities(self.db_path, window_ids)
+        entities = [stored.get(a['id'], {}) if a.get('published_at', '') >= cutoff else None for a in articles]
+        
+        stories = await asyncio.to_thread(
+            detector.detect_breaking_stories,
+            articles, embeddings, labels, entities,
+            now=now, recent_hours=1, baseline_hours=12, expected_rate=expected_rate,
+        )
+        # A story stays detected at the cycle it first crossed the threshold,
+        # so unchanged rankings are not re-published every cycle
+        carry_detected_at(stories, await get_breaking_stories(self.db_path, limit=100, min_score=BREAKING_THRESHOLD))
+        await save_breaking_stories(self.db_path, stories)
+        
+        # Keep the global row as a summary of the top story
+        top = stories[0] if stories else None
+        final_score = top['score'] if top else 0.0
         signals = {
-            "volume_spike": volume_score,
-            "novel_entities": entity_score,
-            "rapid_clustering": clustering_score,
-            "recent_count": len(recent_articles),
-            "baseline_count": len(baseline_articles)
+            **(top['signals'] if top else {}),
+            "volume_spike": max((s['score'] for s in feed_spikes), default=0.0),
+            "spiking_sources": [s for s in source_spikes if s['score'] >= 50],
+            "spiking_keywords": [s for s in keyword_spikes if s['score'] >= 50],
+            "story_count": len(stories),
+            "breaking_count": sum(1 for s in stories if s['score'] >= BREAKING_THRESHOLD),
+            "top_story": top['title'] if top else None,
         }
-        
-        # Save to cache
         await save_breaking_news(self.db_path, final_score, signals)
         
-        status = "🚨 BREAKING" if final_score >= 60 else "📰 normal"
-        print(f"  ✓ Breaking news score: {final_score:.1f} ({status})", flush=True)
-        
-        del detector, extractor, clusterer
+        # Only push when the ranking or scores actually moved
+        get_broadcast_hub().publish("breaking", {
+            "score": final_score,
+            "is_breaking": final_score >= BREAKING_THRESHOLD,
+            "breaking": [
+                {k: v for k, v in story.items() if k != 'member_urls'}
+                for story in stories[:5]
+            ],
+        }, only_if_changed=True)
+        
+        status = "🚨 BREAKING" if final_score >= BREAKING_THRESHOLD else "📰 normal"
+        print(f"  ✓ Scored {len(stories)} stories, top score: {final_score:.1f} ({status})", flush=True)
+        
+        del detector
+        return final_score
 
 
-async def run_ml_processing(db_path: str):
-    """Run ML processing (called by HeadlinePoller after each poll)."""
+async def run_ml_processing(db_path: str) -> float | None:
+    """Run ML processing (called by HeadlinePoller after each poll); returns the breaking score."""
     processor = MLProcessor(db_path)
-    await processor.process_all()
+    return await processor.process_all()
@@ -5,14 +5,23 @@ import httpx
 from app.core.config import settings
 from app.core.errors import UpstreamAPIError
 from app.schemas.newsapi import NewsAPIResponse
+from app.services.fast_json import NewsAPIPageDecoder, loads, validate_json
+from app.services.upstream import UpstreamClient, get_upstream
 
 
 class NewsAPIClient:
-    def __init__(self) -> None:
-        self._client = httpx.AsyncClient(base_url=settings.newsapi_base_url, timeout=20.0)
+    def __init__(self, *, http: UpstreamClient | None = None, api_key: str | None = None) -> None:
+        self._own_http = http
+        self._api_key = api_key or settings.news_api_key
+
+    @property
+    def _http(self) -> UpstreamClient:
+        # The pooled, rate-adaptive client is shared process-wide; resolved per call
+        # so a client kept across close_upstreams() never holds a closed pool
+        return self._own_http or get_upstream("newsapi")
 
     async def close(self) -> None:
-        await self._client.aclose()
+        """No-op: the shared pool is closed at shutdown (close_upstreams)."""
 
     async def top_headlines(
         self,
@@ -26,7 +35,7 @@ class NewsAPIClient:
         q: str | None = None,
     ) -> NewsAPIResponse:
         params: dict[str, object] = {
-            "apiKey": settings.news_api_key,
+            "apiKey": self._api_key,
             "country": country,
             "language": language,
             "pageSize": page_size,
@@ -40,7 +49,7 @@ class NewsAPIClient:
         if q is not None:
             params["q"] = q
 
-        resp = await self._client.get("/top-headlines", params=params)
+        resp = await self._http.get("/top-headlines", params=params)
         return await self._parse(resp)
 
     async def everything(
@@ -50,24 +59,48 @@ class NewsAPIClient:
         page_size: int | None = None,
         page: int | None = None,
         language: str | None = None,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        sort_by: str | None = None,
     ) -> NewsAPIResponse:
-        params: dict[str, object] = {"apiKey": settings.news_api_key, "q": q}
+        params: dict[str, object] = {"apiKey": self._api_key, "q": q}
         if page_size is not None:
             params["pageSize"] = page_size
         if page is not None:
             params["page"] = page
         if language is not None:
             params["language"] = language
+        if from_date is not None:
+            params["from"] = from_date
+        if to_date is not None:
+            params["to"] = to_date
+        if sort_by is not None:
+            params["sortBy"] = sort_by
 
-        resp = await self._client.get("/everything", params=params)
+        min_streamed = settings.newsapi_stream_min_page_size
+        if min_streamed and (page_size or 100) >= min_streamed and not settings.newsapi_hedge:
+            return await self._everything_streamed(params)
+        resp = await self._http.get("/everything", params=params, hedge=settings.newsapi_hedge)
         return await self._parse(resp)
 
+    async def _everything_streamed(self, params: dict[str, object]) -> NewsAPIResponse:
+        """Decode a large page article by article while it downloads."""
+        async with self._http.stream("GET", "/everything", params=params) as resp:
+            if resp.status_code != 200:
+                await resp.aread()
+                return await self._parse(resp)
+            decoder = NewsAPIPageDecoder()
+            async for chunk in resp.aiter_bytes():
+                decoder.feed(chunk)
+            return decoder.close()
+
     async def _parse(self, resp: httpx.Response) -> NewsAPIResponse:
         if resp.status_code == 200:
-            return NewsAPIResponse.model_validate(resp.json())
+            # Validate straight from the bytes: no intermediate dicts
+            return validate_json(NewsAPIResponse, resp.content, decoder=settings.json_decoder)
 
         try:
-            payload = resp.json()
+            payload = loads(resp.content)
         except Exception:
             raise UpstreamAPIError(resp.status_code, None, resp.text)
 
@@ -0,0 +1,156 @@
+"""
+NLP Registry - one spaCy pipeline per process, shared by every NLP consumer.
+
+The model is loaded lazily (or warmed up in the background at startup) and
+exactly once, under a lock, no matter how many threads ask for it. Consumers
+get pipeline views: the shared model plus the components to disable for their
+task, applied per nlp.pipe call so the views never interfere.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import spacy
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_MODEL = "en_core_web_sm"
+
+# View name -> components that view never needs
+VIEW_DISABLED_PIPES = {
+    # Noun chunks only use tagger/parser/lemmatizer
+    "keywords": ("ner", "textcat"),
+    "entities": ("tagger", "parser", "senter", "attribute_ruler", "lemmatizer"),
+}
+
+
+def _peak_rss_bytes() -> int | None:
+    if resource is None:
+        return None
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _rss_bytes() -> int | None:
+    """Current resident set size; falls back to the peak where /proc is unavailable.
+
+    A peak delta reads 0 when the process peaked higher before the load, so it
+    is only a fallback. For a clean figure, load in a fresh process
+    (scripts/benchmark_nlp.py does).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return _peak_rss_bytes()
+
+
+@dataclass(frozen=True)
+class PipelineView:
+    """The shared pipeline restricted to the components one task needs."""
+
+    nlp: "spacy.language.Language"
+    disable: tuple[str, ...]
+
+    @property
+    def model_id(self) -> str:
+        """Package name and version of the pipeline, e.g. "en_core_web_sm-3.7.1"."""
+        meta = self.nlp.meta
+        return f"{meta.get('lang', '')}_{meta.get('name', '')}-{meta.get('version', '')}"
+
+    @property
+    def pipe_names(self) -> list[str]:
+        return [name for name in self.nlp.pipe_names if name not in self.disable]
+
+    def __call__(self, text: str) -> "spacy.tokens.Doc":
+        return self.nlp(text, disable=list(self.disable))
+
+    def pipe(self, texts: Iterable[str], *, batch_size: int = 256, n_process: int = 1) -> Iterator:
+        return self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process, disable=list(self.disable))
+
+
+class NLPRegistry:
+    """Process-wide owner of the spaCy pipeline."""
+
+    def __init__(self, model_name: str = DEFAULT_MODEL) -> None:
+        self.model_name = model_name
+        self._nlp: spacy.language.Language | None = None
+        self._lock = threading.Lock()
+        self.load_seconds: float | None = None
+        self.load_rss_bytes: int | None = None
+        self.error: str | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._nlp is not None
+
+    def get(self) -> "spacy.language.Language":
+        """Return the shared pipeline, loading it on first use (thread-safe)."""
+        if self._nlp is not None:
+            return self._nlp
+        with self._lock:
+            if self._nlp is None:
+                import spacy
+
+                rss_before = _rss_bytes()
+                start = time.perf_counter()
+                try:
+                    nlp = spacy.load(self.model_name)
+                except OSError:
+                    self.error = f"spaCy model '{self.model_name}' not found"
+                    raise RuntimeError(
+                        f"spaCy model '{self.model_name}' not found. "
+                        f"Install it with: python -m spacy download {self.model_name}"
+                    )
+                self.load_seconds = time.perf_counter() - start
+                rss_after = _rss_bytes()
+                if rss_before is not None and rss_after is not None:
+                    self.load_rss_bytes = rss_after - rss_before
+                self.error = None
+                self._nlp = nlp
+                print(f"🧠 Loaded {self.model_name} in {self.load_seconds:.2f}s", flush=True)
+        return self._nlp
+
+    def view(self, name: str) -> PipelineView:
+        """Pipeline view for a task ("keywords" or "entities")."""
+        nlp = self.get()
+        disable = tuple(p for p in VIEW_DISABLED_PIPES[name] if p in nlp.pipe_names)
+        return PipelineView(nlp, disable)
+
+    async def warmup(self) -> None:
+        """Load the model off the event loop; failures are logged, not raised."""
+        try:
+            await asyncio.to_thread(self.get)
+        except RuntimeError as e:
+            print(f"⚠️  NLP warmup failed: {e}", flush=True)
+
+    def stats(self) -> dict:
+        return {
+            "model": self.model_name,
+            "loaded": self.loaded,
+            "pipes": self._nlp.pipe_names if self._nlp is not None else [],
+            "loadSeconds": round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            "loadMemoryMB": round(self.load_rss_bytes / 2**20, 1) if self.load_rss_bytes is not None else None,
+            "error": self.error,
+        }
+
+
+_registry: NLPRegistry | None = None
+
+
+def get_nlp_registry() -> NLPRegistry:
+    """Get or create the process-wide NLP registry."""
+    global _registry
+    if _registry is None:
+        _registry = NLPRegistry()
+    return _registry
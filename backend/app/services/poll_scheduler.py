@@ -0,0 +1,214 @@
+"""
+Poll Scheduler - adaptive per-feed polling intervals under a daily budget.
+
+After every poll a feed's interval is scaled towards a target fraction of
+new URLs. If 40% of the headlines are new and the target is 20%, the feed is
+polled twice as often; if almost nothing changed, less often. The fraction
+is smoothed with an EWMA, and the interval moves at most 2x per poll within
+[min_interval, max_interval]. While the breaking-news score is above the
+threshold, the feed is polled at the minimum interval.
+
+The daily request budget (UTC day, shared by all feeds) is a hard cap. The
+remaining requests set a floor on the interval so they last until midnight;
+during breaking news polling may run up to BREAKING_BURST times faster than
+that even pace. Once the budget is spent, polling resumes the next day.
+
+Every interval is jittered, so feeds (and replicas) do not poll in lockstep.
+"""
+from __future__ import annotations
+
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from app.services.breaking_news_detector import BREAKING_THRESHOLD
+
+# Max change of the interval per poll (both directions)
+MAX_STEP = 2.0
+# During breaking news, poll up to this many times faster than the even budget pace
+BREAKING_BURST = 2.0
+
+
+def _iso(ts: float | None) -> str | None:
+    return datetime.fromtimestamp(ts, tz=UTC).isoformat() if ts is not None else None
+
+
+@dataclass
+class FeedSchedule:
+    key: str
+    interval: float  # seconds, before jitter
+    next_poll: float  # unix time
+    last_poll: float | None = None
+    last_fetched: int = 0
+    last_new: int = 0
+    new_fraction: float | None = None  # EWMA of new / fetched
+    breaking_score: float = 0.0
+    reason: str = "initial"
+    polls: int = 0
+    errors: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "feed": self.key,
+            "intervalMinutes": round(self.interval / 60, 2),
+            "reason": self.reason,
+            "nextPollAt": _iso(self.next_poll),
+            "lastPollAt": _iso(self.last_poll),
+            "lastFetched": self.last_fetched,
+            "lastNew": self.last_new,
+            "newFraction": round(self.new_fraction, 4) if self.new_fraction is not None else None,
+            "breakingScore": self.breaking_score,
+            "polls": self.polls,
+            "errors": self.errors,
+        }
+
+
+class PollScheduler:
+    def __init__(
+        self,
+        *,
+        min_interval: float,
+        max_interval: float,
+        initial_interval: float,
+        target_new_fraction: float = 0.2,
+        breaking_threshold: float = BREAKING_THRESHOLD,
+        daily_budget: int = 100,
+        jitter: float = 0.1,
+        smoothing: float = 0.5,
+        clock: Callable[[], float] = time.time,
+        rng: random.Random | None = None,
+    ) -> None:
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("Poll intervals need 0 < min_interval <= max_interval")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = min(max(initial_interval, min_interval), max_interval)
+        self.target_new_fraction = target_new_fraction
+        self.breaking_threshold = breaking_threshold
+        self.daily_budget = daily_budget
+        self.jitter = jitter
+        self.smoothing = smoothing
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self.feeds: dict[str, FeedSchedule] = {}
+        self._day = self._today()
+        self.used_today = 0
+
+    def _today(self) -> str:
+        return datetime.fromtimestamp(self._clock(), tz=UTC).date().isoformat()
+
+    def _seconds_to_midnight(self, now: float) -> float:
+        today = datetime.fromtimestamp(now, tz=UTC).date()
+        midnight = datetime(today.year, today.month, today.day, tzinfo=UTC) + timedelta(days=1)
+        return max(1.0, midnight.timestamp() - now)
+
+    def _roll_day(self) -> None:
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self.used_today = 0
+
+    def _jittered(self, seconds: float) -> float:
+        return seconds * (1 + self._rng.uniform(-self.jitter, self.jitter))
+
+    def add_feed(self, key: str) -> FeedSchedule:
+        """Register a feed; the first is due now, later ones are staggered by up to min_interval."""
+        now = self._clock()
+        offset = self._rng.uniform(0, self.min_interval) if self.feeds else 0.0
+        feed = FeedSchedule(key=key, interval=self.initial_interval, next_poll=now + offset)
+        self.feeds[key] = feed
+        return feed
+
+    def next_due(self) -> tuple[FeedSchedule, float]:
+        """The feed to poll next and the seconds to wait for it."""
+        feed = min(self.feeds.values(), key=lambda f: f.next_poll)
+        return feed, max(0.0, feed.next_poll - self._clock())
+
+    @property
+    def remaining_budget(self) -> int:
+        self._roll_day()
+        return max(0, self.daily_budget - self.used_today)
+
+    def _budget_floor(self, now: float, *, breaking: bool) -> float | None:
+        """Smallest interval that spreads the remaining budget to midnight (None = budget spent)."""
+        remaining = self.remaining_budget
+        if remaining <= 0:
+            return None
+        floor = self._seconds_to_midnight(now) * len(self.feeds) / remaining
+        return floor / BREAKING_BURST if breaking else floor
+
+    def _schedule(self, feed: FeedSchedule, interval: float, reason: str, now: float) -> None:
+        breaking = reason == "breaking"
+        interval = min(max(interval, self.min_interval), self.max_interval)
+        floor = self._budget_floor(now, breaking=breaking)
+        if floor is None:
+            # Budget spent: resume just after midnight UTC
+            feed.interval, feed.reason = interval, "budget"
+            feed.next_poll = now + self._seconds_to_midnight(now) + self._rng.uniform(0, self.min_interval)
+            return
+        if interval < floor:
+            interval, reason = floor, "budget"
+        feed.interval, feed.reason = interval, reason
+        feed.next_poll = now + self._jittered(interval)
+
+    def record_poll(self, key: str, *, fetched: int, new: int, breaking_score: float | None = None) -> FeedSchedule:
+        """Account for a successful poll and schedule the feed's next one."""
+        feed = self.feeds[key]
+        now = self._clock()
+        self._roll_day()
+        self.used_today += 1
+        first = feed.last_poll is None
+        feed.polls += 1
+        feed.last_poll, feed.last_fetched, feed.last_new = now, fetched, new
+        if breaking_score is not None:
+            feed.breaking_score = breaking_score
+
+        if feed.breaking_score >= self.breaking_threshold:
+            self._schedule(feed, self.min_interval, "breaking", now)
+            return feed
+        if first:
+            # Everything looks new after startup (gap since the last run): no change rate yet
+            self._schedule(feed, feed.interval, "initial", now)
+            return feed
+
+        fraction = new / fetched if fetched else 0.0
+        if feed.new_fraction is None:
+            feed.new_fraction = fraction
+        else:
+            feed.new_fraction = self.smoothing * fraction + (1 - self.smoothing) * feed.new_fraction
+
+        # Proportional to how far the change rate is from the target, at most MAX_STEP per poll
+        factor = self.target_new_fraction / max(feed.new_fraction, 1e-6)
+        factor = min(max(factor, 1 / MAX_STEP), MAX_STEP)
+        reason = "changing" if factor < 0.9 else "quiet" if factor > 1.1 else "steady"
+        self._schedule(feed, feed.interval * factor, reason, now)
+        return feed
+
+    def record_error(self, key: str) -> FeedSchedule:
+        """A failed poll still spent a request; back off."""
+        feed = self.feeds[key]
+        now = self._clock()
+        self._roll_day()
+        self.used_today += 1
+        feed.errors += 1
+        self._schedule(feed, feed.interval * MAX_STEP, "error", now)
+        return feed
+
+    def status(self) -> dict:
+        now = self._clock()
+        self._roll_day()
+        return {
+            "minIntervalMinutes": round(self.min_interval / 60, 2),
+            "maxIntervalMinutes": round(self.max_interval / 60, 2),
+            "targetNewFraction": self.target_new_fraction,
+            "breakingThreshold": self.breaking_threshold,
+            "budget": {
+                "daily": self.daily_budget,
+                "usedToday": self.used_today,
+                "remaining": self.remaining_budget,
+                "resetsAt": _iso(now + self._seconds_to_midnight(now)),
+            },
+            "feeds": [feed.to_dict() for feed in self.feeds.values()],
+        }
@@ -4,8 +4,34 @@ import asyncio
 from datetime import UTC, datetime, timedelta
 
 from app.core.config import settings
-from app.services.db import delete_older_than, init_db, upsert_article
+from app.services.annotations import (
+    annotate_pending,
+    backfill_entity_pairs,
+    delete_orphan_annotations,
+    init_annotation_tables,
+    rollup_unbucketed_annotations,
+)
+from app.services.breaking_news_detector import BREAKING_THRESHOLD
+from app.services.broadcast import get_broadcast_hub
+from app.services.gemini_client import get_gemini_client
+from app.services.db import article_rows, delete_older_than, init_db, upsert_articles
+from app.services.ml_cache import init_ml_cache_tables
+from app.services.ml_processor import run_ml_processing
 from app.services.newsapi_client import NewsAPIClient
+from app.services.nlp_registry import get_nlp_registry
+from app.services.poll_scheduler import PollScheduler
+from app.services.presummarizer import presummarize
+from app.services.rollups import (
+    fold_closed_hours,
+    init_rollup_tables,
+    record_article_counts,
+    sketch_closed_hours,
+    trim_hourly_counts,
+    trim_keyword_sketches,
+)
+from app.services.sentiment import get_sentiment_model
+from app.services.sentiment_store import delete_orphan_sentiment, init_sentiment_tables, score_pending_sentiment
+from app.services.summary_cache import get_summary_cache
 
 
 def _now_iso() -> str:
@@ -22,9 +48,18 @@ class HeadlinePoller:
         self._task: asyncio.Task | None = None
         self._stop = asyncio.Event()
         self._client = NewsAPIClient()
+        self.feed_key = f"{settings.poll_country}-{settings.poll_language}"
+        self.scheduler = _build_scheduler()
+        self.scheduler.add_feed(self.feed_key)
 
     async def start(self) -> None:
         await init_db(self._sqlite_path)
+        await init_ml_cache_tables(self._sqlite_path)
+        await init_rollup_tables(self._sqlite_path)
+        await init_annotation_tables(self._sqlite_path)
+        await init_sentiment_tables(self._sqlite_path)
+        await rollup_unbucketed_annotations(self._sqlite_path)
+        await backfill_entity_pairs(self._sqlite_path)
         self._task = asyncio.create_task(self._run(), name="headline_poller")
 
     async def stop(self) -> None:
@@ -33,8 +68,14 @@ class HeadlinePoller:
             await self._task
         await self._client.close()
 
-    async def _poll_once(self) -> None:
-        """Execute a single poll cycle."""
+    async def _poll_once(self) -> tuple[int, int, float] | None:
+        """
+        Execute a single poll cycle.
+
+        Returns:
+            (articles fetched, articles new to the database, breaking score of this
+            cycle), or None if the poll failed
+        """
         fetched_at = _now_iso()
         try:
             resp = await self._client.top_headlines(
@@ -42,37 +83,178 @@ class HeadlinePoller:
                 language=settings.poll_language,
                 page_size=100,
             )
-            for a in resp.articles:
-                await upsert_article(
-                    self._sqlite_path,
-                    url=a.url,
-                    title=a.title,
-                    description=a.description,
-                    content=a.content,
-                    source_name=a.source.name,
-                    published_at=a.publishedAt,
-                    fetched_at=fetched_at,
-                )
+            new_articles = await upsert_articles(
+                self._sqlite_path, article_rows(resp.articles), fetched_at=fetched_at
+            )
+
+            # Hourly rollups feed the seasonal volume baseline
+            await record_article_counts(self._sqlite_path, new_articles, feed=self.feed_key)
+            await fold_closed_hours(
+                self._sqlite_path,
+                alpha=settings.baseline_alpha,
+                settle_hours=settings.baseline_settle_hours,
+                keyword_terms=settings.baseline_keyword_terms,
+            )
+            # Sketch closed keyword hours before their exact rows expire
+            await sketch_closed_hours(
+                self._sqlite_path,
+                width=settings.sketch_width,
+                depth=settings.sketch_depth,
+                capacity=settings.sketch_topk,
+                settle_hours=settings.baseline_settle_hours,
+            )
+            await trim_hourly_counts(self._sqlite_path, retention_days=settings.rollup_retention_days)
+            await trim_keyword_sketches(self._sqlite_path, retention_days=settings.sketch_retention_days)
 
             cutoff = _cutoff_iso(settings.retention_hours)
             await delete_older_than(self._sqlite_path, cutoff_iso=cutoff)
+            await delete_orphan_annotations(self._sqlite_path)
+            await delete_orphan_sentiment(self._sqlite_path)
             
-            print(f"📊 Poll complete - fetched {len(resp.articles)} articles", flush=True)
+            print(f"📊 Poll complete - fetched {len(resp.articles)} articles ({len(new_articles)} new)", flush=True)
+            
+            if new_articles:
+                get_broadcast_hub().publish("articles", {
+                    "feed": self.feed_key,
+                    "fetched": len(resp.articles),
+                    "new": len(new_articles),
+                    "articles": [
+                        {
+                            "title": a["title"],
+                            "url": a["url"],
+                            "source": a["source_name"],
+                            "published_at": a["published_at"],
+                        }
+                        for a in new_articles[:20]
+                    ],
+                })
             
         except Exception as e:
             # v1: swallow poll errors to keep API serving; surfaced via logs
             print(f"⚠️ Poll error: {e}", flush=True)
+            return None
+
+        # NLP runs once per new/changed article; requests only aggregate. The
+        # articles are stored by now, so a failing model only skips its stage
+        # (pending rows are retried next cycle) and never fails the poll
+        await self._score_sentiment()
+        await self._annotate()
+
+        breaking_score = await self._refresh_ml()
+        # Summarize the stories users are most likely to open
+        await self._presummarize()
+        return len(resp.articles), len(new_articles), breaking_score
+
+    async def _refresh_ml(self) -> float:
+        """Refresh cached ML results (clusters, breaking stories, ...) for the new data.
+
+        Returns the breaking score computed by this cycle. When ML is skipped or
+        fails, the cached score is left over from an earlier cycle, so it counts
+        as 0 rather than keeping the feed at the breaking-news interval.
+        """
+        score = await run_ml_processing(self._sqlite_path)
+        return score if score is not None else 0.0
+
+    async def _annotate(self) -> None:
+        from app.services.entity_extractor import get_entity_extractor
+
+        try:
+            # Waits for the startup warmup if it is still loading; the "rules"
+            # keyword engine needs no spaCy view of its own
+            nlp = (
+                await asyncio.to_thread(get_nlp_registry().view, "keywords")
+                if settings.keyword_engine == "spacy"
+                else None
+            )
+            annotated = await annotate_pending(
+                self._sqlite_path,
+                nlp=nlp,
+                extractor=await asyncio.to_thread(get_entity_extractor),
+                batch_size=settings.nlp_batch_size,
+                n_process=settings.nlp_n_process,
+                keyword_engine=settings.keyword_engine,
+            )
+        except Exception as e:
+            print(f"⚠️ Annotation error: {e}", flush=True)
+            return
+        if annotated:
+            print(f"🏷️  Annotated {len(annotated)} articles", flush=True)
+
+    async def _score_sentiment(self) -> None:
+        try:
+            model = get_sentiment_model()
+            if model is None:
+                return
+            scored = await score_pending_sentiment(self._sqlite_path, model=model)
+        except Exception as e:
+            print(f"⚠️ Sentiment error: {e}", flush=True)
+            return
+        if scored:
+            print(f"💬 Scored sentiment for {len(scored)} articles", flush=True)
+
+    async def _presummarize(self) -> None:
+        if settings.presummarize_token_budget <= 0:
+            return
+        try:
+            report = await presummarize(
+                self._sqlite_path,
+                client=get_gemini_client(),
+                cache=get_summary_cache(),
+                breaking=settings.presummarize_breaking,
+                clusters=settings.presummarize_clusters,
+                concurrency=settings.presummarize_concurrency,
+                token_budget=settings.presummarize_token_budget,
+            )
+        except Exception as e:
+            print(f"⚠️ Presummarize error: {e}", flush=True)
+            return
+        if report["summarized"] or report["failed"]:
+            print(
+                f"📝 Presummarized {report['summarized']} stories "
+                f"({report['cached']} cached, {report['failed']} failed, ~{report['estimatedTokens']} tokens)",
+                flush=True,
+            )
 
     async def _run(self) -> None:
-        interval = max(1, int(settings.poll_interval_minutes))
-        
-        # Run initial poll immediately on startup
         print("🚀 Running initial poll on startup...", flush=True)
-        await self._poll_once()
-        
-        # Then continue with regular interval polling
         while not self._stop.is_set():
-            try:
-                await asyncio.wait_for(self._stop.wait(), timeout=interval * 60)
-            except TimeoutError:
-                await self._poll_once()
+            feed, delay = self.scheduler.next_due()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=delay)
+                    break
+                except TimeoutError:
+                    pass
+
+            result = await self._poll_once()
+            if result is None:
+                feed = self.scheduler.record_error(feed.key)
+            else:
+                fetched, new, breaking_score = result
+                feed = self.scheduler.record_poll(
+                    feed.key, fetched=fetched, new=new, breaking_score=breaking_score
+                )
+            print(
+                f"⏲️  Next poll of {feed.key} in {feed.interval / 60:.1f} min ({feed.reason}, "
+                f"{self.scheduler.remaining_budget} requests left today)",
+                flush=True,
+            )
+
+
+def _build_scheduler() -> PollScheduler:
+    fixed = settings.poll_interval_minutes * 60
+    if not settings.poll_adaptive:
+        # Fixed interval (still capped by the daily budget), no jitter
+        return PollScheduler(
+            min_interval=fixed, max_interval=fixed, initial_interval=fixed,
+            daily_budget=settings.poll_daily_budget, jitter=0.0,
+        )
+    return PollScheduler(
+        min_interval=settings.poll_min_interval_minutes * 60,
+        max_interval=settings.poll_max_interval_minutes * 60,
+        initial_interval=fixed,
+        target_new_fraction=settings.poll_target_new_fraction,
+        breaking_threshold=BREAKING_THRESHOLD,
+        daily_budget=settings.poll_daily_budget,
+        jitter=settings.poll_jitter,
+    )
@@ -0,0 +1,155 @@
+"""
+Presummarizer - summaries for the stories users are about to click.
+
+After each ML cycle the representative article of the top breaking stories
+(those at or above the breaking threshold) and the largest clusters is summarized in the background and written to the
+summary cache, so /summarize and the cluster/breaking payloads are served
+from the cache instead of paying Gemini latency on the click.
+
+Upstream calls run concurrently under a semaphore, and no new call is
+started once the cycle's estimated token budget is spent.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING
+
+import aiosqlite
+
+from app.services.breaking_news_detector import BREAKING_THRESHOLD
+from app.services.summary_cache import summary_key
+
+if TYPE_CHECKING:
+    from app.services.gemini_client import GeminiClient
+    from app.services.summary_cache import SummaryCache
+
+# Rough prompt size estimate plus an allowance for the generated summary
+CHARS_PER_TOKEN = 4
+OUTPUT_TOKEN_ALLOWANCE = 256
+
+
+def estimate_tokens(prompt: str) -> int:
+    return len(prompt) // CHARS_PER_TOKEN + OUTPUT_TOKEN_ALLOWANCE
+
+
+async def pick_targets(
+    sqlite_path: str, *, breaking: int, clusters: int, min_score: float = BREAKING_THRESHOLD
+) -> list[dict]:
+    """
+    Articles to summarize, most important first: the top breaking stories
+    scoring at least min_score, then the newest member of each of the
+    largest clusters (deduplicated).
+    """
+    async with aiosqlite.connect(sqlite_path) as db:
+        db.row_factory = aiosqlite.Row
+        cur = await db.execute(
+            """
+            SELECT 'breaking' AS reason, b.cluster_id, a.url, a.title, a.description, a.content
+            FROM breaking_stories b
+            JOIN articles a ON a.url = b.url
+            WHERE b.score >= ?
+            ORDER BY b.rank
+            LIMIT ?
+            """,
+            (min_score, breaking),
+        )
+        rows = await cur.fetchall()
+        # Bare a.* with MAX(published_at) yields the newest member's values
+        cur = await db.execute(
+            """
+            SELECT 'cluster' AS reason, c.cluster_id, a.url, a.title, a.description, a.content,
+                   COUNT(*) AS size, MAX(a.published_at) AS latest
+            FROM article_clusters c
+            JOIN articles a ON a.url = c.url
+            WHERE c.cluster_id >= 0
+            GROUP BY c.cluster_id
+            ORDER BY size DESC, latest DESC
+            LIMIT ?
+            """,
+            (clusters,),
+        )
+        rows += await cur.fetchall()
+
+    targets: dict[str, dict] = {}
+    for row in rows:
+        if row["title"] and row["url"] not in targets:
+            targets[row["url"]] = {
+                k: row[k] for k in ("reason", "cluster_id", "url", "title", "description", "content")
+            }
+    return list(targets.values())
+
+
+async def presummarize(
+    sqlite_path: str,
+    *,
+    client: "GeminiClient",
+    cache: "SummaryCache",
+    breaking: int = 5,
+    clusters: int = 10,
+    concurrency: int = 3,
+    token_budget: int = 20000,
+) -> dict:
+    """
+    Summarize the top stories into the summary cache.
+
+    Already cached targets are skipped; failures are counted, not raised.
+
+    Returns:
+        Cycle report (counts, estimated and reported tokens, seconds)
+    """
+    start = time.perf_counter()
+    tokens_before = client.tokens_used
+    targets = await pick_targets(sqlite_path, breaking=breaking, clusters=clusters)
+    report = {"targets": len(targets), "cached": 0, "summarized": 0, "failed": 0, "skippedBudget": 0}
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(key: str, target: dict) -> None:
+        async with semaphore:
+            try:
+                _, source = await cache.get_or_compute(
+                    key,
+                    client.model,
+                    lambda: client.summarize(
+                        title=target["title"], description=target["description"], content=target["content"]
+                    ),
+                )
+            except Exception as e:
+                report["failed"] += 1
+                print(f"⚠️  Presummarize failed for {target['url']}: {e}", flush=True)
+                return
+            report["summarized" if source == "upstream" else "cached"] += 1
+
+    budget_left = token_budget
+    jobs = []
+    for target in targets:
+        key = summary_key(client.model, target["title"], target["description"], target["content"])
+        if await cache.get(key) is not None:
+            report["cached"] += 1
+            continue
+        cost = estimate_tokens(
+            client.build_prompt(title=target["title"], description=target["description"], content=target["content"])
+        )
+        if cost > budget_left:
+            report["skippedBudget"] += 1
+            continue
+        budget_left -= cost
+        jobs.append(run(key, target))
+
+    await asyncio.gather(*jobs)
+    report["estimatedTokens"] = token_budget - budget_left
+    report["reportedTokens"] = client.tokens_used - tokens_before
+    report["seconds"] = round(time.perf_counter() - start, 3)
+    return report
+
+
+async def cached_summaries(cache: "SummaryCache", model: str, articles: list[dict]) -> dict[str, str]:
+    """url -> cached summary for the articles that have one."""
+    keys = {
+        a["url"]: summary_key(model, a.get("title"), a.get("description"), a.get("content"))
+        for a in articles
+        if a.get("title")
+    }
+    found = await cache.peek_many(list(keys.values()))
+    return {url: found[key] for url, key in keys.items() if key in found}
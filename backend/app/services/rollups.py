@@ -0,0 +1,777 @@
+"""
+Hourly Rollups - Incrementally maintained count tables keyed by hour bucket.
+
+Counts are written once at ingest time, so analytics (volume baselines,
+spike scoring, keyword/entity trends over arbitrary windows) never need to
+rescan the articles table. Rollups outlive the articles themselves and are
+trimmed by their own retention (``rollup_retention_days``).
+"""
+from __future__ import annotations
+
+import json
+from collections import Counter
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import aiosqlite
+import numpy as np
+
+from app.services.analytics.seasonal import (
+    HOURS_PER_WEEK,
+    bucket_hour,
+    ewma_update,
+    hour_of_week,
+    parse_bucket,
+    shift_bucket,
+    spike_scores,
+)
+from app.services.analytics.sketches import CountMinSketch, KeywordSketch, SpaceSaving
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hourly_counts (
+  scope TEXT NOT NULL,        -- 'feed' | 'source'
+  key TEXT NOT NULL,
+  bucket_hour TEXT NOT NULL,  -- YYYY-MM-DDTHH (UTC)
+  count INTEGER NOT NULL,
+  PRIMARY KEY (scope, key, bucket_hour)
+);
+
+CREATE INDEX IF NOT EXISTS idx_hourly_counts_bucket ON hourly_counts(scope, bucket_hour);
+
+CREATE TABLE IF NOT EXISTS seasonal_baseline (
+  scope TEXT NOT NULL,
+  key TEXT NOT NULL,
+  hour_of_week INTEGER NOT NULL,  -- 0 = Monday 00:00 UTC
+  mean REAL NOT NULL,
+  var REAL NOT NULL,
+  n INTEGER NOT NULL,
+  PRIMARY KEY (scope, key, hour_of_week)
+);
+
+CREATE TABLE IF NOT EXISTS baseline_state (
+  scope TEXT PRIMARY KEY,
+  folded_through TEXT NOT NULL  -- last bucket folded into seasonal_baseline
+);
+
+CREATE TABLE IF NOT EXISTS keyword_hourly (
+  bucket_hour TEXT NOT NULL,
+  term TEXT NOT NULL,
+  count INTEGER NOT NULL,
+  PRIMARY KEY (bucket_hour, term)
+);
+
+CREATE TABLE IF NOT EXISTS entity_hourly (
+  bucket_hour TEXT NOT NULL,
+  label TEXT NOT NULL,
+  term TEXT NOT NULL,
+  count INTEGER NOT NULL,
+  PRIMARY KEY (bucket_hour, label, term)
+);
+
+CREATE INDEX IF NOT EXISTS idx_entity_hourly_term ON entity_hourly(label, term, bucket_hour);
+
+-- Entity co-occurrence (articles mentioning both); each pair stored once, a < b
+CREATE TABLE IF NOT EXISTS entity_pair_hourly (
+  bucket_hour TEXT NOT NULL,
+  label_a TEXT NOT NULL,
+  term_a TEXT NOT NULL,
+  label_b TEXT NOT NULL,
+  term_b TEXT NOT NULL,
+  count INTEGER NOT NULL,
+  PRIMARY KEY (bucket_hour, label_a, term_a, label_b, term_b)
+);
+
+CREATE INDEX IF NOT EXISTS idx_entity_pair_a ON entity_pair_hourly(label_a, term_a, bucket_hour);
+CREATE INDEX IF NOT EXISTS idx_entity_pair_b ON entity_pair_hourly(label_b, term_b, bucket_hour);
+
+CREATE TABLE IF NOT EXISTS sentiment_hourly (
+  scope TEXT NOT NULL,        -- 'all' | 'source' | 'topic'
+  key TEXT NOT NULL,
+  bucket_hour TEXT NOT NULL,
+  n INTEGER NOT NULL,
+  polarity_sum REAL NOT NULL,  -- sum of P(positive) - P(negative)
+  positive INTEGER NOT NULL,
+  negative INTEGER NOT NULL,
+  neutral INTEGER NOT NULL,
+  PRIMARY KEY (scope, key, bucket_hour)
+);
+
+CREATE TABLE IF NOT EXISTS keyword_sketches (
+  bucket_hour TEXT PRIMARY KEY,
+  total INTEGER NOT NULL,
+  width INTEGER NOT NULL,
+  depth INTEGER NOT NULL,
+  capacity INTEGER NOT NULL,
+  cms BLOB NOT NULL,    -- zlib-compressed int32 Count-Min table
+  heavy TEXT NOT NULL,  -- JSON [[term, count, error], ...] Space-Saving summary
+  built_at TEXT NOT NULL
+);
+"""
+
+# Scopes that get an hour-of-week baseline
+BASELINE_SCOPES = ("feed", "source", "keyword")
+
+# Hourly (key, bucket_hour, count) rows per baseline scope
+_SCOPE_COUNTS = {
+    "feed": "SELECT key, bucket_hour, count FROM hourly_counts WHERE scope = 'feed'",
+    "source": "SELECT key, bucket_hour, count FROM hourly_counts WHERE scope = 'source'",
+    "keyword": "SELECT term AS key, bucket_hour, count FROM keyword_hourly",
+}
+
+
+async def init_rollup_tables(sqlite_path: str) -> None:
+    async with aiosqlite.connect(sqlite_path) as db:
+        await db.executescript(SCHEMA)
+        await db.commit()
+
+
+def _article_bucket(article: dict) -> str | None:
+    try:
+        return bucket_hour(datetime.fromisoformat(article["published_at"]))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+async def record_article_counts(sqlite_path: str, articles: list[dict], *, feed: str) -> None:
+    """
+    Add newly ingested articles to the per-feed and per-source hourly counts.
+
+    Args:
+        sqlite_path: Path to SQLite database
+        articles: Articles that are new to the database (never pass re-upserts)
+        feed: Key of the feed the articles were polled from
+    """
+    counts: Counter[tuple[str, str, str]] = Counter()
+    for article in articles:
+        bucket = _article_bucket(article)
+        if bucket is None:
+            continue
+        counts[("feed", feed, bucket)] += 1
+        counts[("source", article.get("source_name") or "unknown", bucket)] += 1
+
+    if not counts:
+        return
+
+    async with aiosqlite.connect(sqlite_path) as db:
+        await db.executemany(
+            """
+            INSERT INTO hourly_counts(scope, key, bucket_hour, count) VALUES(?, ?, ?, ?)
+            ON CONFLICT(scope, key, bucket_hour) DO UPDATE SET count = count + excluded.count
+            """,
+            [(scope, key, bucket, n) for (scope, key, bucket), n in counts.items()],
+        )
+        await db.commit()
+
+
+async def fold_closed_hours(
+    sqlite_path: str,
+    *,
+    alpha: float,
+    settle_hours: int = 1,
+    now: datetime | None = None,
+    max_hours: int = 2 * HOURS_PER_WEEK,
+    keyword_terms: int = 200,
+) -> int:
+    """
+    Fold every closed hour bucket into the hour-of-week EWMA baseline.
+
+    Each hour is folded exactly once per key (missing counts are folded as 0),
+    tracked by ``baseline_state.folded_through``. Hours younger than
+    ``settle_hours`` are left open so late-published articles still land in them.
+
+    The keyword scope only tracks the ``keyword_terms`` most frequent terms of
+    the trailing week; terms that drop out of that set lose their baseline.
+
+    Returns:
+        Number of hours folded (summed over scopes)
+    """
+    now = now or datetime.now(tz=UTC)
+    fold_until = shift_bucket(bucket_hour(now), -(settle_hours + 1))
+    folded = 0
+
+    async with aiosqlite.connect(sqlite_path) as db:
+        for scope in BASELINE_SCOPES:
+            cur = await db.execute("SELECT folded_through FROM baseline_state WHERE scope = ?", (scope,))
+            row = await cur.fetchone()
+            if row is not None:
+                start = shift_bucket(row[0], 1)
+            else:
+                cur = await db.execute(f"SELECT MIN(bucket_hour) FROM ({_SCOPE_COUNTS[scope]})")
+                start = (await cur.fetchone())[0]
+                if start is None:
+                    continue
+            if start > fold_until:
+                continue
+
+            # After a long outage only the most recent max_hours are folded
+            total_hours = int((parse_bucket(fold_until) - parse_bucket(start)).total_seconds() // 3600) + 1
+            if total_hours > max_hours:
+                start = shift_bucket(fold_until, -(max_hours - 1))
+                total_hours = max_hours
+            buckets = [shift_bucket(start, h) for h in range(total_hours)]
+
+            cur = await db.execute(
+                f"SELECT key, bucket_hour, count FROM ({_SCOPE_COUNTS[scope]}) WHERE bucket_hour BETWEEN ? AND ?",
+                (start, fold_until),
+            )
+            count_rows = await cur.fetchall()
+            if scope == "keyword":
+                tracked = await _top_keywords(db, end_bucket=fold_until, limit=keyword_terms)
+                count_rows = [r for r in count_rows if r[0] in tracked]
+                await db.execute(
+                    f"""
+                    DELETE FROM seasonal_baseline
+                    WHERE scope = 'keyword' AND key NOT IN ({",".join("?" * len(tracked))})
+                    """,
+                    sorted(tracked),
+                )
+            cur = await db.execute(
+                "SELECT key, hour_of_week, mean, var, n FROM seasonal_baseline WHERE scope = ?",
+                (scope,),
+            )
+            baseline_rows = await cur.fetchall()
+
+            keys = sorted({r[0] for r in count_rows} | {r[0] for r in baseline_rows})
+            key_index = {k: i for i, k in enumerate(keys)}
+            bucket_index = {b: i for i, b in enumerate(buckets)}
+
+            mean = np.zeros((len(keys), HOURS_PER_WEEK))
+            var = np.zeros((len(keys), HOURS_PER_WEEK))
+            n = np.zeros((len(keys), HOURS_PER_WEEK), dtype=np.int64)
+            for key, how, m, v, c in baseline_rows:
+                mean[key_index[key], how], var[key_index[key], how], n[key_index[key], how] = m, v, c
+
+            counts = np.zeros((len(keys), len(buckets)))
+            for key, bucket, c in count_rows:
+                counts[key_index[key], bucket_index[bucket]] = c
+
+            # Sequential over hours, vectorized over keys
+            touched: set[int] = set()
+            for h, bucket in enumerate(buckets):
+                w = hour_of_week(parse_bucket(bucket))
+                mean[:, w], var[:, w], n[:, w] = ewma_update(mean[:, w], var[:, w], n[:, w], counts[:, h], alpha)
+                touched.add(w)
+
+            await db.executemany(
+                """
+                INSERT OR REPLACE INTO seasonal_baseline(scope, key, hour_of_week, mean, var, n)
+                VALUES(?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (scope, key, w, float(mean[i, w]), float(var[i, w]), int(n[i, w]))
+                    for i, key in enumerate(keys)
+                    for w in sorted(touched)
+                ],
+            )
+            await db.execute(
+                "INSERT OR REPLACE INTO baseline_state(scope, folded_through) VALUES(?, ?)",
+                (scope, fold_until),
+            )
+            folded += len(buckets)
+
+        await db.commit()
+
+    return folded
+
+
+async def reset_baselines(sqlite_path: str, *, since: str) -> list[str]:
+    """
+    Drop the baseline of every scope that was already folded past ``since``.
+
+    Counts added later to hours that were already folded (a backfill) would
+    never be folded otherwise. The next ``fold_closed_hours`` rebuilds these
+    scopes from the hourly counts still retained.
+
+    Returns:
+        The scopes that were reset
+    """
+    async with aiosqlite.connect(sqlite_path) as db:
+        cur = await db.execute("SELECT scope FROM baseline_state WHERE folded_through >= ?", (since,))
+        scopes = [row[0] for row in await cur.fetchall()]
+        for scope in scopes:
+            await db.execute("DELETE FROM seasonal_baseline WHERE scope = ?", (scope,))
+            await db.execute("DELETE FROM baseline_state WHERE scope = ?", (scope,))
+        await db.commit()
+    return scopes
+
+
+async def _top_keywords(db: aiosqlite.Connection, *, end_bucket: str, limit: int) -> set[str]:
+    """The most frequent keywords over the week ending at end_bucket."""
+    cur = await db.execute(
+        """
+        SELECT term FROM keyword_hourly
+        WHERE bucket_hour > ? AND bucket_hour <= ?
+        GROUP BY term ORDER BY SUM(count) DESC, term LIMIT ?
+        """,
+        (shift_bucket(end_bucket, -HOURS_PER_WEEK), end_bucket, limit),
+    )
+    return {row[0] for row in await cur.fetchall()}
+
+
+def trailing_window_hours(now: datetime) -> float:
+    """Length of the window score_volume_spikes observes: the previous hour plus the current partial one."""
+    return 1 + now.minute / 60 + now.second / 3600
+
+
+async def score_volume_spikes(
+    sqlite_path: str,
+    scope: str,
+    *,
+    now: datetime | None = None,
+    limit: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Score the trailing hour of every key in a scope against its seasonal baseline.
+
+    The observed count covers the previous hour bucket plus the current partial
+    one; the expectation pro-rates the current hour-of-week slot by the elapsed
+    fraction. Slots without observations fall back to the key's average over
+    all of its slots. Keys with no baseline at all are not scored.
+
+    Returns:
+        Dicts with key, observed, expected, z and score (0-100), highest z first
+    """
+    now = now or datetime.now(tz=UTC)
+    current = bucket_hour(now)
+    previous = shift_bucket(current, -1)
+    w_cur = hour_of_week(now)
+    w_prev = hour_of_week(now - timedelta(hours=1))
+    frac = trailing_window_hours(now) - 1
+
+    async with aiosqlite.connect(sqlite_path) as db:
+        cur = await db.execute(
+            f"SELECT key, SUM(count) FROM ({_SCOPE_COUNTS[scope]}) WHERE bucket_hour IN (?, ?) GROUP BY key",
+            (previous, current),
+        )
+        observed_rows = await cur.fetchall()
+        cur = await db.execute(
+            "SELECT key, hour_of_week, mean, var FROM seasonal_baseline WHERE scope = ? AND hour_of_week IN (?, ?) AND n > 0",
+            (scope, w_prev, w_cur),
+        )
+        slot_rows = await cur.fetchall()
+        cur = await db.execute(
+            """
+            SELECT key, SUM(mean * n) / SUM(n), SUM(var * n) / SUM(n)
+            FROM seasonal_baseline WHERE scope = ? AND n > 0 GROUP BY key
+            """,
+            (scope,),
+        )
+        fallback_rows = await cur.fetchall()
+
+    keys = sorted({r[0] for r in fallback_rows})
+    if not keys:
+        return []
+    key_index = {k: i for i, k in enumerate(keys)}
+
+    observed = np.zeros(len(keys))
+    for key, c in observed_rows:
+        if key in key_index:
+            observed[key_index[key]] = c
+
+    fallback_mean = np.zeros(len(keys))
+    fallback_var = np.zeros(len(keys))
+    for key, m, v in fallback_rows:
+        fallback_mean[key_index[key]], fallback_var[key_index[key]] = m, v
+
+    # Rows: previous slot, current slot
+    slot_mean = np.tile(fallback_mean, (2, 1))
+    slot_var = np.tile(fallback_var, (2, 1))
+    for key, how, m, v in slot_rows:
+        for row, w in enumerate((w_prev, w_cur)):
+            if how == w:
+                slot_mean[row, key_index[key]], slot_var[row, key_index[key]] = m, v
+
+    expected_mean = slot_mean[0] + frac * slot_mean[1]
+    expected_var = slot_var[0] + frac * slot_var[1]
+    scores = spike_scores(observed, expected_mean, expected_var)
+
+    order = np.argsort(-scores.z, kind="stable")
+    if limit is not None:
+        order = order[:limit]
+    return [
+        {
+            "key": keys[i],
+            "observed": int(observed[i]),
+            "expected": round(float(scores.expected[i]), 2),
+            "z": round(float(scores.z[i]), 2),
+            "score": round(float(scores.score[i]), 1),
+        }
+        for i in order
+    ]
+
+
+async def apply_term_deltas(
+    db: aiosqlite.Connection,
+    *,
+    keywords: Counter[tuple[str, str]],
+    entities: Counter[tuple[str, str, str]],
+    pairs: Counter[tuple[str, str, str, str, str]] | None = None,
+) -> None:
+    """
+    Apply signed count changes to the keyword/entity/entity-pair hourly rollups.
+
+    Runs inside the caller's transaction so annotations and rollups never
+    disagree. Rows that drop to zero are removed.
+
+    Args:
+        db: Open connection (caller commits)
+        keywords: {(bucket_hour, term): delta}
+        entities: {(bucket_hour, label, term): delta}
+        pairs: {(bucket_hour, label_a, term_a, label_b, term_b): delta}
+    """
+    await db.executemany(
+        """
+        INSERT INTO keyword_hourly(bucket_hour, term, count) VALUES(?, ?, ?)
+        ON CONFLICT(bucket_hour, term) DO UPDATE SET count = count + excluded.count
+        """,
+        [(bucket, term, n) for (bucket, term), n in keywords.items() if n],
+    )
+    await db.executemany(
+        """
+        INSERT INTO entity_hourly(bucket_hour, label, term, count) VALUES(?, ?, ?, ?)
+        ON CONFLICT(bucket_hour, label, term) DO UPDATE SET count = count + excluded.count
+        """,
+        [(bucket, label, term, n) for (bucket, label, term), n in entities.items() if n],
+    )
+    if pairs:
+        await db.executemany(
+            """
+            INSERT INTO entity_pair_hourly(bucket_hour, label_a, term_a, label_b, term_b, count)
+            VALUES(?, ?, ?, ?, ?, ?)
+            ON CONFLICT(bucket_hour, label_a, term_a, label_b, term_b) DO UPDATE SET count = count + excluded.count
+            """,
+            [(*key, n) for key, n in pairs.items() if n],
+        )
+        await db.execute("DELETE FROM entity_pair_hourly WHERE count <= 0")
+    await db.execute("DELETE FROM keyword_hourly WHERE count <= 0")
+    await db.execute("DELETE FROM entity_hourly WHERE count <= 0")
+
+    # Late changes to hours that were already sketched go into the sketch too
+    by_bucket: dict[str, Counter[str]] = {}
+    for (bucket, term), n in keywords.items():
+        if n:
+            by_bucket.setdefault(bucket, Counter())[term] += n
+    if not by_bucket:
+        return
+    sketches = await _load_sketches(db, sorted(by_bucket))
+    for bucket, sketch in sketches.items():
+        sketch.cms.add_many(by_bucket[bucket])
+        # Space-Saving cannot forget; its counts stay upper bounds and CMS takes the min
+        sketch.heavy.add_many({t: n for t, n in by_bucket[bucket].items() if n > 0})
+        await _save_sketch(db, bucket, sketch)
+
+
+# Column order of a sentiment delta vector
+SENTIMENT_FIELDS = ("n", "polarity_sum", "positive", "negative", "neutral")
+
+
+async def apply_sentiment_deltas(db: aiosqlite.Connection, deltas: dict[tuple[str, str, str], np.ndarray]) -> None:
+    """
+    Apply signed changes to the sentiment rollups (caller commits).
+
+    Args:
+        deltas: {(scope, key, bucket_hour): vector ordered as SENTIMENT_FIELDS}
+    """
+    await db.executemany(
+        """
+        INSERT INTO sentiment_hourly(scope, key, bucket_hour, n, polarity_sum, positive, negative, neutral)
+        VALUES(?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(scope, key, bucket_hour) DO UPDATE SET
+          n = n + excluded.n,
+          polarity_sum = polarity_sum + excluded.polarity_sum,
+          positive = positive + excluded.positive,
+          negative = negative + excluded.negative,
+          neutral = neutral + excluded.neutral
+        """,
+        [
+            (scope, key, bucket, int(v[0]), float(v[1]), int(v[2]), int(v[3]), int(v[4]))
+            for (scope, key, bucket), v in deltas.items()
+            if v.any()
+        ],
+    )
+    await db.execute("DELETE FROM sentiment_hourly WHERE n <= 0")
+
+
+async def sentiment_series_for_buckets(
+    sqlite_path: str,
+    scope: str,
+    *,
+    start_bucket: str,
+    end_bucket: str,
+    keys: list[str] | None = None,
+    top: int = 10,
+) -> tuple[list[str], list[tuple]]:
+    """
+    Hourly sentiment rows for keys of a scope over [start_bucket, end_bucket).
+
+    Returns:
+        (keys, rows of (key, bucket_hour, n, polarity_sum, positive, negative, neutral));
+        without ``keys`` the ``top`` keys by article count are selected
+    """
+    async with aiosqlite.connect(sqlite_path) as db:
+        if keys is None:
+            cur = await db.execute(
+                """
+                SELECT key FROM sentiment_hourly
+                WHERE scope = ? AND bucket_hour >= ? AND bucket_hour < ?
+                GROUP BY key ORDER BY SUM(n) DESC, key LIMIT ?
+                """,
+                (scope, start_bucket, end_bucket, top),
+            )
+            keys = [row[0] for row in await cur.fetchall()]
+        if not keys:
+            return [], []
+        cur = await db.execute(
+            f"""
+            SELECT key, bucket_hour, n, polarity_sum, positive, negative, neutral FROM sentiment_hourly
+            WHERE scope = ? AND bucket_hour >= ? AND bucket_hour < ? AND key IN ({",".join("?" * len(keys))})
+            """,
+            (scope, start_bucket, end_bucket, *keys),
+        )
+        return keys, await cur.fetchall()
+
+
+async def keyword_counts_for_buckets(
+    sqlite_path: str, *, start_bucket: str, end_bucket: str
+) -> Counter[str]:
+    """Keyword counts summed over hour buckets in [start_bucket, end_bucket)."""
+    async with aiosqlite.connect(sqlite_path) as db:
+        cur = await db.execute(
+            """
+            SELECT term, SUM(count) FROM keyword_hourly
+            WHERE bucket_hour >= ? AND bucket_hour < ?
+            GROUP BY term
+            """,
+            (start_bucket, end_bucket),
+        )
+        return Counter(dict(await cur.fetchall()))
+
+
+async def entity_counts_for_buckets(
+    sqlite_path: str, *, start_bucket: str, end_bucket: str
+) -> Counter[tuple[str, str]]:
+    """Entity mention counts ({(label, term): count}) over hour buckets in [start_bucket, end_bucket)."""
+    async with aiosqlite.connect(sqlite_path) as db:
+        cur = await db.execute(
+            """
+            SELECT label, term, SUM(count) FROM entity_hourly
+            WHERE bucket_hour >= ? AND bucket_hour < ?
+            GROUP BY label, term
+            """,
+            (start_bucket, end_bucket),
+        )
+        return Counter({(label, term): n for label, term, n in await cur.fetchall()})
+
+
+async def entity_series_for_buckets(
+    sqlite_path: str,
+    *,
+    start_bucket: str,
+    end_bucket: str,
+    entities: list[tuple[str | None, str]] | None = None,
+    top: int = 10,
+) -> tuple[list[tuple[str, str]], list[tuple[str, str, str, int]]]:
+    """
+    Hourly mention rows for selected entities over [start_bucket, end_bucket).
+
+    Args:
+        entities: (label or None, name) pairs, names matched case-insensitively;
+                  None selects the ``top`` most mentioned entities in the window
+
+    Returns:
+        (matched (label, term) keys, rows of (label, term, bucket_hour, count))
+    """
+    async with aiosqlite.connect(sqlite_path) as db:
+        if entities is None:
+            cur = await db.execute(
+                """
+                SELECT label, term FROM entity_hourly
+                WHERE bucket_hour >= ? AND bucket_hour < ?
+                GROUP BY label, term ORDER BY SUM(count) DESC, term LIMIT ?
+                """,
+                (start_bucket, end_bucket, top),
+            )
+            keys = [tuple(row) for row in await cur.fetchall()]
+        else:
+            keys = []
+            for label, name in entities:
+                # Most mentioned spelling/label wins when several match
+                cur = await db.execute(
+                    """
+                    SELECT label, term FROM entity_hourly
+                    WHERE term = ? COLLATE NOCASE AND (? IS NULL OR label = ?)
+                      AND bucket_hour >= ? AND bucket_hour < ?
+                    GROUP BY label, term ORDER BY SUM(count) DESC LIMIT 1
+                    """,
+                    (name, label, label, start_bucket, end_bucket),
+                )
+                row = await cur.fetchone()
+                if row is not None and tuple(row) not in keys:
+                    keys.append(tuple(row))
+
+        rows: list[tuple[str, str, str, int]] = []
+        for label, term in keys:
+            cur = await db.execute(
+                """
+                SELECT label, term, bucket_hour, count FROM entity_hourly
+                WHERE label = ? AND term = ? AND bucket_hour >= ? AND bucket_hour < ?
+                """,
+                (label, term, start_bucket, end_bucket),
+            )
+            rows.extend(await cur.fetchall())
+    return keys, rows
+
+
+def _sketch_from_row(row: tuple) -> KeywordSketch:
+    total, width, depth, capacity, cms, heavy = row
+    return KeywordSketch(
+        CountMinSketch.from_bytes(cms, width=width, depth=depth, total=total),
+        SpaceSaving.from_rows(json.loads(heavy), capacity=capacity),
+    )
+
+
+async def _load_sketches(db: aiosqlite.Connection, buckets: list[str]) -> dict[str, KeywordSketch]:
+    result: dict[str, KeywordSketch] = {}
+    for i in range(0, len(buckets), 500):
+        chunk = buckets[i : i + 500]
+        cur = await db.execute(
+            f"""
+            SELECT bucket_hour, total, width, depth, capacity, cms, heavy FROM keyword_sketches
+            WHERE bucket_hour IN ({",".join("?" * len(chunk))})
+            """,
+            chunk,
+        )
+        for row in await cur.fetchall():
+            result[row[0]] = _sketch_from_row(row[1:])
+    return result
+
+
+async def _save_sketch(db: aiosqlite.Connection, bucket: str, sketch: KeywordSketch) -> None:
+    await db.execute(
+        """
+        INSERT OR REPLACE INTO keyword_sketches(bucket_hour, total, width, depth, capacity, cms, heavy, built_at)
+        VALUES(?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            bucket,
+            sketch.total,
+            sketch.cms.width,
+            sketch.cms.depth,
+            sketch.heavy.capacity,
+            sketch.cms.to_bytes(),
+            json.dumps(sketch.heavy.to_rows()),
+            datetime.now(tz=UTC).isoformat(),
+        ),
+    )
+
+
+async def sketch_closed_hours(
+    sqlite_path: str,
+    *,
+    width: int,
+    depth: int,
+    capacity: int,
+    settle_hours: int = 1,
+    now: datetime | None = None,
+) -> int:
+    """
+    Summarize every closed, not yet sketched keyword hour into a KeywordSketch.
+
+    Must run before ``trim_hourly_counts`` so hours are sketched before their
+    exact rows expire; the sketches are then kept for ``sketch_retention_days``.
+
+    Returns:
+        Number of hour buckets sketched
+    """
+    now = now or datetime.now(tz=UTC)
+    sketch_until = shift_bucket(bucket_hour(now), -(settle_hours + 1))
+
+    async with aiosqlite.connect(sqlite_path) as db:
+        cur = await db.execute(
+            """
+            SELECT bucket_hour, term, count FROM keyword_hourly
+            WHERE bucket_hour <= ? AND bucket_hour NOT IN (SELECT bucket_hour FROM keyword_sketches)
+            ORDER BY bucket_hour
+            """,
+            (sketch_until,),
+        )
+        by_bucket: dict[str, dict[str, int]] = {}
+        for bucket, term, n in await cur.fetchall():
+            by_bucket.setdefault(bucket, {})[term] = n
+
+        for bucket, counts in by_bucket.items():
+            sketch = KeywordSketch.empty(width=width, depth=depth, capacity=capacity)
+            sketch.add_many(counts)
+            await _save_sketch(db, bucket, sketch)
+        await db.commit()
+
+    return len(by_bucket)
+
+
+async def keyword_sketch_for_buckets(
+    sqlite_path: str,
+    *,
+    start_bucket: str,
+    end_bucket: str,
+    width: int,
+    depth: int,
+    capacity: int,
+) -> KeywordSketch:
+    """
+    Merged keyword sketch over hour buckets in [start_bucket, end_bucket).
+
+    Stored sketches are merged one at a time, so memory is fixed regardless of
+    the window length. Hours without a compatible sketch (still open, or built
+    with other dimensions) are summarized on the fly from their exact rows.
+    """
+    merged = KeywordSketch.empty(width=width, depth=depth, capacity=capacity)
+    async with aiosqlite.connect(sqlite_path) as db:
+        cur = await db.execute(
+            """
+            SELECT total, width, depth, capacity, cms, heavy FROM keyword_sketches
+            WHERE bucket_hour >= ? AND bucket_hour < ? AND width = ? AND depth = ?
+            """,
+            (start_bucket, end_bucket, width, depth),
+        )
+        async for row in cur:
+            merged.merge(_sketch_from_row(row))
+
+        cur = await db.execute(
+            """
+            SELECT term, SUM(count) FROM keyword_hourly
+            WHERE bucket_hour >= ? AND bucket_hour < ? AND bucket_hour NOT IN (
+              SELECT bucket_hour FROM keyword_sketches WHERE width = ? AND depth = ?
+            )
+            GROUP BY term
+            """,
+            (start_bucket, end_bucket, width, depth),
+        )
+        unsketched = dict(await cur.fetchall())
+
+    if unsketched:
+        recent = KeywordSketch.empty(width=width, depth=depth, capacity=capacity)
+        recent.add_many(unsketched)
+        merged.merge(recent)
+    return merged
+
+
+async def trim_keyword_sketches(sqlite_path: str, *, retention_days: int) -> int:
+    """Delete keyword sketches older than the sketch retention period."""
+    cutoff = bucket_hour(datetime.now(tz=UTC) - timedelta(days=retention_days))
+    async with aiosqlite.connect(sqlite_path) as db:
+        cur = await db.execute("DELETE FROM keyword_sketches WHERE bucket_hour < ?", (cutoff,))
+        await db.commit()
+        return cur.rowcount
+
+
+async def trim_hourly_counts(sqlite_path: str, *, retention_days: int) -> int:
+    """Delete hourly rollup buckets older than the retention period."""
+    cutoff = bucket_hour(datetime.now(tz=UTC) - timedelta(days=retention_days))
+    deleted = 0
+    async with aiosqlite.connect(sqlite_path) as db:
+        for table in ("hourly_counts", "keyword_hourly", "entity_hourly", "entity_pair_hourly", "sentiment_hourly"):
+            cur = await db.execute(f"DELETE FROM {table} WHERE bucket_hour < ?", (cutoff,))
+            deleted += cur.rowcount
+        await db.commit()
+        return deleted
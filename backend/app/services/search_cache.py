@@ -0,0 +1,245 @@
+"""
+Search Cache - short-lived cache of NewsAPI /everything pages for /search.
+
+Parsed NewsAPIResponse objects are kept in an in-process LRU keyed by the
+normalized query (q, page, pageSize, language), so "Bitcoin " and "bitcoin"
+share an entry and an omitted page means page 1.
+
+An entry is fresh for ``ttl_seconds``. For another ``stale_seconds`` it is
+still served immediately, while a single background refresh fetches a new
+page (stale-while-revalidate). Identical misses in flight share one upstream
+call. Errors are never cached, and a failed refresh keeps the stale entry.
+
+With ``sqlite_path`` set, pages are also written to SQLite, so a restart or
+another worker on the same database starts warm.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+
+import aiosqlite
+
+from app.schemas.newsapi import NewsAPIResponse
+from app.services.single_flight import SingleFlight
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_cache (
+  key TEXT PRIMARY KEY,
+  payload TEXT NOT NULL,
+  created_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_search_cache_created ON search_cache(created_at);
+"""
+
+# Where a page came from
+SOURCES = ("cache", "stale", "coalesced", "upstream")
+
+# NewsAPI defaults for /everything
+DEFAULT_PAGE = 1
+DEFAULT_PAGE_SIZE = 100
+
+
+def search_key(q: str, page: int | None, page_size: int | None, language: str | None) -> str:
+    norm = " ".join(q.split()).casefold()
+    payload = json.dumps(
+        [norm, page or DEFAULT_PAGE, page_size or DEFAULT_PAGE_SIZE, (language or "").strip().lower()],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class SearchCache:
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float,
+        stale_seconds: float,
+        max_entries: int,
+        sqlite_path: str | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self.sqlite_path = sqlite_path
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, NewsAPIResponse]] = OrderedDict()
+        self._inflight: SingleFlight[NewsAPIResponse] = SingleFlight("search")
+        self._ready = False
+        self._init_lock = asyncio.Lock()
+        # Metrics (per process)
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.upstream_calls = 0
+        self.upstream_errors = 0
+        self.evictions = 0
+        self._served_ms: dict[str, deque[float]] = {s: deque(maxlen=200) for s in SOURCES}
+
+    async def init(self) -> None:
+        if self.sqlite_path is None:
+            return
+        async with self._init_lock:
+            if not self._ready:
+                async with aiosqlite.connect(self.sqlite_path) as db:
+                    await db.executescript(SCHEMA)
+                    await db.commit()
+                self._ready = True
+
+    def _age(self, created_at: float) -> float:
+        return self._clock() - created_at
+
+    def _remember(self, key: str, created_at: float, resp: NewsAPIResponse) -> None:
+        self._entries[key] = (created_at, resp)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def _load(self, key: str) -> tuple[float, NewsAPIResponse] | None:
+        """Entry from memory, else from SQLite (promoted into memory); None if absent or expired."""
+        entry = self._entries.get(key)
+        if entry is None and self.sqlite_path is not None:
+            await self.init()
+            async with aiosqlite.connect(self.sqlite_path) as db:
+                cur = await db.execute(
+                    "SELECT created_at, payload FROM search_cache WHERE key = ? AND created_at > ?",
+                    (key, self._clock() - self.ttl_seconds - self.stale_seconds),
+                )
+                row = await cur.fetchone()
+            if row is not None:
+                entry = (row[0], NewsAPIResponse.model_validate_json(row[1]))
+                self._remember(key, *entry)
+        if entry is None:
+            return None
+        if self._age(entry[0]) >= self.ttl_seconds + self.stale_seconds:
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def put(self, key: str, resp: NewsAPIResponse) -> None:
+        now = self._clock()
+        self._remember(key, now, resp)
+        if self.sqlite_path is None:
+            return
+        await self.init()
+        async with aiosqlite.connect(self.sqlite_path) as db:
+            await db.execute(
+                "INSERT OR REPLACE INTO search_cache(key, payload, created_at) VALUES(?, ?, ?)",
+                (key, resp.model_dump_json(), now),
+            )
+            await db.execute(
+                "DELETE FROM search_cache WHERE created_at <= ?", (now - self.ttl_seconds - self.stale_seconds,)
+            )
+            await db.execute(
+                """
+                DELETE FROM search_cache WHERE key IN (
+                  SELECT key FROM search_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+            await db.commit()
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[NewsAPIResponse]],
+    ) -> tuple[NewsAPIResponse, str]:
+        """
+        Cached page, or fetch it once for all concurrent callers.
+
+        A stale page is returned at once and refreshed in the background.
+
+        Returns:
+            (response, source) where source is one of SOURCES
+        """
+        start = time.perf_counter()
+        resp, source = await self._get_or_fetch(key, fetch)
+        self._served_ms[source].append((time.perf_counter() - start) * 1000)
+        return resp, source
+
+    async def _get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[NewsAPIResponse]],
+    ) -> tuple[NewsAPIResponse, str]:
+        entry = await self._load(key)
+        if entry is not None:
+            created_at, resp = entry
+            if self._age(created_at) < self.ttl_seconds:
+                self.hits += 1
+                return resp, "cache"
+            self.stale_hits += 1
+            if key not in self._inflight:
+                self.refreshes += 1
+                self._inflight.start(key, lambda: self._fill(key, fetch))
+            return resp, "stale"
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task), "coalesced"
+
+        self.misses += 1
+        return await asyncio.shield(self._inflight.start(key, lambda: self._fill(key, fetch))), "upstream"
+
+    async def _fill(self, key: str, fetch: Callable[[], Awaitable[NewsAPIResponse]]) -> NewsAPIResponse:
+        self.upstream_calls += 1
+        try:
+            resp = await fetch()
+        except Exception:
+            self.upstream_errors += 1
+            raise
+        await self.put(key, resp)
+        return resp
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "staleHits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hitRatio": round((self.hits + self.stale_hits + self.coalesced) / lookups, 4) if lookups else None,
+            "refreshes": self.refreshes,
+            "upstreamCalls": self.upstream_calls,
+            "upstreamErrors": self.upstream_errors,
+            "evictions": self.evictions,
+            "inflight": len(self._inflight),
+            "servedMs": {source: _p50(samples) for source, samples in self._served_ms.items()},
+        }
+
+
+def _p50(samples: deque[float]) -> float | None:
+    if not samples:
+        return None
+    return round(sorted(samples)[len(samples) // 2], 2)
+
+
+_search_cache: SearchCache | None = None
+
+
+def get_search_cache() -> SearchCache:
+    """Get or create the process-wide search cache."""
+    global _search_cache
+    if _search_cache is None:
+        from app.core.config import settings
+
+        _search_cache = SearchCache(
+            ttl_seconds=settings.search_cache_ttl_seconds,
+            stale_seconds=settings.search_cache_stale_seconds,
+            max_entries=settings.search_cache_max_entries,
+            sqlite_path=settings.sqlite_path if settings.search_cache_sqlite else None,
+        )
+    return _search_cache
@@ -1,15 +1,42 @@
 from __future__ import annotations
 
+import hashlib
+import time
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 from pathlib import Path
 
-import joblib
+import numpy as np
+
+MODELS_DIR = Path(__file__).resolve().parents[2] / "models"
+COMPACT_DIR = MODELS_DIR / "sentiment_compact"
+
+
+def artifact_digest(paths: Iterable[Path]) -> str:
+    """Short content hash of a model's artifact files (the ones that exist)."""
+    digest = hashlib.sha1()
+    for path in paths:
+        if path.exists():
+            with path.open("rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+    return digest.hexdigest()[:12]
 
 
 @dataclass(frozen=True)
 class SentimentResult:
     label: str
     score: float | None = None
+    polarity: float | None = None  # P(positive) - P(negative), when the model has both classes
+
+
+@dataclass(frozen=True)
+class SentimentBatch:
+    results: list[SentimentResult]
+    latency_ms: float
+
+    def to_meta(self) -> dict:
+        return {"batchSize": len(self.results), "latencyMs": round(self.latency_ms, 3)}
 
 
 class SentimentModel:
@@ -18,30 +45,111 @@ class SentimentModel:
         self._vectorizer_path = Path(vectorizer_path)
         self._model = None
         self._vectorizer = None
+        # Identifies the loaded artifacts; stored with every score, so a new model rescores
+        self.model_id: str | None = None
+        # Cumulative inference stats across batches
+        self.batches = 0
+        self.texts = 0
+        self.total_ms = 0.0
 
     def load(self) -> None:
         if not self._model_path.exists() or not self._vectorizer_path.exists():
             raise FileNotFoundError(
                 f"Missing sentiment artifacts: {self._model_path} / {self._vectorizer_path}"
             )
+        import joblib  # unpickling pulls in sklearn; only this loader needs it
+
         self._vectorizer = joblib.load(self._vectorizer_path)
         self._model = joblib.load(self._model_path)
+        self.model_id = f"pickle:{artifact_digest([self._vectorizer_path, self._model_path])}"
 
     def predict(self, text: str) -> SentimentResult:
+        return self.predict_many([text]).results[0]
+
+    def predict_many(self, texts: Sequence[str]) -> SentimentBatch:
+        """
+        Classify a batch of texts in one pass.
+
+        The whole batch is vectorized into one sparse matrix and scored with a
+        single predict_proba call; labels are the argmax of each row and the
+        score is that row's maximum probability.
+        """
+        if not texts:
+            return SentimentBatch([], 0.0)
+
+        start = time.perf_counter()
+        classes, proba, labels = self._infer(texts)
+        if proba is not None:
+            best = proba.argmax(axis=1)
+            scores = proba[np.arange(len(best)), best]
+            if "positive" in classes and "negative" in classes:
+                polarity = proba[:, classes.index("positive")] - proba[:, classes.index("negative")]
+            else:
+                polarity = [None] * len(best)
+            results = [
+                SentimentResult(label=classes[i], score=float(s), polarity=None if p is None else float(p))
+                for i, s, p in zip(best, scores, polarity)
+            ]
+        else:
+            results = [SentimentResult(label=label) for label in labels]
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        self.batches += 1
+        self.texts += len(texts)
+        self.total_ms += latency_ms
+        return SentimentBatch(results, latency_ms)
+
+    def _infer(self, texts: Sequence[str]) -> tuple[list[str], np.ndarray | None, list[str] | None]:
+        """(classes, probability matrix or None, labels when there are no probabilities)."""
         if self._model is None or self._vectorizer is None:
             raise RuntimeError("Sentiment model not loaded")
+        X = self._vectorizer.transform(texts)
+        classes = [str(c) for c in self._model.classes_]
+        if hasattr(self._model, "predict_proba"):
+            return classes, self._model.predict_proba(X), None
+        return classes, None, [str(label) for label in self._model.predict(X)]
 
-        X = self._vectorizer.transform([text])
-        pred = self._model.predict(X)[0]
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "texts": self.texts,
+            "avgBatchMs": round(self.total_ms / self.batches, 3) if self.batches else None,
+        }
 
-        score = None
-        if hasattr(self._model, "predict_proba"):
-            proba = self._model.predict_proba(X)[0]
-            # best-effort: probability of predicted class
-            try:
-                idx = list(self._model.classes_).index(pred)
-                score = float(proba[idx])
-            except Exception:
-                score = None
-
-        return SentimentResult(label=str(pred), score=score)
+
+def sentiment_text(title: str | None, description: str | None) -> str | None:
+    """Text the model sees for an article (None when there is no title)."""
+    if not title:
+        return None
+    return f"{title}. {description}" if description else title
+
+
+_sentiment_model: SentimentModel | None = None
+_load_attempted = False
+
+
+def get_sentiment_model() -> SentimentModel | None:
+    """
+    Get the process-wide sentiment model, or None if its artifacts are missing.
+
+    The compact NumPy artifact is preferred (no sklearn import, memory-mapped
+    arrays); the pickled sklearn objects are the fallback.
+    """
+    global _sentiment_model, _load_attempted
+    if not _load_attempted:
+        _load_attempted = True
+        if (COMPACT_DIR / "meta.json").exists():
+            from app.services.sentiment_compact import CompactSentimentModel
+
+            model = CompactSentimentModel(COMPACT_DIR)
+        else:
+            model = SentimentModel(
+                model_path=str(MODELS_DIR / "sentiment.pkl"),
+                vectorizer_path=str(MODELS_DIR / "vectorizer.pkl"),
+            )
+        try:
+            model.load()
+            _sentiment_model = model
+        except Exception as e:
+            print(f"Warning: Could not load sentiment model: {e}")
+    return _sentiment_model
@@ -0,0 +1,252 @@
+"""
+Compact sentiment artifact: plain NumPy arrays instead of pickled sklearn objects.
+
+Layout of an artifact directory:
+  meta.json       format version, classes, vectorizer settings, probability link
+  vocab.npy       sorted term array (column j = vocab[j]), looked up with searchsorted;
+                  absent for hashing vectorizers (column = murmurhash3 of the term)
+  idf.npy         IDF weights per column (absent when use_idf is off)
+  coef.npy        (n_classes or 1, n_features) linear weights
+  intercept.npy   (n_classes or 1,)
+
+Serving re-implements the sklearn word analyzer (lowercase, token regex,
+word n-grams), feature hashing, TF-IDF weighting and normalization with NumPy
+only, so loading needs no sklearn import and the arrays are memory-mapped.
+"""
+from __future__ import annotations
+
+import json
+import re
+from functools import lru_cache
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from app.services.sentiment import SentimentModel, artifact_digest
+
+FORMAT_VERSION = 1
+
+def _proba_link(clf: Any) -> str:
+    """How LogisticRegression turns decision scores into probabilities."""
+    if len(clf.classes_) == 2:
+        return "binary"
+    if hasattr(clf, "loss"):  # SGDClassifier(loss="log_loss"): normalized one-vs-rest sigmoids
+        return "ovr"
+    if getattr(clf, "multi_class", "auto") == "ovr" or getattr(clf, "solver", None) == "liblinear":
+        return "ovr"
+    return "softmax"
+
+
+def export_compact(vectorizer: Any, clf: Any, out_dir: str | Path) -> Path:
+    """
+    Write a fitted TfidfVectorizer/CountVectorizer/HashingVectorizer + linear classifier
+    as a compact artifact.
+
+    Only fitted attributes are read, so this module never imports sklearn itself.
+    """
+    params = vectorizer.get_params()
+    if params.get("analyzer", "word") != "word" or params.get("preprocessor") or params.get("tokenizer"):
+        raise ValueError("Only the default word analyzer can be exported")
+    if params.get("stop_words") is not None or params.get("strip_accents") is not None:
+        raise ValueError("stop_words/strip_accents are not supported by the compact format")
+
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+
+    hashing = not hasattr(vectorizer, "vocabulary_")
+    if hashing:
+        vectorizer_meta = {
+            "kind": "hashing",
+            "n_features": params["n_features"],
+            "alternate_sign": params.get("alternate_sign", True),
+        }
+    else:
+        terms = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.__getitem__)
+        vocab = np.array(terms)
+        if not (vocab[:-1] < vocab[1:]).all():
+            raise ValueError("Vectorizer columns are not in sorted term order")
+        np.save(out / "vocab.npy", vocab)
+        vectorizer_meta = {"kind": "vocabulary"}
+
+    use_idf = hasattr(vectorizer, "idf_") and params.get("use_idf", False)
+    if use_idf:
+        np.save(out / "idf.npy", np.asarray(vectorizer.idf_, dtype=np.float64))
+    np.save(out / "coef.npy", np.asarray(clf.coef_, dtype=np.float64))
+    np.save(out / "intercept.npy", np.asarray(clf.intercept_, dtype=np.float64))
+
+    # TfidfVectorizer and HashingVectorizer normalize; CountVectorizer has no norm
+    normalizes = hashing or hasattr(vectorizer, "idf_")
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "classes": [str(c) for c in clf.classes_],
+        "proba": _proba_link(clf) if hasattr(clf, "predict_proba") else None,
+        "vectorizer": {
+            **vectorizer_meta,
+            "lowercase": params.get("lowercase", True),
+            "token_pattern": params.get("token_pattern", r"(?u)\b\w\w+\b"),
+            "ngram_range": list(params.get("ngram_range", (1, 1))),
+            "use_idf": bool(use_idf),
+            "sublinear_tf": params.get("sublinear_tf", False),
+            "norm": params.get("norm", None) if normalizes else None,
+            "binary": params.get("binary", False),
+        },
+    }
+    (out / "meta.json").write_text(json.dumps(meta, indent=2))
+    return out
+
+
+def word_ngrams(text: str, token_re: re.Pattern, ngram_range: tuple[int, int], lowercase: bool) -> list[str]:
+    """sklearn's word analyzer: optional lowercase, regex tokens, space-joined n-grams."""
+    tokens = token_re.findall(text.lower() if lowercase else text)
+    low, high = ngram_range
+    if high == 1:
+        return tokens
+    grams = list(tokens) if low == 1 else []
+    for n in range(max(low, 2), high + 1):
+        grams.extend(" ".join(tokens[i : i + n]) for i in range(len(tokens) - n + 1))
+    return grams
+
+
+def murmurhash3_32(data: bytes, seed: int = 0) -> int:
+    """Signed 32-bit MurmurHash3 (x86), as used by sklearn's HashingVectorizer."""
+    mask = 0xFFFFFFFF
+    c1, c2 = 0xCC9E2D51, 0x1B873593
+
+    def rotl(x: int, r: int) -> int:
+        return ((x << r) | (x >> (32 - r))) & mask
+
+    h = seed & mask
+    n_blocks = len(data) // 4
+    for i in range(n_blocks):
+        k = int.from_bytes(data[4 * i : 4 * i + 4], "little")
+        k = rotl((k * c1) & mask, 15)
+        h ^= (k * c2) & mask
+        h = (rotl(h, 13) * 5 + 0xE6546B64) & mask
+
+    tail = data[4 * n_blocks :]
+    if tail:
+        k = int.from_bytes(tail, "little")
+        k = rotl((k * c1) & mask, 15)
+        h ^= (k * c2) & mask
+
+    h ^= len(data)
+    h ^= h >> 16
+    h = (h * 0x85EBCA6B) & mask
+    h ^= h >> 13
+    h = (h * 0xC2B2AE35) & mask
+    h ^= h >> 16
+    return h - (1 << 32) if h & 0x80000000 else h
+
+
+@lru_cache(maxsize=200_000)
+def _hashed_column(gram: str, n_features: int) -> tuple[int, float]:
+    """(column, sign) of a term in a hashed feature space."""
+    h = murmurhash3_32(gram.encode("utf-8"))
+    return abs(h) % n_features, 1.0 if h >= 0 else -1.0
+
+
+class CompactSentimentModel(SentimentModel):
+    """SentimentModel served from a compact NumPy artifact (no sklearn)."""
+
+    def __init__(self, artifact_dir: str | Path) -> None:
+        super().__init__(model_path=str(artifact_dir), vectorizer_path=str(artifact_dir))
+        self._dir = Path(artifact_dir)
+        self._meta: dict | None = None
+
+    def load(self) -> None:
+        meta_path = self._dir / "meta.json"
+        if not meta_path.exists():
+            raise FileNotFoundError(f"Missing compact sentiment artifact: {meta_path}")
+        meta = json.loads(meta_path.read_text())
+        if meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compact artifact version: {meta.get('format_version')}")
+
+        vec = meta["vectorizer"]
+        self._token_re = re.compile(vec["token_pattern"])
+        self._ngram_range = tuple(vec["ngram_range"])
+        self._hashing = vec["kind"] == "hashing"
+        self._vocab = None if self._hashing else np.load(self._dir / "vocab.npy", mmap_mode="r")
+        self._idf = np.load(self._dir / "idf.npy", mmap_mode="r") if vec["use_idf"] else None
+        self._coef = np.load(self._dir / "coef.npy", mmap_mode="r")
+        self._intercept = np.load(self._dir / "intercept.npy")
+        self._meta = meta
+        self.model_id = "compact:" + artifact_digest(
+            self._dir / name for name in ("meta.json", "vocab.npy", "idf.npy", "coef.npy", "intercept.npy")
+        )
+
+    def _features(self, texts: Sequence[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Sparse feature rows as COO arrays (row, col, value), normalized per row."""
+        vec = self._meta["vectorizer"]
+        rows: list[int] = []
+        grams: list[str] = []
+        for i, text in enumerate(texts):
+            doc = word_ngrams(text, self._token_re, self._ngram_range, vec["lowercase"])
+            grams.extend(doc)
+            rows.extend([i] * len(doc))
+        if not grams:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        rows_arr = np.asarray(rows, dtype=np.int64)
+        if self._hashing:
+            n_features = vec["n_features"]
+            hashed = [_hashed_column(g, n_features) for g in grams]
+            cols = np.fromiter((c for c, _ in hashed), dtype=np.int64, count=len(hashed))
+            signs = np.fromiter((s for _, s in hashed), dtype=np.float64, count=len(hashed))
+            if not vec["alternate_sign"]:
+                signs[:] = 1.0
+        else:
+            n_features = len(self._vocab)
+            gram_arr = np.array(grams)
+            pos = np.minimum(np.searchsorted(self._vocab, gram_arr), n_features - 1)
+            known = self._vocab[pos] == gram_arr
+            rows_arr, cols = rows_arr[known], pos[known].astype(np.int64)
+            signs = np.ones(len(cols))
+
+        # Signed term counts per (row, col)
+        keys, inverse = np.unique(rows_arr * n_features + cols, return_inverse=True)
+        counts = np.bincount(inverse, weights=signs, minlength=len(keys))
+        rows_arr, cols = keys // n_features, keys % n_features
+        values = counts.astype(np.float64)
+        if vec["binary"]:
+            values[:] = 1.0
+        elif vec["sublinear_tf"]:
+            values = np.log(values) + 1.0
+        if self._idf is not None:
+            values = values * self._idf[cols]
+        if vec["norm"] == "l2":
+            norms = np.sqrt(np.bincount(rows_arr, weights=values**2, minlength=len(texts)))
+            norms[norms == 0] = 1.0
+            values = values / norms[rows_arr]
+        elif vec["norm"] == "l1":
+            norms = np.bincount(rows_arr, weights=np.abs(values), minlength=len(texts))
+            norms[norms == 0] = 1.0
+            values = values / norms[rows_arr]
+        return rows_arr, cols, values
+
+    def decision_function(self, texts: Sequence[str]) -> np.ndarray:
+        rows, cols, values = self._features(texts)
+        scores = np.tile(self._intercept, (len(texts), 1))
+        np.add.at(scores, rows, values[:, None] * self._coef[:, cols].T)
+        return scores
+
+    def _infer(self, texts: Sequence[str]) -> tuple[list[str], np.ndarray | None, list[str] | None]:
+        if self._meta is None:
+            raise RuntimeError("Sentiment model not loaded")
+        classes = self._meta["classes"]
+        scores = self.decision_function(texts)
+        link = self._meta["proba"]
+        if link == "binary":
+            p1 = 1.0 / (1.0 + np.exp(-scores[:, 0]))
+            return classes, np.column_stack([1.0 - p1, p1]), None
+        if link == "softmax":
+            shifted = np.exp(scores - scores.max(axis=1, keepdims=True))
+            return classes, shifted / shifted.sum(axis=1, keepdims=True), None
+        if link == "ovr":
+            p = 1.0 / (1.0 + np.exp(-scores))
+            return classes, p / p.sum(axis=1, keepdims=True), None
+        # No probabilities: sign (binary) or argmax of the decision function
+        if scores.shape[1] == 1:
+            return classes, None, [classes[int(s > 0)] for s in scores[:, 0]]
+        return classes, None, [classes[i] for i in scores.argmax(axis=1)]
@@ -0,0 +1,229 @@
+"""
+Article Sentiment - sentiment scored once per stored article at ingest.
+
+New or changed articles are classified in one batched pass and the result is
+kept per article. Hourly rollups ('all' and per-source) are updated with
+signed deltas in the same transaction, so sentiment-over-time queries never
+run the model. Topic and cluster assignments are recomputed every ML cycle,
+so their sentiment is aggregated from the stored per-article scores instead.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+import aiosqlite
+import numpy as np
+
+from app.services.analytics.seasonal import bucket_hour
+from app.services.rollups import SENTIMENT_FIELDS, apply_sentiment_deltas
+from app.services.sentiment import sentiment_text
+
+if TYPE_CHECKING:
+    from app.services.sentiment import SentimentModel, SentimentResult
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS article_sentiment (
+  article_id INTEGER PRIMARY KEY,
+  text_hash TEXT NOT NULL,
+  label TEXT NOT NULL,
+  score REAL,
+  polarity REAL,
+  bucket_hour TEXT,
+  source_name TEXT,
+  scored_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_article_sentiment_bucket ON article_sentiment(bucket_hour);
+"""
+
+SENTIMENT_LABELS = ("positive", "negative", "neutral")
+
+
+async def init_sentiment_tables(sqlite_path: str) -> None:
+    async with aiosqlite.connect(sqlite_path) as db:
+        await db.executescript(SCHEMA)
+        await db.commit()
+
+
+def _hash(text: str, published_at: str | None, source_name: str | None, model_id: str | None) -> str:
+    # Bucket and source key the rollups; a promoted or compact model rescores everything
+    parts = (text, published_at or "", source_name or "", model_id or "")
+    return hashlib.sha1("\n".join(parts).encode()).hexdigest()
+
+
+def _bucket_of(published_at: str | None) -> str | None:
+    try:
+        return bucket_hour(datetime.fromisoformat(published_at))
+    except (TypeError, ValueError):
+        return None
+
+
+def _delta(label: str, polarity: float | None) -> np.ndarray:
+    vector = np.zeros(len(SENTIMENT_FIELDS))
+    vector[0] = 1
+    vector[1] = polarity or 0.0
+    if label in SENTIMENT_LABELS:
+        vector[2 + SENTIMENT_LABELS.index(label)] = 1
+    return vector
+
+
+async def find_unscored_articles(sqlite_path: str, *, model_id: str | None = None) -> list[dict]:
+    """Articles never scored by this model, or whose text/published_at/source changed since."""
+    async with aiosqlite.connect(sqlite_path) as db:
+        db.row_factory = aiosqlite.Row
+        cur = await db.execute(
+            """
+            SELECT a.id, a.title, a.description, a.published_at, a.source_name,
+                   s.text_hash AS old_hash, s.label AS old_label, s.polarity AS old_polarity,
+                   s.bucket_hour AS old_bucket, s.source_name AS old_source
+            FROM articles a
+            LEFT JOIN article_sentiment s ON s.article_id = a.id
+            """
+        )
+        rows = await cur.fetchall()
+
+    pending = []
+    for row in rows:
+        text = sentiment_text(row["title"], row["description"])
+        if text is None:
+            continue
+        text_hash = _hash(text, row["published_at"], row["source_name"], model_id)
+        if row["old_hash"] != text_hash:
+            pending.append({**dict(row), "text": text, "text_hash": text_hash})
+    return pending
+
+
+async def score_pending_sentiment(
+    sqlite_path: str,
+    *,
+    model: "SentimentModel",
+    batch_size: int = 512,
+) -> list[dict]:
+    """
+    Score every new or changed article and update the sentiment rollups.
+
+    Args:
+        sqlite_path: Path to SQLite database
+        model: Loaded sentiment model (batched predict_many)
+        batch_size: Texts per predict_many call
+
+    Returns:
+        The scored articles
+    """
+    pending = await find_unscored_articles(sqlite_path, model_id=model.model_id)
+    if not pending:
+        return []
+
+    def run_model() -> list[SentimentResult]:
+        texts = [a["text"] for a in pending]
+        results: list[SentimentResult] = []
+        for i in range(0, len(texts), batch_size):
+            results.extend(model.predict_many(texts[i : i + batch_size]).results)
+        return results
+
+    results = await asyncio.to_thread(run_model)
+
+    deltas: dict[tuple[str, str, str], np.ndarray] = {}
+
+    def add(scope: str, key: str, bucket: str, vector: np.ndarray) -> None:
+        deltas[(scope, key, bucket)] = deltas.get((scope, key, bucket), 0) + vector
+
+    now = datetime.now(tz=UTC).isoformat()
+    rows = []
+    for article, result in zip(pending, results):
+        if article["old_bucket"] is not None:
+            old = -_delta(article["old_label"], article["old_polarity"])
+            add("all", "all", article["old_bucket"], old)
+            add("source", article["old_source"] or "unknown", article["old_bucket"], old)
+        bucket = _bucket_of(article["published_at"])
+        source = article["source_name"] or "unknown"
+        if bucket is not None:
+            new = _delta(result.label, result.polarity)
+            add("all", "all", bucket, new)
+            add("source", source, bucket, new)
+        rows.append(
+            (article["id"], article["text_hash"], result.label, result.score, result.polarity, bucket, source, now)
+        )
+
+    async with aiosqlite.connect(sqlite_path) as db:
+        await db.executemany(
+            """
+            INSERT OR REPLACE INTO article_sentiment
+              (article_id, text_hash, label, score, polarity, bucket_hour, source_name, scored_at)
+            VALUES(?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
+        await apply_sentiment_deltas(db, deltas)
+        await db.commit()
+
+    return pending
+
+
+async def rollup_topic_sentiment(sqlite_path: str) -> int:
+    """
+    Rebuild the hourly per-topic sentiment rollup after topics were reassigned.
+
+    Only buckets still covered by stored articles are rebuilt; older topic
+    history is kept as it was.
+
+    Returns:
+        Number of (topic, hour) rows written
+    """
+    async with aiosqlite.connect(sqlite_path) as db:
+        cur = await db.execute("SELECT MIN(bucket_hour) FROM article_sentiment")
+        first = (await cur.fetchone())[0]
+        if first is None:
+            return 0
+        await db.execute("DELETE FROM sentiment_hourly WHERE scope = 'topic' AND bucket_hour >= ?", (first,))
+        cur = await db.execute(
+            """
+            INSERT INTO sentiment_hourly(scope, key, bucket_hour, n, polarity_sum, positive, negative, neutral)
+            SELECT 'topic', t.topic_label, s.bucket_hour, COUNT(*), SUM(COALESCE(s.polarity, 0)),
+                   SUM(s.label = 'positive'), SUM(s.label = 'negative'), SUM(s.label = 'neutral')
+            FROM article_sentiment s
+            JOIN articles a ON a.id = s.article_id
+            JOIN article_topics t ON t.url = a.url
+            WHERE s.bucket_hour IS NOT NULL AND t.topic_label IS NOT NULL AND t.topic_id >= 0
+            GROUP BY t.topic_label, s.bucket_hour
+            """
+        )
+        await db.commit()
+        return cur.rowcount
+
+
+async def sentiment_by_cluster(sqlite_path: str, *, limit: int = 20, min_size: int = 2) -> list[dict]:
+    """Sentiment of the current story clusters (largest first), from stored per-article scores."""
+    async with aiosqlite.connect(sqlite_path) as db:
+        db.row_factory = aiosqlite.Row
+        # Bare a.title/a.url with MAX(published_at) yields the newest member's values
+        cur = await db.execute(
+            """
+            SELECT c.cluster_id, COUNT(*) AS size, COUNT(s.article_id) AS scored,
+                   AVG(s.polarity) AS mean_polarity,
+                   SUM(s.label = 'positive') AS positive, SUM(s.label = 'negative') AS negative,
+                   SUM(s.label = 'neutral') AS neutral,
+                   a.title, a.url, MAX(a.published_at) AS latest
+            FROM article_clusters c
+            JOIN articles a ON a.url = c.url
+            LEFT JOIN article_sentiment s ON s.article_id = a.id
+            WHERE c.cluster_id >= 0
+            GROUP BY c.cluster_id
+            HAVING COUNT(*) >= ?
+            ORDER BY size DESC, latest DESC
+            LIMIT ?
+            """,
+            (min_size, limit),
+        )
+        return [dict(row) for row in await cur.fetchall()]
+
+
+async def delete_orphan_sentiment(sqlite_path: str) -> None:
+    """Drop scores of deleted articles (their rollup contribution is kept)."""
+    async with aiosqlite.connect(sqlite_path) as db:
+        await db.execute("DELETE FROM article_sentiment WHERE article_id NOT IN (SELECT id FROM articles)")
+        await db.commit()
@@ -0,0 +1,279 @@
+"""
+Sentiment Training - out-of-core training for the sentiment model.
+
+The labelled corpus is streamed from disk in chunks and never held in memory:
+texts are hashed into a fixed feature space (HashingVectorizer, so there is no
+vocabulary to grow) and an SGDClassifier is updated with partial_fit per
+chunk. Rows are split into train/validation by a hash of their text, which is
+stable across passes and needs no shuffle buffer; the corpus itself should be
+shuffled on disk, only rows within a chunk are shuffled here.
+
+Hyperparameter candidates are trained in parallel, each in a fresh worker
+process that streams the corpus itself: peak memory per candidate is bounded
+by the chunk size and the coefficient matrix, not by the corpus size, and the
+peak each candidate reports is its own, not carried over from a candidate
+that ran earlier in a reused worker.
+
+Imports sklearn; only the training script uses this module.
+"""
+from __future__ import annotations
+
+import csv
+import hashlib
+import itertools
+import json
+import multiprocessing
+import shutil
+import time
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+
+from app.services.sentiment_compact import export_compact
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_GRID = {"alpha": [1e-6, 1e-5, 1e-4], "penalty": ["l2", "elasticnet"]}
+
+
+def _peak_rss_bytes() -> int | None:
+    if resource is None:
+        return None
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _mb(n: int | None) -> float | None:
+    return round(n / 2**20, 1) if n is not None else None
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """Where the labelled corpus lives and how it is read and split."""
+
+    path: str
+    text_field: str = "text"
+    label_field: str = "label"
+    chunk_size: int = 50_000
+    validation_fraction: float = 0.1
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    n_features: int = 2**20
+    ngram_range: tuple[int, int] = (1, 2)
+
+    def vectorizer(self) -> HashingVectorizer:
+        # Non-negative features, like TF; HashingVectorizer is stateless so every worker builds its own
+        return HashingVectorizer(n_features=self.n_features, ngram_range=self.ngram_range, alternate_sign=False)
+
+
+@dataclass
+class CandidateResult:
+    params: dict
+    metrics: dict
+    seconds: float
+    peak_rss_bytes: int | None
+    model: Any = field(default=None, repr=False)
+
+    def to_dict(self) -> dict:
+        return {
+            "params": self.params,
+            "metrics": self.metrics,
+            "seconds": round(self.seconds, 3),
+            "peakMemoryMB": _mb(self.peak_rss_bytes),
+        }
+
+
+def iter_corpus(spec: CorpusSpec) -> Iterator[tuple[str, str]]:
+    """(text, label) rows from a CSV (with header) or JSONL file; rows missing either are skipped."""
+    path = Path(spec.path)
+    with path.open(newline="", encoding="utf-8") as f:
+        if path.suffix == ".jsonl":
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f, delimiter="\t" if path.suffix == ".tsv" else ",")
+        for row in rows:
+            text, label = row.get(spec.text_field), row.get(spec.label_field)
+            if text and label:
+                yield str(text), str(label)
+
+
+def is_validation(text: str, fraction: float) -> bool:
+    """Stable hash split: duplicates of a text always land on the same side."""
+    digest = hashlib.blake2b(text.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") < fraction * 2**64
+
+
+def iter_chunks(spec: CorpusSpec, *, validation: bool) -> Iterator[tuple[list[str], list[str]]]:
+    """Chunks of (texts, labels) from one side of the split."""
+    rows = (
+        row
+        for row in iter_corpus(spec)
+        if is_validation(row[0], spec.validation_fraction) == validation
+    )
+    while chunk := list(itertools.islice(rows, spec.chunk_size)):
+        texts, labels = zip(*chunk)
+        yield list(texts), list(labels)
+
+
+def scan_labels(spec: CorpusSpec) -> Counter:
+    """Label counts over the whole corpus (one streaming pass)."""
+    return Counter(label for _, label in iter_corpus(spec))
+
+
+def evaluate(model: SGDClassifier, spec: CorpusSpec, features: FeatureSpec) -> dict:
+    """Accuracy, macro F1 and log loss on the validation split, accumulated chunk by chunk."""
+    vectorizer = features.vectorizer()
+    classes = [str(c) for c in model.classes_]
+    confusion = np.zeros((len(classes), len(classes)), dtype=np.int64)
+    log_loss_sum = 0.0
+    for texts, labels in iter_chunks(spec, validation=True):
+        X = vectorizer.transform(texts)
+        truth = np.array([classes.index(y) if y in classes else -1 for y in labels])
+        known = truth >= 0
+        proba = model.predict_proba(X)[known]
+        truth = truth[known]
+        np.add.at(confusion, (truth, proba.argmax(axis=1)), 1)
+        log_loss_sum -= np.log(np.clip(proba[np.arange(len(truth)), truth], 1e-15, 1.0)).sum()
+
+    n = int(confusion.sum())
+    tp = np.diag(confusion).astype(np.float64)
+    predicted, actual = confusion.sum(axis=0), confusion.sum(axis=1)
+    precision = np.divide(tp, predicted, out=np.zeros_like(tp), where=predicted > 0)
+    recall = np.divide(tp, actual, out=np.zeros_like(tp), where=actual > 0)
+    f1 = np.divide(2 * precision * recall, precision + recall, out=np.zeros_like(tp), where=precision + recall > 0)
+    return {
+        "validationRows": n,
+        "accuracy": round(float(tp.sum() / n), 4) if n else None,
+        "macroF1": round(float(f1.mean()), 4) if n else None,
+        "logLoss": round(float(log_loss_sum / n), 4) if n else None,
+        "perClass": {
+            c: {"precision": round(float(p), 4), "recall": round(float(r), 4)}
+            for c, p, r in zip(classes, precision, recall)
+        },
+    }
+
+
+def train_candidate(
+    spec: CorpusSpec,
+    features: FeatureSpec,
+    params: dict,
+    *,
+    classes: Sequence[str],
+    epochs: int = 3,
+    random_state: int = 0,
+) -> CandidateResult:
+    """Train one hyperparameter setting with partial_fit over ``epochs`` streaming passes."""
+    start = time.perf_counter()
+    vectorizer = features.vectorizer()
+    model = SGDClassifier(loss="log_loss", random_state=random_state, **params)
+    rng = np.random.default_rng(random_state)
+    classes = np.array(classes)
+    for _ in range(epochs):
+        for texts, labels in iter_chunks(spec, validation=False):
+            order = rng.permutation(len(texts))
+            X = vectorizer.transform([texts[i] for i in order])
+            model.partial_fit(X, np.array(labels)[order], classes=classes)
+    metrics = evaluate(model, spec, features)
+    return CandidateResult(params, metrics, time.perf_counter() - start, _peak_rss_bytes(), model)
+
+
+def parameter_grid(grid: dict[str, list]) -> list[dict]:
+    keys = sorted(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+
+def select_model(
+    spec: CorpusSpec,
+    features: FeatureSpec,
+    grid: dict[str, list] | None = None,
+    *,
+    epochs: int = 3,
+    n_jobs: int = -1,
+) -> tuple[CandidateResult, list[CandidateResult], dict]:
+    """
+    Train every grid candidate in parallel and pick the best on validation.
+
+    Returns:
+        (best candidate, all candidates, run report with label counts, wall time and peak memory)
+    """
+    start = time.perf_counter()
+    label_counts = scan_labels(spec)
+    if len(label_counts) < 2:
+        raise ValueError(f"Need at least two labels to train, found {sorted(label_counts)}")
+    classes = sorted(label_counts)
+
+    grid_params = parameter_grid(grid or DEFAULT_GRID)
+    # ru_maxrss only ever grows: one spawned process per candidate keeps each
+    # candidate's peak memory its own (a reused or forked worker inherits a higher one)
+    with ProcessPoolExecutor(
+        max_workers=min(joblib.effective_n_jobs(n_jobs), len(grid_params)),
+        mp_context=multiprocessing.get_context("spawn"),
+        max_tasks_per_child=1,
+    ) as pool:
+        futures = [
+            pool.submit(train_candidate, spec, features, params, classes=classes, epochs=epochs)
+            for params in grid_params
+        ]
+        candidates = [f.result() for f in futures]
+    # Best macro F1; ties go to the lower log loss
+    best = max(candidates, key=lambda c: (c.metrics["macroF1"] or 0.0, -(c.metrics["logLoss"] or np.inf)))
+
+    worker_peaks = [c.peak_rss_bytes for c in candidates if c.peak_rss_bytes is not None]
+    report = {
+        "corpus": {"path": spec.path, "rows": sum(label_counts.values()), "labels": dict(label_counts)},
+        "features": {"kind": "hashing", "nFeatures": features.n_features, "ngramRange": list(features.ngram_range)},
+        "epochs": epochs,
+        "chunkSize": spec.chunk_size,
+        "validationFraction": spec.validation_fraction,
+        "wallSeconds": round(time.perf_counter() - start, 3),
+        "peakMemoryMB": {
+            "parent": _mb(_peak_rss_bytes()),
+            "workers": _mb(max(worker_peaks)) if worker_peaks else None,
+        },
+        "best": best.to_dict(),
+        "candidates": [c.to_dict() for c in candidates],
+    }
+    return best, candidates, report
+
+
+def write_artifacts(models_dir: str | Path, best: CandidateResult, features: FeatureSpec, report: dict) -> Path:
+    """
+    Write a versioned artifact directory: models/sentiment/<version>/.
+
+    Holds the pickles (sentiment.pkl, vectorizer.pkl), the compact NumPy
+    artifact (compact/) and metrics.json.
+    """
+    version = datetime.now(tz=UTC).strftime("%Y%m%dT%H%M%SZ")
+    out = Path(models_dir) / "sentiment" / version
+    out.mkdir(parents=True, exist_ok=False)
+    vectorizer = features.vectorizer()
+    joblib.dump(vectorizer, out / "vectorizer.pkl")
+    joblib.dump(best.model, out / "sentiment.pkl")
+    export_compact(vectorizer, best.model, out / "compact")
+    (out / "metrics.json").write_text(json.dumps({"version": version, **report}, indent=2))
+    return out
+
+
+def promote(version_dir: str | Path, models_dir: str | Path) -> None:
+    """Make a versioned artifact the one get_sentiment_model() serves."""
+    version_dir, models_dir = Path(version_dir), Path(models_dir)
+    compact_dir = models_dir / "sentiment_compact"
+    shutil.rmtree(compact_dir, ignore_errors=True)
+    shutil.copytree(version_dir / "compact", compact_dir)
+    for name in ("sentiment.pkl", "vectorizer.pkl"):
+        shutil.copy2(version_dir / name, models_dir / name)
+    (models_dir / "sentiment" / "CURRENT").write_text(version_dir.name)
@@ -0,0 +1,46 @@
+"""
+Single Flight - concurrent requests for one key share one upstream call.
+
+The call runs in its own task, so a caller that disconnects does not cancel
+it for the others. A key stays in flight until its ``fill`` coroutine has
+returned, i.e. until the result has been written to the cache: a request
+arriving in between joins the task instead of missing both the cache and
+the in-flight entry and starting a second call.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._tasks: dict[str, asyncio.Task[T]] = {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._tasks
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def get(self, key: str) -> asyncio.Task[T] | None:
+        return self._tasks.get(key)
+
+    def start(self, key: str, fill: Callable[[], Awaitable[T]]) -> asyncio.Task[T]:
+        """Run ``fill`` (fetch and cache) as the shared task for ``key``."""
+        task = asyncio.create_task(self._run(key, fill), name=f"{self.name}:{key[:12]}")
+        # Mark the error retrieved even if nobody awaits it (every caller left, background refresh)
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._tasks[key] = task
+        return task
+
+    async def _run(self, key: str, fill: Callable[[], Awaitable[T]]) -> T:
+        try:
+            return await fill()
+        finally:
+            if self._tasks.get(key) is asyncio.current_task():
+                self._tasks.pop(key)
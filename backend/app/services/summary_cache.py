@@ -0,0 +1,356 @@
+"""
+Summary Cache - persistent Gemini summaries with request coalescing.
+
+Summaries are keyed by a hash of (model, title, description, content) and kept
+in SQLite, so they survive restarts and are shared by every worker on the same
+database. Entries expire after a TTL; beyond ``max_entries`` the least recently
+used are evicted. Concurrent misses for the same key share one upstream call
+(single-flight), so a burst of clicks on the top headline costs one request.
+That includes streamed calls: a client asking while one streams joins it and
+gets the chunks sent so far, then the rest live.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import aclosing
+from dataclasses import dataclass, field
+
+import aiosqlite
+
+from app.services.single_flight import SingleFlight
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS summary_cache (
+  key TEXT PRIMARY KEY,
+  model TEXT NOT NULL,
+  summary TEXT NOT NULL,
+  created_at REAL NOT NULL,
+  last_access REAL NOT NULL,
+  hits INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_summary_cache_access ON summary_cache(last_access);
+"""
+
+# Where a summary came from
+SOURCES = ("cache", "coalesced", "upstream")
+
+
+def summary_key(model: str, title: str | None, description: str | None, content: str | None) -> str:
+    payload = json.dumps([model, title or "", description or "", content or ""], ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass(eq=False)
+class StreamFlight:
+    """One upstream stream, relayed to every client listening to it."""
+
+    parts: list[str] = field(default_factory=list)
+    changed: asyncio.Condition = field(default_factory=asyncio.Condition)
+    finished: bool = False
+    listeners: int = 0
+    task: asyncio.Task | None = None
+
+
+class SummaryCache:
+    def __init__(
+        self,
+        sqlite_path: str,
+        *,
+        ttl_seconds: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.sqlite_path = sqlite_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._inflight: SingleFlight[str] = SingleFlight("summary")
+        self._streams: dict[str, StreamFlight] = {}
+        self._ready = False
+        self._init_lock = asyncio.Lock()
+        # Metrics (per process)
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.upstream_calls = 0
+        self.upstream_errors = 0
+        self.evictions = 0
+        self._upstream_ms: deque[float] = deque(maxlen=200)  # recent upstream latencies
+        self.streams_completed = 0
+        self.streams_cancelled = 0
+        self._ttft_ms: deque[float] = deque(maxlen=200)  # recent streaming time-to-first-token
+
+    async def init(self) -> None:
+        async with self._init_lock:
+            if not self._ready:
+                async with aiosqlite.connect(self.sqlite_path) as db:
+                    await db.executescript(SCHEMA)
+                    await db.commit()
+                self._ready = True
+
+    async def get(self, key: str) -> str | None:
+        """Fresh cached summary (and bump its recency), or None."""
+        await self.init()
+        now = self._clock()
+        async with aiosqlite.connect(self.sqlite_path) as db:
+            cur = await db.execute(
+                "SELECT summary FROM summary_cache WHERE key = ? AND created_at > ?", (key, now - self.ttl_seconds)
+            )
+            row = await cur.fetchone()
+            if row is None:
+                return None
+            await db.execute(
+                "UPDATE summary_cache SET last_access = ?, hits = hits + 1 WHERE key = ?", (now, key)
+            )
+            await db.commit()
+        return row[0]
+
+    async def lookup(self, key: str) -> str | None:
+        """get() that counts towards the hit ratio."""
+        summary = await self.get(key)
+        if summary is not None:
+            self.hits += 1
+        return summary
+
+    def inflight(self, key: str) -> asyncio.Task | None:
+        """The upstream call currently running for a key, if any."""
+        return self._inflight.get(key)
+
+    def streaming(self, key: str) -> bool:
+        """Whether the upstream call for a key is a stream that can be joined chunk by chunk."""
+        return key in self._streams
+
+    def relay(
+        self, key: str, model: str, open_stream: Callable[[], AsyncIterator[str]]
+    ) -> tuple[AsyncIterator[str], str]:
+        """
+        Chunks of the streamed summary for a key, joining the stream already running.
+
+        The upstream stream runs as the key's single-flight task, so
+        non-streaming requests coalesce onto it as well. It is closed when its
+        last client leaves; a completed stream is stored in the cache.
+
+        Returns:
+            (chunks, source) where source is "coalesced" or "upstream"
+        """
+        flight = self._streams.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            return self._listen(flight), "coalesced"
+        flight = self._streams[key] = StreamFlight()
+        flight.task = self._inflight.start(key, lambda: self._fill_stream(key, model, flight, open_stream))
+        return self._listen(flight), "upstream"
+
+    async def _listen(self, flight: StreamFlight) -> AsyncIterator[str]:
+        flight.listeners += 1
+        sent = 0
+        try:
+            while True:
+                async with flight.changed:
+                    await flight.changed.wait_for(lambda: len(flight.parts) > sent or flight.finished)
+                if len(flight.parts) == sent:
+                    break
+                for text in flight.parts[sent:]:
+                    sent += 1
+                    yield text
+            # Surfaces the upstream error, and waits for the cache write
+            await asyncio.shield(flight.task)
+        finally:
+            flight.listeners -= 1
+            if flight.listeners == 0 and not flight.task.done():
+                # The last client left: close the upstream stream, cache nothing
+                flight.task.cancel()
+                await asyncio.wait({flight.task})
+
+    async def _fill_stream(
+        self, key: str, model: str, flight: StreamFlight, open_stream: Callable[[], AsyncIterator[str]]
+    ) -> str:
+        start = time.perf_counter()
+        ttft_ms = None
+        outcome = "cancelled"
+        try:
+            # aclosing: a cancelled flight closes the upstream stream now, not at garbage collection
+            async with aclosing(open_stream()) as chunks:
+                async for text in chunks:
+                    if ttft_ms is None:
+                        ttft_ms = (time.perf_counter() - start) * 1000
+                    async with flight.changed:
+                        flight.parts.append(text)
+                        flight.changed.notify_all()
+            outcome = "completed"
+        except Exception:
+            outcome = "failed"
+            raise
+        finally:
+            # Runs on completion, upstream error and cancellation alike
+            self.record_stream(ttft_ms=ttft_ms, total_ms=(time.perf_counter() - start) * 1000, outcome=outcome)
+            self._streams.pop(key, None)
+            flight.finished = True
+            async with flight.changed:
+                flight.changed.notify_all()
+        summary = "".join(flight.parts).strip()
+        if summary:
+            await self.put(key, model, summary)
+        return summary
+
+    def record_stream(self, *, ttft_ms: float | None, total_ms: float, outcome: str) -> None:
+        """Account for a streamed upstream call: outcome is "completed", "cancelled" or "failed"."""
+        self.misses += 1
+        self.upstream_calls += 1
+        self._upstream_ms.append(total_ms)
+        if ttft_ms is not None:
+            self._ttft_ms.append(ttft_ms)
+        if outcome == "completed":
+            self.streams_completed += 1
+        elif outcome == "cancelled":
+            self.streams_cancelled += 1
+        else:
+            self.upstream_errors += 1
+
+    async def peek_many(self, keys: list[str]) -> dict[str, str]:
+        """Fresh cached summaries for many keys (recency untouched), e.g. to decorate payloads."""
+        if not keys:
+            return {}
+        await self.init()
+        cutoff = self._clock() - self.ttl_seconds
+        found: dict[str, str] = {}
+        async with aiosqlite.connect(self.sqlite_path) as db:
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i : i + 500]
+                cur = await db.execute(
+                    f"SELECT key, summary FROM summary_cache WHERE created_at > ? AND key IN ({','.join('?' * len(chunk))})",
+                    (cutoff, *chunk),
+                )
+                found.update(dict(await cur.fetchall()))
+        return found
+
+    async def put(self, key: str, model: str, summary: str) -> None:
+        await self.init()
+        now = self._clock()
+        async with aiosqlite.connect(self.sqlite_path) as db:
+            await db.execute(
+                """
+                INSERT OR REPLACE INTO summary_cache(key, model, summary, created_at, last_access, hits)
+                VALUES(?, ?, ?, ?, ?, 0)
+                """,
+                (key, model, summary, now, now),
+            )
+            await self._evict(db, now)
+            await db.commit()
+
+    async def _evict(self, db: aiosqlite.Connection, now: float) -> None:
+        cur = await db.execute("DELETE FROM summary_cache WHERE created_at <= ?", (now - self.ttl_seconds,))
+        expired = cur.rowcount
+        cur = await db.execute(
+            """
+            DELETE FROM summary_cache WHERE key IN (
+              SELECT key FROM summary_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        )
+        self.evictions += expired + cur.rowcount
+
+    async def get_or_compute(
+        self,
+        key: str,
+        model: str,
+        compute: Callable[[], Awaitable[str]],
+    ) -> tuple[str, str]:
+        """
+        Cached summary, or compute it once for all concurrent callers.
+
+        The upstream call runs in its own task, so a caller that disconnects
+        does not cancel it for the others (and its result is still cached).
+
+        Returns:
+            (summary, source) where source is one of SOURCES
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            summary = await self.lookup(key)
+            if summary is not None:
+                return summary, "cache"
+            # Another request may have started the call while we read SQLite
+            task = self._inflight.get(key)
+
+        if task is not None:
+            self.coalesced += 1
+            flight = self._streams.get(key)
+            if flight is not None:
+                # Listen like a streaming client, so the stream is not closed under us
+                async with aclosing(self._listen(flight)) as chunks:
+                    async for _ in chunks:
+                        pass
+            return await asyncio.shield(task), "coalesced"
+
+        self.misses += 1
+        task = self._inflight.start(key, lambda: self._fill(key, model, compute))
+        return await asyncio.shield(task), "upstream"
+
+    async def _fill(self, key: str, model: str, compute: Callable[[], Awaitable[str]]) -> str:
+        self.upstream_calls += 1
+        start = time.perf_counter()
+        try:
+            summary = await compute()
+        except Exception:
+            self.upstream_errors += 1
+            raise
+        finally:
+            self._upstream_ms.append((time.perf_counter() - start) * 1000)
+        await self.put(key, model, summary)
+        return summary
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hitRatio": round((self.hits + self.coalesced) / lookups, 4) if lookups else None,
+            "upstreamCalls": self.upstream_calls,
+            "upstreamErrors": self.upstream_errors,
+            "upstreamLatencyMs": _percentiles(self._upstream_ms),
+            "streams": {
+                "completed": self.streams_completed,
+                "cancelled": self.streams_cancelled,
+                "ttftMs": _percentiles(self._ttft_ms),
+            },
+            "evictions": self.evictions,
+            "inflight": len(self._inflight),
+        }
+
+
+def _percentiles(samples: deque[float]) -> dict | None:
+    if not samples:
+        return None
+    values = sorted(samples)
+    return {
+        "p50": round(values[len(values) // 2], 1),
+        "p95": round(values[int(len(values) * 0.95)], 1),
+        "max": round(values[-1], 1),
+    }
+
+
+_summary_cache: SummaryCache | None = None
+
+
+def get_summary_cache() -> SummaryCache:
+    """Get or create the process-wide summary cache."""
+    global _summary_cache
+    if _summary_cache is None:
+        from app.core.config import settings
+
+        _summary_cache = SummaryCache(
+            settings.sqlite_path,
+            ttl_seconds=settings.summary_cache_ttl_hours * 3600,
+            max_entries=settings.summary_cache_max_entries,
+        )
+    return _summary_cache
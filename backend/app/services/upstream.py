@@ -0,0 +1,304 @@
+"""
+Upstream HTTP - pooled clients, adaptive concurrency and hedged GETs.
+
+One UpstreamClient per external API (NewsAPI, Gemini) is shared by the whole
+process, so keep-alive connections, TLS sessions and (with the optional
+``h2`` package) HTTP/2 are reused across requests and poll cycles.
+
+Every call passes through an AIMD limiter. The concurrency limit grows by
+about one per limit's worth of fast, successful responses. It is halved on a
+429/503, on a timeout, or when latency exceeds the target. A throttled
+upstream therefore sheds load instead of being hammered.
+
+Idempotent GETs can be hedged. If the first attempt has not answered within
+the observed p95 latency, a second identical request is sent (only when the
+limiter has room), and whichever response arrives first wins.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+
+import httpx
+
+from app.core.config import settings
+
+try:
+    import h2  # noqa: F401  (httpx needs it for HTTP/2)
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+THROTTLE_STATUSES = (429, 503)
+
+
+def _percentile(samples: deque[float], q: float) -> float | None:
+    if not samples:
+        return None
+    values = sorted(samples)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+class AIMDLimiter:
+    """Concurrency limit adapted by additive increase / multiplicative decrease."""
+
+    def __init__(
+        self,
+        *,
+        initial: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        latency_target_ms: float = 2000.0,
+        backoff: float = 0.5,
+        cooldown_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target_ms = latency_target_ms
+        self.backoff = backoff
+        # One decrease per cooldown: a burst of slow responses is one congestion signal
+        self.cooldown_seconds = cooldown_seconds
+        self._clock = clock
+        self._last_decrease = float("-inf")
+        self._cond = asyncio.Condition()
+        self.in_flight = 0
+        self.decreases = 0
+        self.waits = 0
+
+    @property
+    def capacity(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            if self.in_flight >= self.capacity:
+                self.waits += 1
+                await self._cond.wait_for(lambda: self.in_flight < self.capacity)
+            self.in_flight += 1
+
+    def try_acquire(self) -> bool:
+        """Take a slot only if one is free right now."""
+        if self.in_flight >= self.capacity:
+            return False
+        self.in_flight += 1
+        return True
+
+    async def release(self, *, latency_ms: float | None = None, throttled: bool = False) -> None:
+        async with self._cond:
+            self.in_flight -= 1
+            self.record(latency_ms=latency_ms, throttled=throttled)
+            self._cond.notify_all()
+
+    def record(self, *, latency_ms: float | None, throttled: bool) -> None:
+        """Adapt the limit to one outcome (latency None = no signal, e.g. a cancelled hedge)."""
+        if throttled or (latency_ms is not None and latency_ms > self.latency_target_ms):
+            now = self._clock()
+            if now - self._last_decrease >= self.cooldown_seconds:
+                self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                self._last_decrease = now
+                self.decreases += 1
+        elif latency_ms is not None:
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+
+    def stats(self) -> dict:
+        return {
+            "limit": round(self.limit, 2),
+            "inFlight": self.in_flight,
+            "decreases": self.decreases,
+            "waits": self.waits,
+        }
+
+
+class UpstreamClient:
+    """A pooled httpx client for one upstream, behind an AIMD limiter."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        base_url: str = "",
+        timeout: float = 20.0,
+        max_connections: int = 20,
+        limiter: AIMDLimiter | None = None,
+        hedge_min_samples: int = 20,
+        hedge_min_delay_ms: float = 50.0,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.name = name
+        self.http2 = HTTP2_AVAILABLE and transport is None
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            http2=self.http2,
+            transport=transport,
+        )
+        self.limiter = limiter or AIMDLimiter()
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_min_delay_ms = hedge_min_delay_ms
+        self._latency_ms: deque[float] = deque(maxlen=500)
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        await self.limiter.acquire()
+        return await self._send_acquired(method, url, **kwargs)
+
+    async def _send_acquired(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send with a limiter slot already held; the slot is released here."""
+        self.requests += 1
+        start = time.perf_counter()
+        latency_ms = None
+        throttled = False
+        try:
+            resp = await self._client.request(method, url, **kwargs)
+        except httpx.TimeoutException:
+            self.errors += 1
+            throttled = True  # a timeout is the strongest overload signal
+            raise
+        except httpx.HTTPError:
+            self.errors += 1
+            raise
+        else:
+            latency_ms = (time.perf_counter() - start) * 1000
+            throttled = resp.status_code in THROTTLE_STATUSES
+            if throttled:
+                self.throttled += 1
+            else:
+                self._latency_ms.append(latency_ms)
+            return resp
+        finally:
+            await self.limiter.release(latency_ms=latency_ms, throttled=throttled)
+
+    def hedge_delay_ms(self) -> float | None:
+        """p95 of recent latencies, once there are enough samples to trust it."""
+        if len(self._latency_ms) < self.hedge_min_samples:
+            return None
+        return max(self.hedge_min_delay_ms, _percentile(self._latency_ms, 0.95))
+
+    async def get(self, url: str, *, hedge: bool = False, **kwargs) -> httpx.Response:
+        """GET, optionally hedged with a second attempt after the p95 delay."""
+        delay_ms = self.hedge_delay_ms() if hedge else None
+        if delay_ms is None:
+            return await self.request("GET", url, **kwargs)
+
+        primary = asyncio.create_task(self.request("GET", url, **kwargs))
+        done, _ = await asyncio.wait({primary}, timeout=delay_ms / 1000)
+        # No spare capacity: a hedge would only add load where it hurts
+        if done or not self.limiter.try_acquire():
+            return await primary
+
+        self.hedges += 1
+        backup = asyncio.create_task(self._send_acquired("GET", url, **kwargs))
+        pending = {primary, backup}
+        error: BaseException | None = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        """Streaming request; latency is measured to the response headers."""
+        await self.limiter.acquire()
+        self.requests += 1
+        start = time.perf_counter()
+        latency_ms = None
+        throttled = False
+        try:
+            async with self._client.stream(method, url, **kwargs) as resp:
+                latency_ms = (time.perf_counter() - start) * 1000
+                throttled = resp.status_code in THROTTLE_STATUSES
+                if throttled:
+                    self.throttled += 1
+                else:
+                    self._latency_ms.append(latency_ms)
+                yield resp
+        except httpx.TimeoutException:
+            self.errors += 1
+            throttled = True
+            raise
+        finally:
+            await self.limiter.release(latency_ms=latency_ms, throttled=throttled)
+
+    def stats(self) -> dict:
+        p50, p95 = _percentile(self._latency_ms, 0.5), _percentile(self._latency_ms, 0.95)
+        return {
+            "http2": self.http2,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "errors": self.errors,
+            "latencyMs": {"p50": round(p50, 1), "p95": round(p95, 1)} if p50 is not None else None,
+            "hedges": self.hedges,
+            "hedgeWins": self.hedge_wins,
+            "limiter": self.limiter.stats(),
+        }
+
+
+_upstreams: dict[str, UpstreamClient] = {}
+
+
+def _build(name: str) -> UpstreamClient:
+    if name == "newsapi":
+        return UpstreamClient(
+            name,
+            base_url=settings.newsapi_base_url,
+            timeout=20.0,
+            max_connections=settings.upstream_max_connections,
+            limiter=AIMDLimiter(
+                initial=settings.newsapi_concurrency,
+                max_limit=settings.newsapi_concurrency_max,
+                latency_target_ms=settings.newsapi_latency_target_ms,
+            ),
+        )
+    if name == "gemini":
+        return UpstreamClient(
+            name,
+            timeout=settings.gemini_timeout_seconds,
+            max_connections=settings.upstream_max_connections,
+            limiter=AIMDLimiter(
+                initial=settings.gemini_concurrency,
+                max_limit=settings.gemini_concurrency_max,
+                latency_target_ms=settings.gemini_latency_target_ms,
+            ),
+        )
+    raise KeyError(f"Unknown upstream: {name}")
+
+
+def get_upstream(name: str) -> UpstreamClient:
+    """Get or create the process-wide client for an upstream ("newsapi" or "gemini")."""
+    if name not in _upstreams:
+        _upstreams[name] = _build(name)
+    return _upstreams[name]
+
+
+async def close_upstreams() -> None:
+    for client in list(_upstreams.values()):
+        await client.close()
+    _upstreams.clear()
+
+
+def upstream_stats() -> dict:
+    return {name: client.stats() for name, client in _upstreams.items()}
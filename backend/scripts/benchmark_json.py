@@ -0,0 +1,100 @@
+"""
+Decode benchmark for NewsAPI pages: resp.json() + model_validate vs decoding from bytes.
+
+Paths compared per page:
+  dicts     json.loads + NewsAPIResponse.model_validate (the old _parse)
+  pydantic  NewsAPIResponse.model_validate_json on the raw bytes (one pass)
+  orjson    orjson.loads + model_validate (only if orjson is installed)
+  streamed  NewsAPIPageDecoder fed 16 KiB chunks (the large-page path)
+
+Pass recorded response bodies (e.g. saved with curl) to measure real payloads;
+without any, synthetic 100-article pages are generated.
+
+Usage:
+    python scripts/benchmark_json.py --repeat 200
+    python scripts/benchmark_json.py --payload recorded/everything_*.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.schemas.newsapi import NewsAPIResponse  # noqa: E402
+from app.services.fast_json import HAS_ORJSON, NewsAPIPageDecoder, validate_json  # noqa: E402
+from benchmark_nlp import make_headlines  # noqa: E402
+
+CHUNK = 16 * 1024
+
+
+def synthetic_page(n: int, seed: int) -> bytes:
+    headlines = make_headlines(n, seed=seed)
+    articles = [
+        {
+            "source": {"id": None, "name": f"Source {i % 17}"},
+            "author": "Staff Writer",
+            "title": title,
+            "description": f"{title}. Officials said the decision follows weeks of talks. " * 2,
+            "url": f"https://news.example.com/{seed}/{i}",
+            "urlToImage": f"https://img.example.com/{seed}/{i}.jpg",
+            "publishedAt": "2024-05-01T12:00:00Z",
+            "content": f"{title} — \"quoted\" remarks and more detail follow here. " * 4 + "… [+2811 chars]",
+        }
+        for i, title in enumerate(headlines)
+    ]
+    return json.dumps({"status": "ok", "totalResults": 10_000, "articles": articles}, ensure_ascii=False).encode()
+
+
+def streamed(body: bytes) -> NewsAPIResponse:
+    decoder = NewsAPIPageDecoder()
+    for i in range(0, len(body), CHUNK):
+        decoder.feed(body[i : i + CHUNK])
+    return decoder.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--payload", nargs="*", default=[], help="recorded NewsAPI response bodies")
+    parser.add_argument("--pages", type=int, default=5, help="synthetic pages when no payloads are given")
+    parser.add_argument("--articles", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    bodies = [Path(p).read_bytes() for p in args.payload] or [
+        synthetic_page(args.articles, seed) for seed in range(args.pages)
+    ]
+    paths = {
+        "dicts": lambda b: NewsAPIResponse.model_validate(json.loads(b)),
+        "pydantic": lambda b: validate_json(NewsAPIResponse, b, decoder="pydantic"),
+        "streamed": streamed,
+    }
+    if HAS_ORJSON:
+        paths["orjson"] = lambda b: validate_json(NewsAPIResponse, b, decoder="orjson")
+
+    expected = [paths["dicts"](b) for b in bodies]
+    for name, fn in paths.items():
+        assert [fn(b) for b in bodies] == expected, f"{name} decodes differently"
+
+    size_kb = statistics.mean(len(b) for b in bodies) / 1024
+    print(f"{len(bodies)} pages, {size_kb:.0f} KiB avg, repeat={args.repeat}\n")
+    print(f"{'path':<10} {'ms/page':>9} {'MB/s':>8} {'speedup':>8}")
+    baseline = None
+    for name, fn in paths.items():
+        timings = []
+        for _ in range(args.repeat):
+            for body in bodies:
+                start = time.perf_counter()
+                fn(body)
+                timings.append(time.perf_counter() - start)
+        ms = statistics.median(timings) * 1000
+        baseline = baseline or ms
+        print(f"{name:<10} {ms:>9.3f} {size_kb / 1024 / (ms / 1000):>8.0f} {baseline / ms:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
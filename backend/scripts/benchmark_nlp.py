@@ -0,0 +1,124 @@
+"""
+Throughput benchmark: per-text spaCy calls vs batched nlp.pipe.
+
+Covers the two NLP request paths:
+  /trends   -> keyword (noun chunk) extraction over titles
+  /entities -> NER over title + description
+
+Model load time and memory are measured in a fresh subprocess: peak RSS
+never goes down, so an in-process delta hides whatever an earlier step
+already allocated.
+
+Usage:
+    python scripts/benchmark_nlp.py --sizes 1000 10000 --batch-size 256 --n-process 1
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.analytics.keywords import count_keywords, extract_keywords, load_spacy_model  # noqa: E402
+from app.services.entity_extractor import EntityExtractor  # noqa: E402
+from app.services.nlp_registry import get_nlp_registry  # noqa: E402
+
+# Runs in the fresh subprocess: spaCy is imported first, so only the load itself is measured
+LOAD_PROBE = """
+import json, sys, time
+sys.path.insert(0, sys.argv[2])
+import spacy
+from app.services.nlp_registry import _peak_rss_bytes, _rss_bytes
+rss, peak = _rss_bytes(), _peak_rss_bytes()
+start = time.perf_counter()
+nlp = spacy.load(sys.argv[1])
+seconds = time.perf_counter() - start
+print(json.dumps({
+    "pipes": nlp.pipe_names,
+    "loadSeconds": seconds,
+    "rssDelta": _rss_bytes() - rss,
+    "peakDelta": _peak_rss_bytes() - peak if peak is not None else None,
+}))
+"""
+
+
+SUBJECTS = [
+    "President Biden", "Apple", "The Federal Reserve", "Elon Musk", "NASA", "Microsoft",
+    "The European Union", "Taylor Swift", "Google", "The Supreme Court", "China", "OpenAI",
+]
+VERBS = ["announces", "warns of", "unveils", "faces", "rejects", "plans", "delays", "celebrates"]
+OBJECTS = [
+    "new climate policy", "record quarterly profits", "interest rate cuts", "antitrust lawsuit",
+    "lunar mission", "AI safety rules", "trade tariffs", "world tour dates", "data privacy probe",
+]
+PLACES = ["in Washington", "in Paris", "after Tokyo summit", "amid London protests", "in California", ""]
+
+
+def make_headlines(n: int, seed: int = 42) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)} {rng.choice(PLACES)}".strip()
+        for _ in range(n)
+    ]
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def measure_load(model_name: str) -> dict:
+    """Load time and memory of a spaCy model, measured in a fresh interpreter."""
+    backend_dir = str(Path(__file__).resolve().parents[1])
+    out = subprocess.run(
+        [sys.executable, "-c", LOAD_PROBE, model_name, backend_dir],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _mb(n: int | None) -> str:
+    return f"{n / 2**20:.1f}MB" if n is not None else "n/a"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--n-process", type=int, default=1)
+    args = parser.parse_args()
+
+    model_name = get_nlp_registry().model_name
+    load = measure_load(model_name)
+    print(
+        f"model: {model_name} pipes={load['pipes']} load={load['loadSeconds']:.2f}s "
+        f"rss+={_mb(load['rssDelta'])} peak+={_mb(load['peakDelta'])} (fresh process)\n"
+    )
+
+    nlp = load_spacy_model()
+    extractor = EntityExtractor()  # shares the pipeline loaded above
+
+    print(f"{'path':<10} {'n':>7} {'per-text (s)':>13} {'pipe (s)':>10} {'docs/s':>10} {'speedup':>8}")
+    for n in args.sizes:
+        headlines = make_headlines(n)
+
+        per_text = _timed(lambda: [extract_keywords(nlp, t) for t in headlines])
+        piped = _timed(lambda: count_keywords(nlp, headlines, batch_size=args.batch_size, n_process=args.n_process))
+        print(f"{'/trends':<10} {n:>7} {per_text:>13.2f} {piped:>10.2f} {n / piped:>10.0f} {per_text / piped:>7.1f}x")
+
+        # Baseline: full pipeline, one call per text (the old extract_entities)
+        per_text = _timed(lambda: [extractor.nlp.nlp(t).ents for t in headlines])
+        piped = _timed(
+            lambda: extractor.extract_entities_many(headlines, batch_size=args.batch_size, n_process=args.n_process)
+        )
+        print(f"{'/entities':<10} {n:>7} {per_text:>13.2f} {piped:>10.2f} {n / piped:>10.0f} {per_text / piped:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
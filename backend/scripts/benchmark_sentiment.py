@@ -0,0 +1,69 @@
+"""
+Sentiment inference benchmark: per-article calls vs one batched pass.
+
+The per-article baseline reproduces the old /search loop (transform, predict
+and predict_proba per text); the batched paths are SentimentModel.predict_many
+on the pickled model and, when exported, on the compact NumPy artifact.
+
+Usage:
+    python scripts/train_sentiment.py   # if models/ is empty
+    python scripts/benchmark_sentiment.py --sizes 20 100 --repeat 50
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.sentiment import COMPACT_DIR, MODELS_DIR, SentimentModel  # noqa: E402
+from app.services.sentiment_compact import CompactSentimentModel  # noqa: E402
+from benchmark_nlp import make_headlines  # noqa: E402
+
+
+def per_article(model, texts: list[str]) -> None:
+    vectorizer, clf = model._vectorizer, model._model
+    for text in texts:
+        X = vectorizer.transform([text])
+        clf.predict(X)
+        clf.predict_proba(X)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 100])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    model = SentimentModel(
+        model_path=str(MODELS_DIR / "sentiment.pkl"), vectorizer_path=str(MODELS_DIR / "vectorizer.pkl")
+    )
+    try:
+        model.load()
+    except FileNotFoundError:
+        sys.exit("Sentiment artifacts missing; run scripts/train_sentiment.py first")
+    compact = None
+    if (COMPACT_DIR / "meta.json").exists():
+        compact = CompactSentimentModel(COMPACT_DIR)
+        compact.load()
+
+    print(f"{'page':>6} {'per-article (ms)':>17} {'batched (ms)':>13} {'compact (ms)':>13} {'speedup':>8}")
+    for n in args.sizes:
+        texts = make_headlines(n)
+        loop_ms, batch_ms, compact_ms = [], [], []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            per_article(model, texts)
+            loop_ms.append((time.perf_counter() - start) * 1000)
+            batch_ms.append(model.predict_many(texts).latency_ms)
+            if compact is not None:
+                compact_ms.append(compact.predict_many(texts).latency_ms)
+        loop, batch = statistics.median(loop_ms), statistics.median(batch_ms)
+        compact_col = f"{statistics.median(compact_ms):>13.2f}" if compact_ms else f"{'-':>13}"
+        print(f"{n:>6} {loop:>17.2f} {batch:>13.2f} {compact_col} {loop / batch:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
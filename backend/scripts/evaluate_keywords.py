@@ -0,0 +1,105 @@
+"""
+Keyword engine evaluation: rule-based chunker vs spaCy noun chunks.
+
+Reports, on a headline corpus:
+  - phrase overlap with the spaCy output (micro precision / recall / F1 over
+    per-headline phrase multisets, and word-level F1 for partial matches)
+  - throughput of both engines and the speedup
+
+Corpus: --corpus FILE (one headline per line), --sqlite DB (stored titles)
+or, by default, synthetic headlines from benchmark_nlp.py.
+
+Usage:
+    python scripts/evaluate_keywords.py --sqlite news.db --show 10
+"""
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.analytics.keywords import extract_keywords_many, load_spacy_model  # noqa: E402
+from benchmark_nlp import make_headlines  # noqa: E402
+
+
+def load_corpus(args: argparse.Namespace) -> list[str]:
+    if args.corpus:
+        return [line.strip() for line in Path(args.corpus).read_text().splitlines() if line.strip()]
+    if args.sqlite:
+        with sqlite3.connect(args.sqlite) as db:
+            return [row[0] for row in db.execute("SELECT title FROM articles WHERE title IS NOT NULL")]
+    return make_headlines(args.size)
+
+
+def _f1(matched: int, predicted: int, reference: int) -> tuple[float, float, float]:
+    precision = matched / predicted if predicted else 0.0
+    recall = matched / reference if reference else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1
+
+
+def overlap(reference: list[list[str]], predicted: list[list[str]]) -> dict[str, tuple[float, float, float]]:
+    phrase = [0, 0, 0]
+    word = [0, 0, 0]
+    for ref, pred in zip(reference, predicted):
+        phrase[0] += sum((Counter(ref) & Counter(pred)).values())
+        phrase[1] += len(pred)
+        phrase[2] += len(ref)
+        ref_words = Counter(w for p in ref for w in p.split())
+        pred_words = Counter(w for p in pred for w in p.split())
+        word[0] += sum((ref_words & pred_words).values())
+        word[1] += sum(pred_words.values())
+        word[2] += sum(ref_words.values())
+    return {"phrase": _f1(*phrase), "word": _f1(*word)}
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Text file with one headline per line")
+    parser.add_argument("--sqlite", help="SQLite database to read article titles from")
+    parser.add_argument("--size", type=int, default=10000, help="Synthetic corpus size")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--show", type=int, default=0, help="Print N example headlines where the engines differ")
+    args = parser.parse_args()
+
+    headlines = load_corpus(args)
+    nlp = load_spacy_model()
+
+    spacy_kw, spacy_s = _timed(
+        lambda: extract_keywords_many(nlp, headlines, batch_size=args.batch_size, engine="spacy")
+    )
+    rules_kw, rules_s = _timed(lambda: extract_keywords_many(None, headlines, engine="rules"))
+
+    n = len(headlines)
+    print(f"headlines: {n}")
+    print(f"{'engine':<8} {'seconds':>9} {'docs/s':>10}")
+    print(f"{'spacy':<8} {spacy_s:>9.3f} {n / spacy_s:>10.0f}")
+    print(f"{'rules':<8} {rules_s:>9.3f} {n / rules_s:>10.0f}")
+    print(f"speedup: {spacy_s / rules_s:.1f}x")
+
+    print(f"\n{'overlap':<8} {'precision':>10} {'recall':>8} {'f1':>6}")
+    for level, (p, r, f) in overlap(spacy_kw, rules_kw).items():
+        print(f"{level:<8} {p:>10.3f} {r:>8.3f} {f:>6.3f}")
+
+    shown = 0
+    for text, ref, pred in zip(headlines, spacy_kw, rules_kw):
+        if shown >= args.show:
+            break
+        if Counter(ref) != Counter(pred):
+            print(f"\n{text}\n  spacy: {ref}\n  rules: {pred}")
+            shown += 1
+
+
+if __name__ == "__main__":
+    main()
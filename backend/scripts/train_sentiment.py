@@ -1,11 +1,32 @@
+"""
+Train the sentiment model.
+
+Without --corpus, fits TF-IDF + LogisticRegression on the small seed set below.
+With --corpus (CSV/TSV with a header, or JSONL), streams the labelled corpus in
+chunks through a HashingVectorizer + SGDClassifier.partial_fit, selects
+hyperparameters in parallel with joblib, and writes a versioned artifact
+(models/sentiment/<version>/ with metrics.json). --promote makes it the
+served model.
+
+Usage:
+    python scripts/train_sentiment.py
+    python scripts/train_sentiment.py --corpus headlines.csv --text-field title --n-jobs -1 --promote
+"""
 from __future__ import annotations
 
+import argparse
+import json
+import sys
 from pathlib import Path
 
 import joblib
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.sentiment_compact import export_compact  # noqa: E402
+
 
 # Minimal, non-copyrighted seed set.
 # Replace with your offline training set later; v1 goal is a working .pkl artifact.
@@ -28,7 +49,10 @@ TRAIN = [
 ]
 
 
-def main() -> None:
+MODELS_DIR = Path(__file__).resolve().parents[1] / "models"
+
+
+def train_seed() -> None:
     texts = [t for t, _ in TRAIN]
     labels = [y for _, y in TRAIN]
 
@@ -38,7 +62,7 @@ def main() -> None:
     clf = LogisticRegression(max_iter=1000, n_jobs=None)
     clf.fit(X, labels)
 
-    out_dir = Path(__file__).resolve().parents[1] / "models"
+    out_dir = MODELS_DIR
     out_dir.mkdir(parents=True, exist_ok=True)
 
     joblib.dump(vectorizer, out_dir / "vectorizer.pkl")
@@ -47,6 +71,64 @@ def main() -> None:
     print(f"Wrote: {out_dir / 'vectorizer.pkl'}")
     print(f"Wrote: {out_dir / 'sentiment.pkl'}")
 
+    # NumPy-only artifact for serving (preferred by get_sentiment_model)
+    compact_dir = export_compact(vectorizer, clf, out_dir / "sentiment_compact")
+    print(f"Wrote: {compact_dir}")
+
+
+def train_streaming(args: argparse.Namespace) -> None:
+    from app.services.sentiment_training import CorpusSpec, FeatureSpec, promote, select_model, write_artifacts
+
+    spec = CorpusSpec(
+        path=args.corpus,
+        text_field=args.text_field,
+        label_field=args.label_field,
+        chunk_size=args.chunk_size,
+        validation_fraction=args.validation,
+    )
+    features = FeatureSpec(n_features=2**args.hash_bits, ngram_range=(1, args.ngram_max))
+    grid = {"alpha": args.alpha, "penalty": args.penalty}
+
+    best, candidates, report = select_model(spec, features, grid, epochs=args.epochs, n_jobs=args.n_jobs)
+
+    print(f"{'alpha':>9} {'penalty':>11} {'macroF1':>8} {'accuracy':>9} {'logLoss':>8} {'seconds':>8} {'peakMB':>7}")
+    for c in candidates:
+        m = c.to_dict()
+        print(
+            f"{c.params['alpha']:>9.0e} {c.params['penalty']:>11} {c.metrics['macroF1']!s:>8} "
+            f"{c.metrics['accuracy']!s:>9} {c.metrics['logLoss']!s:>8} {m['seconds']:>8.1f} {m['peakMemoryMB']!s:>7}"
+        )
+    print(f"best: {best.params}")
+    print(f"wall time: {report['wallSeconds']:.1f}s, peak memory: {json.dumps(report['peakMemoryMB'])}")
+
+    version_dir = write_artifacts(MODELS_DIR, best, features, report)
+    print(f"Wrote: {version_dir}")
+    if args.promote:
+        promote(version_dir, MODELS_DIR)
+        print(f"Promoted {version_dir.name} to {MODELS_DIR / 'sentiment_compact'}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Labelled corpus (CSV/TSV with header, or JSONL); omit for the seed set")
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--label-field", default="label")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="Rows per partial_fit call")
+    parser.add_argument("--validation", type=float, default=0.1, help="Hash-split validation fraction")
+    parser.add_argument("--hash-bits", type=int, default=20, help="Hashed feature space is 2**bits")
+    parser.add_argument("--ngram-max", type=int, default=2)
+    parser.add_argument("--epochs", type=int, default=3, help="Streaming passes over the training split")
+    parser.add_argument("--alpha", type=float, nargs="+", default=[1e-6, 1e-5, 1e-4])
+    parser.add_argument("--penalty", nargs="+", default=["l2", "elasticnet"])
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Parallel candidates (joblib)")
+    parser.add_argument("--promote", action="store_true", help="Serve the new version")
+    args = parser.parse_args()
+
+    if args.corpus:
+        train_streaming(args)
+    else:
+        train_seed()
+
 
 if __name__ == "__main__":
     main()
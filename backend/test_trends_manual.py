@@ -9,13 +9,13 @@ from app.services.db import upsert_article, fetch_articles_between_published
 from app.services.analytics.keywords import count_keywords
 from app.services.analytics.trends import rank_trends, TrendItem
 from app.core.config import settings
-import spacy
+from app.services.nlp_registry import get_nlp_registry
 
 async def test_trends_with_sample_data():
     """Test trend computation with sample articles."""
     
-    # Load spaCy model
-    nlp = spacy.load("en_core_web_sm")
+    # Shared spaCy pipeline
+    nlp = get_nlp_registry().get()
     
     # Create sample articles spanning 24 hours
     now = datetime.now(timezone.utc)
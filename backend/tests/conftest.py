@@ -0,0 +1,5 @@
+import os
+
+# Settings requires API keys at import; tests never reach the real APIs
+os.environ.setdefault("NEWS_API_KEY", "test")
+os.environ.setdefault("GEMINI_API_KEY", "test")
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import aiosqlite
+import pytest
+
+from app.services.annotations import (
+    find_pending_articles,
+    init_annotation_tables,
+    keyword_counts_between,
+    top_entities,
+)
+from app.services.db import init_db, upsert_articles
+
+
+async def _setup(tmp_path) -> str:
+    db_path = str(tmp_path / "news.db")
+    await init_db(db_path)
+    await init_annotation_tables(db_path)
+    await upsert_articles(
+        db_path,
+        [
+            {"url": "u1", "title": "Quantum computing leap", "source_name": "A", "published_at": "2025-01-01T10:00:00Z"},
+            {"url": "u2", "title": "Quantum startup funding", "source_name": "B", "published_at": "2025-01-01T20:00:00Z"},
+        ],
+        fetched_at="2025-01-01T21:00:00Z",
+    )
+    return db_path
+
+
+@pytest.mark.asyncio
+async def test_pending_until_annotated_and_again_after_change(tmp_path):
+    db_path = await _setup(tmp_path)
+    pending = await find_pending_articles(db_path)
+    assert {a["title"] for a in pending} == {"Quantum computing leap", "Quantum startup funding"}
+
+    async with aiosqlite.connect(db_path) as db:
+        await db.executemany(
+            "INSERT INTO article_annotations(article_id, text_hash, annotated_at) VALUES(?, ?, 'now')",
+            [(a["id"], a["text_hash"]) for a in pending],
+        )
+        await db.commit()
+    assert await find_pending_articles(db_path) == []
+
+    # Changing the title makes the article pending again
+    await upsert_articles(
+        db_path,
+        [{"url": "u1", "title": "Quantum computing record", "published_at": "2025-01-01T10:00:00Z"}],
+        fetched_at="2025-01-01T22:00:00Z",
+    )
+    assert [a["title"] for a in await find_pending_articles(db_path)] == ["Quantum computing record"]
+
+    # Switching the keyword engine or the spaCy model re-annotates everything
+    assert len(await find_pending_articles(db_path, keyword_engine="rules")) == 2
+    assert len(await find_pending_articles(db_path, model="en_core_web_md-3.7.1")) == 2
+
+    # A corrected timestamp moves the article to another rollup bucket
+    await upsert_articles(
+        db_path,
+        [{"url": "u2", "title": "Quantum startup funding", "published_at": "2025-01-01T18:00:00Z"}],
+        fetched_at="2025-01-01T22:00:00Z",
+    )
+    assert {a["title"] for a in await find_pending_articles(db_path)} == {
+        "Quantum computing record", "Quantum startup funding"
+    }
+
+
+@pytest.mark.asyncio
+async def test_aggregations_are_pure_sql(tmp_path):
+    db_path = await _setup(tmp_path)
+    async with aiosqlite.connect(db_path) as db:
+        await db.executemany(
+            "INSERT INTO article_keywords(article_id, phrase, count) VALUES(?, ?, ?)",
+            [(1, "quantum computing", 1), (1, "leap", 1), (2, "quantum startup", 1), (2, "funding", 1)],
+        )
+        await db.executemany(
+            "INSERT INTO article_entities(article_id, label, text, count) VALUES(?, ?, ?, ?)",
+            [(1, "ORG", "IBM", 2), (2, "ORG", "IBM", 1), (2, "ORG", "Acme", 1), (2, "GPE", "Paris", 1)],
+        )
+        await db.commit()
+
+    counts = await keyword_counts_between(db_path, start_iso="2025-01-01T12:00:00Z", end_iso="2025-01-02T00:00:00Z")
+    assert counts == {"quantum startup": 1, "funding": 1}
+
+    entities = await top_entities(db_path, limit=1)
+    assert entities["ORG"] == [("IBM", 3)]
+    assert entities["GPE"] == [("Paris", 1)]
+    assert entities["PERSON"] == []
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+
+import aiosqlite
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+from app.services.analytics.seasonal import bucket_hour
+from app.services.backfill import RateBudget, load_progress, plan_windows, run_backfill
+from app.services.newsapi_client import NewsAPIClient
+from app.services.rollups import fold_closed_hours, init_rollup_tables
+from app.services.upstream import AIMDLimiter, UpstreamClient
+
+START = datetime(2024, 5, 1, tzinfo=UTC)
+PER_WINDOW = 250
+
+
+def fake_newsapi(
+    *,
+    per_window: int = PER_WINDOW,
+    errors: dict[str, tuple[int, str]] | None = None,
+    timeouts: set[str] | None = None,
+) -> FastAPI:
+    """
+    /everything with ``per_window`` articles per (q, from).
+
+    From page 2 on, errors maps q -> (status, code) and queries in timeouts
+    fail with a read timeout.
+    """
+    app = FastAPI()
+    app.state.calls = []
+    app.state.active = app.state.peak = 0
+
+    # "from" is not a valid parameter name, so the query string is read directly
+    @app.get("/everything")
+    async def everything(request: Request):
+        params = request.query_params
+        q, page, size = params["q"], int(params.get("page", 1)), int(params.get("pageSize", 100))
+        start = datetime.fromisoformat(params["from"])
+        app.state.calls.append((q, params["from"], page))
+        app.state.active += 1
+        app.state.peak = max(app.state.peak, app.state.active)
+        await asyncio.sleep(0.01)
+        app.state.active -= 1
+        if timeouts and q in timeouts and page >= 2:
+            raise httpx.ReadTimeout("timed out")
+        if errors and q in errors and page >= 2:
+            status, code = errors[q]
+            return JSONResponse({"status": "error", "code": code, "message": code}, status_code=status)
+        articles = [
+            {
+                "source": {"id": None, "name": f"Source {i % 3}"},
+                "title": f"{q} story {i}",
+                "url": f"https://example.com/{q}/{params['from']}/{i}",
+                "publishedAt": (start + timedelta(minutes=5 * i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            }
+            for i in range((page - 1) * size, min(page * size, per_window))
+        ]
+        return {"status": "ok", "totalResults": per_window, "articles": articles}
+
+    return app
+
+
+def _client(app: FastAPI) -> NewsAPIClient:
+    http = UpstreamClient(
+        "newsapi",
+        base_url="http://newsapi",
+        limiter=AIMDLimiter(initial=16, max_limit=16),
+        transport=httpx.ASGITransport(app=app),
+    )
+    return NewsAPIClient(http=http, api_key="k")
+
+
+async def _backfill(path: str, app: FastAPI, **kwargs) -> dict:
+    params = {
+        "queries": ["bitcoin", "election"],
+        "start": START,
+        "end": START + timedelta(days=3),
+        "concurrency": 3,
+        "budget": RateBudget(rate=0),
+        "enrich": False,
+        **kwargs,
+    }
+    return await run_backfill(path, _client(app), **params)
+
+
+async def _count(path: str, sql: str) -> int:
+    async with aiosqlite.connect(path) as db:
+        return (await (await db.execute(sql)).fetchone())[0]
+
+
+def test_plan_windows_covers_range_newest_first():
+    windows = plan_windows(["a"], START, START + timedelta(hours=60), slice_hours=24)
+    assert [(w.start.hour, (w.end - w.start).total_seconds() / 3600) for w in windows] == [
+        (12, 24.0), (12, 24.0), (0, 12.0)
+    ]
+    assert windows[0].end == START + timedelta(hours=60) and windows[-1].start == START
+    with pytest.raises(ValueError):
+        plan_windows(["a"], START, START)
+
+
+@pytest.mark.asyncio
+async def test_backfill_pages_every_window_concurrently(tmp_path):
+    path = str(tmp_path / "news.db")
+    app = fake_newsapi()
+
+    report = await _backfill(path, app)
+
+    assert report["windowsDone"] == 6 and report["windowsRemaining"] == 0
+    assert report["requests"] == len(app.state.calls) == 6 * 3  # 250 articles = 3 pages of 100
+    assert report["fetched"] == report["new"] == 6 * PER_WINDOW
+    assert report["articlesPerSecond"] > 0
+    assert 1 < app.state.peak <= 3
+    assert await _count(path, "SELECT COUNT(*) FROM articles") == 6 * PER_WINDOW
+    assert await _count(path, "SELECT SUM(count) FROM hourly_counts WHERE scope = 'feed'") == 6 * PER_WINDOW
+
+    # Everything is checkpointed as done: a re-run fetches nothing
+    again = await _backfill(path, app)
+    assert again["windowsSkipped"] == 6 and again["requests"] == 0
+
+
+@pytest.mark.asyncio
+async def test_interrupted_backfill_resumes_from_checkpoint(tmp_path):
+    path = str(tmp_path / "news.db")
+    app = fake_newsapi()
+
+    first = await _backfill(path, app, budget=RateBudget(rate=0, max_requests=7))
+    assert first["stoppedReason"] and first["windowsRemaining"] > 0
+    assert first["requests"] == 7
+    progress = await load_progress(path)
+    assert any(page > 1 and not done for page, done in progress.values())  # stopped mid-window
+
+    second = await _backfill(path, app)
+    assert second["windowsRemaining"] == 0
+    # No page fetched twice
+    assert len(app.state.calls) == len(set(app.state.calls)) == 6 * 3
+    assert await _count(path, "SELECT COUNT(*) FROM articles") == 6 * PER_WINDOW
+
+
+@pytest.mark.asyncio
+async def test_result_cap_ends_window_and_bad_key_stops_job(tmp_path):
+    path = str(tmp_path / "news.db")
+    capped = await _backfill(
+        path, fake_newsapi(errors={"bitcoin": (426, "maximumResultsReached")}), queries=["bitcoin"]
+    )
+    assert capped["windowsDone"] == 3 and capped["windowsFailed"] == 0
+    assert capped["fetched"] == 3 * 100
+
+    app = fake_newsapi(errors={"election": (401, "apiKeyInvalid")})
+    failed = await _backfill(str(tmp_path / "other.db"), app, queries=["election"], concurrency=1)
+    assert failed["windowsFailed"] == 1
+    assert "apiKeyInvalid" in failed["stoppedReason"]
+    assert len(app.state.calls) == 2  # no further windows after the fatal error
+
+
+@pytest.mark.asyncio
+async def test_timeout_fails_the_window_and_resumes_later(tmp_path):
+    path = str(tmp_path / "news.db")
+    lines = []
+    report = await _backfill(path, fake_newsapi(timeouts={"bitcoin"}), progress=lines.append)
+
+    # Every bitcoin window timed out on page 2; election finished
+    assert (report["windowsDone"], report["windowsFailed"]) == (3, 3)
+    assert report["stoppedReason"] is None
+    assert sum("ReadTimeout" in line for line in lines) == 3
+    progress = await load_progress(path)
+    assert {v for k, v in progress.items() if k[0] == "bitcoin"} == {(2, False)}
+
+    resumed = await _backfill(path, fake_newsapi())
+    assert (resumed["windowsSkipped"], resumed["windowsDone"], resumed["windowsFailed"]) == (3, 3, 0)
+    assert await _count(path, "SELECT COUNT(*) FROM articles") == 6 * PER_WINDOW
+
+
+@pytest.mark.asyncio
+async def test_rate_budget_paces_requests():
+    budget = RateBudget(rate=50)
+    start = time.perf_counter()
+    await asyncio.gather(*(budget.acquire() for _ in range(6)))
+    assert time.perf_counter() - start >= 5 / 50 * 0.9
+    assert budget.used == 6
+
+
+@pytest.mark.asyncio
+async def test_backfill_warms_the_live_feed_baseline(tmp_path):
+    path = str(tmp_path / "news.db")
+    feed = f"{settings.poll_country}-{settings.poll_language}"
+    now = datetime.now(tz=UTC)
+    start = now.replace(minute=0, second=0, microsecond=0) - timedelta(days=4)
+    # The poller already folded every hour up to now
+    await init_rollup_tables(path)
+    async with aiosqlite.connect(path) as db:
+        await db.execute("INSERT INTO hourly_counts VALUES('feed', ?, ?, 1)", (feed, bucket_hour(now)))
+        await db.commit()
+    await fold_closed_hours(path, alpha=0.2, settle_hours=0, now=now + timedelta(hours=1))
+
+    report = await _backfill(path, fake_newsapi(per_window=24), start=start, end=start + timedelta(days=1))
+
+    assert "feed" in report["baselinesRebuilt"]
+    assert await _count(path, f"SELECT SUM(count) FROM hourly_counts WHERE scope = 'feed' AND key = '{feed}'") >= 2 * 24
+    # Backfilled hours made it into the hour-of-week baseline of the poller's feed
+    assert await _count(path, f"SELECT MAX(mean) FROM seasonal_baseline WHERE scope = 'feed' AND key = '{feed}'") > 0
+
+
+@pytest.mark.asyncio
+async def test_failing_annotation_does_not_fail_the_backfill(tmp_path, monkeypatch):
+    import app.services.entity_extractor as entity_extractor
+    import app.services.nlp_registry as nlp_registry
+    import app.services.sentiment as sentiment
+
+    def missing_model(*args, **kwargs):
+        raise RuntimeError("spaCy model not installed")
+
+    monkeypatch.setattr(settings, "keyword_engine", "rules")
+    monkeypatch.setattr(sentiment, "get_sentiment_model", lambda: None)
+    monkeypatch.setattr(entity_extractor, "get_entity_extractor", missing_model)
+    # The rules engine never asks for the keyword view
+    monkeypatch.setattr(nlp_registry, "get_nlp_registry", missing_model)
+    lines = []
+
+    path = str(tmp_path / "news.db")
+    report = await _backfill(
+        path, fake_newsapi(per_window=24), queries=["bitcoin"], enrich=True, progress=lines.append
+    )
+
+    assert report["new"] == 3 * 24 and report["windowsFailed"] == 0
+    assert (report["scored"], report["annotated"]) == (0, 0)
+    assert "✗ annotation: spaCy model not installed" in lines
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import aiosqlite
+import numpy as np
+import pytest
+
+from app.services.breaking_news_detector import BreakingNewsDetector, carry_detected_at
+from app.services.ml_cache import get_breaking_news, init_ml_cache_tables, save_breaking_news
+
+NOW = datetime(2025, 1, 1, 12, 0, tzinfo=UTC)
+
+
+def _article(url: str, minutes_ago: int) -> dict:
+    return {
+        "url": url,
+        "title": f"Title {url}",
+        "source_name": "Test",
+        "published_at": (NOW - timedelta(minutes=minutes_ago)).isoformat(),
+    }
+
+
+def _stories(**kwargs):
+    # Cluster 0: three fresh, near-identical articles -> breaking
+    # Cluster 1: two old articles, nothing recent -> not a candidate
+    # Cluster 2: one fresh + several baseline articles, loose -> weak story
+    articles = [
+        _article("a1", 5), _article("a2", 10), _article("a3", 20),
+        _article("b1", 300), _article("b2", 320),
+        _article("c1", 30), _article("c2", 200), _article("c3", 400), _article("c4", 500),
+        _article("noise", 2),
+    ]
+    embeddings = np.array([
+        [1.0, 0.0, 0.0], [0.99, 0.05, 0.0], [0.98, 0.0, 0.05],
+        [0.0, 1.0, 0.0], [0.0, 0.99, 0.05],
+        [0.0, 0.0, 1.0], [0.0, 0.6, 0.8], [0.5, 0.0, 0.85], [0.0, 0.3, 0.95],
+        [0.5, 0.5, 0.5],
+    ])
+    labels = [0, 0, 0, 1, 1, 2, 2, 2, 2, -1]
+    entities = [
+        {"PERSON": ["Jane Doe"]}, {"PERSON": ["Jane Doe"], "GPE": ["Paris"]}, {},
+        None, None,
+        {"ORG": ["Acme"]}, {"ORG": ["Acme"]}, {}, {},
+        {"EVENT": ["Noise Fest"]},
+    ]
+    return BreakingNewsDetector().detect_breaking_stories(
+        articles, embeddings, labels, entities, now=NOW, **kwargs
+    )
+
+
+def test_stories_ranked_per_cluster():
+    stories = _stories()
+
+    assert [s["cluster_id"] for s in stories] == [0, 2]
+    assert stories[0]["rank"] == 1
+    assert stories[0]["score"] > stories[1]["score"]
+    assert stories[0]["member_urls"] == ["a1", "a2", "a3"]
+    assert stories[0]["recent_count"] == 3
+
+
+def test_story_signals_computed_per_group():
+    top, weak = _stories()
+
+    # All three pairs in cluster 0 are highly similar; cluster 2 is loose
+    assert top["signals"]["clustering"] == 100
+    assert weak["signals"]["clustering"] < 100
+    # Novel entities only count once per story and exclude the baseline window
+    assert top["novel_entities"] == ["Jane Doe", "Paris"]
+    assert weak["novel_entities"] == []
+    # Cluster 0 has no baseline at all, cluster 2 has three baseline articles
+    assert (top["signals"]["volume"], top["signals"]["volume_z"]) == (75, 3.0)
+    assert weak["signals"]["baseline_count"] == 3
+
+
+def test_volume_scored_against_the_seasonal_expectation():
+    # Cluster 2 had 3 of the 5 baseline-window articles, so it expects 60% of
+    # the articles this hour of the week usually brings
+    _, quiet = _stories(expected_rate=0.5)
+    _, busy = _stories(expected_rate=10.0)
+
+    assert (quiet["signals"]["expected_count"], busy["signals"]["expected_count"]) == (0.3, 6.0)
+    assert quiet["signals"]["volume_z"] == 0.7
+    assert busy["signals"]["volume"] == 0 and busy["signals"]["volume_z"] < 0
+    assert quiet["score"] > busy["score"]
+
+
+def test_no_stories_without_clusters():
+    detector = BreakingNewsDetector()
+    articles = [_article("x", 1), _article("y", 2)]
+    embeddings = np.eye(2)
+
+    assert detector.detect_breaking_stories(articles, embeddings, [-1, -1], now=NOW) == []
+
+
+def test_detected_at_kept_from_previous_cycle():
+    previous = [{"member_urls": ["a0", "a1"], "detected_at": "2025-01-01T11:00:00+00:00"}]
+    stories = [
+        {"member_urls": ["a1", "a2"], "detected_at": NOW.isoformat()},
+        {"member_urls": ["z1"], "detected_at": NOW.isoformat()},
+        {"member_urls": ["a0"], "detected_at": None},
+    ]
+
+    carry_detected_at(stories, previous)
+
+    assert [s["detected_at"] for s in stories] == ["2025-01-01T11:00:00+00:00", NOW.isoformat(), None]
+
+
+@pytest.mark.asyncio
+async def test_non_breaking_cycle_is_saved_on_a_migrated_table(tmp_path):
+    db_path = str(tmp_path / "news.db")
+    # Table as created by older versions: detected_at NOT NULL
+    async with aiosqlite.connect(db_path) as db:
+        await db.execute(
+            """
+            CREATE TABLE breaking_news_cache (
+                id INTEGER PRIMARY KEY CHECK (id = 1), score REAL NOT NULL, signals TEXT NOT NULL,
+                detected_at TEXT NOT NULL, computed_at TEXT NOT NULL
+            )
+            """
+        )
+        await db.commit()
+    await init_ml_cache_tables(db_path)
+
+    await save_breaking_news(db_path, 80.0, {})
+    await save_breaking_news(db_path, 12.5, {"story_count": 3})
+
+    cached = await get_breaking_news(db_path)
+    assert cached["score"] == 12.5 and cached["is_breaking"] is False
+    assert cached["detected_at"] is None
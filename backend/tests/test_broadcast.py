@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.api.routes import events
+from app.services.broadcast import BroadcastHub
+
+
+@pytest.mark.asyncio
+async def test_publish_fans_out_to_matching_subscribers():
+    hub = BroadcastHub()
+    everything = hub.subscribe()
+    breaking_only = hub.subscribe({"breaking"})
+
+    hub.publish("articles", {"new": 3})
+    hub.publish("breaking", {"score": 72})
+
+    assert (await everything.get(timeout=0.1)).type == "articles"
+    assert (await everything.get(timeout=0.1)).type == "breaking"
+    event = await breaking_only.get(timeout=0.1)
+    assert event.data == {"score": 72}
+    assert await breaking_only.get(timeout=0.01) is None
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_dropped_without_affecting_others():
+    hub = BroadcastHub(queue_size=2)
+    slow = hub.subscribe()
+    fast = hub.subscribe()
+
+    for i in range(3):
+        hub.publish("articles", {"i": i})
+        await fast.get(timeout=0.1)
+
+    assert slow.dropped and not slow.active
+    assert fast.active
+    assert hub.stats()["subscribers"] == 1
+    assert hub.stats()["dropped_subscribers"] == 1
+
+
+@pytest.mark.asyncio
+async def test_new_subscriber_gets_latest_state_and_unchanged_is_skipped():
+    hub = BroadcastHub()
+    hub.publish("breaking", {"score": 10})
+    assert hub.publish("breaking", {"score": 10}, only_if_changed=True) is None
+    hub.publish("breaking", {"score": 80}, only_if_changed=True)
+
+    sub = hub.subscribe({"breaking"})
+    event = await sub.get(timeout=0.1)
+    assert event.data == {"score": 80}
+    assert "event: breaking" in event.to_sse()
+
+
+
+class FakeWebSocket:
+    """Records sent messages; receive() blocks until the client disconnects."""
+
+    def __init__(self):
+        self.sent = []
+        self.gone = asyncio.Event()
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+    async def receive(self):
+        await self.gone.wait()
+        return {"type": "websocket.disconnect", "code": 1001}
+
+    async def close(self, code=1000, reason=None):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_websocket_disconnect_unsubscribes_without_waiting_for_a_send(monkeypatch):
+    hub = BroadcastHub()
+    hub.publish("breaking", {"score": 80})
+    monkeypatch.setattr(events, "get_broadcast_hub", lambda: hub)
+    monkeypatch.setattr(events, "KEEPALIVE_SECONDS", 60.0)
+    ws = FakeWebSocket()
+
+    handler = asyncio.create_task(events.websocket_events(ws, types="breaking"))
+    while not ws.sent:
+        await asyncio.sleep(0.01)
+    assert ws.sent[0]["data"] == {"score": 80}
+    assert hub.stats()["subscribers"] == 1
+
+    # The handler returns on the disconnect, long before the next keepalive is due
+    ws.gone.set()
+    await asyncio.wait_for(handler, timeout=1)
+    assert hub.stats()["subscribers"] == 0
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import aiosqlite
+import pytest
+
+from app.services.annotations import backfill_entity_pairs, init_annotation_tables
+from app.services.db import init_db, upsert_articles
+from app.services.entity_graph import articles_connecting, load_entity_graph
+from app.services.rollups import init_rollup_tables
+
+ARTICLE_ENTITIES = {
+    1: [("ORG", "NASA"), ("PERSON", "Jane Doe"), ("GPE", "Houston")],
+    2: [("ORG", "NASA"), ("PERSON", "Jane Doe")],
+    3: [("ORG", "NASA"), ("GPE", "Paris")],
+    4: [("GPE", "Paris"), ("ORG", "UNESCO")],
+}
+
+
+async def _setup(tmp_path) -> str:
+    db_path = str(tmp_path / "news.db")
+    await init_db(db_path)
+    await init_rollup_tables(db_path)
+    await init_annotation_tables(db_path)
+    await upsert_articles(
+        db_path,
+        [
+            {"url": f"u{i}", "title": f"Story {i}", "published_at": f"2025-01-01T1{i}:00:00Z"}
+            for i in ARTICLE_ENTITIES
+        ],
+        fetched_at="2025-01-01T20:00:00Z",
+    )
+    async with aiosqlite.connect(db_path) as db:
+        for article_id, entities in ARTICLE_ENTITIES.items():
+            await db.execute(
+                "INSERT INTO article_annotations(article_id, text_hash, bucket_hour, annotated_at) VALUES(?, 'h', ?, 'now')",
+                (article_id, f"2025-01-01T1{article_id}"),
+            )
+            await db.executemany(
+                "INSERT INTO article_entities(article_id, label, text, count) VALUES(?, ?, ?, 1)",
+                [(article_id, label, text) for label, text in entities],
+            )
+            await db.executemany(
+                "INSERT INTO entity_hourly(bucket_hour, label, term, count) VALUES(?, ?, ?, 1)",
+                [(f"2025-01-01T1{article_id}", label, text) for label, text in entities],
+            )
+        await db.commit()
+    return db_path
+
+
+@pytest.mark.asyncio
+async def test_backfilled_pairs_form_a_sparse_graph(tmp_path):
+    db_path = await _setup(tmp_path)
+    assert await backfill_entity_pairs(db_path) == 6
+    assert await backfill_entity_pairs(db_path) == 0  # one-time
+
+    graph = await load_entity_graph(db_path, start_bucket="2025-01-01T00", end_bucket="2025-01-02T00")
+    nasa = graph.find("nasa")
+    related = graph.related(nasa, limit=5)
+    assert [(r["name"], r["cooccurrences"]) for r in related] == [("Jane Doe", 2), ("Houston", 1), ("Paris", 1)]
+    assert related[0]["association"] == pytest.approx(2 / (3 * 2) ** 0.5, abs=1e-4)
+
+    ego = graph.neighbourhood(nasa, limit=2, depth=2)
+    names = [n["name"] for n in ego["nodes"]]
+    assert names[0] == "NASA"
+    assert {n["name"]: n["depth"] for n in ego["nodes"]}["Houston"] == 1
+    edges = {(names[e["source"]], names[e["target"]]) for e in ego["edges"]}
+    assert ("NASA", "Jane Doe") in edges or ("Jane Doe", "NASA") in edges
+
+    # Window excludes the buckets of articles 1-3
+    late = await load_entity_graph(db_path, start_bucket="2025-01-01T14", end_bucket="2025-01-02T00")
+    assert late.find("NASA") is None
+
+
+@pytest.mark.asyncio
+async def test_articles_connecting_two_entities(tmp_path):
+    db_path = await _setup(tmp_path)
+    rows = await articles_connecting(db_path, ("ORG", "NASA"), ("PERSON", "Jane Doe"))
+    assert [r["url"] for r in rows] == ["u2", "u1"]
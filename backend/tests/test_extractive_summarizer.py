@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.api.routes import summarize as summarize_route
+from app.core.errors import UpstreamAPIError
+from app.services.extractive_summarizer import rank_sentences, split_sentences, summarize_extractive
+from app.services.summary_cache import SummaryCache
+
+DESCRIPTION = "The central bank raised interest rates by half a point to fight inflation."
+CONTENT = (
+    "The Federal Reserve raised interest rates on Wednesday. "
+    "Officials said inflation remains far too high. "
+    "The weather in Washington was mild. "
+    "Analysts expect further rate hikes to fight inflation this year. "
+    "Mortgage rates are likely to cli… [+2301 chars]"
+)
+
+
+def test_split_sentences_keeps_abbreviations_and_quotes():
+    assert split_sentences('The U.S. Senate voted. "It is done." Dr. Smith agreed! 3 more followed.') == [
+        "The U.S. Senate voted.",
+        '"It is done."',
+        "Dr. Smith agreed!",
+        "3 more followed.",
+    ]
+
+
+def test_summary_prefers_central_sentences_in_article_order():
+    summary = summarize_extractive(
+        title="Fed raises rates to fight inflation", description=DESCRIPTION, content=CONTENT, max_sentences=2
+    )
+    assert "weather" not in summary
+    assert "cli" not in summary.split()[-1]  # truncated tail dropped
+    assert summary.startswith("The central bank raised")
+
+
+def test_rank_sentences_is_a_distribution():
+    scores = rank_sentences(split_sentences(CONTENT), "rates")
+    assert scores.sum() == pytest.approx(1.0)
+    assert scores.argmin() == 2  # the off-topic sentence
+
+
+def test_summary_falls_back_to_title():
+    assert summarize_extractive(title="Only a headline", description=None, content=None) == "Only a headline"
+    assert summarize_extractive(title="T", description="Single sentence.", content=None) == "Single sentence."
+
+
+class SlowClient:
+    model = "fake"
+
+    def __init__(self, delay: float, error: UpstreamAPIError | None = None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def summarize(self, **_):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return "LLM summary"
+
+
+def _route(monkeypatch, tmp_path, client) -> SummaryCache:
+    cache = SummaryCache(str(tmp_path / "news.db"), ttl_seconds=3600, max_entries=10)
+    monkeypatch.setattr(summarize_route, "get_gemini_client", lambda: client)
+    monkeypatch.setattr(summarize_route, "get_summary_cache", lambda: cache)
+    monkeypatch.setattr(summarize_route.settings, "summary_llm_budget_seconds", 0.05)
+    return cache
+
+
+REQ = summarize_route.SummarizeRequest(title="Fed raises rates", description=DESCRIPTION, content=CONTENT)
+
+
+@pytest.mark.asyncio
+async def test_fast_mode_never_calls_the_llm(monkeypatch, tmp_path):
+    client = SlowClient(0)
+    _route(monkeypatch, tmp_path, client)
+    response = await summarize_route.summarize(REQ, mode="fast")
+    assert response["source"] == "extractive"
+    assert client.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_auto_mode_falls_back_then_serves_cached_llm_summary(monkeypatch, tmp_path):
+    client = SlowClient(0.2)
+    _route(monkeypatch, tmp_path, client)
+
+    response = await summarize_route.summarize(REQ, mode="auto")
+    assert response["source"] == "extractive"
+    assert response["fallback"] == "llmTimeout"
+
+    await asyncio.sleep(0.3)  # background LLM call finishes and is cached
+    assert await summarize_route.summarize(REQ, mode="auto") == {"summary": "LLM summary", "source": "cache"}
+    assert client.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_auto_mode_falls_back_on_upstream_error(monkeypatch, tmp_path):
+    _route(monkeypatch, tmp_path, SlowClient(0, UpstreamAPIError(429, "RESOURCE_EXHAUSTED", "quota")))
+    response = await summarize_route.summarize(REQ, mode="auto")
+    assert response["fallback"] == "RESOURCE_EXHAUSTED"
+
+    with pytest.raises(summarize_route.HTTPException) as e:
+        await summarize_route.summarize(REQ, mode="llm")
+    assert e.value.status_code == 429
+    with pytest.raises(summarize_route.HTTPException) as e:
+        await summarize_route.summarize(REQ, mode="slow")
+    assert e.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_unreachable_gemini_falls_back_or_maps_to_502(monkeypatch, tmp_path):
+    _route(monkeypatch, tmp_path, SlowClient(0, httpx.ConnectTimeout("timed out")))
+    response = await summarize_route.summarize(REQ, mode="auto")
+    assert (response["source"], response["fallback"]) == ("extractive", "upstreamUnavailable")
+
+    with pytest.raises(summarize_route.HTTPException) as e:
+        await summarize_route.summarize(REQ, mode="llm")
+    assert e.value.status_code == 502
+    assert e.value.detail["code"] == "upstreamUnavailable"
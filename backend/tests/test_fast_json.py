@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI, Response
+
+from app.core.config import settings
+from app.core.errors import UpstreamAPIError
+from app.schemas.newsapi import NewsAPIResponse
+from app.services.fast_json import HAS_ORJSON, NewsAPIPageDecoder, validate_json
+from app.services.newsapi_client import NewsAPIClient
+from app.services.upstream import UpstreamClient
+
+
+def page(n: int = 3) -> bytes:
+    articles = [
+        {
+            "source": {"id": None, "name": "Wire {\"quoted\"}"},
+            "author": "A. Writer",
+            "title": f"Story {i}: \"braces\" {{ [ ] }} and a backslash \\",
+            "description": "articles",
+            "url": f"https://example.com/{i}",
+            "urlToImage": None,
+            "publishedAt": "2024-05-01T12:00:00Z",
+            "content": "Café ünïcode… [+1234 chars]",
+        }
+        for i in range(n)
+    ]
+    return json.dumps({"status": "ok", "totalResults": 1000, "articles": articles}, ensure_ascii=False).encode()
+
+
+def decode_in_chunks(body: bytes, size: int) -> NewsAPIResponse:
+    decoder = NewsAPIPageDecoder()
+    for i in range(0, len(body), size):
+        decoder.feed(body[i : i + size])
+    return decoder.close()
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 64, 10**6])
+def test_stream_decoder_matches_one_shot_validation(size):
+    body = page()
+    assert decode_in_chunks(body, size) == NewsAPIResponse.model_validate_json(body)
+
+
+def test_stream_decoder_handles_field_order_and_empty_pages():
+    body = b'{"articles": [], "totalResults": 0, "status": "ok"}'
+    assert decode_in_chunks(body, 3) == NewsAPIResponse(status="ok", totalResults=0, articles=[])
+    body = b'{"status": "ok"}'
+    assert decode_in_chunks(body, 3).articles == []
+
+
+def test_stream_decoder_rejects_truncated_body():
+    with pytest.raises(ValueError):
+        decode_in_chunks(page()[:-10], 16)
+
+
+@pytest.mark.parametrize("decoder", ["pydantic", "orjson"])
+def test_validate_json_decoders_agree(decoder):
+    if decoder == "orjson" and not HAS_ORJSON:
+        pytest.skip("orjson not installed (falls back to pydantic)")
+    body = page()
+    assert validate_json(NewsAPIResponse, body, decoder=decoder) == NewsAPIResponse.model_validate(json.loads(body))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("page_size", [20, 100])
+async def test_everything_decodes_plain_and_streamed_pages(page_size, monkeypatch):
+    monkeypatch.setattr(settings, "newsapi_stream_min_page_size", 50)
+    app = FastAPI()
+
+    @app.get("/everything")
+    async def everything(q: str, pageSize: int = 100):
+        if q == "bad":
+            return Response(json.dumps({"status": "error", "code": "apiKeyInvalid", "message": "nope"}), 401)
+        return Response(page(pageSize), media_type="application/json")
+
+    http = UpstreamClient("newsapi", base_url="http://newsapi", transport=httpx.ASGITransport(app=app))
+    client = NewsAPIClient(http=http, api_key="k")
+    resp = await client.everything(q="bitcoin", page_size=page_size)
+    assert resp.totalResults == 1000
+    assert len(resp.articles) == page_size
+    assert resp.articles[-1].url == f"https://example.com/{page_size - 1}"
+
+    with pytest.raises(UpstreamAPIError) as err:
+        await client.everything(q="bad", page_size=page_size)
+    assert (err.value.status_code, err.value.code) == (401, "apiKeyInvalid")
+    await http.close()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import spacy
+from spacy.language import Language
+
+from app.services.entity_extractor import EntityExtractor
+from app.services.nlp_registry import NLPRegistry
+
+NER_CALLS: list[str] = []
+
+
+@Language.component("test_record_ner")
+def _record_ner(doc):
+    NER_CALLS.append(doc.text)
+    return doc
+
+
+def _fake_model():
+    nlp = spacy.blank("en")
+    for name in ("tagger", "parser"):
+        nlp.add_pipe("sentencizer", name=name)
+    nlp.add_pipe("test_record_ner", name="ner")
+    return nlp
+
+
+def test_model_is_loaded_once_across_threads(monkeypatch):
+    calls = []
+
+    def fake_load(name):
+        calls.append(name)
+        return _fake_model()
+
+    monkeypatch.setattr(spacy, "load", fake_load)
+    registry = NLPRegistry()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        models = list(pool.map(lambda _: registry.get(), range(32)))
+
+    assert calls == ["en_core_web_sm"]
+    assert all(m is models[0] for m in models)
+    assert registry.stats()["loaded"] is True
+    assert registry.stats()["loadSeconds"] is not None
+
+
+def test_views_share_the_model_and_disable_per_task(monkeypatch):
+    monkeypatch.setattr(spacy, "load", lambda name: _fake_model())
+    registry = NLPRegistry()
+
+    keywords, entities = registry.view("keywords"), registry.view("entities")
+    assert keywords.nlp is entities.nlp
+    assert keywords.pipe_names == ["tagger", "parser"]
+    assert entities.pipe_names == ["ner"]
+    assert [doc.text for doc in entities.pipe(["a b", "c"])] == ["a b", "c"]
+    # Views never mutate the shared pipeline
+    assert keywords.nlp.pipe_names == ["tagger", "parser", "ner"]
+
+
+def test_missing_model_is_reported(monkeypatch):
+    def fake_load(name):
+        raise OSError("E050")
+
+    monkeypatch.setattr(spacy, "load", fake_load)
+    registry = NLPRegistry()
+    with pytest.raises(RuntimeError, match="python -m spacy download"):
+        registry.get()
+    assert registry.stats()["error"] == "spaCy model 'en_core_web_sm' not found"
+
+
+def test_keyword_view_never_runs_ner(monkeypatch):
+    monkeypatch.setattr(spacy, "load", lambda name: _fake_model())
+    registry = NLPRegistry()
+    NER_CALLS.clear()
+
+    keywords = registry.view("keywords")
+    keywords("Climate summit")
+    list(keywords.pipe(["Paris talks"]))
+    assert NER_CALLS == []
+
+    EntityExtractor(registry.view("entities")).extract_entities("Paris talks")
+    assert NER_CALLS == ["Paris talks"]
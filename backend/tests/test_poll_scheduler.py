@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import random
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes.poller import router
+from app.services.db import init_db
+from app.services.ml_cache import init_ml_cache_tables, save_breaking_news
+from app.services.poll_scheduler import PollScheduler
+from app.services.poller import HeadlinePoller
+
+MIN = 60.0
+
+
+class Clock:
+    def __init__(self):
+        self.now = datetime(2024, 5, 1, 6, 0, tzinfo=UTC).timestamp()
+
+    def __call__(self):
+        return self.now
+
+
+def _scheduler(clock: Clock, **kwargs) -> PollScheduler:
+    params = {
+        "min_interval": 5 * MIN,
+        "max_interval": 90 * MIN,
+        "initial_interval": 30 * MIN,
+        "target_new_fraction": 0.2,
+        "daily_budget": 1000,
+        "jitter": 0.0,
+        "smoothing": 1.0,
+        "clock": clock,
+        "rng": random.Random(0),
+    }
+    scheduler = PollScheduler(**{**params, **kwargs})
+    scheduler.add_feed("us-en")
+    return scheduler
+
+
+def _poll(scheduler: PollScheduler, clock: Clock, *, new: int, breaking: float = 0.0):
+    feed, delay = scheduler.next_due()
+    clock.now += delay
+    return scheduler.record_poll(feed.key, fetched=100, new=new, breaking_score=breaking)
+
+
+def test_interval_follows_change_rate_within_bounds():
+    clock = Clock()
+    scheduler = _scheduler(clock)
+    assert scheduler.next_due()[1] == 0  # first poll right away
+
+    assert _poll(scheduler, clock, new=100).interval == 30 * MIN  # startup poll: no change rate yet
+    feed = _poll(scheduler, clock, new=40)  # twice the target
+    assert (feed.interval, feed.reason) == (15 * MIN, "changing")
+    feed = _poll(scheduler, clock, new=90)  # capped at one halving per poll
+    assert feed.interval == 7.5 * MIN
+    assert _poll(scheduler, clock, new=90).interval == 5 * MIN  # min bound
+
+    feed = _poll(scheduler, clock, new=20)
+    assert (feed.interval, feed.reason) == (5 * MIN, "steady")
+    for _ in range(6):
+        feed = _poll(scheduler, clock, new=0)
+    assert (feed.interval, feed.reason) == (90 * MIN, "quiet")
+
+
+def test_breaking_news_polls_at_minimum_then_relaxes():
+    clock = Clock()
+    scheduler = _scheduler(clock)
+    _poll(scheduler, clock, new=100)
+    feed = _poll(scheduler, clock, new=5, breaking=75)
+    assert (feed.interval, feed.reason) == (5 * MIN, "breaking")
+    feed = _poll(scheduler, clock, new=5, breaking=20)
+    assert (feed.interval, feed.reason) == (10 * MIN, "quiet")  # grows back gradually
+
+
+@pytest.mark.asyncio
+async def test_stale_breaking_row_does_not_pin_the_minimum_interval(tmp_path):
+    db_path = str(tmp_path / "news.db")
+    await init_db(db_path)
+    await init_ml_cache_tables(db_path)
+    # Left over from an earlier breaking cycle; this cycle skips ML (< 5 articles)
+    await save_breaking_news(db_path, 90.0, {})
+
+    clock = Clock()
+    poller = HeadlinePoller(sqlite_path=db_path)
+    poller.scheduler = _scheduler(clock)
+    _poll(poller.scheduler, clock, new=100)
+    assert _poll(poller.scheduler, clock, new=5, breaking=75).reason == "breaking"
+
+    score = await poller._refresh_ml()
+    assert score == 0.0
+    feed = _poll(poller.scheduler, clock, new=5, breaking=score)
+    assert (feed.interval, feed.reason) == (10 * MIN, "quiet")
+
+
+def test_daily_budget_is_spread_and_never_exceeded():
+    clock = Clock()  # 06:00 UTC: 18 hours left today
+    scheduler = _scheduler(clock, daily_budget=20)
+    _poll(scheduler, clock, new=100)
+    feed = _poll(scheduler, clock, new=90, breaking=90)
+    # 18 remaining requests over the ~17.5 hours left: ~58 min even pace, halved during breaking news
+    assert feed.reason == "budget"
+    assert 25 * MIN < feed.interval < 35 * MIN
+
+    polls_today = 2
+    while scheduler.remaining_budget > 0:
+        _poll(scheduler, clock, new=90, breaking=90)
+        polls_today += 1
+    assert polls_today == 20
+    assert datetime.fromtimestamp(clock.now, tz=UTC).day == 1
+
+    feed, delay = scheduler.next_due()
+    assert feed.reason == "budget"
+    assert datetime.fromtimestamp(clock.now + delay, tz=UTC).day == 2  # resumes after midnight
+    clock.now += delay
+    assert scheduler.remaining_budget == 20
+
+
+def test_errors_back_off_and_count_against_budget():
+    clock = Clock()
+    scheduler = _scheduler(clock)
+    _poll(scheduler, clock, new=100)
+    feed = scheduler.record_error("us-en")
+    assert (feed.interval, feed.reason, feed.errors) == (60 * MIN, "error", 1)
+    assert scheduler.used_today == 2
+
+
+def test_jitter_and_feed_staggering():
+    clock = Clock()
+    scheduler = _scheduler(clock, jitter=0.1)
+    second = scheduler.add_feed("gb-en")
+    assert 0 <= second.next_poll - clock.now <= 5 * MIN
+
+    delays = set()
+    for _ in range(20):
+        feed = scheduler.record_poll("us-en", fetched=100, new=20)
+        delays.add(round(feed.next_poll - clock.now))
+        assert 0.9 * feed.interval <= feed.next_poll - clock.now <= 1.1 * feed.interval
+    assert len(delays) > 1
+
+
+def test_status_endpoint():
+    clock = Clock()
+    scheduler = _scheduler(clock)
+    _poll(scheduler, clock, new=100)
+    _poll(scheduler, clock, new=40, breaking=12.5)
+
+    app = FastAPI()
+    app.include_router(router)
+    with TestClient(app) as client:
+        assert client.get("/poller/status").status_code == 503
+        app.state.poller = SimpleNamespace(scheduler=scheduler)
+        body = client.get("/poller/status").json()
+
+    assert body["budget"]["usedToday"] == 2 and body["budget"]["remaining"] == 998
+    assert body["budget"]["resetsAt"].startswith("2024-05-02T00:00:00")
+    (feed,) = body["feeds"]
+    assert feed["feed"] == "us-en"
+    assert (feed["intervalMinutes"], feed["reason"], feed["breakingScore"]) == (15.0, "changing", 12.5)
+    assert feed["newFraction"] == pytest.approx(0.4)
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import asyncio
+
+import aiosqlite
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+
+from app.services.db import init_db, upsert_articles
+from app.services.gemini_client import GeminiClient
+from app.services.ml_cache import init_ml_cache_tables, save_breaking_stories
+from app.services.presummarizer import cached_summaries, estimate_tokens, pick_targets, presummarize
+from app.services.summary_cache import SummaryCache
+from app.services.upstream import UpstreamClient
+
+
+def fake_gemini(delay: float = 0.05) -> FastAPI:
+    """Local stand-in for the generateContent endpoint; records calls and peak concurrency."""
+    app = FastAPI()
+    app.state.calls = []
+    app.state.active = app.state.peak = 0
+
+    @app.post("/v1/models/{model}:generateContent")
+    async def generate(model: str, request: Request):
+        body = await request.json()
+        prompt = body["contents"][0]["parts"][0]["text"]
+        app.state.calls.append(prompt)
+        app.state.active += 1
+        app.state.peak = max(app.state.peak, app.state.active)
+        await asyncio.sleep(delay)
+        app.state.active -= 1
+        if "FAIL" in prompt:
+            return {"candidates": []}
+        title = prompt.splitlines()[1]
+        return {
+            "candidates": [{"content": {"parts": [{"text": f"summary of {title}"}]}}],
+            "usageMetadata": {"totalTokenCount": 100},
+        }
+
+    return app
+
+
+async def _setup(tmp_path) -> str:
+    db_path = str(tmp_path / "news.db")
+    await init_db(db_path)
+    await init_ml_cache_tables(db_path)
+    await upsert_articles(
+        db_path,
+        [
+            {"url": f"u{i}", "title": f"Story {i}", "description": f"About {i}", "published_at": f"2025-01-01T10:{i:02d}:00Z"}
+            for i in range(8)
+        ],
+        fetched_at="2025-01-01T12:00:00Z",
+    )
+    async with aiosqlite.connect(db_path) as db:
+        # Cluster 1: u0..u3 (newest u3), cluster 2: u4..u5 (newest u5), u6/u7 noise
+        await db.executemany(
+            "INSERT INTO article_clusters(url, cluster_id, cluster_size, computed_at) VALUES(?, ?, ?, 'now')",
+            [("u0", 1, 4), ("u1", 1, 4), ("u2", 1, 4), ("u3", 1, 4), ("u4", 2, 2), ("u5", 2, 2),
+             ("u6", -1, 2), ("u7", -1, 2)],
+        )
+        await db.commit()
+    await save_breaking_stories(
+        db_path,
+        [{"rank": 1, "cluster_id": 2, "score": 80.0, "url": "u4", "title": "Story 4", "article_count": 2,
+          "recent_count": 2, "member_urls": ["u4", "u5"]},
+         # Ranked, but below the breaking threshold
+         {"rank": 2, "cluster_id": 1, "score": 30.0, "url": "u0", "title": "Story 0", "article_count": 4,
+          "recent_count": 1, "member_urls": ["u0", "u1", "u2", "u3"]}],
+    )
+    return db_path
+
+
+def _client(app: FastAPI) -> GeminiClient:
+    http = UpstreamClient("gemini", transport=httpx.ASGITransport(app=app))
+    return GeminiClient(model="fake", base_url="http://gemini/v1", api_key="k", http=http)
+
+
+@pytest.mark.asyncio
+async def test_pick_targets_orders_breaking_then_largest_clusters(tmp_path):
+    db_path = await _setup(tmp_path)
+    targets = await pick_targets(db_path, breaking=5, clusters=5)
+    assert [(t["reason"], t["url"]) for t in targets] == [("breaking", "u4"), ("cluster", "u3"), ("cluster", "u5")]
+    targets = await pick_targets(db_path, breaking=5, clusters=0, min_score=0)
+    assert [t["url"] for t in targets] == ["u4", "u0"]
+
+
+@pytest.mark.asyncio
+async def test_presummarize_fills_cache_under_concurrency_limit(tmp_path):
+    db_path = await _setup(tmp_path)
+    app = fake_gemini()
+    client = _client(app)
+    cache = SummaryCache(db_path, ttl_seconds=3600, max_entries=100)
+
+    report = await presummarize(db_path, client=client, cache=cache, concurrency=2)
+    assert report["summarized"] == 3
+    assert report["reportedTokens"] == 300
+    assert app.state.peak == 2
+
+    articles = [{"url": f"u{i}", "title": f"Story {i}", "description": f"About {i}", "content": None} for i in range(8)]
+    summaries = await cached_summaries(cache, client.model, articles)
+    assert summaries == {u: f"summary of Title: Story {u[1]}" for u in ("u3", "u4", "u5")}
+
+    # Next cycle: everything is already cached, no upstream calls
+    again = await presummarize(db_path, client=client, cache=cache)
+    assert again["cached"] == 3 and again["summarized"] == 0
+    assert len(app.state.calls) == 3
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_presummarize_respects_token_budget(tmp_path):
+    db_path = await _setup(tmp_path)
+    app = fake_gemini(delay=0)
+    client = _client(app)
+    cache = SummaryCache(db_path, ttl_seconds=3600, max_entries=100)
+    one = estimate_tokens(client.build_prompt(title="Story 4", description="About 4", content=None))
+
+    report = await presummarize(db_path, client=client, cache=cache, token_budget=one)
+    assert report["summarized"] == 1
+    assert report["skippedBudget"] == 2
+    assert report["estimatedTokens"] == one
+    assert app.state.calls[0].splitlines()[1] == "Title: Story 4"  # breaking story first
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_presummarize_counts_failures(tmp_path):
+    db_path = await _setup(tmp_path)
+    await upsert_articles(
+        db_path,
+        [{"url": "u4", "title": "FAIL", "description": "About 4", "published_at": "2025-01-01T10:04:00Z"}],
+        fetched_at="2025-01-01T13:00:00Z",
+    )
+    client = _client(fake_gemini(delay=0))
+    cache = SummaryCache(db_path, ttl_seconds=3600, max_entries=100)
+
+    report = await presummarize(db_path, client=client, cache=cache)
+    assert report["failed"] == 1
+    assert report["summarized"] == 2
+    await client.close()
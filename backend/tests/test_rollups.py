@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from collections import Counter
+
+import aiosqlite
+import pytest
+
+from app.services.annotations import init_annotation_tables, rollup_unbucketed_annotations
+from app.services.db import init_db, upsert_articles
+from app.services.rollups import (
+    apply_term_deltas,
+    entity_counts_for_buckets,
+    entity_series_for_buckets,
+    init_rollup_tables,
+    keyword_counts_for_buckets,
+)
+
+
+@pytest.mark.asyncio
+async def test_term_deltas_sum_over_bucket_ranges(tmp_path):
+    db_path = str(tmp_path / "news.db")
+    await init_rollup_tables(db_path)
+
+    async with aiosqlite.connect(db_path) as db:
+        await apply_term_deltas(
+            db,
+            keywords=Counter({("2025-01-01T10", "ai"): 2, ("2025-01-01T11", "ai"): 1, ("2025-01-01T11", "vote"): 1}),
+            entities=Counter({("2025-01-01T11", "ORG", "NASA"): 3}),
+        )
+        # Re-annotation moves "vote" out again
+        await apply_term_deltas(db, keywords=Counter({("2025-01-01T11", "vote"): -1}), entities=Counter())
+        await db.commit()
+        cur = await db.execute("SELECT COUNT(*) FROM keyword_hourly")
+        assert (await cur.fetchone())[0] == 2  # zero rows are deleted
+
+    assert await keyword_counts_for_buckets(db_path, start_bucket="2025-01-01T10", end_bucket="2025-01-01T12") == {"ai": 3}
+    assert await keyword_counts_for_buckets(db_path, start_bucket="2025-01-01T11", end_bucket="2025-01-01T12") == {"ai": 1}
+    assert await entity_counts_for_buckets(db_path, start_bucket="2025-01-01T00", end_bucket="2025-01-02T00") == {
+        ("ORG", "NASA"): 3
+    }
+
+
+@pytest.mark.asyncio
+async def test_existing_annotations_are_rolled_up_once(tmp_path):
+    db_path = str(tmp_path / "news.db")
+    await init_db(db_path)
+    await init_rollup_tables(db_path)
+    await init_annotation_tables(db_path)
+    await upsert_articles(
+        db_path,
+        [{"url": "u1", "title": "AI summit", "published_at": "2025-01-01T10:30:00Z"}],
+        fetched_at="2025-01-01T11:00:00Z",
+    )
+    async with aiosqlite.connect(db_path) as db:
+        await db.execute("INSERT INTO article_annotations(article_id, text_hash, annotated_at) VALUES(1, 'h', 'now')")
+        await db.execute("INSERT INTO article_keywords(article_id, phrase, count) VALUES(1, 'ai summit', 1)")
+        await db.commit()
+
+    assert await rollup_unbucketed_annotations(db_path) == 1
+    assert await rollup_unbucketed_annotations(db_path) == 0
+    assert await keyword_counts_for_buckets(db_path, start_bucket="2025-01-01T10", end_bucket="2025-01-01T11") == {
+        "ai summit": 1
+    }
+
+
+@pytest.mark.asyncio
+async def test_entity_series_selects_named_or_top_entities(tmp_path):
+    db_path = str(tmp_path / "news.db")
+    await init_rollup_tables(db_path)
+    async with aiosqlite.connect(db_path) as db:
+        await apply_term_deltas(
+            db,
+            keywords=Counter(),
+            entities=Counter(
+                {
+                    ("2025-01-01T10", "ORG", "NASA"): 1,
+                    ("2025-01-01T11", "ORG", "NASA"): 4,
+                    ("2025-01-01T11", "GPE", "Paris"): 2,
+                    ("2025-01-01T11", "PERSON", "Paris"): 1,
+                }
+            ),
+        )
+        await db.commit()
+
+    window = {"start_bucket": "2025-01-01T10", "end_bucket": "2025-01-01T12"}
+    keys, rows = await entity_series_for_buckets(db_path, **window, top=1)
+    assert keys == [("ORG", "NASA")]
+    assert sorted(rows) == [("ORG", "NASA", "2025-01-01T10", 1), ("ORG", "NASA", "2025-01-01T11", 4)]
+
+    keys, _ = await entity_series_for_buckets(db_path, **window, entities=[(None, "paris"), ("PERSON", "Paris")])
+    assert keys == [("GPE", "Paris"), ("PERSON", "Paris")]
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import Settings
+from app.services.analytics.keywords import count_keywords
+from app.services.analytics.rule_keywords import extract_keywords_rules, lemmatize
+
+
+def test_phrases_break_at_stopwords_verbs_and_punctuation():
+    assert extract_keywords_rules("Apple unveils new iPhones in California") == ["apple", "new iphone", "california"]
+    assert extract_keywords_rules("Fed warns of interest rate cuts amid London protests") == [
+        "fed",
+        "interest rate",
+        "london protest",
+    ]
+    assert extract_keywords_rules("Markets: 5 things to know") == ["market", "thing"]
+
+
+def test_lemmatizer_table_and_suffix_rules():
+    assert [lemmatize(w) for w in ["cities", "taxes", "women", "crisis", "news", "bus"]] == [
+        "city",
+        "tax",
+        "woman",
+        "crisis",
+        "news",
+        "bus",
+    ]
+
+
+def test_rules_engine_behind_count_keywords():
+    counts = count_keywords(None, ["Climate summit opens in Paris", "Paris climate summit ends"], engine="rules")
+    assert counts.counts["climate summit"] == 1
+    assert counts.counts["paris"] == 1
+    assert counts.counts["paris climate summit"] == 1
+
+
+def test_unknown_keyword_engine_fails_at_startup():
+    with pytest.raises(ValidationError):
+        Settings(keyword_engine="rule")
+    assert Settings(keyword_engine="rules").keyword_engine == "rules"
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.schemas.newsapi import NewsAPIResponse
+from app.services.search_cache import SearchCache, search_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeEverything:
+    def __init__(self, delay: float = 0.05):
+        self.calls = 0
+        self.delay = delay
+        self.fail = False
+
+    async def __call__(self) -> NewsAPIResponse:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return NewsAPIResponse(status="ok", totalResults=self.calls, articles=[])
+
+
+def _cache(clock=None, **kwargs) -> SearchCache:
+    params = {"ttl_seconds": 60, "stale_seconds": 300, "max_entries": 10, **kwargs}
+    return SearchCache(clock=clock or Clock(), **params)
+
+
+def test_key_is_normalized():
+    assert search_key("  Bitcoin  ETF ", None, None, None) == search_key("bitcoin etf", 1, 100, "")
+    assert search_key("bitcoin", None, None, "EN") == search_key("bitcoin", 1, None, "en")
+    assert search_key("bitcoin", 2, None, None) != search_key("bitcoin", 1, None, None)
+    assert search_key("bitcoin", None, 20, None) != search_key("bitcoin", None, None, None)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_upstream_call():
+    cache = _cache()
+    fetch = FakeEverything()
+
+    results = await asyncio.gather(*(cache.get_or_fetch("k", fetch) for _ in range(5)))
+
+    assert fetch.calls == 1
+    assert sorted(source for _, source in results) == ["coalesced"] * 4 + ["upstream"]
+    resp, source = await cache.get_or_fetch("k", fetch)
+    assert (resp.totalResults, source) == (1, "cache")
+    stats = cache.stats()
+    assert stats["upstreamCalls"] == 1
+    assert stats["servedMs"]["cache"] < stats["servedMs"]["upstream"]
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_while_one_refresh_runs():
+    clock = Clock()
+    cache = _cache(clock)
+    fetch = FakeEverything()
+    await cache.get_or_fetch("k", fetch)
+
+    clock.now += 61
+    first = await asyncio.gather(*(cache.get_or_fetch("k", fetch) for _ in range(3)))
+    assert [(r.totalResults, s) for r, s in first] == [(1, "stale")] * 3
+    await asyncio.sleep(0.1)
+
+    assert fetch.calls == 2
+    assert cache.stats()["refreshes"] == 1
+    resp, source = await cache.get_or_fetch("k", fetch)
+    assert (resp.totalResults, source) == (2, "cache")
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_stale_entry_and_errors_are_not_cached():
+    clock = Clock()
+    cache = _cache(clock)
+    fetch = FakeEverything(delay=0)
+    await cache.get_or_fetch("k", fetch)
+
+    fetch.fail = True
+    clock.now += 61
+    assert (await cache.get_or_fetch("k", fetch))[1] == "stale"
+    await asyncio.sleep(0.01)
+    assert (await cache.get_or_fetch("k", fetch))[1] == "stale"
+    assert cache.stats()["upstreamErrors"] >= 1
+
+    clock.now += 300  # past the stale window: a plain miss again
+    with pytest.raises(RuntimeError):
+        await cache.get_or_fetch("k", fetch)
+    fetch.fail = False
+    assert (await cache.get_or_fetch("k", fetch))[1] == "upstream"
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction():
+    cache = _cache(max_entries=2)
+    fetch = FakeEverything(delay=0)
+    await cache.get_or_fetch("a", fetch)
+    await cache.get_or_fetch("b", fetch)
+    await cache.get_or_fetch("a", fetch)  # a is now more recent than b
+    await cache.get_or_fetch("c", fetch)
+
+    assert (await cache.get_or_fetch("a", fetch))[1] == "cache"
+    assert (await cache.get_or_fetch("b", fetch))[1] == "upstream"
+    assert cache.stats()["evictions"] == 2
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backing_survives_a_new_process(tmp_path):
+    clock = Clock()
+    path = str(tmp_path / "news.db")
+    fetch = FakeEverything(delay=0)
+    await _cache(clock, sqlite_path=path).get_or_fetch("k", fetch)
+
+    restarted = _cache(clock, sqlite_path=path)
+    resp, source = await restarted.get_or_fetch("k", fetch)
+    assert (resp.totalResults, source) == (1, "cache")
+    assert fetch.calls == 1
+
+    clock.now += 400
+    assert (await _cache(clock, sqlite_path=path).get_or_fetch("k", fetch))[1] == "upstream"
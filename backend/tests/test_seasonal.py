@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import aiosqlite
+import numpy as np
+import pytest
+
+from app.services.analytics.seasonal import bucket_hour, ewma_update, hour_of_week, shift_bucket, spike_scores
+from app.services.rollups import (
+    fold_closed_hours,
+    init_rollup_tables,
+    record_article_counts,
+    score_volume_spikes,
+)
+
+
+def test_ewma_first_observation_seeds_mean_and_poisson_variance():
+    mean, var, n = ewma_update(np.zeros(2), np.zeros(2), np.zeros(2, dtype=int), np.array([4, 0]), alpha=0.5)
+
+    assert mean.tolist() == [4.0, 0.0]
+    assert var.tolist() == [4.0, 0.0]
+    assert n.tolist() == [1, 1]
+
+    mean, var, n = ewma_update(mean, var, n, np.array([8, 0]), alpha=0.5)
+    assert mean.tolist() == [6.0, 0.0]
+
+
+def test_spike_scores_use_poisson_floor():
+    scores = spike_scores(np.array([10, 10, 3]), np.array([2.0, 10.0, 4.0]), np.array([0.0, 1.0, 4.0]))
+
+    # Variance of key 0 is floored at its mean (2): z = 8 / sqrt(2)
+    assert scores.z[0] == pytest.approx(8 / np.sqrt(2))
+    assert scores.score[0] == 100
+    assert scores.score[1] == 0  # exactly as expected
+    assert scores.score[2] == 0  # below expectation never scores
+
+
+def test_hour_of_week():
+    assert hour_of_week(datetime(2025, 1, 6, 0, tzinfo=UTC)) == 0  # Monday
+    assert hour_of_week(datetime(2025, 1, 12, 23, tzinfo=UTC)) == 167  # Sunday
+
+
+@pytest.mark.asyncio
+async def test_seasonal_baseline_scores_against_same_hour_of_week(tmp_path):
+    db_path = str(tmp_path / "news.db")
+    await init_rollup_tables(db_path)
+    now = datetime(2025, 1, 13, 9, 30, tzinfo=UTC)  # Monday 09:30
+
+    # One week ago: busy morning for "busy", quiet for "quiet"
+    week_ago = now - timedelta(days=7)
+    articles = []
+    for hour_offset, source, n in [(-1, "busy", 10), (0, "busy", 10), (-1, "quiet", 1), (0, "quiet", 1)]:
+        published = (week_ago + timedelta(hours=hour_offset)).replace(minute=5)
+        articles += [{"published_at": published.isoformat(), "source_name": source}] * n
+    await record_article_counts(db_path, articles, feed="us-en")
+    assert await fold_closed_hours(db_path, alpha=0.2, now=now) > 0
+
+    # Today both sources publish 10 last hour and 5 in the current half hour
+    current = [
+        {"published_at": (now.replace(minute=0) + timedelta(hours=h, minutes=5)).isoformat(), "source_name": s}
+        for h, n in ((-1, 10), (0, 5))
+        for s in ("busy", "quiet")
+        for _ in range(n)
+    ]
+    await record_article_counts(db_path, current, feed="us-en")
+
+    spikes = {s["key"]: s for s in await score_volume_spikes(db_path, "source", now=now)}
+    assert spikes["quiet"]["score"] == 100
+    assert spikes["busy"]["score"] == 0
+
+
+@pytest.mark.asyncio
+async def test_keyword_baseline_tracks_top_terms_and_scores_spikes(tmp_path):
+    db_path = str(tmp_path / "news.db")
+    await init_rollup_tables(db_path)
+    now = datetime(2025, 1, 13, 9, 30, tzinfo=UTC)
+    current = bucket_hour(now)
+
+    # A steady "election" and "weather" over the past day, one rare term
+    rows = [(shift_bucket(current, -h), term, 2) for h in range(2, 26) for term in ("election", "weather")]
+    rows.append((shift_bucket(current, -5), "rare", 1))
+    async with aiosqlite.connect(db_path) as db:
+        await db.executemany("INSERT INTO keyword_hourly(bucket_hour, term, count) VALUES(?, ?, ?)", rows)
+        await db.commit()
+    await fold_closed_hours(db_path, alpha=0.2, now=now, keyword_terms=2)
+
+    async with aiosqlite.connect(db_path) as db:
+        cur = await db.execute("SELECT DISTINCT key FROM seasonal_baseline WHERE scope = 'keyword'")
+        assert {r[0] for r in await cur.fetchall()} == {"election", "weather"}
+
+        # "election" jumps in the trailing hour, "weather" stays put
+        await db.executemany(
+            "INSERT INTO keyword_hourly(bucket_hour, term, count) VALUES(?, ?, ?)",
+            [(shift_bucket(current, -1), "election", 30), (shift_bucket(current, -1), "weather", 2)],
+        )
+        await db.commit()
+
+    spikes = {s["key"]: s for s in await score_volume_spikes(db_path, "keyword", now=now)}
+    assert spikes["election"]["score"] == 100
+    assert spikes["weather"]["score"] == 0
+    assert "rare" not in spikes
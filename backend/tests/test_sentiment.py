@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import joblib
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from app.services.sentiment import SentimentModel, sentiment_text
+
+TRAIN = [
+    ("Stocks soar on strong earnings", "positive"),
+    ("Team wins championship", "positive"),
+    ("Market crashes amid fears", "negative"),
+    ("Storm causes widespread damage", "negative"),
+    ("Conference scheduled for next month", "neutral"),
+    ("Company appoints new CEO", "neutral"),
+]
+
+
+@pytest.fixture
+def model(tmp_path) -> SentimentModel:
+    vectorizer = TfidfVectorizer(ngram_range=(1, 2))
+    clf = LogisticRegression(max_iter=1000).fit(vectorizer.fit_transform([t for t, _ in TRAIN]), [y for _, y in TRAIN])
+    joblib.dump(vectorizer, tmp_path / "vectorizer.pkl")
+    joblib.dump(clf, tmp_path / "sentiment.pkl")
+    m = SentimentModel(model_path=str(tmp_path / "sentiment.pkl"), vectorizer_path=str(tmp_path / "vectorizer.pkl"))
+    m.load()
+    return m
+
+
+def test_batch_matches_per_text_predictions(model):
+    texts = ["Stocks soar again", "Storm damage spreads", "CEO scheduled to speak", "Team wins again"]
+    batch = model.predict_many(texts)
+
+    clf, vectorizer = model._model, model._vectorizer
+    for text, result in zip(texts, batch.results):
+        X = vectorizer.transform([text])
+        assert result.label == clf.predict(X)[0]
+        assert result.score == pytest.approx(clf.predict_proba(X)[0].max())
+
+    assert batch.latency_ms >= 0
+    assert model.stats()["batches"] == 1
+    assert model.stats()["texts"] == 4
+    assert model.predict_many([]).results == []
+
+
+def test_sentiment_text():
+    assert sentiment_text("Title", "Desc") == "Title. Desc"
+    assert sentiment_text("Title", None) == "Title"
+    assert sentiment_text(None, "Desc") is None
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+
+from app.services.sentiment import SentimentModel
+from app.services.sentiment_compact import CompactSentimentModel, export_compact, murmurhash3_32
+
+TRAIN = [
+    ("Stocks soar on strong earnings", "positive"),
+    ("Team wins championship", "positive"),
+    ("Breakthrough treatment shows promising results", "positive"),
+    ("Market crashes amid fears", "negative"),
+    ("Storm causes widespread damage", "negative"),
+    ("Data breach exposes millions of accounts", "negative"),
+    ("Conference scheduled for next month", "neutral"),
+    ("Company appoints new CEO", "neutral"),
+]
+
+TEXTS = [
+    "Stocks soar again after strong earnings",
+    "Storm damage spreads; market crashes",
+    "CEO scheduled to speak at conference",
+    "Nothing here matches the vocabulary at all",
+    "",
+    "TEAM WINS — championship!! team wins",
+]
+
+
+def _fit(labels_of, vectorizer=None, clf=None, **vectorizer_kwargs):
+    vectorizer = vectorizer or TfidfVectorizer(**vectorizer_kwargs)
+    X = vectorizer.fit_transform([t for t, _ in TRAIN])
+    clf = (clf or LogisticRegression(max_iter=1000)).fit(X, [labels_of(y) for _, y in TRAIN])
+    return vectorizer, clf
+
+
+def _pair(tmp_path, vectorizer, clf) -> tuple[SentimentModel, CompactSentimentModel]:
+    joblib.dump(vectorizer, tmp_path / "vectorizer.pkl")
+    joblib.dump(clf, tmp_path / "sentiment.pkl")
+    pickled = SentimentModel(model_path=str(tmp_path / "sentiment.pkl"), vectorizer_path=str(tmp_path / "vectorizer.pkl"))
+    pickled.load()
+    compact = CompactSentimentModel(export_compact(vectorizer, clf, tmp_path / "compact"))
+    compact.load()
+    return pickled, compact
+
+
+@pytest.mark.parametrize(
+    "labels_of, vectorizer_kwargs",
+    [
+        (lambda y: y, {"ngram_range": (1, 2), "max_df": 0.95}),
+        (lambda y: y, {"ngram_range": (1, 1), "sublinear_tf": True}),
+        (lambda y: "positive" if y == "positive" else "negative", {"ngram_range": (1, 3), "norm": "l1"}),
+    ],
+)
+def test_compact_matches_pickled_model(tmp_path, labels_of, vectorizer_kwargs):
+    vectorizer, clf = _fit(labels_of, **vectorizer_kwargs)
+    pickled, compact = _pair(tmp_path, vectorizer, clf)
+
+    np.testing.assert_allclose(compact.decision_function(TEXTS).squeeze(), clf.decision_function(vectorizer.transform(TEXTS)))
+    for expected, got in zip(pickled.predict_many(TEXTS).results, compact.predict_many(TEXTS).results):
+        assert got.label == expected.label
+        assert got.score == pytest.approx(expected.score)
+        assert got.polarity == pytest.approx(expected.polarity)
+    assert compact.stats()["texts"] == len(TEXTS)
+
+
+@pytest.mark.parametrize("alternate_sign", [True, False])
+@pytest.mark.parametrize("clf", [LogisticRegression(max_iter=1000), SGDClassifier(loss="log_loss", random_state=0)])
+def test_compact_matches_hashing_models(tmp_path, alternate_sign, clf):
+    vectorizer, clf = _fit(
+        lambda y: y,
+        vectorizer=HashingVectorizer(n_features=2**10, ngram_range=(1, 2), alternate_sign=alternate_sign),
+        clf=clf,
+    )
+    pickled, compact = _pair(tmp_path, vectorizer, clf)
+    assert not (tmp_path / "compact" / "vocab.npy").exists()
+
+    np.testing.assert_allclose(compact.decision_function(TEXTS), clf.decision_function(vectorizer.transform(TEXTS)))
+    for expected, got in zip(pickled.predict_many(TEXTS).results, compact.predict_many(TEXTS).results):
+        assert got.label == expected.label
+        assert got.score == pytest.approx(expected.score)
+
+
+def test_murmurhash_matches_sklearn():
+    from sklearn.utils import murmurhash3_32 as reference
+
+    for term in ["", "a", "ab", "abc", "abcd", "stocks soar", "café crème", "x" * 37]:
+        assert murmurhash3_32(term.encode("utf-8")) == reference(term.encode("utf-8"), seed=0)
+
+
+def test_compact_artifact_is_memory_mapped(tmp_path):
+    vectorizer, clf = _fit(lambda y: y, ngram_range=(1, 2))
+    _, compact = _pair(tmp_path, vectorizer, clf)
+    assert isinstance(compact._coef, np.memmap)
+    assert list(compact._vocab) == sorted(vectorizer.vocabulary_)
+
+
+def test_model_id_tracks_the_artifacts(tmp_path):
+    for name in "abc":
+        (tmp_path / name).mkdir()
+    pickled, compact = _pair(tmp_path / "a", *_fit(lambda y: y))
+    again, _ = _pair(tmp_path / "b", *_fit(lambda y: y))
+    _, retrained = _pair(tmp_path / "c", *_fit(lambda y: y, ngram_range=(1, 2)))
+
+    assert pickled.model_id.startswith("pickle:") and compact.model_id.startswith("compact:")
+    assert pickled.model_id == again.model_id
+    assert compact.model_id != retrained.model_id
+
+
+def test_compact_serving_does_not_import_sklearn(tmp_path):
+    vectorizer, clf = _fit(lambda y: y, ngram_range=(1, 2))
+    export_compact(vectorizer, clf, tmp_path / "compact")
+    script = (
+        "import sys\n"
+        "from app.services.sentiment_compact import CompactSentimentModel\n"
+        f"m = CompactSentimentModel({str(tmp_path / 'compact')!r}); m.load()\n"
+        "print(m.predict('Stocks soar').label)\n"
+        "assert not any(name.split('.')[0] in ('sklearn', 'joblib') for name in sys.modules), 'sklearn imported'\n"
+    )
+    backend = Path(__file__).resolve().parents[1]
+    out = subprocess.run([sys.executable, "-c", script], cwd=backend, capture_output=True, text=True)
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip() == "positive"
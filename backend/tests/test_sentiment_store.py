@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import aiosqlite
+import pytest
+
+from app.services.db import init_db, upsert_articles
+from app.services.ml_cache import init_ml_cache_tables
+from app.services.rollups import init_rollup_tables, sentiment_series_for_buckets
+from app.services.sentiment import SentimentBatch, SentimentResult
+from app.services.sentiment_store import (
+    init_sentiment_tables,
+    rollup_topic_sentiment,
+    score_pending_sentiment,
+    sentiment_by_cluster,
+)
+
+
+class KeywordModel:
+    """Stand-in model: 'win' is positive, 'loss' negative, anything else neutral."""
+
+    def __init__(self, model_id: str = "keywords-v1"):
+        self.model_id = model_id
+        self.calls = 0
+
+    def predict_many(self, texts):
+        self.calls += 1
+        results = []
+        for text in texts:
+            if "win" in text:
+                results.append(SentimentResult("positive", 0.9, 0.8))
+            elif "loss" in text:
+                results.append(SentimentResult("negative", 0.9, -0.8))
+            else:
+                results.append(SentimentResult("neutral", 0.9, 0.0))
+        return SentimentBatch(results, 0.1)
+
+
+async def _setup(tmp_path) -> str:
+    db_path = str(tmp_path / "news.db")
+    await init_db(db_path)
+    await init_rollup_tables(db_path)
+    await init_ml_cache_tables(db_path)
+    await init_sentiment_tables(db_path)
+    await upsert_articles(
+        db_path,
+        [
+            {"url": "u1", "title": "Big win", "source_name": "A", "published_at": "2025-01-01T10:10:00Z"},
+            {"url": "u2", "title": "Heavy loss", "source_name": "A", "published_at": "2025-01-01T10:20:00Z"},
+            {"url": "u3", "title": "Another win", "source_name": "B", "published_at": "2025-01-01T11:00:00Z"},
+        ],
+        fetched_at="2025-01-01T12:00:00Z",
+    )
+    return db_path
+
+
+@pytest.mark.asyncio
+async def test_scored_once_and_rollups_follow_changes(tmp_path):
+    db_path = await _setup(tmp_path)
+    model = KeywordModel()
+    window = {"start_bucket": "2025-01-01T00", "end_bucket": "2025-01-02T00"}
+
+    assert len(await score_pending_sentiment(db_path, model=model)) == 3
+    assert await score_pending_sentiment(db_path, model=model) == []
+    assert model.calls == 1  # one batch for all articles
+
+    keys, rows = await sentiment_series_for_buckets(db_path, "source", **window)
+    assert keys == ["A", "B"]
+    assert sorted(rows)[0] == ("A", "2025-01-01T10", 2, 0.0, 1, 1, 0)
+
+    # Headline rewritten: old contribution is subtracted, new one added
+    await upsert_articles(
+        db_path,
+        [{"url": "u2", "title": "Late win", "source_name": "A", "published_at": "2025-01-01T10:20:00Z"}],
+        fetched_at="2025-01-01T13:00:00Z",
+    )
+    assert len(await score_pending_sentiment(db_path, model=model)) == 1
+    _, rows = await sentiment_series_for_buckets(db_path, "all", **window, keys=["all"])
+    assert sorted(rows) == [
+        ("all", "2025-01-01T10", 2, pytest.approx(1.6), 2, 0, 0),
+        ("all", "2025-01-01T11", 1, pytest.approx(0.8), 1, 0, 0),
+    ]
+
+    # A corrected timestamp moves the article's contribution to its new hour
+    await upsert_articles(
+        db_path,
+        [{"url": "u2", "title": "Late win", "source_name": "A", "published_at": "2025-01-01T11:20:00Z"}],
+        fetched_at="2025-01-01T14:00:00Z",
+    )
+    assert len(await score_pending_sentiment(db_path, model=model)) == 1
+    _, rows = await sentiment_series_for_buckets(db_path, "all", **window, keys=["all"])
+    assert sorted(rows) == [
+        ("all", "2025-01-01T10", 1, pytest.approx(0.8), 1, 0, 0),
+        ("all", "2025-01-01T11", 2, pytest.approx(1.6), 2, 0, 0),
+    ]
+
+    # A new model version rescores every article
+    assert len(await score_pending_sentiment(db_path, model=KeywordModel("keywords-v2"))) == 3
+
+
+@pytest.mark.asyncio
+async def test_topic_and_cluster_sentiment(tmp_path):
+    db_path = await _setup(tmp_path)
+    await score_pending_sentiment(db_path, model=KeywordModel())
+    async with aiosqlite.connect(db_path) as db:
+        await db.executemany(
+            "INSERT INTO article_topics(url, topic_id, topic_label, computed_at) VALUES(?, ?, ?, 'now')",
+            [("u1", 0, "sports"), ("u2", 0, "sports"), ("u3", 1, "markets")],
+        )
+        await db.executemany(
+            "INSERT INTO article_clusters(url, cluster_id, cluster_size, computed_at) VALUES(?, ?, ?, 'now')",
+            [("u1", 7, 2), ("u3", 7, 2), ("u2", -1, 1)],
+        )
+        await db.commit()
+
+    assert await rollup_topic_sentiment(db_path) == 2
+    keys, rows = await sentiment_series_for_buckets(
+        db_path, "topic", start_bucket="2025-01-01T00", end_bucket="2025-01-02T00"
+    )
+    assert keys == ["sports", "markets"]
+
+    clusters = await sentiment_by_cluster(db_path)
+    assert len(clusters) == 1
+    assert clusters[0]["cluster_id"] == 7
+    assert clusters[0]["positive"] == 2
+    assert clusters[0]["mean_polarity"] == pytest.approx(0.8)
+    assert clusters[0]["url"] == "u3"  # newest member
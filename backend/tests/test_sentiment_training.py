@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import csv
+import json
+
+import numpy as np
+import pytest
+
+from app.services.sentiment_compact import CompactSentimentModel
+from app.services.sentiment_training import (
+    CorpusSpec,
+    FeatureSpec,
+    is_validation,
+    iter_chunks,
+    parameter_grid,
+    promote,
+    select_model,
+    write_artifacts,
+)
+
+WORDS = {
+    "positive": ["soar", "wins", "record profits", "breakthrough", "rally"],
+    "negative": ["crash", "layoffs", "storm damage", "breach", "fears"],
+    "neutral": ["announces", "scheduled", "appoints", "releases", "meets"],
+}
+
+
+@pytest.fixture
+def corpus(tmp_path) -> CorpusSpec:
+    rng = np.random.default_rng(0)
+    path = tmp_path / "corpus.csv"
+    with path.open("w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["title", "label"])
+        for i in range(1200):
+            label = ["positive", "negative", "neutral"][i % 3]
+            writer.writerow([f"Company {rng.choice(WORDS[label])} {i}", label])
+        writer.writerow(["", "positive"])  # skipped
+    return CorpusSpec(path=str(path), text_field="title", chunk_size=100, validation_fraction=0.2)
+
+
+def test_chunks_stream_a_stable_split(corpus):
+    train = [t for texts, _ in iter_chunks(corpus, validation=False) for t in texts]
+    validation = [t for texts, _ in iter_chunks(corpus, validation=True) for t in texts]
+
+    assert len(train) + len(validation) == 1200
+    assert not set(train) & set(validation)
+    assert 0.1 < len(validation) / 1200 < 0.3
+    assert all(is_validation(t, 0.2) for t in validation)
+    assert max(len(texts) for texts, _ in iter_chunks(corpus, validation=False)) == 100
+
+
+def test_parameter_grid():
+    assert parameter_grid({"penalty": ["l2"], "alpha": [1e-5, 1e-4]}) == [
+        {"alpha": 1e-5, "penalty": "l2"},
+        {"alpha": 1e-4, "penalty": "l2"},
+    ]
+
+
+def test_select_model_writes_versioned_servable_artifacts(corpus, tmp_path):
+    features = FeatureSpec(n_features=2**12)
+    best, candidates, report = select_model(
+        corpus, features, {"alpha": [1e-5, 1e-3], "penalty": ["l2"]}, epochs=2, n_jobs=2
+    )
+
+    assert len(candidates) == 2
+    assert best.metrics["macroF1"] == max(c.metrics["macroF1"] for c in candidates)
+    assert best.metrics["accuracy"] > 0.9
+    assert report["corpus"]["rows"] == 1200
+    assert report["wallSeconds"] > 0
+
+    models_dir = tmp_path / "models"
+    version_dir = write_artifacts(models_dir, best, features, report)
+    metrics = json.loads((version_dir / "metrics.json").read_text())
+    assert metrics["version"] == version_dir.name
+    assert metrics["best"]["params"] == best.params
+
+    promote(version_dir, models_dir)
+    assert (models_dir / "sentiment" / "CURRENT").read_text() == version_dir.name
+    compact = CompactSentimentModel(models_dir / "sentiment_compact")
+    compact.load()
+    texts = ["Startup wins record profits", "Bank layoffs spark fears", "Council meets today"]
+    vectorizer = features.vectorizer()
+    expected = best.model.predict_proba(vectorizer.transform(texts))
+    got = compact.predict_many(texts).results
+    assert [r.label for r in got] == ["positive", "negative", "neutral"]
+    assert [r.score for r in got] == pytest.approx(expected.max(axis=1).tolist())
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_key_stays_in_flight_until_fill_returns():
+    flight: SingleFlight[str] = SingleFlight("test")
+    fetched, cached = asyncio.Event(), asyncio.Event()
+
+    async def fill() -> str:
+        fetched.set()
+        await cached.wait()  # e.g. the cache write
+        return "value"
+
+    task = flight.start("k", fill)
+    await fetched.wait()
+    assert flight.get("k") is task
+    cached.set()
+
+    assert await task == "value"
+    assert "k" not in flight
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_fill_leaves_the_key():
+    flight: SingleFlight[str] = SingleFlight("test")
+
+    async def fill() -> str:
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        await flight.start("k", fill)
+    assert flight.get("k") is None
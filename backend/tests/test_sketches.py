@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from collections import Counter
+from datetime import UTC, datetime
+
+import aiosqlite
+import numpy as np
+import pytest
+
+from app.services.analytics.sketches import CountMinSketch, SpaceSaving
+from app.services.rollups import (
+    apply_term_deltas,
+    init_rollup_tables,
+    keyword_sketch_for_buckets,
+    sketch_closed_hours,
+)
+
+
+def _zipf_counts(n_terms: int, seed: int) -> dict[str, int]:
+    rng = np.random.default_rng(seed)
+    draws = rng.zipf(1.3, size=50_000)
+    return {f"term{k}": int(c) for k, c in Counter(draws[draws <= n_terms]).items()}
+
+
+def test_count_min_overcounts_within_bound_and_merges():
+    a, b = _zipf_counts(5000, 1), _zipf_counts(5000, 2)
+    left, right = CountMinSketch(width=512, depth=4), CountMinSketch(width=512, depth=4)
+    left.add_many(a)
+    right.add_many(b)
+    left.merge(right)
+
+    truth = Counter(a) + Counter(b)
+    terms = list(truth)
+    est = left.estimate_many(terms)
+    exact = np.array([truth[t] for t in terms])
+    assert (est >= exact).all()
+    # Bound holds per query with prob 1 - e^-4; allow the expected few violations
+    assert ((est - exact) > left.max_overcount()).mean() < 0.05
+
+    restored = CountMinSketch.from_bytes(left.to_bytes(), width=512, depth=4, total=left.total)
+    assert (restored.estimate_many(terms) == est).all()
+
+
+def test_space_saving_merge_keeps_heavy_hitters():
+    a, b = _zipf_counts(5000, 3), _zipf_counts(5000, 4)
+    left, right = SpaceSaving(capacity=50), SpaceSaving(capacity=50)
+    left.add_many(a)
+    right.add_many(b)
+    left.merge(right)
+
+    truth = Counter(a) + Counter(b)
+    expected_top = {t for t, _ in truth.most_common(10)}
+    assert expected_top <= {t for t, _, _ in left.top(20)}
+    for term, count, error in left.top():
+        assert count - error <= truth[term] <= count
+
+
+@pytest.mark.asyncio
+async def test_window_sketch_combines_stored_and_open_hours(tmp_path):
+    db_path = str(tmp_path / "news.db")
+    await init_rollup_tables(db_path)
+    dims = {"width": 256, "depth": 4, "capacity": 16}
+
+    async with aiosqlite.connect(db_path) as db:
+        await apply_term_deltas(
+            db,
+            keywords=Counter({("2025-01-01T08", "ai"): 5, ("2025-01-01T09", "ai"): 2, ("2025-01-01T12", "vote"): 3}),
+            entities=Counter(),
+        )
+        await db.commit()
+
+    now = datetime(2025, 1, 1, 12, 30, tzinfo=UTC)
+    assert await sketch_closed_hours(db_path, settle_hours=1, now=now, **dims) == 2
+    assert await sketch_closed_hours(db_path, settle_hours=1, now=now, **dims) == 0
+
+    # A late article lands in an hour that is already sketched
+    async with aiosqlite.connect(db_path) as db:
+        await apply_term_deltas(db, keywords=Counter({("2025-01-01T09", "ai"): 1}), entities=Counter())
+        await db.commit()
+
+    sketch = await keyword_sketch_for_buckets(db_path, start_bucket="2025-01-01T00", end_bucket="2025-01-02T00", **dims)
+    assert sketch.total == 11
+    assert sketch.estimate_many(["ai", "vote"]) == {"ai": 8, "vote": 3}
+    assert sketch.candidates(1) == ["ai"]
+
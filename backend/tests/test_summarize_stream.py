@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+from app.api.routes import summarize as summarize_route
+from app.core.errors import UpstreamAPIError
+from app.services.gemini_client import GeminiClient
+from app.services.summary_cache import SummaryCache, summary_key
+from app.services.upstream import UpstreamClient
+
+
+def fake_stream_gemini(chunks: list[str], status: int = 200) -> FastAPI:
+    """Local stand-in for streamGenerateContent?alt=sse."""
+    app = FastAPI()
+
+    @app.post("/v1/models/{model}:streamGenerateContent")
+    async def stream(model: str, alt: str):
+        assert alt == "sse"
+        if status != 200:
+            return StreamingResponse(iter([json.dumps({"error": {"status": "RESOURCE_EXHAUSTED"}})]), status_code=status)
+
+        async def frames():
+            for i, text in enumerate(chunks):
+                data = {
+                    "candidates": [{"content": {"parts": [{"text": text}]}}],
+                    "usageMetadata": {"totalTokenCount": 10 * (i + 1)},
+                }
+                yield f"data: {json.dumps(data)}\r\n\r\n"
+
+        return StreamingResponse(frames(), media_type="text/event-stream")
+
+    return app
+
+
+def _client(app: FastAPI) -> GeminiClient:
+    http = UpstreamClient("gemini", transport=httpx.ASGITransport(app=app))
+    return GeminiClient(model="fake", base_url="http://gemini/v1", api_key="k", http=http)
+
+
+class FakeStreamClient:
+    """Yields chunks with a pause; records whether the stream was closed early."""
+
+    model = "fake"
+
+    def __init__(self, chunks: list[str], error: Exception | None = None):
+        self.chunks = chunks
+        self.error = error
+        self.closed_early = False
+        self.calls = 0
+
+    async def summarize_stream(self, **_):
+        self.calls += 1
+        sent = 0
+        try:
+            for text in self.chunks:
+                await asyncio.sleep(0.01)
+                yield text
+                sent += 1
+            if self.error:
+                raise self.error
+        finally:
+            self.closed_early = sent < len(self.chunks)
+
+
+class ConnectedRequest:
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+def _parse(frames: list[str]) -> list[tuple[str, dict]]:
+    events = []
+    for frame in frames:
+        lines = dict(line.split(": ", 1) for line in frame.strip().splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+async def _stream(monkeypatch, client, cache, *, take: int | None = None) -> list[tuple[str, dict]]:
+    monkeypatch.setattr(summarize_route, "get_gemini_client", lambda: client)
+    monkeypatch.setattr(summarize_route, "get_summary_cache", lambda: cache)
+    response = await summarize_route.summarize_stream(
+        summarize_route.SummarizeRequest(title="Story"), ConnectedRequest()
+    )
+    frames = []
+    async for frame in response.body_iterator:
+        frames.append(frame)
+        if take is not None and len(frames) == take:
+            await response.body_iterator.aclose()  # what the server does when the browser goes away
+            break
+    return _parse(frames)
+
+
+@pytest.mark.asyncio
+async def test_gemini_client_streams_chunks():
+    client = _client(fake_stream_gemini(["Hello", " world", "."]))
+    assert [t async for t in client.summarize_stream(title="T", description=None, content=None)] == [
+        "Hello",
+        " world",
+        ".",
+    ]
+    assert client.tokens_used == 30
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_gemini_client_stream_error():
+    client = _client(fake_stream_gemini([], status=429))
+    with pytest.raises(UpstreamAPIError) as e:
+        async for _ in client.summarize_stream(title="T", description=None, content=None):
+            pass
+    assert e.value.status_code == 429
+    assert e.value.code == "RESOURCE_EXHAUSTED"
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_relays_chunks_and_fills_cache(tmp_path, monkeypatch):
+    cache = SummaryCache(str(tmp_path / "news.db"), ttl_seconds=3600, max_entries=10)
+    client = FakeStreamClient(["A ", "summary", "."])
+
+    events = await _stream(monkeypatch, client, cache)
+    assert [e for e, _ in events] == ["chunk", "chunk", "chunk", "done"]
+    assert "".join(d["text"] for e, d in events if e == "chunk") == "A summary."
+    done = events[-1][1]
+    assert done["source"] == "upstream"
+    assert done["ttftMs"] <= done["totalMs"]
+    assert await cache.get(summary_key("fake", "Story", None, None)) == "A summary."
+
+    # Second request is served from the cache in one chunk
+    events = await _stream(monkeypatch, client, cache)
+    assert events == [("chunk", {"text": "A summary."}), ("done", events[1][1])]
+    assert events[1][1]["source"] == "cache"
+    stats = cache.stats()
+    assert stats["streams"]["completed"] == 1
+    assert stats["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_upstream_and_skips_cache(tmp_path, monkeypatch):
+    cache = SummaryCache(str(tmp_path / "news.db"), ttl_seconds=3600, max_entries=10)
+    client = FakeStreamClient(["one ", "two ", "three ", "four"])
+
+    events = await _stream(monkeypatch, client, cache, take=2)
+    assert [d["text"] for _, d in events] == ["one ", "two "]
+    assert client.closed_early
+    assert await cache.get(summary_key("fake", "Story", None, None)) is None
+    assert cache.stats()["streams"]["cancelled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_upstream_timeout_ends_stream_with_error_event(tmp_path, monkeypatch):
+    cache = SummaryCache(str(tmp_path / "news.db"), ttl_seconds=3600, max_entries=10)
+    client = FakeStreamClient(["partial "], error=httpx.ReadTimeout("timed out"))
+
+    events = await _stream(monkeypatch, client, cache)
+    assert [e for e, _ in events] == ["chunk", "error"]
+    assert events[-1][1]["code"] == "upstreamUnavailable"
+    assert await cache.get(summary_key("fake", "Story", None, None)) is None
+    assert cache.stats()["upstreamErrors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_stream(tmp_path, monkeypatch):
+    cache = SummaryCache(str(tmp_path / "news.db"), ttl_seconds=3600, max_entries=10)
+    client = FakeStreamClient(["one ", "two ", "three ", "four"])
+    key = summary_key("fake", "Story", None, None)
+
+    async def join_late():
+        while not cache.streaming(key):
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(0.025)  # a couple of chunks in
+        # A streaming and a non-streaming request both join the running stream
+        return await asyncio.gather(
+            _stream(monkeypatch, client, cache),
+            cache.get_or_compute(key, "fake", lambda: pytest.fail("second upstream call")),
+        )
+
+    first, (late, plain) = await asyncio.gather(_stream(monkeypatch, client, cache), join_late())
+
+    assert client.calls == 1
+    text = "one two three four"
+    assert "".join(d["text"] for e, d in first if e == "chunk") == text
+    assert "".join(d["text"] for e, d in late if e == "chunk") == text
+    assert (first[-1][1]["source"], late[-1][1]["source"]) == ("upstream", "coalesced")
+    assert plain == (text, "coalesced")
+    assert cache.stats()["coalesced"] == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_survives_one_of_two_clients_leaving(tmp_path, monkeypatch):
+    cache = SummaryCache(str(tmp_path / "news.db"), ttl_seconds=3600, max_entries=10)
+    client = FakeStreamClient(["one ", "two ", "three ", "four"])
+
+    leaver, stayer = await asyncio.gather(
+        _stream(monkeypatch, client, cache, take=1), _stream(monkeypatch, client, cache)
+    )
+
+    assert client.calls == 1 and not client.closed_early
+    assert [d["text"] for _, d in leaver] == ["one "]
+    assert stayer[-1] == ("done", stayer[-1][1])
+    assert await cache.get(summary_key("fake", "Story", None, None)) == "one two three four"
+    assert cache.stats()["streams"]["completed"] == 1
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services.summary_cache import SummaryCache, summary_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeUpstream:
+    def __init__(self, delay: float = 0.05):
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return f"summary {self.calls}"
+
+
+def test_key_covers_model_and_fields():
+    assert summary_key("m", "t", None, None) == summary_key("m", "t", "", "")
+    assert summary_key("m", "t", None, None) != summary_key("m2", "t", None, None)
+    assert summary_key("m", "a", "b", None) != summary_key("m", "a", None, "b")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_upstream_call(tmp_path):
+    cache = SummaryCache(str(tmp_path / "news.db"), ttl_seconds=3600, max_entries=10)
+    upstream = FakeUpstream()
+
+    results = await asyncio.gather(*(cache.get_or_compute("k", "m", upstream) for _ in range(5)))
+
+    assert upstream.calls == 1
+    assert {summary for summary, _ in results} == {"summary 1"}
+    assert sorted(source for _, source in results) == ["coalesced"] * 4 + ["upstream"]
+    assert await cache.get_or_compute("k", "m", upstream) == ("summary 1", "cache")
+
+    stats = cache.stats()
+    assert stats["upstreamCalls"] == 1
+    assert stats["hitRatio"] == pytest.approx(5 / 6, abs=1e-4)
+    assert stats["upstreamLatencyMs"]["max"] >= 40
+    assert stats["inflight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_call(tmp_path):
+    cache = SummaryCache(str(tmp_path / "news.db"), ttl_seconds=3600, max_entries=10)
+    upstream = FakeUpstream(delay=0.1)
+
+    first = asyncio.create_task(cache.get_or_compute("k", "m", upstream))
+    await asyncio.sleep(0.02)
+    second = asyncio.create_task(cache.get_or_compute("k", "m", upstream))
+    await asyncio.sleep(0.02)
+    first.cancel()
+
+    assert await second == ("summary 1", "coalesced")
+    assert await cache.get("k") == "summary 1"
+    assert upstream.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_request_during_cache_write_is_coalesced(tmp_path, monkeypatch):
+    cache = SummaryCache(str(tmp_path / "news.db"), ttl_seconds=3600, max_entries=10)
+    upstream = FakeUpstream(delay=0)
+    put = cache.put
+    writing = asyncio.Event()
+
+    async def slow_put(*args):
+        writing.set()
+        await asyncio.sleep(0.05)
+        await put(*args)
+
+    monkeypatch.setattr(cache, "put", slow_put)
+    first = asyncio.create_task(cache.get_or_compute("k", "m", upstream))
+    await writing.wait()
+
+    assert await cache.get_or_compute("k", "m", upstream) == ("summary 1", "coalesced")
+    assert await first == ("summary 1", "upstream")
+    assert upstream.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached(tmp_path):
+    cache = SummaryCache(str(tmp_path / "news.db"), ttl_seconds=3600, max_entries=10)
+
+    async def failing() -> str:
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_compute("k", "m", failing)
+    assert cache.stats()["upstreamErrors"] == 1
+    assert await cache.get_or_compute("k", "m", FakeUpstream(delay=0)) == ("summary 1", "upstream")
+
+
+@pytest.mark.asyncio
+async def test_ttl_and_lru_eviction(tmp_path):
+    clock = Clock()
+    cache = SummaryCache(str(tmp_path / "news.db"), ttl_seconds=100, max_entries=2, clock=clock)
+
+    await cache.put("a", "m", "A")
+    clock.now += 1
+    await cache.put("b", "m", "B")
+    clock.now += 1
+    assert await cache.get("a") == "A"  # a is now more recent than b
+    clock.now += 1
+    await cache.put("c", "m", "C")
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == "A"
+    assert await cache.get("c") == "C"
+
+    clock.now += 100
+    assert await cache.get("c") is None
+    await cache.put("d", "m", "D")
+    assert cache.stats()["evictions"] == 3
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import numpy as np
+
+from app.services.analytics.timelines import kinematics, series_matrix
+
+
+def test_series_matrix_aligns_sparse_rows():
+    keys = [("ORG", "NASA"), ("GPE", "Paris")]
+    buckets = ["2025-01-01T10", "2025-01-01T11", "2025-01-01T12"]
+    rows = [("ORG", "NASA", "2025-01-01T12", 3), ("GPE", "Paris", "2025-01-01T10", 1), ("GPE", "Rome", "2025-01-01T10", 9)]
+    assert series_matrix(rows, keys, buckets).tolist() == [[0, 0, 3], [1, 0, 0]]
+
+
+def test_velocity_and_acceleration_per_row():
+    series = np.array([[1, 2, 3, 4, 5, 6], [0, 0, 0, 0, 0, 6], [5, 5, 5, 5, 5, 5]], dtype=float)
+    motion = kinematics(series, smoothing_hours=3)
+    assert motion.smoothed[0].tolist() == [1, 1.5, 2, 3, 4, 5]
+    assert motion.velocity.tolist() == [1, 2, 0]  # steady riser, sudden burst, flat
+    assert motion.acceleration.tolist() == [0, 2, 0]
+
+
+def test_partial_last_hour_is_not_read_as_deceleration():
+    # Steady riser whose current hour has only just started
+    series = np.array([[1, 2, 3, 4, 5, 1]], dtype=float)
+    motion = kinematics(series, smoothing_hours=1, partial_last=True)
+    assert motion.smoothed.shape == (1, 6)
+    assert motion.velocity.tolist() == [1]
+    assert motion.acceleration.tolist() == [0]
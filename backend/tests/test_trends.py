@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from app.services.analytics.trends import rank_trends
+import numpy as np
+
+from app.services.analytics.trends import align_counts, rank_trends, rank_trends_scored, top_k
 
 
 def test_ranking_new_group_above_existing():
@@ -28,3 +30,31 @@ def test_ranking_existing_sorted_by_growth_desc():
     ranked = rank_trends(current=current, previous=previous, limit=10)
     # growth(x)=1.0, growth(y)=4.0
     assert ranked[0].keyword == "y"
+
+
+def test_scored_modes_prefer_supported_risers():
+    current = {"one-off": 1, "riser": 20, "steady": 50}
+    previous = {"riser": 2, "steady": 50, "faded": 30}
+
+    for method in ("log_ratio", "zscore"):
+        ranked = rank_trends_scored(current=current, previous=previous, method=method, min_support=2)
+        assert [r.keyword for r in ranked][0] == "riser"
+        assert "one-off" not in {r.keyword for r in ranked}  # below min_support
+        assert "faded" not in {r.keyword for r in ranked}
+
+
+def test_top_k_matches_full_sort():
+    rng = np.random.default_rng(0)
+    scores = rng.normal(size=100_000)
+    scores[::7] = -np.inf
+
+    idx = top_k(scores, 25)
+    expected = np.argsort(-scores)[:25]
+    assert idx.tolist() == expected.tolist()
+
+
+def test_align_counts_covers_both_windows():
+    terms, cur, prev = align_counts({"a": 2, "b": 1}, {"b": 3, "c": 4})
+    assert terms == ["a", "b", "c"]
+    assert cur.tolist() == [2, 1, 0]
+    assert prev.tolist() == [0, 3, 4]
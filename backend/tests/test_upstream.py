@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, Response
+
+from app.services.upstream import AIMDLimiter, UpstreamClient
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def stub_server() -> FastAPI:
+    """Local stub upstream: /slow-first stalls on its first call only; /limited always answers 429."""
+    app = FastAPI()
+    app.state.calls = 0
+    app.state.active = app.state.peak = 0
+
+    @app.get("/fast")
+    async def fast():
+        app.state.active += 1
+        app.state.peak = max(app.state.peak, app.state.active)
+        await asyncio.sleep(0.01)
+        app.state.active -= 1
+        return {"ok": True}
+
+    @app.get("/slow-first")
+    async def slow_first():
+        app.state.calls += 1
+        await asyncio.sleep(1.0 if app.state.calls == 1 else 0.0)
+        return {"attempt": app.state.calls}
+
+    @app.get("/limited")
+    async def limited():
+        return Response(status_code=429)
+
+    return app
+
+
+def _client(app: FastAPI, **kwargs) -> UpstreamClient:
+    return UpstreamClient("stub", base_url="http://stub", transport=httpx.ASGITransport(app=app), **kwargs)
+
+
+def test_aimd_increases_additively_and_halves_on_throttle():
+    clock = Clock()
+    limiter = AIMDLimiter(initial=4, max_limit=8, latency_target_ms=100, clock=clock)
+    for _ in range(4):
+        limiter.record(latency_ms=10, throttled=False)
+    assert limiter.limit == pytest.approx(4.9, abs=0.05)
+
+    limiter.record(latency_ms=10, throttled=True)
+    assert limiter.capacity == 2
+    limiter.record(latency_ms=500, throttled=False)  # within the cooldown: same congestion event
+    assert limiter.capacity == 2
+    clock.now += 2
+    limiter.record(latency_ms=500, throttled=False)
+    assert limiter.capacity == 1
+    assert limiter.decreases == 2
+
+    limiter.record(latency_ms=None, throttled=False)  # cancelled request: no signal
+    assert limiter.capacity == 1
+
+
+@pytest.mark.asyncio
+async def test_limiter_caps_concurrent_requests():
+    app = stub_server()
+    client = _client(app, limiter=AIMDLimiter(initial=2, max_limit=2))
+    responses = await asyncio.gather(*(client.get("/fast") for _ in range(8)))
+    assert all(r.status_code == 200 for r in responses)
+    assert app.state.peak <= 2
+    assert client.limiter.waits > 0
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_429_shrinks_the_limit():
+    client = _client(stub_server(), limiter=AIMDLimiter(initial=8))
+    resp = await client.get("/limited")
+    assert resp.status_code == 429
+    assert client.limiter.capacity == 4
+    assert client.stats()["throttled"] == 1
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_hedged_get_returns_the_faster_attempt():
+    app = stub_server()
+    client = _client(app, hedge_min_samples=5, hedge_min_delay_ms=20)
+    for _ in range(5):
+        await client.get("/fast")
+
+    resp = await client.get("/slow-first", hedge=True)
+    assert resp.json() == {"attempt": 2}
+    assert client.hedges == 1 and client.hedge_wins == 1
+    assert client.limiter.in_flight == 0
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_without_latency_history_or_spare_capacity():
+    app = stub_server()
+    client = _client(app, hedge_min_samples=5, hedge_min_delay_ms=20)
+    assert (await client.get("/slow-first", hedge=True)).json() == {"attempt": 1}
+    assert client.hedges == 0
+
+    for _ in range(5):
+        await client.get("/fast")
+    client.limiter.limit = 1  # the primary takes the only slot
+    app.state.calls = 0
+    assert (await client.get("/slow-first", hedge=True)).json() == {"attempt": 1}
+    assert client.hedges == 0
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_singleton_client_uses_a_fresh_pool_after_close():
+    from app.services.gemini_client import get_gemini_client
+    from app.services.upstream import close_upstreams, get_upstream
+
+    client = get_gemini_client()
+    before = client._http
+    await close_upstreams()
+
+    assert client._http is get_upstream("gemini")
+    assert client._http is not before
+    await close_upstreams()
@@ -1,12 +1,23 @@
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useRef } from 'react'
 import PropTypes from 'prop-types'
 
 const BreakingNews = ({ apiBase = 'http://localhost:8000' }) => {
     const [breakingStories, setBreakingStories] = useState([])
     const [visible, setVisible] = useState(false)
-    const [dismissed, setDismissed] = useState(new Set())
+    // A ref, not state: dismissing must not tear down and reopen the event stream
+    const dismissed = useRef(new Set())
 
     useEffect(() => {
+        const showStories = (stories) => {
+            // Filter out dismissed and below-threshold stories
+            const activeStories = stories.filter(
+                story => story.score >= 60 && !dismissed.current.has(story.url)
+            )
+
+            setBreakingStories(activeStories)
+            setVisible(activeStories.length > 0)
+        }
+
         const fetchBreakingNews = async () => {
             try {
                 const response = await fetch(`${apiBase}/breaking?threshold=60`)
@@ -16,20 +27,22 @@ const BreakingNews = ({ apiBase = 'http://localhost:8000' }) => {
                 }
 
                 const data = await response.json()
-                const stories = data.breaking || []
-
-                // Filter out dismissed stories
-                const activeStories = stories.filter(
-                    story => !dismissed.has(story.url)
-                )
-
-                setBreakingStories(activeStories)
-                setVisible(activeStories.length > 0)
+                showStories(data.breaking || [])
             } catch (err) {
                 console.error('Breaking news error:', err)
             }
         }
 
+        // Push updates from the server; fall back to polling without EventSource
+        if (typeof EventSource !== 'undefined') {
+            const source = new EventSource(`${apiBase}/events?types=breaking`)
+            source.addEventListener('breaking', (event) => {
+                showStories(JSON.parse(event.data).breaking || [])
+            })
+            fetchBreakingNews()
+            return () => source.close()
+        }
+
         // Initial fetch
         fetchBreakingNews()
 
@@ -37,10 +50,10 @@ const BreakingNews = ({ apiBase = 'http://localhost:8000' }) => {
         const interval = setInterval(fetchBreakingNews, 5 * 60 * 1000)
 
         return () => clearInterval(interval)
-    }, [apiBase, dismissed])
+    }, [apiBase])
 
     const handleDismiss = (storyUrl) => {
-        setDismissed(prev => new Set([...prev, storyUrl]))
+        dismissed.current.add(storyUrl)
         setBreakingStories(prev => prev.filter(s => s.url !== storyUrl))
 
         // Hide banner if no stories left
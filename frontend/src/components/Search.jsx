@@ -69,7 +69,8 @@ export default function Search({ initialQuery = '' }) {
         setSummarizing(prev => ({ ...prev, [articleIdx]: true }));
 
         try {
-            const response = await fetch(`${API_BASE}/summarize`, {
+            // Streamed as Server-Sent Events: text appears as soon as the first chunk arrives
+            const response = await fetch(`${API_BASE}/summarize/stream`, {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({
@@ -85,8 +86,28 @@ export default function Search({ initialQuery = '' }) {
                 throw new Error(errorMsg)
             }
 
-            const data = await response.json();
-            setSummaries(prev => ({ ...prev, [articleIdx]: data.summary }));
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            let text = '';
+            while (true) {
+                const { done, value } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                const frames = buffer.split('\n\n');
+                buffer = frames.pop();
+                for (const frame of frames) {
+                    const event = frame.match(/^event: (.*)$/m)?.[1];
+                    const data = JSON.parse(frame.match(/^data: (.*)$/m)?.[1] || '{}');
+                    if (event === 'chunk') {
+                        text += data.text;
+                        setSummaries(prev => ({ ...prev, [articleIdx]: text }));
+                        setSummarizing(prev => ({ ...prev, [articleIdx]: false }));
+                    } else if (event === 'error') {
+                        throw new Error(data.message || 'Summarization failed');
+                    }
+                }
+            }
         } catch (err) {
             setSummaries(prev => ({ ...prev, [articleIdx]: `Error: ${err.message}` }));
         } finally {
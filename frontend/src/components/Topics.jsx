@@ -33,6 +33,19 @@ const Topics = ({ apiBase = 'http://localhost:8000' }) => {
         }
 
         fetchTopics()
+
+        // Topics are recomputed once per poll cycle; the server pushes them
+        if (typeof EventSource === 'undefined') return undefined
+        const source = new EventSource(`${apiBase}/events?types=topics`)
+        source.addEventListener('topics', (event) => {
+            const data = JSON.parse(event.data)
+            setTopics(data.topics || [])
+            setTotalArticles(data.total_articles || 0)
+            setUncategorized(data.uncategorized_count || 0)
+            setError(null)
+            setLoading(false)
+        })
+        return () => source.close()
     }, [apiBase])
 
     if (loading) {